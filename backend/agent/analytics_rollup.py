@@ -0,0 +1,233 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Analytics Rollups
+
+Vorab aggregierte Zaehler fuer das Dashboard (Tabelle analytics_rollups), damit
+/analytics nicht bei jedem Aufruf COUNT(*) und GROUP BY ueber Conversations,
+Messages und Audit-Log laufen laesst.
+
+Pro (Tag, Metrik, Dimension) gibt es eine Zeile, zusaetzlich laufende Summen
+unter day = TOTAL_DAY. Aktualisiert wird inkrementell in derselben Transaktion
+wie der eigentliche Write:
+
+- ORM-Writes (Conversation, Message, AuditLog im AUDIT_SYNC-Modus, Cascade-
+  Deletes): after_flush-Listener auf der Session
+- AuditWriter (Core Bulk-Insert): apply_audit_batch()
+
+rebuild_rollups() berechnet alles neu aus den Basistabellen (Upgrade bestehender
+Datenbanken, Reparatur).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from db.models import AnalyticsRollup, AuditLog, Conversation, Message
+
+logger = logging.getLogger(__name__)
+
+TOTAL_DAY = "total"
+
+METRIC_CONVERSATIONS = "conversations"
+METRIC_MESSAGES = "messages"
+METRIC_AUDIT = "audit"  # dimension = event_type
+METRIC_TOOL_EXECUTED = "tool_executed"  # dimension = tool_name
+METRIC_TOOL_FAILED = "tool_failed"  # dimension = tool_name
+
+# Latency histogram of tool executions: (column, upper bound in ms)
+LATENCY_BUCKETS = [
+    ("le_100ms", 100),
+    ("le_1s", 1000),
+    ("le_5s", 5000),
+    ("le_30s", 30000),
+    ("gt_30s", None),
+]
+_COUNTERS = ["count", "time_sum_ms", "time_count"] + [c for c, _ in LATENCY_BUCKETS]
+
+_Key = tuple[str, str, str]  # (day, metric, dimension)
+
+
+def _day(value: Optional[datetime]) -> str:
+    return (value or datetime.utcnow()).strftime("%Y-%m-%d")
+
+
+def _latency_bucket(ms: int) -> str:
+    for column, bound in LATENCY_BUCKETS:
+        if bound is None or ms <= bound:
+            return column
+    return LATENCY_BUCKETS[-1][0]
+
+
+class RollupDelta:
+    """Counter changes collected from one flush or batch"""
+
+    def __init__(self):
+        self._rows: dict[_Key, dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(_COUNTERS, 0)
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self._rows)
+
+    def add(
+        self,
+        day: str,
+        metric: str,
+        dimension: str = "",
+        n: int = 1,
+        time_ms: Optional[int] = None,
+    ):
+        """Count n rows (negative for deletes) on the day and in the totals"""
+        for key_day in (day, TOTAL_DAY):
+            row = self._rows[(key_day, metric, dimension)]
+            row["count"] += n
+            if time_ms is not None:
+                row["time_sum_ms"] += n * time_ms
+                row["time_count"] += n
+                row[_latency_bucket(time_ms)] += n
+
+    def add_conversation(self, created_at: Optional[datetime], sign: int = 1):
+        self.add(_day(created_at), METRIC_CONVERSATIONS, n=sign)
+
+    def add_message(self, created_at: Optional[datetime], sign: int = 1):
+        self.add(_day(created_at), METRIC_MESSAGES, n=sign)
+
+    def add_audit(
+        self,
+        timestamp: Optional[datetime],
+        event_type: str,
+        tool_name: Optional[str],
+        execution_time_ms: Optional[int],
+        sign: int = 1,
+    ):
+        day = _day(timestamp)
+        self.add(day, METRIC_AUDIT, event_type, n=sign)
+        if tool_name is None:
+            return
+        if event_type == METRIC_TOOL_EXECUTED:
+            self.add(
+                day, METRIC_TOOL_EXECUTED, tool_name, sign, time_ms=execution_time_ms
+            )
+        elif event_type == METRIC_TOOL_FAILED:
+            self.add(day, METRIC_TOOL_FAILED, tool_name, sign)
+
+    def rows(self) -> list[dict]:
+        return [
+            {"day": day, "metric": metric, "dimension": dimension, **counters}
+            for (day, metric, dimension), counters in self._rows.items()
+            if any(counters.values())
+        ]
+
+
+def upsert_statement(dialect_name: str):
+    """INSERT ... ON CONFLICT DO UPDATE that adds the delta to the counters"""
+    dialect = postgresql if dialect_name == "postgresql" else sqlite
+    stmt = dialect.insert(AnalyticsRollup)
+    return stmt.on_conflict_do_update(
+        index_elements=["day", "metric", "dimension"],
+        set_={
+            column: getattr(AnalyticsRollup, column) + getattr(stmt.excluded, column)
+            for column in _COUNTERS
+        },
+    )
+
+
+def delta_from_audit_rows(rows: Iterable[dict]) -> RollupDelta:
+    delta = RollupDelta()
+    for row in rows:
+        delta.add_audit(
+            row.get("timestamp"),
+            row["event_type"],
+            row.get("tool_name"),
+            row.get("execution_time_ms"),
+        )
+    return delta
+
+
+async def apply_audit_batch(session: AsyncSession, rows: list[dict]) -> None:
+    """Add a bulk-inserted audit batch to the rollups (same transaction)"""
+    delta = delta_from_audit_rows(rows)
+    if delta:
+        dialect = session.get_bind().dialect.name
+        await session.execute(upsert_statement(dialect), delta.rows())
+
+
+def _delta_from_flush(session: Session) -> RollupDelta:
+    delta = RollupDelta()
+    for objects, sign in ((session.new, 1), (session.deleted, -1)):
+        for obj in objects:
+            if isinstance(obj, Message):
+                delta.add_message(obj.created_at, sign)
+            elif isinstance(obj, Conversation):
+                delta.add_conversation(obj.created_at, sign)
+            elif isinstance(obj, AuditLog):
+                delta.add_audit(
+                    obj.timestamp,
+                    obj.event_type,
+                    obj.tool_name,
+                    obj.execution_time_ms,
+                    sign,
+                )
+    return delta
+
+
+@event.listens_for(Session, "after_flush")
+def _rollup_after_flush(session: Session, flush_context):
+    delta = _delta_from_flush(session)
+    if delta:
+        connection = session.connection()
+        connection.execute(upsert_statement(connection.dialect.name), delta.rows())
+
+
+async def rebuild_rollups(session: AsyncSession) -> int:
+    """Recompute all rollups from the base tables; returns the row count"""
+    delta = RollupDelta()
+
+    for model, metric in (
+        (Conversation, METRIC_CONVERSATIONS),
+        (Message, METRIC_MESSAGES),
+    ):
+        day = func.date(model.created_at)
+        for value, count in await session.execute(
+            select(day, func.count(model.id)).group_by(day)
+        ):
+            delta.add(str(value) if value else _day(None), metric, n=count)
+
+    # Audit rows are streamed: histograms need the individual latencies
+    result = await session.stream(
+        select(
+            AuditLog.timestamp,
+            AuditLog.event_type,
+            AuditLog.tool_name,
+            AuditLog.execution_time_ms,
+        ).execution_options(yield_per=5000)
+    )
+    async for row in result:
+        delta.add_audit(*row)
+
+    await session.execute(delete(AnalyticsRollup))
+    rows = delta.rows()
+    if rows:
+        dialect = session.get_bind().dialect.name
+        await session.execute(upsert_statement(dialect), rows)
+    await session.commit()
+    logger.info(f"Analytics-Rollups neu berechnet ({len(rows)} Zeilen)")
+    return len(rows)
+
+
+async def ensure_rollups(session: AsyncSession) -> bool:
+    """Build the rollups once for databases that predate them"""
+    if await session.scalar(select(AnalyticsRollup.id).limit(1)) is not None:
+        return False
+    has_data = await session.scalar(select(Conversation.id).limit(1))
+    if has_data is None:
+        return False
+    await rebuild_rollups(session)
+    return True
@@ -0,0 +1,337 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Approval Bus
+
+Backend fuer offene Tool-Freigaben und erteilte Berechtigungen:
+
+- memory (Standard): alles im Prozess — ausreichend mit einem Uvicorn-Worker
+- sqlite: gemeinsame SQLite-Datei (APPROVAL_DB_PATH) fuer alle Worker auf
+  einem Host. Der SSE-Stream wartet auf einem Worker, die Freigabe
+  (POST /chat/approve) darf auf jedem Worker landen; Session-Grants und
+  Blocklist gelten ebenfalls fuer alle Worker.
+
+Landet die Freigabe auf dem wartenden Worker, wird der Stream sofort
+geweckt; sonst sieht er die Entscheidung beim naechsten Poll
+(APPROVAL_POLL_INTERVAL). Die SQLite-Zugriffe laufen per asyncio.to_thread,
+nicht auf dem Event-Loop.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Offene Freigaben aelter als das gelten als verwaist (Worker abgestuerzt)
+STALE_APPROVAL_SECONDS = 3600
+
+
+class ApprovalBackend(ABC):
+    """Pending approvals plus session grants and blocklist"""
+
+    def __init__(self):
+        # approval_id -> (event, result holder) of approvals waited on here
+        self._waiters: dict[str, tuple[asyncio.Event, dict]] = {}
+
+    async def wait(self, approval_id: str, timeout: float) -> Optional[str]:
+        """Wait for the decision on approval_id; None on timeout"""
+        event = asyncio.Event()
+        result_holder = {"decision": None}
+        self._waiters[approval_id] = (event, result_holder)
+        # A task, so a cancelled wait still unregisters after registering
+        registered = asyncio.ensure_future(self._register(approval_id))
+        try:
+            await asyncio.shield(registered)
+            return await self._wait_for_decision(
+                approval_id, event, result_holder, timeout
+            )
+        finally:
+            self._waiters.pop(approval_id, None)
+            await asyncio.gather(registered, return_exceptions=True)
+            await self._unregister(approval_id)
+
+    async def resolve(self, approval_id: str, decision: str) -> bool:
+        """Deliver a decision; False if nobody waits for approval_id"""
+        if not await self._publish(approval_id, decision):
+            return False
+        waiter = self._waiters.get(approval_id)
+        if waiter is not None:
+            event, result_holder = waiter
+            result_holder["decision"] = decision
+            event.set()
+        return True
+
+    async def _wait_for_decision(
+        self,
+        approval_id: str,
+        event: asyncio.Event,
+        result_holder: dict,
+        timeout: float,
+    ) -> Optional[str]:
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        return result_holder["decision"]
+
+    async def _register(self, approval_id: str) -> None:
+        pass
+
+    async def _unregister(self, approval_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def _publish(self, approval_id: str, decision: str) -> bool:
+        """Record the decision where the waiter can see it"""
+
+    @abstractmethod
+    async def add_grant(self, session_id: str, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def remove_grant(self, session_id: str, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def has_grant(self, session_id: str, keys: list[str]) -> bool:
+        """True if the session holds any of keys"""
+
+    @abstractmethod
+    async def session_grants(self, session_id: str) -> list[str]:
+        pass
+
+    @abstractmethod
+    async def clear_session(self, session_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def add_block(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def remove_block(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def is_blocked(self, keys: list[str]) -> bool:
+        """True if any of keys is blocked"""
+
+    def pending_count(self) -> int:
+        return len(self._waiters)
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryApprovalBackend(ApprovalBackend):
+    """Single-process backend (default)"""
+
+    def __init__(self):
+        super().__init__()
+        self._grants: dict[str, set[str]] = {}
+        self._blocked: set[str] = set()
+
+    async def _publish(self, approval_id: str, decision: str) -> bool:
+        return approval_id in self._waiters
+
+    async def add_grant(self, session_id: str, key: str) -> None:
+        self._grants.setdefault(session_id, set()).add(key)
+
+    async def remove_grant(self, session_id: str, key: str) -> None:
+        if session_id in self._grants:
+            self._grants[session_id].discard(key)
+
+    async def has_grant(self, session_id: str, keys: list[str]) -> bool:
+        grants = self._grants.get(session_id, set())
+        return any(key in grants for key in keys)
+
+    async def session_grants(self, session_id: str) -> list[str]:
+        return list(self._grants.get(session_id, set()))
+
+    async def clear_session(self, session_id: str) -> None:
+        self._grants.pop(session_id, None)
+
+    async def add_block(self, key: str) -> None:
+        self._blocked.add(key)
+
+    async def remove_block(self, key: str) -> None:
+        self._blocked.discard(key)
+
+    async def is_blocked(self, keys: list[str]) -> bool:
+        return any(key in self._blocked for key in keys)
+
+
+class SqliteApprovalBackend(ApprovalBackend):
+    """Backend shared by all worker processes through one SQLite file"""
+
+    def __init__(self, path: str, poll_interval: float = 0.2):
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=10.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS approvals ("
+                "id TEXT PRIMARY KEY, decision TEXT, created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS grants ("
+                "session_id TEXT NOT NULL, key TEXT NOT NULL, "
+                "PRIMARY KEY (session_id, key))"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS blocked (key TEXT PRIMARY KEY)")
+            self._conn = conn
+        return self._conn
+
+    def _query(self, sql: str, params: tuple = (), fetch: Optional[str] = None):
+        """Run one statement; returns fetchone()/fetchall() or the rowcount"""
+        with self._lock:
+            cursor = self._db().execute(sql, params)
+            if fetch == "one":
+                return cursor.fetchone()
+            if fetch == "all":
+                return cursor.fetchall()
+            return cursor.rowcount
+
+    async def _execute(self, sql: str, params: tuple = (), fetch: Optional[str] = None):
+        """_query() in a worker thread"""
+        return await asyncio.to_thread(self._query, sql, params, fetch)
+
+    async def _register(self, approval_id: str) -> None:
+        now = time.time()
+        await self._execute(
+            "DELETE FROM approvals WHERE created_at < ?",
+            (now - STALE_APPROVAL_SECONDS,),
+        )
+        await self._execute(
+            "INSERT OR REPLACE INTO approvals (id, decision, created_at) "
+            "VALUES (?, NULL, ?)",
+            (approval_id, now),
+        )
+
+    async def _unregister(self, approval_id: str) -> None:
+        await self._execute("DELETE FROM approvals WHERE id = ?", (approval_id,))
+
+    async def _publish(self, approval_id: str, decision: str) -> bool:
+        rowcount = await self._execute(
+            "UPDATE approvals SET decision = ? WHERE id = ? AND decision IS NULL",
+            (decision, approval_id),
+        )
+        return rowcount > 0
+
+    async def _stored_decision(self, approval_id: str) -> Optional[str]:
+        row = await self._execute(
+            "SELECT decision FROM approvals WHERE id = ?", (approval_id,), fetch="one"
+        )
+        return row[0] if row else None
+
+    async def _wait_for_decision(
+        self,
+        approval_id: str,
+        event: asyncio.Event,
+        result_holder: dict,
+        timeout: float,
+    ) -> Optional[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                # Same worker: woken at once; other worker: seen on the next poll
+                await asyncio.wait_for(
+                    event.wait(), timeout=min(self.poll_interval, remaining)
+                )
+                return result_holder["decision"]
+            except asyncio.TimeoutError:
+                pass
+            decision = await self._stored_decision(approval_id)
+            if decision is not None:
+                return decision
+
+    async def add_grant(self, session_id: str, key: str) -> None:
+        await self._execute(
+            "INSERT OR IGNORE INTO grants (session_id, key) VALUES (?, ?)",
+            (session_id, key),
+        )
+
+    async def remove_grant(self, session_id: str, key: str) -> None:
+        await self._execute(
+            "DELETE FROM grants WHERE session_id = ? AND key = ?", (session_id, key)
+        )
+
+    async def has_grant(self, session_id: str, keys: list[str]) -> bool:
+        placeholders = ",".join("?" * len(keys))
+        row = await self._execute(
+            f"SELECT 1 FROM grants WHERE session_id = ? AND key IN ({placeholders})",
+            (session_id, *keys),
+            fetch="one",
+        )
+        return row is not None
+
+    async def session_grants(self, session_id: str) -> list[str]:
+        rows = await self._execute(
+            "SELECT key FROM grants WHERE session_id = ?", (session_id,), fetch="all"
+        )
+        return [row[0] for row in rows]
+
+    async def clear_session(self, session_id: str) -> None:
+        await self._execute("DELETE FROM grants WHERE session_id = ?", (session_id,))
+
+    async def add_block(self, key: str) -> None:
+        await self._execute("INSERT OR IGNORE INTO blocked (key) VALUES (?)", (key,))
+
+    async def remove_block(self, key: str) -> None:
+        await self._execute("DELETE FROM blocked WHERE key = ?", (key,))
+
+    async def is_blocked(self, keys: list[str]) -> bool:
+        placeholders = ",".join("?" * len(keys))
+        row = await self._execute(
+            f"SELECT 1 FROM blocked WHERE key IN ({placeholders})",
+            tuple(keys),
+            fetch="one",
+        )
+        return row is not None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_approval_backend(
+    backend: str, path: str = "", poll_interval: float = 0.2
+) -> ApprovalBackend:
+    """Backend for APPROVAL_BACKEND ("memory" or "sqlite")"""
+    if backend == "sqlite":
+        return SqliteApprovalBackend(path, poll_interval=poll_interval)
+    if backend != "memory":
+        logger.warning(f"Unbekanntes APPROVAL_BACKEND '{backend}' — nutze memory")
+    return InMemoryApprovalBackend()
+
+
+# Global singleton — shared by the permission manager and the chat API
+approval_backend = create_approval_backend(
+    settings.approval_backend,
+    settings.approval_db_path,
+    settings.approval_poll_interval,
+)
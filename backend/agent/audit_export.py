@@ -0,0 +1,245 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Streaming Audit Export
+
+Liest das Audit-Log mit einem serverseitigen Cursor (yield_per) und erzeugt
+CSV, NDJSON, JSON oder Parquet Chunk fuer Chunk. Der Speicherverbrauch bleibt
+dadurch unabhaengig von der Tabellengroesse konstant.
+
+Sortierung: timestamp DESC, id DESC. Keyset-Pagination ueber
+(after_timestamp, after_id) = Timestamp und ID der zuletzt exportierten Zeile.
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import AuditLog
+
+EXPORT_FIELDS = [
+    "id",
+    "session_id",
+    "timestamp",
+    "event_type",
+    "tool_name",
+    "tool_params",
+    "result",
+    "error",
+    "user_decision",
+    "execution_time_ms",
+]
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_CSV_RESULT_MAX = 500  # CSV kuerzt Tool-Ergebnisse wie bisher
+
+
+@dataclass
+class AuditExportFilter:
+    session_id: Optional[str] = None
+    event_type: Optional[str] = None
+    tool_name: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    after_timestamp: Optional[datetime] = None
+    after_id: Optional[str] = None
+    limit: Optional[int] = None
+
+    def query(self):
+        query = select(
+            AuditLog.id,
+            AuditLog.conversation_id,
+            AuditLog.timestamp,
+            AuditLog.event_type,
+            AuditLog.tool_name,
+            AuditLog.tool_params,
+            AuditLog.result,
+            AuditLog.error,
+            AuditLog.user_decision,
+            AuditLog.execution_time_ms,
+        ).order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+
+        if self.session_id:
+            query = query.where(AuditLog.conversation_id == self.session_id)
+        if self.event_type:
+            query = query.where(AuditLog.event_type == self.event_type)
+        if self.tool_name:
+            query = query.where(AuditLog.tool_name == self.tool_name)
+        if self.since:
+            query = query.where(AuditLog.timestamp >= self.since)
+        if self.until:
+            query = query.where(AuditLog.timestamp < self.until)
+        if self.after_timestamp:
+            # Keyset: rows that come after the cursor in export order
+            if self.after_id:
+                query = query.where(
+                    or_(
+                        AuditLog.timestamp < self.after_timestamp,
+                        and_(
+                            AuditLog.timestamp == self.after_timestamp,
+                            AuditLog.id < self.after_id,
+                        ),
+                    )
+                )
+            else:
+                query = query.where(AuditLog.timestamp < self.after_timestamp)
+        if self.limit:
+            query = query.limit(self.limit)
+        return query
+
+
+async def iter_audit_rows(
+    export_filter: AuditExportFilter,
+    chunk_size: int = 1000,
+    session_factory: Optional[Callable[[], AsyncSession]] = None,
+) -> AsyncIterator[list[dict]]:
+    """Yield audit rows in chunks, streamed from a server-side cursor"""
+    if session_factory is None:
+        from db.database import async_session as session_factory
+
+    query = export_filter.query().execution_options(yield_per=chunk_size)
+    async with session_factory() as session:
+        result = await session.stream(query)
+        async for partition in result.partitions():
+            yield [
+                {
+                    "id": row.id,
+                    "session_id": row.conversation_id,
+                    "timestamp": row.timestamp.isoformat() if row.timestamp else None,
+                    "event_type": row.event_type,
+                    "tool_name": row.tool_name,
+                    "tool_params": row.tool_params,
+                    "result": row.result,
+                    "error": row.error,
+                    "user_decision": row.user_decision,
+                    "execution_time_ms": row.execution_time_ms,
+                }
+                for row in partition
+            ]
+
+
+async def csv_chunks(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+    async for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow(
+                [
+                    row["id"],
+                    row["session_id"],
+                    row["timestamp"],
+                    row["event_type"],
+                    row["tool_name"],
+                    str(row["tool_params"]) if row["tool_params"] else "",
+                    row["result"][:_CSV_RESULT_MAX] if row["result"] else "",
+                    row["error"] or "",
+                    row["user_decision"] or "",
+                    row["execution_time_ms"] or "",
+                ]
+            )
+        yield buffer.getvalue()
+
+
+async def ndjson_chunks(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[str]:
+    async for rows in chunks:
+        if rows:
+            yield "".join(json.dumps(row, default=str) + "\n" for row in rows)
+
+
+async def json_chunks(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[str]:
+    """JSON array, written incrementally"""
+    yield "["
+    first = True
+    async for rows in chunks:
+        if not rows:
+            continue
+        body = ",".join(json.dumps(row, default=str) for row in rows)
+        yield body if first else "," + body
+        first = False
+    yield "]"
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes out in chunks"""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+async def parquet_chunks(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    """Parquet file, one row group per chunk (requires pyarrow)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("session_id", pa.string()),
+            ("timestamp", pa.string()),
+            ("event_type", pa.string()),
+            ("tool_name", pa.string()),
+            ("tool_params", pa.string()),
+            ("result", pa.string()),
+            ("error", pa.string()),
+            ("user_decision", pa.string()),
+            ("execution_time_ms", pa.int64()),
+        ]
+    )
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for rows in chunks:
+            if not rows:
+                continue
+            for row in rows:
+                if row["tool_params"] is not None:
+                    row["tool_params"] = json.dumps(row["tool_params"], default=str)
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+ENCODERS = {
+    "csv": csv_chunks,
+    "ndjson": ndjson_chunks,
+    "json": json_chunks,
+    "parquet": parquet_chunks,
+}
@@ -9,7 +9,9 @@ import logging
 import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
 from db.models import AuditLog
+from .audit_writer import audit_writer
 
 logger = logging.getLogger(__name__)
 
@@ -41,24 +43,31 @@ class AuditLogger:
         user_decision: Optional[str] = None,
         execution_time_ms: Optional[int] = None,
     ) -> AuditLog:
-        """Create an audit log entry"""
-
-        entry = AuditLog(
-            id=str(uuid.uuid4()),
-            conversation_id=session_id,
-            timestamp=datetime.utcnow(),
-            event_type=event_type.value,
-            tool_name=tool_name,
-            tool_params=tool_params,
-            result=result[:1000] if result else None,  # Truncate long results
-            error=error,
-            user_decision=user_decision,
-            execution_time_ms=execution_time_ms,
-        )
-
-        self.db.add(entry)
-        await self.db.flush()
-        await self.db.commit()
+        """
+        Create an audit log entry.
+        Buffered via the AuditWriter when it runs, unless AUDIT_SYNC is set.
+        """
+
+        values = {
+            "id": str(uuid.uuid4()),
+            "conversation_id": session_id,
+            "timestamp": datetime.utcnow(),
+            "event_type": event_type.value,
+            "tool_name": tool_name,
+            "tool_params": tool_params,
+            "result": result[:1000] if result else None,  # Truncate long results
+            "error": error,
+            "user_decision": user_decision,
+            "execution_time_ms": execution_time_ms,
+        }
+        entry = AuditLog(**values)
+
+        if not settings.audit_sync and audit_writer.running:
+            await audit_writer.enqueue(values)
+        else:
+            self.db.add(entry)
+            await self.db.flush()
+            await self.db.commit()
 
         logger.info(
             f"Audit: {event_type.value} - {tool_name or 'N/A'} "
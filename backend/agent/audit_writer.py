@@ -0,0 +1,213 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Batched Audit Writer
+
+Audit-Events landen in einer begrenzten asyncio.Queue und werden von einem
+Hintergrund-Task gebuendelt per Bulk-Insert geschrieben — statt einem
+SQLite-Commit pro Event im Hot Path des Agent-Loops.
+
+- max_latency_ms: spaetestens nach dieser Zeit wird ein angefangener Batch
+  geschrieben
+- queue_max: volle Queue blockiert den Aufrufer (Back-Pressure)
+- stop(): schreibt alle ausstehenden Events (Lifespan-Shutdown)
+- Schlaegt ein Commit fehl (z.B. SQLite gesperrt), wird der Batch mit
+  exponentiellem Backoff erneut geschrieben, danach Event fuer Event.
+  Erst dann gilt ein Event als verloren; stats()["alert"] meldet das.
+- AUDIT_SYNC=true: kein Puffer, jedes Event wird sofort committet
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agent.analytics_rollup import apply_audit_batch
+from core.config import settings
+from db.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_FLUSH = object()  # Queue marker: write the current batch immediately
+
+
+class AuditWriter:
+    """Background sink that bulk-inserts audit rows"""
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        max_latency_ms: int = 200,
+        queue_max: int = 10000,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        retries: int = 5,
+        retry_backoff_ms: int = 100,
+    ):
+        self.batch_size = batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.queue_max = queue_max
+        self.retries = max(0, retries)
+        self.retry_backoff = retry_backoff_ms / 1000
+        self._session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Metrics
+        self._enqueued = 0
+        self._written = 0
+        self._failed = 0
+        self._retries = 0
+        self._last_error: Optional[str] = None
+        self._batches = 0
+        self._flush_ms_total = 0.0
+        self._flush_ms_max = 0.0
+        self._flush_ms_last = 0.0
+        self._queue_depth_max = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background task (idempotent)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_max)
+        self._task = asyncio.create_task(self._run(), name="audit-writer")
+        logger.info(
+            f"AuditWriter gestartet (batch {self.batch_size}, "
+            f"max. {int(self.max_latency * 1000)} ms Latenz)"
+        )
+
+    async def stop(self) -> None:
+        """Write all pending events, then stop the background task"""
+        if not self.running:
+            return
+        await self.flush()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info(f"AuditWriter gestoppt ({self._written} Events geschrieben)")
+
+    async def enqueue(self, values: dict) -> None:
+        """Queue one audit row; waits while the queue is full (back-pressure)"""
+        await self._queue.put(values)
+        self._enqueued += 1
+        self._queue_depth_max = max(self._queue_depth_max, self._queue.qsize())
+
+    async def flush(self) -> None:
+        """Write the current batch now and wait until the queue is empty"""
+        if self.running:
+            await self._queue.put(_FLUSH)
+            await self._queue.join()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_depth_max": self._queue_depth_max,
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "failed": self._failed,
+            "retries": self._retries,
+            "last_error": self._last_error,
+            # Events were lost: needs attention (compliance record)
+            "alert": self._failed > 0,
+            "batches": self._batches,
+            "flush_ms_last": round(self._flush_ms_last, 2),
+            "flush_ms_max": round(self._flush_ms_max, 2),
+            "flush_ms_avg": (
+                round(self._flush_ms_total / self._batches, 2)
+                if self._batches
+                else None
+            ),
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_latency
+            while len(batch) < self.batch_size and batch[-1] is not _FLUSH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            rows = [row for row in batch if row is not _FLUSH]
+            try:
+                if rows:
+                    await self._write(rows)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _insert(self, rows: list[dict]) -> None:
+        session_factory = self._session_factory
+        if session_factory is None:
+            from db.database import async_session as session_factory
+        async with session_factory() as session:
+            await session.execute(insert(AuditLog), rows)
+            await apply_audit_batch(session, rows)
+            await session.commit()
+
+    async def _write(self, batch: list[dict]):
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            try:
+                await self._insert(batch)
+                break
+            except Exception as e:
+                self._last_error = str(e)[:500]
+                if attempt == self.retries:
+                    logger.error(
+                        f"AuditWriter: Batch mit {len(batch)} Events nach "
+                        f"{attempt + 1} Versuchen nicht geschrieben: {e} "
+                        f"— schreibe einzeln"
+                    )
+                    await self._write_each(batch)
+                    return
+                self._retries += 1
+                delay = self.retry_backoff * 2**attempt
+                logger.warning(
+                    f"AuditWriter: Schreiben fehlgeschlagen ({e}), "
+                    f"neuer Versuch in {int(delay * 1000)} ms"
+                )
+                await asyncio.sleep(delay)
+        self._written += len(batch)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._batches += 1
+        self._flush_ms_last = elapsed_ms
+        self._flush_ms_total += elapsed_ms
+        self._flush_ms_max = max(self._flush_ms_max, elapsed_ms)
+
+    async def _write_each(self, batch: list[dict]):
+        """Last resort: one commit per event, so one bad row loses only itself"""
+        for row in batch:
+            try:
+                await self._insert([row])
+                self._written += 1
+            except Exception as e:
+                self._failed += 1
+                self._last_error = str(e)[:500]
+                logger.error(
+                    f"AuditWriter: Event verloren "
+                    f"({row.get('event_type')}, id={row.get('id')}): {e}"
+                )
+
+
+# Global singleton — started/stopped in the FastAPI lifespan
+audit_writer = AuditWriter(
+    batch_size=settings.audit_batch_size,
+    max_latency_ms=settings.audit_max_latency_ms,
+    queue_max=settings.audit_queue_max,
+    retries=settings.audit_write_retries,
+    retry_backoff_ms=settings.audit_retry_backoff_ms,
+)
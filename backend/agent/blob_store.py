@@ -0,0 +1,219 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Content-Addressed Upload Store
+
+Uploads werden nach SHA-256 abgelegt (data/uploads/blobs/ab/<sha256><ext>).
+Alle UploadedDocument-Zeilen mit gleichem Inhalt (z.B. dasselbe Handbuch in
+zehn Conversations) verweisen ueber content_hash auf einen DocumentBlob —
+Datei, extrahierter Text und Abschnitte/Embeddings gibt es nur einmal, und
+Extraktion + Embedding laufen einmal pro Inhalt.
+
+ref_count zaehlt die verweisenden Dokumente. Beim Loeschen des letzten
+Dokuments werden Blob-Zeile, Abschnitte und Datei entfernt — nur wenn das
+bedingte DELETE (ref_count = 0) die Zeile tatsaechlich geloescht hat, denn ein
+anderer Worker kann zwischenzeitlich einen Verweis hinzugefuegt haben.
+
+Dokumente von vor dem Blob-Store (ohne Blob) behalten ihre Datei, ihren
+extracted_text und eigene Abschnitte.
+
+Hinweis: Das Lock gilt pro Prozess (ein Uvicorn-Worker); die Zaehler selbst
+werden atomar per Upsert in der DB gefuehrt.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import delete, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.i18n import t
+from db.models import DocumentBlob, DocumentChunk, UploadedDocument
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = "data/uploads"
+READ_CHUNK_SIZE = 1024 * 1024  # 1 MB pro Lese-/Schreibschritt
+
+
+async def stream_to_disk(
+    file: UploadFile, target: Path, max_size: int
+) -> tuple[int, str]:
+    """
+    Copy the upload to target chunk by chunk, enforcing max_size and hashing.
+
+    Writes go to a .part file in a worker thread and are renamed at the end,
+    so an aborted upload never leaves a file under the final name.
+    """
+    partial = target.with_name(target.name + ".part")
+    digest = hashlib.sha256()
+    size = 0
+    out = await asyncio.to_thread(open, partial, "wb")
+    try:
+        while chunk := await file.read(READ_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                raise HTTPException(
+                    status_code=400,
+                    detail=t("upload.too_large", max_mb=max_size // 1024 // 1024),
+                )
+            digest.update(chunk)
+            await asyncio.to_thread(out.write, chunk)
+        await asyncio.to_thread(out.close)
+        await asyncio.to_thread(os.replace, partial, target)
+    except BaseException:
+        out.close()
+        try:
+            os.unlink(partial)
+        except OSError:
+            pass
+        raise
+    return size, digest.hexdigest()
+
+
+def _acquire_statement(dialect_name: str, values: dict):
+    """INSERT the blob, or add one reference if the content is already stored"""
+    dialect = postgresql if dialect_name == "postgresql" else sqlite
+    stmt = dialect.insert(DocumentBlob).values(ref_count=1, **values)
+    return stmt.on_conflict_do_update(
+        index_elements=["sha256"],
+        set_={"ref_count": DocumentBlob.ref_count + 1},
+    )
+
+
+class BlobStore:
+    """Files and DocumentBlob rows addressed by SHA-256, with reference counts"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = asyncio.Lock()
+
+    def path_for(self, sha256: str, suffix: str = "") -> Path:
+        return self.root / sha256[:2] / f"{sha256}{suffix.lower()}"
+
+    async def receive(self, file: UploadFile, max_size: int) -> tuple[Path, int, str]:
+        """Stream an upload to a temporary file; returns (path, size, sha256)"""
+        incoming = self.root / "incoming"
+        await asyncio.to_thread(incoming.mkdir, parents=True, exist_ok=True)
+        target = incoming / uuid.uuid4().hex
+        size, sha256 = await stream_to_disk(file, target, max_size)
+        return target, size, sha256
+
+    async def add_document(
+        self, db: AsyncSession, doc: UploadedDocument, incoming: Path
+    ) -> tuple[DocumentBlob, bool]:
+        """
+        Store doc with its content (incoming from receive()) and commit.
+
+        Returns (blob, created); created is False when the content was
+        already stored and the temporary file was discarded.
+        """
+        sha256 = doc.content_hash
+        async with self._lock:
+            blob = await db.get(DocumentBlob, sha256)
+            created = blob is None
+            if created:
+                target = self.path_for(sha256, Path(doc.filename).suffix)
+                await asyncio.to_thread(
+                    target.parent.mkdir, parents=True, exist_ok=True
+                )
+                await asyncio.to_thread(os.replace, incoming, target)
+                file_path = str(target)
+            else:
+                file_path = blob.file_path
+
+            dialect = db.get_bind().dialect.name
+            await db.execute(
+                _acquire_statement(
+                    dialect,
+                    {
+                        "sha256": sha256,
+                        "file_path": file_path,
+                        "file_size": doc.file_size,
+                        "mime_type": doc.mime_type,
+                    },
+                )
+            )
+            doc.file_path = file_path
+            db.add(doc)
+            await db.commit()
+
+            blob = await db.get(DocumentBlob, sha256, populate_existing=True)
+            if not created:
+                if blob.ref_count == 1:
+                    # Another worker deleted the last reference (and the file)
+                    # after we looked: the upsert re-created the row, restore
+                    # the file from this upload
+                    target = Path(file_path)
+                    await asyncio.to_thread(
+                        target.parent.mkdir, parents=True, exist_ok=True
+                    )
+                    await asyncio.to_thread(os.replace, incoming, target)
+                else:
+                    await asyncio.to_thread(_unlink, incoming)
+
+        if not created:
+            logger.info(
+                f"Upload {doc.filename}: Inhalt bereits gespeichert "
+                f"({sha256[:12]}, {blob.ref_count} Verweise)"
+            )
+        return blob, created
+
+    async def remove_document(self, db: AsyncSession, doc: UploadedDocument) -> bool:
+        """
+        Delete doc and commit; the blob goes with its last reference.
+
+        Returns True when the blob (file, text, chunks) was deleted.
+        """
+        sha256 = doc.content_hash
+        async with self._lock:
+            await db.delete(doc)
+            blob = await db.get(DocumentBlob, sha256) if sha256 else None
+            if blob is None:
+                # Document without blob: owns its file
+                await db.commit()
+                await asyncio.to_thread(_unlink, Path(doc.file_path))
+                return False
+
+            file_path = blob.file_path
+            await db.execute(
+                update(DocumentBlob)
+                .where(DocumentBlob.sha256 == sha256)
+                .values(ref_count=DocumentBlob.ref_count - 1)
+            )
+            # Conditional in SQL: a reference added meanwhile keeps the blob
+            result = await db.execute(
+                delete(DocumentBlob)
+                .where(DocumentBlob.sha256 == sha256, DocumentBlob.ref_count <= 0)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                await db.commit()
+                await db.refresh(blob, ["ref_count"])
+                return False
+
+            await db.execute(
+                delete(DocumentChunk).where(DocumentChunk.blob_hash == sha256)
+            )
+            await db.commit()
+            db.expunge(blob)
+            await asyncio.to_thread(_unlink, Path(file_path))
+        logger.info(f"Blob {sha256[:12]} ohne Verweise geloescht")
+        return True
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Konnte Datei nicht loeschen: {e}")
+
+
+# Global singleton — used by the upload API
+blob_store = BlobStore(Path(UPLOAD_DIR) / "blobs")
@@ -0,0 +1,402 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Conversation Context Cache
+
+Haelt pro Conversation das Nachrichtenfenster im Speicher, damit nicht jeder
+Turn die komplette History aus der DB liest:
+
+- Pro Turn werden nur neue Messages nachgeladen (eine kleine Query)
+- Das Fenster ist durch ein Token-Budget begrenzt (CONTEXT_MAX_TOKENS)
+- Aeltere Turns fasst ein Hintergrund-Task zu einer rollierenden
+  Zusammenfassung zusammen (Conversation.summary). Sie baut auf dem Stand in
+  der DB auf und wird nur gespeichert, wenn summary_until unveraendert ist
+- Dokument-Abschnitte (agent/document_chunks.py) werden einmal geladen und bei
+  Uploads invalidiert; pro Turn kommen nur die top-k passenden in den Prompt.
+  Ein kleiner Fingerprint (Anzahl + juengstes fertig verarbeitetes Dokument)
+  erkennt Uploads und Loeschungen, die ein anderer Worker verarbeitet hat
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.i18n import t
+from db.models import Conversation, Message, UploadedDocument
+from agent.document_chunks import DocumentIndex, load_document_index
+from llm.provider import BaseLLMProvider, ChatMessage
+
+logger = logging.getLogger(__name__)
+
+_CHARS_PER_TOKEN = 4  # Grobe Schaetzung, reicht fuer das Budget
+_INITIAL_MESSAGES = 200  # Max. Messages beim ersten Laden einer Conversation
+_SUMMARY_MAX_MESSAGES = 100  # Max. Messages pro Zusammenfassungs-Lauf
+_SUMMARY_MAX_CHARS = 24000  # Transcript-Laenge fuer den Zusammenfassungs-Prompt
+_CHAT_ROLES = ("user", "assistant")
+
+
+async def _documents_key(db: AsyncSession, conversation_id: str) -> tuple:
+    """Count and newest upload of the conversation's processed documents"""
+    result = await db.execute(
+        select(func.count(UploadedDocument.id), func.max(UploadedDocument.created_at))
+        .where(UploadedDocument.conversation_id == conversation_id)
+        .where(UploadedDocument.extract_status == "done")
+    )
+    return tuple(result.one())
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate for budgeting (no tokenizer dependency)"""
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class _Entry:
+    id: str
+    created_at: datetime
+    role: str
+    content: str
+    tokens: int
+
+
+@dataclass
+class ConversationContext:
+    """Token-bounded message window of one conversation"""
+
+    conversation_id: str
+    summary: Optional[str] = None
+    summary_until: Optional[datetime] = None
+    window: deque = field(default_factory=deque)
+    tokens: int = 0
+    # Messages outside the window that are not yet part of the summary
+    unsummarized: int = 0
+    documents: Optional[DocumentIndex] = None  # None = not loaded yet
+    documents_key: Optional[tuple] = None  # Fingerprint documents was loaded at
+    loaded: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def chat_messages(self) -> list[ChatMessage]:
+        return [ChatMessage(role=e.role, content=e.content) for e in self.window]
+
+    def _append(self, msg: Message) -> None:
+        tokens = estimate_tokens(msg.content)
+        self.window.append(
+            _Entry(msg.id, msg.created_at, msg.role, msg.content, tokens)
+        )
+        self.tokens += tokens
+
+    def _trim(self, max_tokens: int) -> None:
+        # The newest message always stays, even if it alone exceeds the budget
+        while self.tokens > max_tokens and len(self.window) > 1:
+            self.tokens -= self.window.popleft().tokens
+            self.unsummarized += 1
+
+
+class ConversationContextCache:
+    """LRU of ConversationContext objects, shared by all chat requests"""
+
+    def __init__(
+        self,
+        max_conversations: int = 256,
+        max_tokens: int = 6000,
+        summary_min_messages: int = 20,
+        document_top_k: int = 6,
+    ):
+        self.max_conversations = max_conversations
+        self.max_tokens = max_tokens
+        self.summary_min_messages = summary_min_messages
+        self.document_top_k = document_top_k
+        self._contexts: OrderedDict[str, ConversationContext] = OrderedDict()
+        self._summary_tasks: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get_or_create(self, conversation: Conversation) -> ConversationContext:
+        ctx = self._contexts.get(conversation.id)
+        if ctx is not None:
+            self._contexts.move_to_end(conversation.id)
+            self.hits += 1
+            return ctx
+        self.misses += 1
+        ctx = ConversationContext(
+            conversation_id=conversation.id,
+            summary=conversation.summary,
+            summary_until=conversation.summary_until,
+        )
+        self._contexts[conversation.id] = ctx
+        while len(self._contexts) > self.max_conversations:
+            self._contexts.popitem(last=False)
+        return ctx
+
+    async def load(
+        self, db: AsyncSession, conversation: Conversation
+    ) -> ConversationContext:
+        """Bring the window up to date (only new messages are read) and return it"""
+        ctx = self._get_or_create(conversation)
+        async with ctx.lock:
+            if ctx.loaded:
+                await self._load_new(db, ctx)
+            else:
+                await self._load_initial(db, ctx)
+            ctx._trim(self.max_tokens)
+        return ctx
+
+    async def _load_initial(self, db: AsyncSession, ctx: ConversationContext):
+        query = (
+            select(Message)
+            .where(Message.conversation_id == ctx.conversation_id)
+            .where(Message.role.in_(_CHAT_ROLES))
+            .order_by(Message.created_at.desc())
+            .limit(_INITIAL_MESSAGES)
+        )
+        if ctx.summary_until is not None:
+            query = query.where(Message.created_at > ctx.summary_until)
+        rows = (await db.execute(query)).scalars().all()
+
+        # Newest first: take messages until the token budget is used up
+        taken = []
+        tokens = 0
+        for msg in rows:
+            tokens += estimate_tokens(msg.content)
+            if taken and tokens > self.max_tokens:
+                break
+            taken.append(msg)
+        for msg in reversed(taken):
+            ctx._append(msg)
+
+        if len(taken) < len(rows) or len(rows) == _INITIAL_MESSAGES:
+            # Older messages exist that are neither in the window nor summarized
+            count_query = (
+                select(func.count(Message.id))
+                .where(Message.conversation_id == ctx.conversation_id)
+                .where(Message.role.in_(_CHAT_ROLES))
+                .where(Message.created_at < ctx.window[0].created_at)
+            )
+            if ctx.summary_until is not None:
+                count_query = count_query.where(Message.created_at > ctx.summary_until)
+            ctx.unsummarized = (await db.execute(count_query)).scalar() or 0
+        ctx.loaded = True
+
+    async def _load_new(self, db: AsyncSession, ctx: ConversationContext):
+        query = (
+            select(Message)
+            .where(Message.conversation_id == ctx.conversation_id)
+            .where(Message.role.in_(_CHAT_ROLES))
+            .order_by(Message.created_at.asc())
+        )
+        if ctx.window:
+            # >= plus id check: messages may share a timestamp
+            last = ctx.window[-1].created_at
+            seen = {e.id for e in ctx.window if e.created_at == last}
+            query = query.where(Message.created_at >= last)
+        else:
+            seen = set()
+        for msg in (await db.execute(query)).scalars().all():
+            if msg.id not in seen:
+                ctx._append(msg)
+
+    async def get_documents(
+        self,
+        db: AsyncSession,
+        conversation_id: str,
+        query: Optional[str] = None,
+        provider=None,
+    ) -> str:
+        """Document context block: the chunks most relevant to query"""
+        ctx = self._contexts.get(conversation_id)
+        index = ctx.documents if ctx is not None else None
+        key = await _documents_key(db, conversation_id)
+        if index is None or ctx.documents_key != key:
+            # Chunk vectors are loaded once, then cached until invalidated
+            index = await load_document_index(db, conversation_id, provider)
+            if ctx is not None:
+                ctx.documents = index
+                ctx.documents_key = key
+        if not len(index):
+            return ""
+
+        query_embedding = None
+        if query and index.vectors is not None and len(index) > self.document_top_k:
+            if provider is None:
+                from agent.embeddings import embedding_provider as provider
+            query_embedding = await provider.embed(query)
+        selected = index.select(self.document_top_k, query, query_embedding)
+        return t("chat.docs_uploaded") + "\n" + index.format(selected)
+
+    def invalidate_documents(self, conversation_id: Optional[str]) -> None:
+        """Called after a document of this conversation was added or removed"""
+        ctx = self._contexts.get(conversation_id) if conversation_id else None
+        if ctx is not None:
+            ctx.documents = None
+
+    def invalidate(self, conversation_id: str) -> None:
+        """Forget a conversation (e.g. after it was deleted)"""
+        self._contexts.pop(conversation_id, None)
+
+    # ------------------------------------------------------------------
+    # Rolling summary
+    # ------------------------------------------------------------------
+
+    def schedule_summary(
+        self, conversation_id: str, provider: BaseLLMProvider
+    ) -> Optional[asyncio.Task]:
+        """Start a background summary if enough messages left the window"""
+        ctx = self._contexts.get(conversation_id)
+        if ctx is None or ctx.unsummarized < self.summary_min_messages:
+            return None
+        running = self._summary_tasks.get(conversation_id)
+        if running is not None and not running.done():
+            return running
+
+        task = asyncio.create_task(
+            self.summarize(conversation_id, provider),
+            name=f"summary-{conversation_id}",
+        )
+        self._summary_tasks[conversation_id] = task
+        task.add_done_callback(
+            lambda done: self._summary_tasks.pop(conversation_id, None)
+        )
+        return task
+
+    async def summarize(
+        self,
+        conversation_id: str,
+        provider: BaseLLMProvider,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ) -> Optional[str]:
+        """Fold messages that left the window into Conversation.summary"""
+        ctx = self._contexts.get(conversation_id)
+        if ctx is None or not ctx.window:
+            return None
+        if session_factory is None:
+            from db.database import async_session as session_factory
+
+        window_start = ctx.window[0].created_at
+        try:
+            async with session_factory() as db:
+                # Another worker may have summarized since ctx was loaded
+                stored = (
+                    await db.execute(
+                        select(Conversation.summary, Conversation.summary_until).where(
+                            Conversation.id == conversation_id
+                        )
+                    )
+                ).one_or_none()
+                if stored is None:
+                    self.invalidate(conversation_id)
+                    return None
+                base_summary, base_until = stored
+                ctx.summary, ctx.summary_until = base_summary, base_until
+
+                query = (
+                    select(Message)
+                    .where(Message.conversation_id == conversation_id)
+                    .where(Message.role.in_(_CHAT_ROLES))
+                    .where(Message.created_at < window_start)
+                    .order_by(Message.created_at.asc())
+                    .limit(_SUMMARY_MAX_MESSAGES)
+                )
+                if base_until is not None:
+                    query = query.where(Message.created_at > base_until)
+                rows = (await db.execute(query)).scalars().all()
+                if not rows:
+                    ctx.unsummarized = 0
+                    return base_summary
+
+                transcript = "\n".join(f"{m.role}: {m.content}" for m in rows)
+                prompt = t(
+                    "chat.summary_prompt",
+                    summary=base_summary or "-",
+                    transcript=transcript[-_SUMMARY_MAX_CHARS:],
+                )
+                response = await provider.chat(
+                    [ChatMessage(role="user", content=prompt)]
+                )
+                summary = (response.content or "").strip()
+                if not summary:
+                    return base_summary
+
+                # Only on top of the base read above: never move backwards
+                unchanged = (
+                    Conversation.summary_until.is_(None)
+                    if base_until is None
+                    else Conversation.summary_until == base_until
+                )
+                result = await db.execute(
+                    update(Conversation)
+                    .where(Conversation.id == conversation_id, unchanged)
+                    .values(summary=summary, summary_until=rows[-1].created_at)
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                if result.rowcount == 0:
+                    logger.info(
+                        f"Conversation {conversation_id}: Zusammenfassung in "
+                        f"anderem Prozess aktualisiert — verworfen"
+                    )
+                    return await self._reload_summary(db, ctx, window_start)
+        except Exception as e:
+            logger.warning(
+                f"Zusammenfassung fuer {conversation_id} fehlgeschlagen: {e}"
+            )
+            return None
+
+        ctx.summary = summary
+        ctx.summary_until = rows[-1].created_at
+        ctx.unsummarized = max(0, ctx.unsummarized - len(rows))
+        logger.info(
+            f"Conversation {conversation_id}: {len(rows)} Messages zusammengefasst"
+        )
+        return summary
+
+    async def _reload_summary(
+        self, db: AsyncSession, ctx: ConversationContext, window_start: datetime
+    ) -> Optional[str]:
+        """Take over the summary another worker stored, recount what is left"""
+        stored = (
+            await db.execute(
+                select(Conversation.summary, Conversation.summary_until).where(
+                    Conversation.id == ctx.conversation_id
+                )
+            )
+        ).one_or_none()
+        if stored is None:
+            self.invalidate(ctx.conversation_id)
+            return None
+        ctx.summary, ctx.summary_until = stored
+        count_query = (
+            select(func.count(Message.id))
+            .where(Message.conversation_id == ctx.conversation_id)
+            .where(Message.role.in_(_CHAT_ROLES))
+            .where(Message.created_at < window_start)
+        )
+        if ctx.summary_until is not None:
+            count_query = count_query.where(Message.created_at > ctx.summary_until)
+        ctx.unsummarized = (await db.execute(count_query)).scalar() or 0
+        return ctx.summary
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "conversations": len(self._contexts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "summaries_running": len(self._summary_tasks),
+        }
+
+
+# Global singleton — used by the chat API
+conversation_context_cache = ConversationContextCache(
+    max_conversations=settings.context_cache_size,
+    max_tokens=settings.context_max_tokens,
+    summary_min_messages=settings.context_summary_min_messages,
+    document_top_k=settings.document_top_k,
+)
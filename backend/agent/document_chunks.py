@@ -0,0 +1,276 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Document Chunks
+
+Hochgeladene Dokumente werden in ueberlappende Abschnitte zerlegt, per
+EmbeddingProvider.embed_batch eingebettet und in document_chunks gespeichert.
+Pro Turn landen nur die top-k Abschnitte, die zur aktuellen User-Nachricht
+passen, im Prompt — statt bis zu 10 Dokumente komplett (und auf 8000 Zeichen
+gekuerzt) bei jedem Turn.
+
+Ohne Embedding-Modell wird nach Wort-Ueberschneidung gerankt.
+
+Abschnitte gehoeren zum DocumentBlob (agent/blob_store.py) und werden von
+allen Dokumenten mit gleichem Inhalt geteilt; nur Dokumente ohne Blob haben
+eigene Abschnitte.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.models import DocumentBlob, DocumentChunk, UploadedDocument
+
+logger = logging.getLogger(__name__)
+
+_EMBED_BATCH = 64  # Abschnitte pro Ollama-Request
+_MAX_DOCUMENTS = 10
+_WORD_RE = re.compile(r"\w{3,}")
+_BREAKS = ("\n\n", "\n", ". ", " ")
+
+
+def chunk_text(text: str, size: int = 1200, overlap: int = 200) -> list[str]:
+    """Split text into overlapping chunks, preferably at paragraph/sentence breaks"""
+    text = (text or "").strip()
+    if not text:
+        return []
+    if len(text) <= size:
+        return [text]
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            # Break in the second half of the window if possible
+            for sep in _BREAKS:
+                cut = text.rfind(sep, start + size // 2, end)
+                if cut != -1:
+                    end = cut + len(sep)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        next_start = max(end - overlap, start + 1)
+        # Start the overlap at a word boundary
+        space = text.find(" ", next_start, end)
+        start = space + 1 if space != -1 else next_start
+    return chunks
+
+
+def _to_blob(embedding: Optional[list[float]]) -> Optional[bytes]:
+    if embedding is None:
+        return None
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+async def _embed_chunks(
+    text: Optional[str], provider
+) -> list[tuple[str, Optional[list[float]]]]:
+    if provider is None:
+        from agent.embeddings import embedding_provider as provider
+
+    chunks = chunk_text(
+        text,
+        settings.document_chunk_size,
+        settings.document_chunk_overlap,
+    )
+    embeddings: list[Optional[list[float]]] = []
+    for i in range(0, len(chunks), _EMBED_BATCH):
+        embeddings.extend(await provider.embed_batch(chunks[i : i + _EMBED_BATCH]))
+    return list(zip(chunks, embeddings))
+
+
+async def index_document(db: AsyncSession, doc: UploadedDocument, provider=None) -> int:
+    """Chunk and embed a document without blob; adds DocumentChunk rows (caller commits)"""
+    chunks = await _embed_chunks(doc.extracted_text, provider)
+    for index, (content, embedding) in enumerate(chunks):
+        db.add(
+            DocumentChunk(
+                document_id=doc.id,
+                conversation_id=doc.conversation_id,
+                chunk_index=index,
+                content=content,
+                embedding=_to_blob(embedding),
+            )
+        )
+    return len(chunks)
+
+
+async def index_blob(db: AsyncSession, blob: DocumentBlob, provider=None) -> int:
+    """Chunk and embed shared blob text once; adds DocumentChunk rows (caller commits)"""
+    chunks = await _embed_chunks(blob.extracted_text, provider)
+    for index, (content, embedding) in enumerate(chunks):
+        db.add(
+            DocumentChunk(
+                blob_hash=blob.sha256,
+                chunk_index=index,
+                content=content,
+                embedding=_to_blob(embedding),
+            )
+        )
+    blob.chunk_count = len(chunks)
+    return len(chunks)
+
+
+@dataclass
+class _Chunk:
+    document_id: str
+    filename: str
+    index: int
+    total: int
+    content: str
+
+
+class DocumentIndex:
+    """In-memory chunk vectors of one conversation (cached per conversation)"""
+
+    def __init__(self, chunks: list[_Chunk], vectors: Optional[np.ndarray]):
+        self.chunks = chunks
+        self.vectors = vectors  # Normalized rows; None if a chunk lacks a vector
+        self._words: Optional[list[set[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def select(
+        self,
+        top_k: int,
+        query: Optional[str] = None,
+        query_embedding: Optional[list[float]] = None,
+    ) -> list[_Chunk]:
+        """Top-k chunks for the query, returned in document order"""
+        if len(self.chunks) <= top_k:
+            return list(self.chunks)
+
+        scores = None
+        if query_embedding is not None and self.vectors is not None:
+            q = np.asarray(query_embedding, dtype=np.float32)
+            norm = float(np.linalg.norm(q))
+            if norm > 0 and q.shape[0] == self.vectors.shape[1]:
+                scores = self.vectors @ (q / norm)
+        if scores is None and query:
+            scores = self._lexical_scores(query)
+        if scores is None:
+            return self.chunks[:top_k]
+
+        # Stable: equal scores keep document order
+        best = np.argsort(-scores, kind="stable")[:top_k]
+        return [self.chunks[i] for i in sorted(best)]
+
+    def _lexical_scores(self, query: str) -> np.ndarray:
+        if self._words is None:
+            self._words = [
+                set(_WORD_RE.findall(c.content.lower())) for c in self.chunks
+            ]
+        terms = set(_WORD_RE.findall(query.lower()))
+        return np.array([len(terms & words) for words in self._words], dtype=np.float32)
+
+    def format(self, selected: list[_Chunk]) -> str:
+        """Context block: selected chunks grouped per document"""
+        from agent.document_handler import format_chunks_for_context
+
+        blocks = []
+        current: list[_Chunk] = []
+        for chunk in selected + [None]:
+            if current and (
+                chunk is None or chunk.document_id != current[0].document_id
+            ):
+                blocks.append(
+                    format_chunks_for_context(
+                        current[0].filename,
+                        [(c.index, c.content) for c in current],
+                        current[0].total,
+                    )
+                )
+                current = []
+            if chunk is not None:
+                current.append(chunk)
+        return "\n\n".join(blocks)
+
+
+async def load_document_index(
+    db: AsyncSession, conversation_id: str, provider=None, backfill: bool = True
+) -> DocumentIndex:
+    """Load chunks of a conversation; documents without chunks are indexed now"""
+    result = await db.execute(
+        select(UploadedDocument, DocumentBlob)
+        .outerjoin(DocumentBlob, DocumentBlob.sha256 == UploadedDocument.content_hash)
+        .where(UploadedDocument.conversation_id == conversation_id)
+        .order_by(UploadedDocument.created_at.asc())
+        .limit(_MAX_DOCUMENTS)
+    )
+    # (document, chunk owner key); blobs are still indexing while extracted_text is None
+    docs: list[tuple[UploadedDocument, str]] = []
+    for doc, blob in result.all():
+        text = blob.extracted_text if blob is not None else doc.extracted_text
+        if text and text.strip():
+            docs.append((doc, blob.sha256 if blob is not None else doc.id))
+    if not docs:
+        return DocumentIndex([], None)
+
+    doc_ids = [doc.id for doc, key in docs if key == doc.id]
+    blob_hashes = [key for doc, key in docs if key != doc.id]
+    columns = (
+        DocumentChunk.blob_hash,
+        DocumentChunk.document_id,
+        DocumentChunk.chunk_index,
+        DocumentChunk.content,
+        DocumentChunk.embedding,
+    )
+    rows = []
+    if doc_ids:
+        rows += (
+            await db.execute(
+                select(*columns).where(DocumentChunk.document_id.in_(doc_ids))
+            )
+        ).all()
+    if blob_hashes:
+        rows += (
+            await db.execute(
+                select(*columns).where(DocumentChunk.blob_hash.in_(blob_hashes))
+            )
+        ).all()
+
+    by_key: dict[str, list] = {}
+    for row in rows:
+        by_key.setdefault(row.blob_hash or row.document_id, []).append(row)
+
+    # Documents without blob uploaded before chunking existed
+    missing = [doc for doc, key in docs if key == doc.id and key not in by_key]
+    if missing and backfill:
+        for doc in missing:
+            await index_document(db, doc, provider)
+        await db.commit()
+        logger.info(f"{len(missing)} Dokument(e) nachtraeglich in Abschnitte zerlegt")
+        return await load_document_index(db, conversation_id, provider, False)
+
+    chunks = []
+    embeddings = []
+    for doc, key in docs:
+        doc_rows = sorted(by_key.get(key, []), key=lambda r: r.chunk_index)
+        for row in doc_rows:
+            chunks.append(
+                _Chunk(
+                    doc.id, doc.filename, row.chunk_index, len(doc_rows), row.content
+                )
+            )
+            embeddings.append(row.embedding)
+
+    vectors = None
+    dims = {len(e) if e else 0 for e in embeddings}
+    if len(dims) == 1 and 0 not in dims:  # All embedded with the same model
+        matrix = np.stack([np.frombuffer(e, dtype=np.float32) for e in embeddings])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = matrix / norms
+    return DocumentIndex(chunks, vectors)
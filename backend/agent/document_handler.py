@@ -51,7 +51,11 @@ ALLOWED_MIME_TYPES = {
     "image/jpeg",
 }
 
-MAX_TEXT_LENGTH = 8000  # Zeichen fuer Context
+MAX_TEXT_LENGTH = 8000  # Zeichen fuer Context (ganzes Dokument, ohne Chunks)
+MAX_EXTRACT_LENGTH = (
+    2_000_000  # Zeichen, die extrahiert und in Abschnitte zerlegt werden
+)
+MAX_CSV_ROWS = 10000
 
 
 def is_allowed_file(filename: str) -> bool:
@@ -101,39 +105,39 @@ def _extract_pdf(file_path: str) -> str:
         text = ""
         for page in doc:
             text += page.get_text()
-            if len(text) > MAX_TEXT_LENGTH:
+            if len(text) > MAX_EXTRACT_LENGTH:
                 break
         doc.close()
-        return text[:MAX_TEXT_LENGTH]
+        return text[:MAX_EXTRACT_LENGTH]
     except ImportError:
         # Fallback wenn pymupdf nicht installiert
         return "[PDF-Extraktion benoetigt pymupdf. Bitte installieren: pip install pymupdf]"
 
 
 def _extract_csv(file_path: str) -> str:
-    """CSV als Tabelle extrahieren (erste 100 Zeilen)"""
+    """CSV als Tabelle extrahieren (erste MAX_CSV_ROWS Zeilen)"""
     with open(file_path, "r", encoding="utf-8", errors="replace") as f:
         reader = csv.reader(f)
         lines = []
         for i, row in enumerate(reader):
-            if i >= 100:
+            if i >= MAX_CSV_ROWS:
                 lines.append(f"... ({i}+ Zeilen insgesamt)")
                 break
             lines.append(" | ".join(row))
-    return "\n".join(lines)[:MAX_TEXT_LENGTH]
+    return "\n".join(lines)[:MAX_EXTRACT_LENGTH]
 
 
 def _extract_json(file_path: str) -> str:
     """JSON formatiert ausgeben"""
     with open(file_path, "r", encoding="utf-8") as f:
         data = json.load(f)
-    return json.dumps(data, indent=2, ensure_ascii=False)[:MAX_TEXT_LENGTH]
+    return json.dumps(data, indent=2, ensure_ascii=False)[:MAX_EXTRACT_LENGTH]
 
 
 def _extract_text(file_path: str) -> str:
     """Plaintext/Code lesen"""
     with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-        return f.read()[:MAX_TEXT_LENGTH]
+        return f.read(MAX_EXTRACT_LENGTH)
 
 
 def truncate_text(text: str, max_chars: int = MAX_TEXT_LENGTH) -> str:
@@ -150,3 +154,16 @@ def format_for_context(filename: str, extracted_text: str) -> str:
         f"{truncate_text(extracted_text)}\n"
         f"--- Ende: {filename} ---"
     )
+
+
+def format_chunks_for_context(
+    filename: str, chunks: list[tuple[int, str]], total: int
+) -> str:
+    """Formatiert ausgewaehlte Abschnitte eines Dokuments als Context-Block"""
+    if len(chunks) == total:
+        header = f"--- Dokument: {filename} ---"
+    else:
+        numbers = ", ".join(str(index + 1) for index, _ in chunks)
+        header = f"--- Dokument: {filename} (Abschnitte {numbers} von {total}) ---"
+    body = "\n[...]\n".join(content for _, content in chunks)
+    return f"{header}\n{body}\n--- Ende: {filename} ---"
@@ -0,0 +1,290 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Embedding Cache
+
+Content-adressierter Cache fuer Embeddings, Schluessel = sha256(Modell + Text).
+Gleicher Text wird so nie zweimal durch Ollama geschickt.
+
+Zwei Stufen:
+- In-Memory LRU (float32-Arrays, begrenzt auf `max_entries`)
+- SQLite-Datei auf Disk (optional), ueberlebt Neustarts
+
+Die SQLite-Verbindung wird erst beim ersten Zugriff geoeffnet. Die async
+Varianten (aget_many/aput_many) fuehren die Disk-Zugriffe per
+asyncio.to_thread aus, damit der Event-Loop nicht auf SQLite wartet.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+import numpy as np
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PRUNE_EVERY = 1000  # Disk-Tier nach so vielen Inserts auf max_disk_entries kuerzen
+
+
+def embedding_key(model: str, text: str) -> str:
+    """Cache key for a (model, text) pair"""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (LRU + SQLite) embedding cache"""
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        path: Optional[str] = None,
+        max_disk_entries: int = 200_000,
+    ):
+        self.max_entries = max_entries
+        self.path = path or None
+        self.max_disk_entries = max_disk_entries
+        self._lru: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._inserts_since_prune = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is None:
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, model TEXT NOT NULL, "
+                    "vector BLOB NOT NULL, created_at REAL NOT NULL)"
+                )
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(
+                    f"Embedding-Cache auf Disk deaktiviert ({self.path}): {e}"
+                )
+                self.path = None
+                return None
+        return self._conn
+
+    def _disk_get(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        if self.path is None or not keys:
+            return {}
+        found = {}
+        with self._lock:
+            conn = self._db()
+            if conn is None:
+                return {}
+            # SQLite-Limit fuer Parameter pro Statement beachten
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def _disk_put(self, rows: list[tuple[str, str, np.ndarray]]):
+        if self.path is None or not rows:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._db()
+            if conn is None:
+                return
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, model, vec.tobytes(), now) for key, model, vec in rows],
+            )
+            conn.commit()
+            self._inserts_since_prune += len(rows)
+            if self._inserts_since_prune >= _PRUNE_EVERY:
+                self._inserts_since_prune = 0
+                conn.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings "
+                    "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                )
+                conn.commit()
+
+    # ------------------------------------------------------------------
+    # LRU tier
+    # ------------------------------------------------------------------
+
+    def _lru_put(self, key: str, vec: np.ndarray):
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, model: str, text: str) -> Optional[list[float]]:
+        """Cached embedding for a text, or None"""
+        return self.get_many(model, [text])[0]
+
+    def _lru_lookup(self, keys: list[str]) -> tuple[dict[str, np.ndarray], list]:
+        vectors: dict[str, np.ndarray] = {}
+        for key in keys:
+            vec = self._lru.get(key)
+            if vec is not None:
+                self._lru.move_to_end(key)
+                vectors[key] = vec
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        return vectors, missing
+
+    def _read_disk(self, keys: list[str]) -> dict[str, np.ndarray]:
+        try:
+            return self._disk_get(keys)
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding-Cache: Lesen von Disk fehlgeschlagen: {e}")
+            return {}
+
+    def _collect(
+        self,
+        keys: list[str],
+        vectors: dict[str, np.ndarray],
+        from_disk: dict[str, np.ndarray],
+    ) -> list[Optional[list[float]]]:
+        for key, vec in from_disk.items():
+            self._lru_put(key, vec)
+        vectors.update(from_disk)
+        self.disk_hits += len(from_disk)
+
+        results = []
+        for key in keys:
+            vec = vectors.get(key)
+            if vec is None:
+                self.misses += 1
+                results.append(None)
+            else:
+                self.hits += 1
+                results.append(vec.tolist())
+        return results
+
+    def get_many(self, model: str, texts: Sequence[str]) -> list[Optional[list[float]]]:
+        """Cached embeddings for several texts (None for misses)"""
+        keys = [embedding_key(model, text) for text in texts]
+        vectors, missing = self._lru_lookup(keys)
+        from_disk = self._read_disk(missing) if missing else {}
+        return self._collect(keys, vectors, from_disk)
+
+    async def aget_many(
+        self, model: str, texts: Sequence[str]
+    ) -> list[Optional[list[float]]]:
+        """get_many() with the disk lookup in a worker thread"""
+        keys = [embedding_key(model, text) for text in texts]
+        vectors, missing = self._lru_lookup(keys)
+        from_disk = {}
+        if missing and self.path is not None:
+            from_disk = await asyncio.to_thread(self._read_disk, missing)
+        return self._collect(keys, vectors, from_disk)
+
+    async def aget(self, model: str, text: str) -> Optional[list[float]]:
+        return (await self.aget_many(model, [text]))[0]
+
+    def put(self, model: str, text: str, embedding: list[float]) -> None:
+        self.put_many(model, [text], [embedding])
+
+    def _stage(
+        self,
+        model: str,
+        texts: Sequence[str],
+        embeddings: Sequence[Optional[list[float]]],
+    ) -> list[tuple[str, str, np.ndarray]]:
+        """Put embeddings into the LRU; returns the rows for the disk tier"""
+        rows = []
+        for text, embedding in zip(texts, embeddings):
+            if not embedding:
+                continue
+            key = embedding_key(model, text)
+            vec = np.asarray(embedding, dtype=np.float32)
+            self._lru_put(key, vec)
+            rows.append((key, model, vec))
+        return rows
+
+    def _write_disk(self, rows: list[tuple[str, str, np.ndarray]]) -> None:
+        try:
+            self._disk_put(rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding-Cache: Schreiben auf Disk fehlgeschlagen: {e}")
+
+    def put_many(
+        self,
+        model: str,
+        texts: Sequence[str],
+        embeddings: Sequence[Optional[list[float]]],
+    ) -> None:
+        """Store embeddings (None entries are skipped)"""
+        self._write_disk(self._stage(model, texts, embeddings))
+
+    async def aput_many(
+        self,
+        model: str,
+        texts: Sequence[str],
+        embeddings: Sequence[Optional[list[float]]],
+    ) -> None:
+        """put_many() with the disk write in a worker thread"""
+        rows = self._stage(model, texts, embeddings)
+        if rows and self.path is not None:
+            await asyncio.to_thread(self._write_disk, rows)
+
+    async def aput(self, model: str, text: str, embedding: list[float]) -> None:
+        await self.aput_many(model, [text], [embedding])
+
+    def clear(self) -> None:
+        """Drop all cached embeddings (both tiers)"""
+        self._lru.clear()
+        with self._lock:
+            conn = self._db()
+            if conn is not None:
+                conn.execute("DELETE FROM embeddings")
+                conn.commit()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+# Global singleton — used by the global EmbeddingProvider
+embedding_cache = EmbeddingCache(
+    max_entries=settings.embedding_cache_size,
+    path=settings.embedding_cache_path,
+)
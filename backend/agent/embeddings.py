@@ -5,6 +5,7 @@ Axon by NeuroVexon - Embedding Provider
 
 Generiert Embeddings ueber Ollama (nomic-embed-text) fuer semantische Memory-Suche.
 Fallback: Kein Embedding verfuegbar → ILIKE-Suche wie bisher.
+Bereits berechnete Embeddings kommen aus dem EmbeddingCache (agent/embedding_cache.py).
 """
 
 import logging
@@ -13,6 +14,7 @@ from typing import Optional
 import httpx
 
 from core.config import settings
+from agent.embedding_cache import EmbeddingCache, embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +26,12 @@ _CACHE_TTL_AVAILABLE = 3600  # 1 hour for positive results
 class EmbeddingProvider:
     """Generates text embeddings via Ollama"""
 
-    def __init__(self, model: str = "nomic-embed-text"):
+    def __init__(
+        self, model: str = "nomic-embed-text", cache: Optional[EmbeddingCache] = None
+    ):
         self.model = model
         self.base_url = settings.ollama_base_url
+        self.cache = cache
         self._available: Optional[bool] = None
         self._checked_at: float = 0
 
@@ -68,6 +73,11 @@ class EmbeddingProvider:
 
     async def embed(self, text: str) -> Optional[list[float]]:
         """Generate embedding for a single text. Returns None if unavailable."""
+        if self.cache is not None:
+            cached = await self.cache.aget(self.model, text)
+            if cached is not None:
+                return cached
+
         if not await self.is_available():
             return None
 
@@ -83,6 +93,8 @@ class EmbeddingProvider:
                 # Ollama /api/embed returns {"embeddings": [[...]]}
                 embeddings = data.get("embeddings", [])
                 if embeddings and len(embeddings) > 0:
+                    if self.cache is not None:
+                        await self.cache.aput(self.model, text, embeddings[0])
                     return embeddings[0]
 
                 return None
@@ -91,7 +103,22 @@ class EmbeddingProvider:
             return None
 
     async def embed_batch(self, texts: list[str]) -> list[Optional[list[float]]]:
-        """Generate embeddings for multiple texts"""
+        """Generate embeddings for multiple texts (only cache misses hit Ollama)"""
+        if self.cache is not None and texts:
+            results = await self.cache.aget_many(self.model, texts)
+            missing = list(
+                dict.fromkeys(t for t, r in zip(texts, results) if r is None)
+            )
+            if missing:
+                computed = dict(zip(missing, await self._embed_uncached(missing)))
+                await self.cache.aput_many(self.model, missing, list(computed.values()))
+                results = [
+                    r if r is not None else computed[t] for t, r in zip(texts, results)
+                ]
+            return results
+        return await self._embed_uncached(texts)
+
+    async def _embed_uncached(self, texts: list[str]) -> list[Optional[list[float]]]:
         if not await self.is_available():
             return [None] * len(texts)
 
@@ -142,4 +169,4 @@ def cosine_similarity(a: list[float], b: list[float]) -> float:
 
 
 # Global singleton
-embedding_provider = EmbeddingProvider()
+embedding_provider = EmbeddingProvider(cache=embedding_cache)
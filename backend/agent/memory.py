@@ -7,16 +7,28 @@ als Kontext in den System-Prompt injiziert.
 
 v2.0: Semantische Suche via Embeddings (Ollama nomic-embed-text).
 Fallback auf ILIKE wenn Embeddings nicht verfuegbar.
+Die Vektoren liegen zusaetzlich im prozessweiten MemoryIndex (agent/memory_index.py),
+damit eine Suche nicht jedes Mal alle Memories aus der DB laden muss.
+Memories ohne Embedding werden per Hintergrund-Job in Batches nachgezogen.
+Aenderungen am Index werden erst nach dem Commit der Session uebernommen
+(after_commit), bei einem Rollback verworfen. Aenderungen anderer Uvicorn-Worker
+erkennt ein Fingerabdruck der Tabelle (Anzahl, max(updated_at)), der hoechstens
+alle MEMORY_INDEX_CHECK_SECONDS gelesen wird; weicht er ab, wird neu geladen.
 """
 
+import asyncio
 import logging
 import struct
-from typing import Optional
+import time
+from typing import Callable, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
 
+from core.config import settings
 from db.models import Memory
-from agent.embeddings import embedding_provider, cosine_similarity
+from agent.embeddings import embedding_provider
+from agent.memory_index import MemoryIndex, memory_index
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +36,52 @@ logger = logging.getLogger(__name__)
 MAX_MEMORIES_IN_PROMPT = 30
 MAX_MEMORY_CONTENT_LENGTH = 500
 
+# Minimale Cosine-Similarity fuer semantische Treffer
+MIN_SIMILARITY = 0.3
+
+# Laufender Backfill-Job (max. einer pro Prozess)
+_backfill_task: Optional[asyncio.Task] = None
+
+# Gecachter Memory-Prompt (plain -> (Zeitpunkt, Prompt)), wird bei Schreibzugriffen
+# invalidiert; die TTL faengt Aenderungen an anderen Stellen ab
+_MEMORY_PROMPT_TTL = 60  # seconds
+_memory_prompt_cache: dict[bool, tuple[float, str]] = {}
+
+
+def invalidate_memory_prompt() -> None:
+    """Drop the cached memory prompt (after memories were written)"""
+    _memory_prompt_cache.clear()
+
+
+# session.info key for index changes waiting for the commit
+_PENDING_INDEX_OPS = "memory_index_ops"
+
+# Serializes fingerprint checks and reloads of the index
+_index_lock = asyncio.Lock()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_index_ops(session: Session) -> None:
+    ops = session.info.pop(_PENDING_INDEX_OPS, None)
+    if not ops:
+        return
+    for index, memory_id, embedding in ops:
+        if not index.loaded:
+            continue  # Loads the committed state on first use
+        if memory_id is None:
+            index.clear()
+        elif embedding:
+            index.upsert(memory_id, _deserialize_embedding(embedding))
+        else:
+            index.remove(memory_id)
+    invalidate_memory_prompt()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_index_ops(session: Session) -> None:
+    if session.info.pop(_PENDING_INDEX_OPS, None):
+        invalidate_memory_prompt()
+
 
 def _serialize_embedding(embedding: list[float]) -> bytes:
     """Serialize embedding list to bytes (float32)"""
@@ -36,11 +94,130 @@ def _deserialize_embedding(data: bytes) -> list[float]:
     return list(struct.unpack(f"{count}f", data))
 
 
+async def _embed_unscored(
+    db: AsyncSession, batch_size: int, skip_ids: set[str] = frozenset()
+) -> list[Memory]:
+    """Embed one batch of memories without embedding via embed_batch"""
+    query = select(Memory).where(Memory.embedding.is_(None)).limit(batch_size)
+    if skip_ids:
+        query = query.where(Memory.id.notin_(skip_ids))
+    result = await db.execute(query)
+    unscored = list(result.scalars().all())
+    if not unscored:
+        return []
+
+    texts = [f"{mem.key}: {mem.content}" for mem in unscored]
+    embeddings = await embedding_provider.embed_batch(texts)
+    for mem, emb in zip(unscored, embeddings):
+        if emb:
+            mem.embedding = _serialize_embedding(emb)
+    await db.flush()
+    return unscored
+
+
+async def backfill_embeddings(
+    session_factory: Optional[Callable[[], AsyncSession]] = None,
+    batch_size: Optional[int] = None,
+    index: Optional[MemoryIndex] = None,
+    skip_ids: Optional[set[str]] = None,
+) -> int:
+    """
+    Embed all memories that have no embedding yet, `batch_size` texts per
+    embed_batch call, committing after every batch. Returns the count embedded.
+    """
+    if session_factory is None:
+        from db.database import async_session as session_factory
+    batch_size = batch_size or settings.embedding_backfill_batch_size
+    index = index if index is not None else memory_index
+
+    embedded = 0
+    # Bereits erledigt oder nicht einbettbar — nicht endlos wiederholen
+    failed: set[str] = set(skip_ids or ())
+    while True:
+        async with session_factory() as db:
+            batch = await _embed_unscored(db, batch_size, failed)
+            await db.commit()
+        if not batch:
+            break
+        done = [mem for mem in batch if mem.embedding]
+        if not done:
+            break  # Embedding-Modell nicht verfuegbar
+        failed.update(mem.id for mem in batch if not mem.embedding)
+        embedded += len(done)
+        if index.loaded:
+            for mem in done:
+                index.upsert(mem.id, _deserialize_embedding(mem.embedding))
+
+    if embedded:
+        logger.info(f"Embedding-Backfill: {embedded} Memories nachtraeglich embedded")
+    return embedded
+
+
+def schedule_embedding_backfill(**kwargs) -> asyncio.Task:
+    """Start the backfill job in the background (no-op while one is running)"""
+    global _backfill_task
+    if _backfill_task is None or _backfill_task.done():
+        _backfill_task = asyncio.create_task(backfill_embeddings(**kwargs))
+    return _backfill_task
+
+
 class MemoryManager:
     """Manages persistent agent memories across conversations"""
 
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, index: Optional[MemoryIndex] = None):
         self.db = db_session
+        self.index = index if index is not None else memory_index
+
+    def _index_fresh(self) -> bool:
+        index = self.index
+        if not index.loaded:
+            return False
+        if self.db.sync_session.info.get(_PENDING_INDEX_OPS):
+            return True  # Uncommitted writes of this session must not be loaded
+        return time.monotonic() - index.checked_at < settings.memory_index_check_seconds
+
+    async def _ensure_index(self) -> None:
+        """
+        Load all stored embeddings into the vector index, and reload it when
+        another worker changed the memories table
+        """
+        if self._index_fresh():
+            return
+
+        async with _index_lock:
+            if self._index_fresh():
+                return
+            result = await self.db.execute(
+                select(func.count(Memory.id), func.max(Memory.updated_at))
+            )
+            fingerprint = tuple(result.one())
+            self.index.checked_at = time.monotonic()
+            if self.index.loaded:
+                if fingerprint == self.index.fingerprint:
+                    return
+                logger.info("Memories in anderem Prozess geaendert — Index neu geladen")
+
+            result = await self.db.execute(select(Memory.id, Memory.embedding))
+            self.index.load(result.all())
+            self.index.fingerprint = fingerprint
+
+    def _index_update(self, memory: Memory) -> None:
+        """Mirror a memory's embedding into the index, if it is loaded"""
+        if not self.index.loaded:
+            return
+        if memory.embedding:
+            self.index.upsert(memory.id, _deserialize_embedding(memory.embedding))
+        else:
+            self.index.remove(memory.id)
+
+    def _changed(self, memory_id: Optional[str], embedding: Optional[bytes]) -> None:
+        """
+        Record a write: the prompt cache is dropped now, the index follows
+        on commit. memory_id None clears the index, embedding None removes.
+        """
+        ops = self.db.sync_session.info.setdefault(_PENDING_INDEX_OPS, [])
+        ops.append((self.index, memory_id, embedding))
+        invalidate_memory_prompt()
 
     async def add(
         self,
@@ -69,6 +246,7 @@ class MemoryManager:
             if category:
                 existing.category = category
             await self.db.flush()
+            self._changed(existing.id, embedding_bytes)
             logger.info(f"Memory updated: {key}")
             return existing
 
@@ -81,6 +259,7 @@ class MemoryManager:
         )
         self.db.add(memory)
         await self.db.flush()
+        self._changed(memory.id, embedding_bytes)
         logger.info(f"Memory created: {key}")
         return memory
 
@@ -110,6 +289,7 @@ class MemoryManager:
             return False
         await self.db.delete(memory)
         await self.db.flush()
+        self._changed(memory_id, None)
         logger.info(f"Memory deleted: {memory.key}")
         return True
 
@@ -121,6 +301,7 @@ class MemoryManager:
             return False
         await self.db.delete(memory)
         await self.db.flush()
+        self._changed(memory.id, None)
         logger.info(f"Memory deleted by key: {key}")
         return True
 
@@ -129,73 +310,60 @@ class MemoryManager:
         Semantic search via embeddings with ILIKE fallback.
 
         1. Embed the query
-        2. Load all memories with embeddings
-        3. Rank by cosine similarity
+        2. Rank all indexed memories with one matrix-vector product
+        3. Batch-embed memories without embeddings if nothing matched
         4. Fallback to ILIKE if no embeddings available
         """
         # Try semantic search first
         query_embedding = await embedding_provider.embed(query)
 
         if query_embedding:
-            # Load all memories (bei <1000 kein Performance-Problem)
-            result = await self.db.execute(select(Memory))
-            all_memories = list(result.scalars().all())
-
-            # Score memories with embeddings
-            scored = []
-            unscored = []
-            for mem in all_memories:
-                if mem.embedding:
-                    mem_embedding = _deserialize_embedding(mem.embedding)
-                    score = cosine_similarity(query_embedding, mem_embedding)
-                    scored.append((score, mem))
-                else:
-                    unscored.append(mem)
-
-            if scored:
-                # Sort by similarity (highest first)
-                scored.sort(key=lambda x: x[0], reverse=True)
-                # Filter by minimum threshold
-                results = [mem for score, mem in scored if score > 0.3][:limit]
-
-                if results:
-                    logger.info(
-                        f"Semantic search for '{query}': {len(results)} results (best score: {scored[0][0]:.3f})"
-                    )
-                    return results
-
-            # If no scored results, try to embed unscored memories lazily
+            await self._ensure_index()
+            results = await self._semantic_search(query_embedding, limit)
+            if results:
+                return results
+
+            # If no scored results, embed one batch of unscored memories now
+            # and leave the rest to the background backfill job
+            batch_size = settings.embedding_backfill_batch_size
+            unscored = await _embed_unscored(self.db, batch_size)
             if unscored:
                 logger.info(
-                    f"{len(unscored)} memories without embeddings — generating lazily"
+                    f"{len(unscored)} memories without embeddings — embedded in batch"
                 )
-                for mem in unscored[:50]:  # Max 50 auf einmal
-                    embed_text = f"{mem.key}: {mem.content}"
-                    emb = await embedding_provider.embed(embed_text)
-                    if emb:
-                        mem.embedding = _serialize_embedding(emb)
-                await self.db.flush()
+                # Rows already exist; only their embedding is new, so the
+                # index is updated right away for the retry below
+                for mem in unscored:
+                    self._index_update(mem)
+                if len(unscored) == batch_size:
+                    schedule_embedding_backfill(
+                        index=self.index, skip_ids={mem.id for mem in unscored}
+                    )
 
                 # Retry search after embedding
-                return await self._semantic_search(query_embedding, all_memories, limit)
+                return await self._semantic_search(query_embedding, limit)
 
         # Fallback: ILIKE text search
         logger.info(f"Fallback to ILIKE search for: {query}")
         return await self._ilike_search(query, limit)
 
     async def _semantic_search(
-        self, query_embedding: list[float], memories: list[Memory], limit: int
+        self, query_embedding: list[float], limit: int
     ) -> list[Memory]:
-        """Perform semantic search on a list of memories"""
-        scored = []
-        for mem in memories:
-            if mem.embedding:
-                mem_embedding = _deserialize_embedding(mem.embedding)
-                score = cosine_similarity(query_embedding, mem_embedding)
-                scored.append((score, mem))
+        """Rank indexed memories by cosine similarity and load the top hits"""
+        hits = self.index.search(query_embedding, k=limit, min_score=MIN_SIMILARITY)
+        if not hits:
+            return []
 
-        scored.sort(key=lambda x: x[0], reverse=True)
-        results = [mem for score, mem in scored if score > 0.3][:limit]
+        result = await self.db.execute(
+            select(Memory).where(Memory.id.in_([memory_id for memory_id, _ in hits]))
+        )
+        by_id = {mem.id: mem for mem in result.scalars().all()}
+        results = [by_id[memory_id] for memory_id, _ in hits if memory_id in by_id]
+        if results:
+            logger.info(
+                f"Semantic search: {len(results)} results (best score: {hits[0][1]:.3f})"
+            )
         return results
 
     async def _ilike_search(self, query: str, limit: int) -> list[Memory]:
@@ -211,14 +379,25 @@ class MemoryManager:
         )
         return list(result.scalars().all())
 
-    async def build_memory_prompt(self, plain: bool = False) -> str:
+    async def build_memory_prompt(
+        self, plain: bool = False, use_cache: bool = False
+    ) -> str:
         """
         Build a memory block for injection into the system prompt.
         Returns an empty string if no memories exist.
 
         Args:
             plain: If True, returns plain text without markdown (for tool-calling models).
+            use_cache: Reuse the process-wide cached prompt (chat hot path).
         """
+        if use_cache:
+            cached = _memory_prompt_cache.get(plain)
+            if cached and time.monotonic() - cached[0] < _MEMORY_PROMPT_TTL:
+                return cached[1]
+            prompt = await self.build_memory_prompt(plain=plain)
+            _memory_prompt_cache[plain] = (time.monotonic(), prompt)
+            return prompt
+
         memories = await self.list_all(limit=MAX_MEMORIES_IN_PROMPT)
         if not memories:
             return ""
@@ -247,5 +426,6 @@ class MemoryManager:
         for mem in memories:
             await self.db.delete(mem)
         await self.db.flush()
+        self._changed(None, None)
         logger.info(f"All memories cleared: {count} entries")
         return count
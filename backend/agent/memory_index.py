@@ -0,0 +1,341 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Memory Vector Index
+
+Prozessweiter In-Memory-Index fuer Memory-Embeddings.
+Alle Vektoren liegen vor-normalisiert in einer float32-Matrix, eine Suche
+ist damit ein einziges Matrix-Vektor-Produkt statt N einzelner
+cosine_similarity-Aufrufe.
+
+Modi:
+- exact: Brute-Force ueber die komplette Matrix (Default)
+- ivf:   Inverted File Index (k-means Zentroiden, reines numpy)
+- hnsw:  HNSW-Graph via hnswlib (optional, Fallback auf ivf)
+
+ANN-Modi greifen erst ab `ann_threshold` Eintraegen, darunter ist exact schneller.
+"""
+
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_MODES = ("exact", "ivf", "hnsw")
+
+_INITIAL_CAPACITY = 256
+_IVF_TRAIN_SAMPLE = 20000
+_IVF_TRAIN_ITERATIONS = 8
+_IVF_RETRAIN_GROWTH = 4  # Neu trainieren wenn der Index um diesen Faktor waechst
+_COMPACT_RATIO = 0.25  # Kompaktieren ab 25% geloeschter Zeilen
+
+
+def _normalize(vec: np.ndarray) -> Optional[np.ndarray]:
+    """L2-normalize a vector; returns None for zero vectors"""
+    norm = float(np.linalg.norm(vec))
+    if norm == 0.0:
+        return None
+    return (vec / norm).astype(np.float32, copy=False)
+
+
+class MemoryIndex:
+    """Pre-normalized float32 embedding matrix with top-k cosine search"""
+
+    def __init__(
+        self,
+        mode: str = "exact",
+        ann_threshold: int = 20000,
+        nprobe: int = 8,
+    ):
+        if mode not in INDEX_MODES:
+            raise ValueError(f"Unknown memory index mode: {mode}")
+        self.mode = mode
+        self.ann_threshold = ann_threshold
+        self.nprobe = nprobe
+        self.loaded = False
+        # DB state of the last load and when it was last compared (MemoryManager)
+        self.fingerprint: Optional[tuple] = None
+        self.checked_at = 0.0
+        self._reset_storage()
+
+    def _reset_storage(self):
+        self._dim: Optional[int] = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._ids: list[Optional[str]] = []
+        self._rows: dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0  # Belegte Zeilen (inkl. geloeschter)
+        self._deleted = 0
+        # IVF
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._lists: Optional[list[np.ndarray]] = None
+        self._trained_size = 0
+        # HNSW
+        self._hnsw = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._dim
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def load(self, rows: Iterable[tuple[str, Optional[bytes]]]) -> None:
+        """(Re)build the index from (memory_id, embedding_bytes) rows"""
+        self._reset_storage()
+        for memory_id, data in rows:
+            if data:
+                self.upsert(memory_id, np.frombuffer(data, dtype=np.float32))
+        self.loaded = True
+        logger.info(f"Memory-Index geladen: {len(self)} Vektoren ({self.mode})")
+
+    def clear(self) -> None:
+        """Remove all vectors (index stays loaded)"""
+        self._reset_storage()
+
+    def invalidate(self) -> None:
+        """Drop all vectors and force a reload on next use"""
+        self._reset_storage()
+        self.loaded = False
+        self.fingerprint = None
+
+    def upsert(self, memory_id: str, embedding) -> None:
+        """Insert or replace the vector for a memory"""
+        vec = _normalize(np.asarray(embedding, dtype=np.float32).ravel())
+        if vec is None:
+            self.remove(memory_id)
+            return
+
+        if self._dim is None:
+            self._dim = vec.shape[0]
+            self._matrix = np.zeros((_INITIAL_CAPACITY, self._dim), dtype=np.float32)
+            self._alive = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+            self._assign = np.full(_INITIAL_CAPACITY, -1, dtype=np.int32)
+        elif vec.shape[0] != self._dim:
+            logger.warning(
+                f"Embedding-Dimension {vec.shape[0]} passt nicht zum Index "
+                f"({self._dim}) — Memory {memory_id} wird nicht indiziert"
+            )
+            self.remove(memory_id)
+            return
+
+        row = self._rows.get(memory_id)
+        if row is None:
+            if self._size == self._matrix.shape[0]:
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._rows[memory_id] = row
+            self._ids.append(memory_id)
+            self._alive[row] = True
+
+        self._matrix[row] = vec
+        if self._centroids is not None:
+            self._assign[row] = int(np.argmax(self._centroids @ vec))
+            self._lists = None
+        if self._hnsw is not None:
+            self._hnsw_add(np.array([row]))
+
+    def remove(self, memory_id: str) -> None:
+        """Remove the vector for a memory (no-op if not indexed)"""
+        row = self._rows.pop(memory_id, None)
+        if row is None:
+            return
+        self._ids[row] = None
+        self._alive[row] = False
+        self._deleted += 1
+        self._lists = None
+        if self._hnsw is not None:
+            try:
+                self._hnsw.mark_deleted(row)
+            except RuntimeError:
+                pass
+        if self._deleted > _COMPACT_RATIO * max(self._size, 1):
+            self._compact()
+
+    def _grow(self):
+        capacity = max(_INITIAL_CAPACITY, self._matrix.shape[0] * 2)
+        matrix = np.zeros((capacity, self._dim), dtype=np.float32)
+        matrix[: self._size] = self._matrix[: self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        assign = np.full(capacity, -1, dtype=np.int32)
+        assign[: self._size] = self._assign[: self._size]
+        self._matrix, self._alive, self._assign = matrix, alive, assign
+        if self._hnsw is not None:
+            self._hnsw.resize_index(capacity)
+
+    def _compact(self):
+        """Drop deleted rows so the matrix stays dense"""
+        keep = np.flatnonzero(self._alive[: self._size])
+        n = len(keep)
+        capacity = max(_INITIAL_CAPACITY, self._matrix.shape[0])
+        matrix = np.zeros((capacity, self._dim), dtype=np.float32)
+        matrix[:n] = self._matrix[keep]
+        assign = np.full(capacity, -1, dtype=np.int32)
+        assign[:n] = self._assign[keep]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:n] = True
+
+        self._ids = [self._ids[i] for i in keep]
+        self._rows = {memory_id: i for i, memory_id in enumerate(self._ids)}
+        self._matrix, self._assign, self._alive = matrix, assign, alive
+        self._size = n
+        self._deleted = 0
+        self._lists = None
+        if self._hnsw is not None:
+            # Row-IDs haben sich verschoben — Graph neu aufbauen
+            self._hnsw = None
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(
+        self, query, k: int = 10, min_score: float = -1.0
+    ) -> list[tuple[str, float]]:
+        """
+        Return up to k (memory_id, cosine score) pairs, best first.
+        Pairs with score <= min_score are dropped.
+        """
+        if not self._rows or k <= 0:
+            return []
+
+        q = _normalize(np.asarray(query, dtype=np.float32).ravel())
+        if q is None or q.shape[0] != self._dim:
+            return []
+
+        if len(self._rows) >= self.ann_threshold and self.mode != "exact":
+            if self.mode == "hnsw" and self._ensure_hnsw():
+                return self._search_hnsw(q, k, min_score)
+            self._ensure_ivf()
+            candidates = self._ivf_candidates(q)
+        else:
+            candidates = None
+
+        if candidates is None:
+            scores = self._matrix[: self._size] @ q
+            scores[~self._alive[: self._size]] = -np.inf
+            rows = np.arange(self._size)
+        else:
+            scores = self._matrix[candidates] @ q
+            rows = candidates
+
+        return self._top_k(rows, scores, k, min_score)
+
+    def _top_k(self, rows, scores, k, min_score) -> list[tuple[str, float]]:
+        if len(scores) == 0:
+            return []
+        if len(scores) > k:
+            part = np.argpartition(-scores, k - 1)[:k]
+        else:
+            part = np.arange(len(scores))
+        order = part[np.argsort(-scores[part])]
+
+        results = []
+        for i in order:
+            score = float(scores[i])
+            if score <= min_score:
+                break
+            memory_id = self._ids[int(rows[i])]
+            if memory_id is not None:
+                results.append((memory_id, score))
+        return results
+
+    # --- IVF ---
+
+    def _ensure_ivf(self):
+        n = len(self._rows)
+        if self._centroids is None or n >= self._trained_size * _IVF_RETRAIN_GROWTH:
+            self._train_ivf()
+        if self._lists is None:
+            assign = self._assign[: self._size].copy()
+            assign[~self._alive[: self._size]] = -1
+            order = np.argsort(assign, kind="stable")
+            counts = np.bincount(assign[assign >= 0], minlength=len(self._centroids))
+            start = int(np.count_nonzero(assign < 0))
+            self._lists = []
+            for count in counts:
+                self._lists.append(order[start : start + count])
+                start += count
+
+    def _train_ivf(self):
+        """Spherical k-means over a sample of the live vectors"""
+        live = np.flatnonzero(self._alive[: self._size])
+        nlist = int(min(1024, max(16, np.sqrt(len(live)))))
+        rng = np.random.default_rng(0)
+        sample = live
+        if len(sample) > _IVF_TRAIN_SAMPLE:
+            sample = rng.choice(live, _IVF_TRAIN_SAMPLE, replace=False)
+        data = self._matrix[sample]
+        centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+
+        for _ in range(_IVF_TRAIN_ITERATIONS):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = data[labels == c]
+                if len(members):
+                    norm = np.linalg.norm(members.sum(axis=0))
+                    if norm > 0:
+                        centroids[c] = members.sum(axis=0) / norm
+
+        self._centroids = centroids.astype(np.float32)
+        # Alle Zeilen zuweisen (in Bloecken, um den Speicher zu begrenzen)
+        for start in range(0, self._size, 8192):
+            block = self._matrix[start : start + 8192][: self._size - start]
+            self._assign[start : start + len(block)] = np.argmax(
+                block @ self._centroids.T, axis=1
+            )
+        self._trained_size = len(live)
+        self._lists = None
+        logger.info(f"Memory-Index IVF trainiert: {nlist} Listen, {len(live)} Vektoren")
+
+    def _ivf_candidates(self, q: np.ndarray) -> np.ndarray:
+        nprobe = min(self.nprobe, len(self._centroids))
+        probe = np.argpartition(-(self._centroids @ q), nprobe - 1)[:nprobe]
+        return np.concatenate([self._lists[c] for c in probe])
+
+    # --- HNSW (optional) ---
+
+    def _ensure_hnsw(self) -> bool:
+        if self._hnsw is not None:
+            return True
+        try:
+            import hnswlib
+        except ImportError:
+            logger.warning("hnswlib nicht installiert — Memory-Index nutzt IVF")
+            self.mode = "ivf"
+            return False
+
+        index = hnswlib.Index(space="ip", dim=self._dim)
+        index.init_index(max_elements=self._matrix.shape[0], ef_construction=200, M=16)
+        index.set_ef(64)
+        self._hnsw = index
+        self._hnsw_add(np.flatnonzero(self._alive[: self._size]))
+        return True
+
+    def _hnsw_add(self, rows: np.ndarray):
+        if len(rows):
+            self._hnsw.add_items(self._matrix[rows], rows)
+
+    def _search_hnsw(self, q, k, min_score) -> list[tuple[str, float]]:
+        k = min(k, len(self._rows))
+        labels, distances = self._hnsw.knn_query(q, k=k)
+        # space="ip" liefert 1 - <q, v>
+        return self._top_k(labels[0], 1.0 - distances[0], k, min_score)
+
+
+# Global singleton — shared by all MemoryManager instances
+memory_index = MemoryIndex(
+    mode=settings.memory_index_mode,
+    ann_threshold=settings.memory_index_ann_threshold,
+)
@@ -4,23 +4,56 @@ Axon by NeuroVexon - Agent Orchestrator
 Koordiniert LLM, Tools und Permissions.
 """
 
+from dataclasses import dataclass
 from typing import AsyncGenerator, Optional, Callable, Awaitable
+import asyncio
 import time
 import logging
+import weakref
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .tool_registry import ToolRegistry, tool_registry
 from .permission_manager import PermissionManager, permission_manager, PermissionScope
 from .audit_logger import AuditLogger
-from .tool_handlers import execute_tool, ToolExecutionError
+from .tool_handlers import execute_tool, uses_db_session, ToolExecutionError
 from .agent_manager import AgentManager
-from llm.provider import BaseLLMProvider, ChatMessage
+from llm.provider import BaseLLMProvider, ChatMessage, ToolCall
 from db.models import Agent
+from core.config import settings
 from core.i18n import t
 
 logger = logging.getLogger(__name__)
 
+# Per-session concurrency slots, shared by all orchestrators of a session
+_session_slots: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _session_semaphore(session_id: str, limit: int) -> asyncio.Semaphore:
+    semaphore = _session_slots.get(session_id)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(limit)
+        _session_slots[session_id] = semaphore
+    return semaphore
+
+
+@dataclass
+class _ToolRun:
+    """An admitted tool call waiting for (or running) its execution"""
+
+    tool_call: ToolCall
+    auto_approved: bool
+    task: Optional[asyncio.Task] = None
+
+
+@dataclass
+class _ToolOutcome:
+    result: object = None
+    error: Optional[Exception] = None
+    execution_time_ms: int = 0
+
 
 class AgentOrchestrator:
     """
@@ -39,12 +72,22 @@ class AgentOrchestrator:
         tools: Optional[ToolRegistry] = None,
         permissions: Optional[PermissionManager] = None,
         agent: Optional[Agent] = None,
+        max_parallel_tools: Optional[int] = None,
     ):
         self.llm = llm_provider
         self.tools = tools or tool_registry
         self.permissions = permissions or permission_manager
         self.audit = AuditLogger(db_session)
         self.agent = agent  # Agent-Profil mit Permissions
+        # 1 = Tools strikt nacheinander (Ergebnis direkt nach jedem Call)
+        self.max_parallel_tools = max(
+            1,
+            (
+                max_parallel_tools
+                if max_parallel_tools is not None
+                else settings.agent_max_parallel_tools
+            ),
+        )
 
     async def process_message(
         self,
@@ -68,249 +111,299 @@ class AgentOrchestrator:
         """
 
         iteration = 0
+        # Cached schema, filtered by the agent's allowed tools (no per-turn work)
+        llm_tools = self.tools.get_tools_for_llm(
+            self.agent.allowed_tools if self.agent else None
+        )
+        parallel = self.max_parallel_tools > 1
+        semaphore = (
+            _session_semaphore(session_id, self.max_parallel_tools)
+            if parallel
+            else None
+        )
 
         while iteration < max_tool_iterations:
             iteration += 1
 
-            # Call LLM with tools
-            response = await self.llm.chat(
-                messages=messages, tools=self.tools.get_tools_for_llm()
-            )
+            # Stream LLM output: text goes out while it is generated, each tool
+            # call is admitted (permission/approval) as soon as it is assembled
+            had_tool_calls = False
+            runs: list[_ToolRun] = []
+            try:
+                async for chunk in self.llm.chat_events(
+                    messages=messages, tools=llm_tools
+                ):
+                    if chunk.text:
+                        yield {"type": "text", "content": chunk.text}
+                        continue
+                    if not chunk.tool_call:
+                        continue
+
+                    had_tool_calls = True
+                    admitted: list[_ToolRun] = []
+                    async for event in self._admit_tool_call(
+                        session_id,
+                        chunk.tool_call,
+                        messages,
+                        on_approval_needed,
+                        admitted,
+                    ):
+                        yield event
+
+                    for run in admitted:
+                        if not parallel:
+                            outcome = await self._run_tool(run.tool_call)
+                            async for event in self._finish_tool_call(
+                                session_id, run, outcome, messages
+                            ):
+                                yield event
+                            continue
+                        # Tools on the shared DB session run later, in call order
+                        if not uses_db_session(run.tool_call.name):
+                            run.task = asyncio.create_task(
+                                self._run_tool(run.tool_call, semaphore)
+                            )
+                        runs.append(run)
+
+                # Results (and audit entries) in call order, independent of
+                # which concurrent execution finished first
+                for run in runs:
+                    if run.task is not None:
+                        outcome = await run.task
+                    else:
+                        outcome = await self._run_tool(run.tool_call)
+                    async for event in self._finish_tool_call(
+                        session_id, run, outcome, messages
+                    ):
+                        yield event
+            finally:
+                for run in runs:
+                    if run.task is not None and not run.task.done():
+                        run.task.cancel()
 
             # If no tool calls, we're done
-            if not response.tool_calls:
-                if response.content:
-                    yield {"type": "text", "content": response.content}
+            if not had_tool_calls:
                 yield {"type": "done"}
                 return
 
-            # Process each tool call
-            for tool_call in response.tool_calls:
-                tool_name = tool_call.name
-                tool_params = tool_call.parameters
-
-                # Get tool definition
-                tool_def = self.tools.get(tool_name)
-                if not tool_def:
-                    yield {
-                        "type": "tool_error",
-                        "tool": tool_name,
-                        "error": f"Unknown tool: {tool_name}",
-                    }
-                    continue
-
-                # Agent-level permission check: is this tool allowed for this agent?
-                if self.agent and not AgentManager.is_tool_allowed(
-                    self.agent, tool_name
-                ):
-                    logger.info(
-                        f"Agent '{self.agent.name}' darf {tool_name} nicht nutzen"
-                    )
-                    yield {
-                        "type": "tool_error",
-                        "tool": tool_name,
-                        "error": t(
-                            "orch.agent_no_access",
-                            agent=self.agent.name,
-                            tool=tool_name,
-                        ),
-                    }
-                    messages.append(
-                        ChatMessage(
-                            role="assistant",
-                            content=t("orch.tool_not_allowed", tool=tool_name),
-                        )
-                    )
-                    continue
-
-                # Log the request
-                await self.audit.log_tool_request(session_id, tool_name, tool_params)
+        # Max iterations reached
+        yield {"type": "warning", "message": "Maximum tool iterations reached"}
+        yield {"type": "done"}
 
-                # Check auto-approve: agent-level OR tool-level
-                agent_auto_approved = (
-                    self.agent is not None
-                    and AgentManager.is_auto_approved(self.agent, tool_name)
+    async def _admit_tool_call(
+        self,
+        session_id: str,
+        tool_call: ToolCall,
+        messages: list[ChatMessage],
+        on_approval_needed: Callable[[dict], Awaitable[Optional[PermissionScope]]],
+        admitted: list[_ToolRun],
+    ) -> AsyncGenerator[dict, None]:
+        """
+        Permission check and approval of a single tool call.
+        Appends a _ToolRun to `admitted` if the call may be executed.
+        """
+        tool_name = tool_call.name
+        tool_params = tool_call.parameters
+
+        # Get tool definition
+        tool_def = self.tools.get(tool_name)
+        if not tool_def:
+            yield {
+                "type": "tool_error",
+                "tool": tool_name,
+                "error": f"Unknown tool: {tool_name}",
+            }
+            return
+
+        # Agent-level permission check: is this tool allowed for this agent?
+        if self.agent and not AgentManager.is_tool_allowed(self.agent, tool_name):
+            logger.info(f"Agent '{self.agent.name}' darf {tool_name} nicht nutzen")
+            yield {
+                "type": "tool_error",
+                "tool": tool_name,
+                "error": t(
+                    "orch.agent_no_access",
+                    agent=self.agent.name,
+                    tool=tool_name,
+                ),
+            }
+            messages.append(
+                ChatMessage(
+                    role="assistant",
+                    content=t("orch.tool_not_allowed", tool=tool_name),
                 )
-
-                if not tool_def.requires_approval or agent_auto_approved:
-                    logger.info(f"Auto-approving {tool_name} (requires_approval=False)")
-                    # Skip approval flow, go straight to execution
-                    start_time = time.time()
-                    try:
-                        result = await execute_tool(
-                            tool_name, tool_params, db_session=self.audit.db
-                        )
-                        execution_time_ms = int((time.time() - start_time) * 1000)
-
-                        await self.audit.log_tool_execution(
-                            session_id,
-                            tool_name,
-                            tool_params,
-                            str(result),
-                            execution_time_ms,
-                        )
-
-                        yield {
-                            "type": "tool_result",
-                            "tool": tool_name,
-                            "result": result,
-                            "execution_time_ms": execution_time_ms,
-                        }
-
-                        messages.append(
-                            ChatMessage(
-                                role="assistant",
-                                content=f"Tool {tool_name} executed. Result: {str(result)[:500]}",
-                            )
-                        )
-
-                    except Exception as e:
-                        logger.exception(f"Error executing auto-approved {tool_name}")
-                        await self.audit.log_tool_failure(
-                            session_id, tool_name, tool_params, str(e)
-                        )
-                        yield {"type": "tool_error", "tool": tool_name, "error": str(e)}
-                        messages.append(
-                            ChatMessage(
-                                role="assistant",
-                                content=f"Tool {tool_name} failed: {str(e)}",
-                            )
-                        )
-                    continue
-
-                # Check existing permission
-                has_permission = self.permissions.check_permission(
-                    session_id, tool_name, tool_params
+            )
+            return
+
+        # Log the request
+        await self.audit.log_tool_request(session_id, tool_name, tool_params)
+
+        # Check auto-approve: agent-level OR tool-level
+        agent_auto_approved = self.agent is not None and AgentManager.is_auto_approved(
+            self.agent, tool_name
+        )
+
+        if not tool_def.requires_approval or agent_auto_approved:
+            logger.info(f"Auto-approving {tool_name} (requires_approval=False)")
+            admitted.append(_ToolRun(tool_call, auto_approved=True))
+            return
+
+        # Check existing permission
+        has_permission = await self.permissions.check_permission(
+            session_id, tool_name, tool_params
+        )
+
+        if not has_permission:
+            # Check if blocked
+            if await self.permissions.is_blocked(tool_name, tool_params):
+                await self.audit.log_tool_rejection(
+                    session_id, tool_name, tool_params, "blocked"
                 )
-
-                if not has_permission:
-                    # Check if blocked
-                    if self.permissions.is_blocked(tool_name, tool_params):
-                        await self.audit.log_tool_rejection(
-                            session_id, tool_name, tool_params, "blocked"
-                        )
-                        yield {
-                            "type": "tool_blocked",
-                            "tool": tool_name,
-                            "message": t("orch.tool_blocked"),
-                        }
-                        messages.append(
-                            ChatMessage(
-                                role="assistant",
-                                content=t("orch.tool_blocked_msg", tool=tool_name),
-                            )
-                        )
-                        continue
-
-                    # Create approval request FIRST so we have an ID
-                    approval_id = self.permissions.create_approval_request(
-                        session_id=session_id,
-                        tool=tool_name,
-                        params=tool_params,
-                        description=tool_def.get_description(),
-                        risk_level=tool_def.risk_level.value,
+                yield {
+                    "type": "tool_blocked",
+                    "tool": tool_name,
+                    "message": t("orch.tool_blocked"),
+                }
+                messages.append(
+                    ChatMessage(
+                        role="assistant",
+                        content=t("orch.tool_blocked_msg", tool=tool_name),
                     )
+                )
+                return
 
-                    # Yield tool request with approval_id to UI
-                    yield {
-                        "type": "tool_request",
-                        "tool": tool_name,
-                        "params": tool_params,
-                        "description": tool_def.description_de,
-                        "risk_level": tool_def.risk_level.value,
-                        "approval_id": approval_id,
-                    }
-
-                    # Wait for approval decision
-                    decision = await on_approval_needed(
-                        {
-                            "tool": tool_name,
-                            "params": tool_params,
-                            "description": tool_def.description_de,
-                            "risk_level": tool_def.risk_level.value,
-                            "approval_id": approval_id,
-                        }
-                    )
-
-                    if decision is None:
-                        await self.audit.log_tool_rejection(
-                            session_id, tool_name, tool_params, "rejected"
-                        )
-                        yield {"type": "tool_rejected", "tool": tool_name}
-                        messages.append(
-                            ChatMessage(
-                                role="assistant",
-                                content=t("orch.user_rejected", tool=tool_name),
-                            )
-                        )
-                        continue
-
-                    # Grant permission
-                    self.permissions.grant_permission(
-                        session_id, tool_name, tool_params, decision
-                    )
-                    await self.audit.log_tool_approval(
-                        session_id, tool_name, tool_params, decision.value
-                    )
+            # Create approval request FIRST so we have an ID
+            approval_id = self.permissions.create_approval_request(
+                session_id=session_id,
+                tool=tool_name,
+                params=tool_params,
+                description=tool_def.get_description(),
+                risk_level=tool_def.risk_level.value,
+            )
 
-                # Execute the tool (pass db_session for memory tools)
-                start_time = time.time()
-                try:
-                    result = await execute_tool(
-                        tool_name, tool_params, db_session=self.audit.db
-                    )
-                    execution_time_ms = int((time.time() - start_time) * 1000)
+            # Yield tool request with approval_id to UI
+            yield {
+                "type": "tool_request",
+                "tool": tool_name,
+                "params": tool_params,
+                "description": tool_def.description_de,
+                "risk_level": tool_def.risk_level.value,
+                "approval_id": approval_id,
+            }
+
+            # Wait for approval decision
+            decision = await on_approval_needed(
+                {
+                    "tool": tool_name,
+                    "params": tool_params,
+                    "description": tool_def.description_de,
+                    "risk_level": tool_def.risk_level.value,
+                    "approval_id": approval_id,
+                }
+            )
 
-                    await self.audit.log_tool_execution(
-                        session_id,
-                        tool_name,
-                        tool_params,
-                        str(result),
-                        execution_time_ms,
+            if decision is None:
+                await self.audit.log_tool_rejection(
+                    session_id, tool_name, tool_params, "rejected"
+                )
+                yield {"type": "tool_rejected", "tool": tool_name}
+                messages.append(
+                    ChatMessage(
+                        role="assistant",
+                        content=t("orch.user_rejected", tool=tool_name),
                     )
+                )
+                return
 
-                    yield {
-                        "type": "tool_result",
-                        "tool": tool_name,
-                        "result": result,
-                        "execution_time_ms": execution_time_ms,
-                    }
-
-                    # Add result to messages for next LLM call
-                    messages.append(
-                        ChatMessage(
-                            role="assistant",
-                            content=f"Tool {tool_name} executed. Result: {str(result)[:500]}",
-                        )
-                    )
+            # Grant permission
+            await self.permissions.grant_permission(
+                session_id, tool_name, tool_params, decision
+            )
+            await self.audit.log_tool_approval(
+                session_id, tool_name, tool_params, decision.value
+            )
 
-                except ToolExecutionError as e:
-                    await self.audit.log_tool_failure(
-                        session_id, tool_name, tool_params, str(e)
-                    )
-                    yield {"type": "tool_error", "tool": tool_name, "error": str(e)}
-                    messages.append(
-                        ChatMessage(
-                            role="assistant",
-                            content=f"Tool {tool_name} failed: {str(e)}",
-                        )
-                    )
+        admitted.append(_ToolRun(tool_call, auto_approved=False))
+
+    async def _run_tool(
+        self, tool_call: ToolCall, semaphore: Optional[asyncio.Semaphore] = None
+    ) -> _ToolOutcome:
+        """Execute a tool; timing starts once a concurrency slot is acquired"""
+        if semaphore is not None:
+            async with semaphore:
+                return await self._run_tool(tool_call)
+
+        # Pass db_session for memory tools
+        start_time = time.time()
+        try:
+            result = await execute_tool(
+                tool_call.name, tool_call.parameters, db_session=self.audit.db
+            )
+            return _ToolOutcome(
+                result=result, execution_time_ms=int((time.time() - start_time) * 1000)
+            )
+        except Exception as e:
+            return _ToolOutcome(
+                error=e, execution_time_ms=int((time.time() - start_time) * 1000)
+            )
 
-                except Exception as e:
-                    logger.exception(f"Unexpected error executing {tool_name}")
-                    await self.audit.log_tool_failure(
-                        session_id, tool_name, tool_params, str(e)
-                    )
-                    yield {
-                        "type": "tool_error",
-                        "tool": tool_name,
-                        "error": f"Unexpected error: {str(e)}",
-                    }
+    async def _finish_tool_call(
+        self,
+        session_id: str,
+        run: _ToolRun,
+        outcome: _ToolOutcome,
+        messages: list[ChatMessage],
+    ) -> AsyncGenerator[dict, None]:
+        """Audit-log an execution outcome and turn it into events/messages"""
+        tool_name = run.tool_call.name
+        tool_params = run.tool_call.parameters
+        e = outcome.error
+
+        if e is None:
+            result = outcome.result
+            await self.audit.log_tool_execution(
+                session_id,
+                tool_name,
+                tool_params,
+                str(result),
+                outcome.execution_time_ms,
+            )
 
-            # If we had partial text response, yield it
-            if response.content:
-                yield {"type": "text", "content": response.content}
+            yield {
+                "type": "tool_result",
+                "tool": tool_name,
+                "result": result,
+                "execution_time_ms": outcome.execution_time_ms,
+            }
+
+            # Add result to messages for next LLM call
+            messages.append(
+                ChatMessage(
+                    role="assistant",
+                    content=f"Tool {tool_name} executed. Result: {str(result)[:500]}",
+                )
+            )
+            return
 
-        # Max iterations reached
-        yield {"type": "warning", "message": "Maximum tool iterations reached"}
-        yield {"type": "done"}
+        if run.auto_approved or isinstance(e, ToolExecutionError):
+            if run.auto_approved:
+                logger.error(f"Error executing auto-approved {tool_name}", exc_info=e)
+            await self.audit.log_tool_failure(
+                session_id, tool_name, tool_params, str(e)
+            )
+            yield {"type": "tool_error", "tool": tool_name, "error": str(e)}
+            messages.append(
+                ChatMessage(
+                    role="assistant",
+                    content=f"Tool {tool_name} failed: {str(e)}",
+                )
+            )
+            return
+
+        logger.error(f"Unexpected error executing {tool_name}", exc_info=e)
+        await self.audit.log_tool_failure(session_id, tool_name, tool_params, str(e))
+        yield {
+            "type": "tool_error",
+            "tool": tool_name,
+            "error": f"Unexpected error: {str(e)}",
+        }
@@ -3,10 +3,12 @@ Axon by NeuroVexon - Permission Manager
 """
 
 from enum import Enum
-from typing import Dict, Set, Optional
+from typing import Dict, Optional
 import hashlib
 import logging
 
+from .approval_bus import ApprovalBackend, InMemoryApprovalBackend, approval_backend
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,11 +21,9 @@ class PermissionScope(str, Enum):
 class PermissionManager:
     """Manages tool execution permissions"""
 
-    def __init__(self):
-        # Session-based permissions: session_id -> set of permission keys
-        self._session_permissions: Dict[str, Set[str]] = {}
-        # Blocked patterns: set of permission keys that are permanently blocked
-        self._blocked: Set[str] = set()
+    def __init__(self, backend: Optional[ApprovalBackend] = None):
+        # Session grants and blocklist (shared across workers with APPROVAL_BACKEND=sqlite)
+        self.backend = backend or InMemoryApprovalBackend()
         # Pending approvals: approval_id -> approval request
         self._pending: Dict[str, dict] = {}
 
@@ -37,30 +37,20 @@ class PermissionManager:
         """Create a key for tool-level permission"""
         return hashlib.sha256(f"tool:{tool}".encode()).hexdigest()[:16]
 
-    def check_permission(self, session_id: str, tool: str, params: dict) -> bool:
+    async def check_permission(self, session_id: str, tool: str, params: dict) -> bool:
         """Check if permission exists for this tool call"""
         # Check if blocked
         exact_key = self._create_permission_key(tool, params)
         tool_key = self._create_tool_key(tool)
 
-        if exact_key in self._blocked or tool_key in self._blocked:
+        if await self.backend.is_blocked([exact_key, tool_key]):
             logger.info(f"Tool {tool} is blocked")
             return False
 
-        # Check session permissions
-        session_perms = self._session_permissions.get(session_id, set())
-
-        # Check exact match first
-        if exact_key in session_perms:
-            return True
-
-        # Check tool-level permission
-        if tool_key in session_perms:
-            return True
-
-        return False
+        # Check session permissions (exact call or tool-level)
+        return await self.backend.has_grant(session_id, [exact_key, tool_key])
 
-    def grant_permission(
+    async def grant_permission(
         self, session_id: str, tool: str, params: dict, scope: PermissionScope
     ) -> None:
         """Grant permission for a tool call"""
@@ -69,24 +59,20 @@ class PermissionManager:
 
         if scope == PermissionScope.NEVER:
             # Block this exact call
-            self._blocked.add(exact_key)
+            await self.backend.add_block(exact_key)
             logger.info(f"Blocked tool call: {tool}")
 
         elif scope == PermissionScope.SESSION:
             # Grant for entire session (tool-level)
-            if session_id not in self._session_permissions:
-                self._session_permissions[session_id] = set()
-            self._session_permissions[session_id].add(tool_key)
+            await self.backend.add_grant(session_id, tool_key)
             logger.info(f"Granted session permission for {tool}")
 
         elif scope == PermissionScope.ONCE:
             # One-time: add exact key temporarily
-            if session_id not in self._session_permissions:
-                self._session_permissions[session_id] = set()
-            self._session_permissions[session_id].add(exact_key)
+            await self.backend.add_grant(session_id, exact_key)
             logger.info(f"Granted one-time permission for {tool}")
 
-    def revoke_permission(
+    async def revoke_permission(
         self, session_id: str, tool: str, params: Optional[dict] = None
     ) -> None:
         """Revoke a specific permission"""
@@ -95,27 +81,26 @@ class PermissionManager:
         else:
             key = self._create_tool_key(tool)
 
-        if session_id in self._session_permissions:
-            self._session_permissions[session_id].discard(key)
+        await self.backend.remove_grant(session_id, key)
 
-    def revoke_session(self, session_id: str) -> None:
+    async def revoke_session(self, session_id: str) -> None:
         """Revoke all permissions for a session"""
-        self._session_permissions.pop(session_id, None)
+        await self.backend.clear_session(session_id)
         logger.info(f"Revoked all permissions for session {session_id}")
 
-    def is_blocked(self, tool: str, params: dict) -> bool:
+    async def is_blocked(self, tool: str, params: dict) -> bool:
         """Check if a tool call is explicitly blocked"""
         exact_key = self._create_permission_key(tool, params)
         tool_key = self._create_tool_key(tool)
-        return exact_key in self._blocked or tool_key in self._blocked
+        return await self.backend.is_blocked([exact_key, tool_key])
 
-    def unblock(self, tool: str, params: Optional[dict] = None) -> None:
+    async def unblock(self, tool: str, params: Optional[dict] = None) -> None:
         """Remove a tool from the blocklist"""
         if params:
             key = self._create_permission_key(tool, params)
         else:
             key = self._create_tool_key(tool)
-        self._blocked.discard(key)
+        await self.backend.remove_block(key)
 
     def create_approval_request(
         self,
@@ -149,10 +134,10 @@ class PermissionManager:
         """Remove and return a pending approval"""
         return self._pending.pop(approval_id, None)
 
-    def get_session_permissions(self, session_id: str) -> list[str]:
+    async def get_session_permissions(self, session_id: str) -> list[str]:
         """Get all permissions for a session (for debugging)"""
-        return list(self._session_permissions.get(session_id, set()))
+        return await self.backend.session_grants(session_id)
 
 
 # Global instance
-permission_manager = PermissionManager()
+permission_manager = PermissionManager(approval_backend)
@@ -2,45 +2,163 @@
 Axon by NeuroVexon - Task Scheduler
 
 Proaktive Aufgaben mit Cron-Ausdruecken und Approval-Gate.
-Sicherheit: Max 10 aktive Tasks, Timeout 5 Min, max 1/min pro Task.
+
+- sync_tasks() gleicht DB und registrierte Jobs ab und aendert nur, was
+  sich geaendert hat (neu, Cron geaendert, deaktiviert/geloescht)
+- Ausfuehrungen laufen ueber einen begrenzten Pool (SCHEDULER_MAX_CONCURRENT)
+  mit Limits pro LLM-Provider (SCHEDULER_PROVIDER_CONCURRENCY). Erst der
+  Provider-Slot, dann der globale: ein Lauf, der auf einen ausgelasteten
+  Provider wartet, blockiert keinen globalen Slot
+- Zufaelliger Versatz pro Lauf (SCHEDULER_JITTER_SECONDS), damit hunderte
+  Tasks mit "0 * * * *" nicht gleichzeitig starten
+- Ein Task laeuft nie doppelt: ueberlappende Laeufe werden uebersprungen
+- Jeder Lauf landet in task_runs (Dauer, Tokens, Status)
+- Mit mehreren Uvicorn-Workern plant nur ein Worker (LeaderLock auf
+  SCHEDULER_LOCK_PATH); er uebernimmt Aenderungen anderer Worker alle
+  SCHEDULER_SYNC_SECONDS aus der DB
+
+Sicherheit: Timeout 5 Min pro Lauf, max. SCHEDULER_MAX_ACTIVE_TASKS Tasks.
 """
 
 import asyncio
 import logging
+import os
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Optional
 
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy import select
 
-from db.models import ScheduledTask
+from db.models import ScheduledTask, TaskRun
 from llm.router import llm_router
-from llm.provider import ChatMessage
-from core.config import LLMProvider
+from llm.provider import ChatMessage, LLMResponse
+from core.config import LLMProvider, settings
 from core.i18n import t, set_language
+from core.settings_cache import SettingsSnapshot, configure_llm_router
 
 logger = logging.getLogger(__name__)
 
 # Safety limits
-MAX_ACTIVE_TASKS = 10
+MAX_ACTIVE_TASKS = settings.scheduler_max_active_tasks
 TASK_TIMEOUT_SECONDS = 300  # 5 Minuten
 MAX_RESULT_LENGTH = 5000
 
 
+def parse_provider_limits(spec: str) -> dict[str, int]:
+    """'ollama=1,claude=4' -> {'ollama': 1, 'claude': 4}"""
+    limits = {}
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        name = name.strip().lower()
+        if not name:
+            continue
+        try:
+            limits[name] = max(1, int(value))
+        except ValueError:
+            logger.warning(f"Ungueltiges Provider-Limit ignoriert: '{part.strip()}'")
+    return limits
+
+
+def _job_id(task_id: str) -> str:
+    return f"task_{task_id}"
+
+
+_SYNC_JOB_ID = "sync_tasks"
+
+
+class LeaderLock:
+    """
+    Exclusive, non-blocking lock on a file: held by exactly one worker
+    process on the host, released by the OS when that process dies
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle = None
+
+    def acquire(self) -> bool:
+        if self._handle is not None:
+            return True
+        try:
+            import fcntl
+        except ImportError:  # Windows: no fcntl, run a single worker
+            return True
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        handle = open(self.path, "a")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._handle = handle
+        return True
+
+    def release(self) -> None:
+        if self._handle is not None:
+            self._handle.close()  # Closing the file releases the lock
+            self._handle = None
+
+
 class TaskScheduler:
     """Verwaltet und fuehrt geplante Tasks aus"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        session_factory=None,
+        max_concurrent: int = 4,
+        provider_limits: Optional[dict[str, int]] = None,
+        default_provider_limit: int = 2,
+        jitter_seconds: int = 0,
+    ):
         self.scheduler = AsyncIOScheduler()
         self._running = False
-
-    def start(self):
-        """Scheduler starten"""
+        # False in workers that do not hold the LeaderLock: they plan nothing
+        self.leader = True
+        self._session_factory = session_factory
+        self.jitter_seconds = jitter_seconds
+        # task_id -> cron expression of the registered job
+        self._jobs: dict[str, str] = {}
+        self._sync_lock = asyncio.Lock()
+        # Worker pool: total slots plus one semaphore per provider
+        self._slots = asyncio.Semaphore(max(1, max_concurrent))
+        self._provider_limits = provider_limits or {}
+        self._default_provider_limit = max(1, default_provider_limit)
+        self._provider_slots: dict[str, asyncio.Semaphore] = {}
+        # Tasks queued or running (overlap prevention)
+        self._active: set[str] = set()
+
+    def _session(self):
+        if self._session_factory is None:
+            from db.database import async_session
+
+            self._session_factory = async_session
+        return self._session_factory()
+
+    def start(self, sync_interval: float = 0):
+        """Scheduler starten; sync_interval > 0 gleicht periodisch mit der DB ab"""
         if not self._running:
             self.scheduler.start()
             self._running = True
+            if sync_interval > 0:
+                self.add_interval_job(self.sync_tasks, sync_interval, _SYNC_JOB_ID)
             logger.info("TaskScheduler gestartet")
 
+    def add_interval_job(self, func, seconds: float, job_id: str) -> None:
+        """Periodic maintenance job next to the tasks (leader only)"""
+        self.scheduler.add_job(
+            func,
+            "interval",
+            seconds=seconds,
+            id=job_id,
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+        )
+
     def stop(self):
         """Scheduler stoppen"""
         if self._running:
@@ -48,116 +166,226 @@ class TaskScheduler:
             self._running = False
             logger.info("TaskScheduler gestoppt")
 
-    async def sync_tasks(self):
-        """Tasks aus DB laden und Scheduler synchronisieren"""
-        from db.database import async_session
+    def _trigger(self, cron_expression: str) -> CronTrigger:
+        trigger = CronTrigger.from_crontab(cron_expression)
+        if self.jitter_seconds > 0:
+            trigger.jitter = self.jitter_seconds
+        return trigger
 
-        async with async_session() as db:
-            result = await db.execute(
-                select(ScheduledTask).where(ScheduledTask.enabled)
-            )
-            tasks = result.scalars().all()
-
-            # Alle bestehenden Jobs entfernen
-            existing_jobs = {job.id for job in self.scheduler.get_jobs()}
-            for job_id in existing_jobs:
-                if job_id.startswith("task_"):
-                    self.scheduler.remove_job(job_id)
+    def _remove_job(self, task_id: str) -> None:
+        self._jobs.pop(task_id, None)
+        try:
+            self.scheduler.remove_job(_job_id(task_id))
+        except JobLookupError:
+            pass
+
+    async def sync_tasks(self) -> dict:
+        """Registrierte Jobs mit der DB abgleichen; nur Aenderungen anwenden"""
+        if not self.leader:
+            # Planned by the leader worker on its next periodic sync
+            return {"added": 0, "changed": 0, "removed": 0}
+        async with self._sync_lock:
+            async with self._session() as db:
+                result = await db.execute(
+                    select(
+                        ScheduledTask.id,
+                        ScheduledTask.name,
+                        ScheduledTask.cron_expression,
+                    )
+                    .where(ScheduledTask.enabled)
+                    .order_by(ScheduledTask.created_at)
+                    .limit(MAX_ACTIVE_TASKS + 1)
+                )
+                rows = result.all()
 
-            # Safety: Max 10 Tasks
-            active_tasks = tasks[:MAX_ACTIVE_TASKS]
-            if len(tasks) > MAX_ACTIVE_TASKS:
+            if len(rows) > MAX_ACTIVE_TASKS:
                 logger.warning(
-                    f"Zu viele Tasks ({len(tasks)}), nur die ersten {MAX_ACTIVE_TASKS} werden geplant"
+                    f"Zu viele Tasks, nur die ersten {MAX_ACTIVE_TASKS} werden geplant"
                 )
-
-            for task in active_tasks:
+                rows = rows[:MAX_ACTIVE_TASKS]
+
+            wanted = {row.id for row in rows}
+            removed = [task_id for task_id in self._jobs if task_id not in wanted]
+            for task_id in removed:
+                self._remove_job(task_id)
+
+            added = changed = 0
+            for row in rows:
+                registered = self._jobs.get(row.id)
+                if registered == row.cron_expression:
+                    continue
                 try:
-                    trigger = CronTrigger.from_crontab(task.cron_expression)
+                    trigger = self._trigger(row.cron_expression)
+                except Exception as e:
+                    logger.error(f"Fehler beim Planen von Task '{row.name}': {e}")
+                    if registered is not None:
+                        self._remove_job(row.id)
+                        removed.append(row.id)
+                    continue
+
+                if registered is None:
                     self.scheduler.add_job(
                         self._execute_task,
                         trigger=trigger,
-                        id=f"task_{task.id}",
-                        args=[task.id],
+                        id=_job_id(row.id),
+                        args=[row.id],
                         replace_existing=True,
                         misfire_grace_time=60,
+                        coalesce=True,
+                        max_instances=1,
                     )
-                    logger.info(f"Task '{task.name}' geplant: {task.cron_expression}")
-                except Exception as e:
-                    logger.error(f"Fehler beim Planen von Task '{task.name}': {e}")
-
-    async def _execute_task(self, task_id: str):
-        """Task ausfuehren (wird vom Scheduler aufgerufen)"""
-        from db.database import async_session
-
-        async with async_session() as db:
+                    added += 1
+                else:
+                    self.scheduler.reschedule_job(_job_id(row.id), trigger=trigger)
+                    changed += 1
+                self._jobs[row.id] = row.cron_expression
+                logger.info(f"Task '{row.name}' geplant: {row.cron_expression}")
+
+            if added or changed or removed:
+                logger.info(
+                    f"Scheduler-Sync: {added} neu, {changed} geaendert, "
+                    f"{len(removed)} entfernt ({len(self._jobs)} aktiv)"
+                )
+            return {"added": added, "changed": changed, "removed": len(removed)}
+
+    @asynccontextmanager
+    async def _provider_slot(self, provider: str):
+        slots = self._provider_slots.get(provider)
+        if slots is None:
+            limit = self._provider_limits.get(provider, self._default_provider_limit)
+            slots = self._provider_slots[provider] = asyncio.Semaphore(limit)
+        async with slots:
+            yield
+
+    async def _execute_task(self, task_id: str, trigger: str = "schedule") -> bool:
+        """Task ausfuehren (wird vom Scheduler aufgerufen); False = uebersprungen"""
+        if task_id in self._active:
+            logger.warning(f"Task {task_id} laeuft noch — Lauf uebersprungen")
+            await self._record_skipped(task_id, trigger)
+            return False
+
+        self._active.add(task_id)
+        try:
+            # One snapshot per run: provider slot, language and LLM router
+            async with self._session() as db:
+                snapshot = await configure_llm_router(db)
+            provider_name = snapshot.get("llm_provider", "ollama")
+            async with self._provider_slot(provider_name):
+                async with self._slots:
+                    await self._run_task(task_id, trigger, snapshot)
+        finally:
+            self._active.discard(task_id)
+        return True
+
+    async def _run_task(
+        self, task_id: str, trigger: str, snapshot: SettingsSnapshot
+    ) -> None:
+        """Run a task with the settings snapshot loaded by _execute_task"""
+        provider_name = snapshot.get("llm_provider", "ollama")
+        async with self._session() as db:
             task = await db.get(ScheduledTask, task_id)
             if not task or not task.enabled:
                 return
 
-            # Load language from settings for scheduled context
-            from db.models import Settings as SettingsModel
-
-            lang_result = await db.execute(
-                select(SettingsModel).where(SettingsModel.key == "language")
-            )
-            lang_setting = lang_result.scalar_one_or_none()
-            set_language(lang_setting.value if lang_setting else "de")
+            set_language(snapshot.get("language") or "de")
 
+            # Both slots are held: started_at and duration exclude queueing
             logger.info(f"Fuehre Task '{task.name}' aus...")
             task.last_run = datetime.utcnow()
+            run = TaskRun(
+                task_id=task.id,
+                trigger=trigger,
+                provider=provider_name,
+                started_at=task.last_run,
+            )
+            start = time.monotonic()
 
             try:
-                result = await asyncio.wait_for(
-                    self._run_prompt(task, db), timeout=TASK_TIMEOUT_SECONDS
+                response = await asyncio.wait_for(
+                    self._run_prompt(task, provider_name),
+                    timeout=TASK_TIMEOUT_SECONDS,
                 )
-                task.last_result = (
-                    result[:MAX_RESULT_LENGTH] if result else t("scheduler.no_result")
-                )
-                logger.info(f"Task '{task.name}' erfolgreich")
+                if response is None:
+                    run.status = "error"
+                    result = t("scheduler.invalid_provider", provider=provider_name)
+                else:
+                    run.status = "success"
+                    run.input_tokens = response.input_tokens
+                    run.output_tokens = response.output_tokens
+                    result = response.content or t("scheduler.no_response")
+                    logger.info(f"Task '{task.name}' erfolgreich")
             except asyncio.TimeoutError:
-                task.last_result = t("scheduler.timeout", seconds=TASK_TIMEOUT_SECONDS)
+                run.status = "timeout"
+                result = t("scheduler.timeout", seconds=TASK_TIMEOUT_SECONDS)
                 logger.error(f"Task '{task.name}' Timeout")
             except Exception as e:
-                task.last_result = t("scheduler.error", error=str(e)[:500])
+                run.status = "error"
+                result = t("scheduler.error", error=str(e)[:500])
                 logger.error(f"Task '{task.name}' Fehler: {e}")
 
+            task.last_result = (
+                result[:MAX_RESULT_LENGTH] if result else t("scheduler.no_result")
+            )
+            run.result = task.last_result
+            run.duration_ms = int((time.monotonic() - start) * 1000)
+            db.add(run)
             await db.commit()
 
-    async def _run_prompt(self, task: ScheduledTask, db) -> str:
-        """Prompt an LLM senden und Antwort holen"""
-        # Load settings for LLM provider
-        from db.models import Settings as SettingsModel
-
-        result = await db.execute(select(SettingsModel))
-        db_settings = {s.key: s.value for s in result.scalars().all()}
-
-        current_provider = db_settings.get("llm_provider", "ollama")
-        llm_router.update_settings(db_settings)
+    async def _record_skipped(self, task_id: str, trigger: str) -> None:
+        async with self._session() as db:
+            if await db.get(ScheduledTask, task_id) is None:
+                return
+            db.add(
+                TaskRun(
+                    task_id=task_id,
+                    trigger=trigger,
+                    status="skipped",
+                    duration_ms=0,
+                    result=t("scheduler.already_running"),
+                )
+            )
+            await db.commit()
 
+    async def _run_prompt(
+        self, task: ScheduledTask, provider_name: str
+    ) -> Optional[LLMResponse]:
+        """Prompt an LLM senden; None bei ungueltigem Provider"""
         try:
-            provider = llm_router.get_provider(LLMProvider(current_provider))
+            provider = llm_router.get_provider(LLMProvider(provider_name))
         except ValueError:
-            return t("scheduler.invalid_provider", provider=current_provider)
+            return None
 
         messages = [
             ChatMessage(role="assistant", content=t("scheduler.intro", name=task.name)),
             ChatMessage(role="user", content=task.prompt),
         ]
-
-        response = await provider.chat(messages)
-        return response.content or t("scheduler.no_response")
+        return await provider.chat(messages)
 
     async def run_task_now(self, task_id: str) -> str:
         """Task sofort manuell ausfuehren"""
-        await self._execute_task(task_id)
+        if not await self._execute_task(task_id, trigger="manual"):
+            return t("scheduler.already_running")
 
-        from db.database import async_session
-
-        async with async_session() as db:
+        async with self._session() as db:
             task = await db.get(ScheduledTask, task_id)
             return task.last_result if task else t("scheduler.not_found")
 
+    def stats(self) -> dict:
+        return {
+            "leader": self.leader,
+            "jobs": len(self._jobs),
+            "active": len(self._active),
+            "provider_limits": {
+                name: self._provider_limits.get(name, self._default_provider_limit)
+                for name in self._provider_slots
+            },
+        }
+
 
 # Global instance
-task_scheduler = TaskScheduler()
+task_scheduler = TaskScheduler(
+    max_concurrent=settings.scheduler_max_concurrent,
+    provider_limits=parse_provider_limits(settings.scheduler_provider_concurrency),
+    default_provider_limit=settings.scheduler_default_provider_concurrency,
+    jitter_seconds=settings.scheduler_jitter_seconds,
+)
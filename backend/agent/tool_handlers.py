@@ -4,7 +4,6 @@ Axon by NeuroVexon - Tool Handlers
 
 import os
 import asyncio
-import httpx
 from pathlib import Path
 from typing import Any
 import logging
@@ -27,6 +26,11 @@ class ToolExecutionError(Exception):
     pass
 
 
+def uses_db_session(tool_name: str) -> bool:
+    """Tools that work on the caller's DB session (must not run concurrently)"""
+    return tool_name.startswith("memory_")
+
+
 async def execute_tool(tool_name: str, params: dict, db_session=None) -> Any:
     """Execute a tool and return the result"""
     handlers = {
@@ -45,7 +49,7 @@ async def execute_tool(tool_name: str, params: dict, db_session=None) -> Any:
     }
 
     # Memory tools need db_session
-    if tool_name.startswith("memory_") and db_session:
+    if uses_db_session(tool_name) and db_session:
         params["_db_session"] = db_session
 
     handler = handlers.get(tool_name)
@@ -165,17 +169,18 @@ async def handle_web_fetch(params: dict) -> str:
     if not validate_url(url):
         raise ToolExecutionError(f"Access denied: {url}")
 
+    # Pooled client, byte-capped streaming read, HTTP cache for GET
+    from agent.web_fetch import web_fetcher
+
     try:
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            response = await client.request(method, url)
-            return response.text[:10000]  # Truncate large responses
+        return await web_fetcher.fetch(url, method)
     except Exception as e:
         raise ToolExecutionError(f"Error fetching URL: {e}")
 
 
 async def handle_web_search(params: dict) -> list[dict]:
     """Search the web using DuckDuckGo (with lite fallback for rate limits)"""
-    import re as _re
+    from agent.web_search import web_search
 
     query = params.get("query")
     max_results = params.get("max_results", 5)
@@ -183,70 +188,13 @@ async def handle_web_search(params: dict) -> list[dict]:
     if not query:
         raise ToolExecutionError("Missing 'query' parameter")
 
-    # Try DDGS library first
     try:
-        from duckduckgo_search import DDGS
-
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=max_results))
-            if results:
-                return [
-                    {
-                        "title": r.get("title", ""),
-                        "url": r.get("href", ""),
-                        "snippet": r.get("body", ""),
-                    }
-                    for r in results
-                ]
-    except Exception as e:
-        logger.warning(f"DDGS library failed: {e}, falling back to lite")
-
-    # Fallback: DuckDuckGo HTML lite endpoint (bypasses API rate limits)
-    try:
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-            resp = await client.get(
-                "https://lite.duckduckgo.com/lite/",
-                params={"q": query},
-                headers={"User-Agent": "Mozilla/5.0 (compatible; Axon/1.1)"},
-            )
-            resp.raise_for_status()
-
-            results = []
-            # Find all result links — href may appear before or after class
-            links = _re.findall(
-                r"""<a[^>]*href=["']([^"']+)["'][^>]*class=.result-link[^>]*>(.+?)</a>""",
-                resp.text,
-                _re.DOTALL,
-            )
-            if not links:
-                # Try reverse order (class before href)
-                links = _re.findall(
-                    r"""<a[^>]*class=.result-link[^>]*href=["']([^"']+)["'][^>]*>(.+?)</a>""",
-                    resp.text,
-                    _re.DOTALL,
-                )
-            # Find all snippets
-            snippets = _re.findall(
-                r"""class=.result-snippet.[^>]*>(.+?)</td>""", resp.text, _re.DOTALL
-            )
-
-            for i, (url, title) in enumerate(links[:max_results]):
-                title = _re.sub(r"<[^>]+>", "", title).strip()
-                title = title.replace("&quot;", '"').replace("&amp;", "&")
-                snippet = ""
-                if i < len(snippets):
-                    snippet = _re.sub(r"<[^>]+>", "", snippets[i]).strip()
-                if title:
-                    results.append({"title": title, "url": url, "snippet": snippet})
-
-            if results:
-                return results
-
-        raise ToolExecutionError("No search results found")
-    except ToolExecutionError:
-        raise
+        results = await web_search.search(query, max_results)
     except Exception as e:
         raise ToolExecutionError(f"Search failed: {e}")
+    if not results:
+        raise ToolExecutionError("No search results found")
+    return results
 
 
 async def handle_shell_execute(params: dict) -> str:
@@ -3,7 +3,7 @@ Axon by NeuroVexon - Tool Registry
 """
 
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from pydantic import BaseModel
 from core.i18n import get_language
 
@@ -36,8 +36,12 @@ class ToolDefinition(BaseModel):
 class ToolRegistry:
     """Registry for all available tools"""
 
+    # Incremented on every register(); cached schemas belong to one version
+    version: int = 0
+
     def __init__(self):
         self._tools: Dict[str, ToolDefinition] = {}
+        self._schema_cache: Dict[Optional[frozenset], ToolSchema] = {}
         self._register_builtin_tools()
 
     def _register_builtin_tools(self):
@@ -308,8 +312,10 @@ class ToolRegistry:
         )
 
     def register(self, tool: ToolDefinition):
-        """Register a tool"""
+        """Register a tool (invalidates the cached LLM schemas)"""
         self._tools[tool.name] = tool
+        self.version += 1
+        self._schema_cache = {}
 
     def get(self, name: str) -> Optional[ToolDefinition]:
         """Get a tool by name"""
@@ -319,33 +325,67 @@ class ToolRegistry:
         """List all registered tools"""
         return list(self._tools.values())
 
-    def get_tools_for_llm(self) -> list[dict]:
-        """Format tools for LLM function calling (OpenAI format)"""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            k: {
-                                "type": v.get("type", "string"),
-                                "description": v.get("description", ""),
-                            }
-                            for k, v in tool.parameters.items()
-                        },
-                        "required": [
-                            k
-                            for k, v in tool.parameters.items()
-                            if v.get("required", False)
-                        ],
-                    },
+    def get_tools_for_llm(
+        self, allowed_tools: Optional[Iterable[str]] = None
+    ) -> "ToolSchema":
+        """
+        Format tools for LLM function calling (OpenAI format).
+
+        The result is cached per registry version and per allowed-tools set
+        (Agent.allowed_tools, None = all tools) and returned by reference —
+        callers must not modify it.
+        """
+        key = None if allowed_tools is None else frozenset(allowed_tools)
+        schema = self._schema_cache.get(key)
+        if schema is None:
+            schema = ToolSchema(
+                (
+                    _tool_to_openai(tool)
+                    for tool in self._tools.values()
+                    if key is None or tool.name in key
+                ),
+                version=self.version,
+            )
+            self._schema_cache[key] = schema
+        return schema
+
+
+def _tool_to_openai(tool: ToolDefinition) -> dict:
+    return {
+        "type": "function",
+        "function": {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    k: {
+                        "type": v.get("type", "string"),
+                        "description": v.get("description", ""),
+                    }
+                    for k, v in tool.parameters.items()
                 },
-            }
-            for tool in self._tools.values()
-        ]
+                "required": [
+                    k for k, v in tool.parameters.items() if v.get("required", False)
+                ],
+            },
+        },
+    }
+
+
+class ToolSchema(list):
+    """
+    Cached OpenAI-format tool list.
+
+    `converted` holds provider-specific forms (Claude, Gemini, ...), filled
+    lazily by the providers. A new registry version creates new ToolSchema
+    objects, so stale conversions are never reused.
+    """
+
+    def __init__(self, tools: Iterable[dict] = (), version: int = 0):
+        super().__init__(tools)
+        self.version = version
+        self.converted: Dict[str, Any] = {}
 
 
 # Global registry instance
@@ -0,0 +1,349 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Upload Extraction Jobs
+
+Text-Extraktion (PyMuPDF, CSV, JSON) laeuft nicht mehr auf dem Event Loop,
+sondern in einem begrenzten Prozess-Pool. Der Upload-Request kehrt sofort
+zurueck; der Client fragt den Job-Status ab (GET /upload/jobs/{id}) oder
+abonniert ihn per SSE (GET /upload/jobs/{id}/events).
+
+Ablauf eines Jobs: pending -> extracting -> indexing -> done | failed
+
+Extrahiert und eingebettet wird pro Inhalt (DocumentBlob, agent/blob_store.py):
+Ist der Blob schon indexiert, ist der Job sofort fertig (reused); laeuft fuer
+denselben Inhalt bereits ein Job, wartet der neue auf dessen Ergebnis.
+
+Der Job-Status wird zusaetzlich am Dokument gespeichert (extract_status), damit
+andere Uvicorn-Worker ihn abfragen koennen und /chat/agent auf laufende
+Uploads der Konversation warten kann (wait_for_conversation). Die Job-ID ist
+die Dokument-ID. Bleibt ein Job durch Neustart oder Absturz des Workers
+haengen, gilt er nach _STALE_AFTER als fehlgeschlagen (load, fail_stale).
+"""
+
+import asyncio
+import logging
+import time
+from calendar import timegm
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Callable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.models import DocumentBlob, UploadedDocument
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = ("done", "failed")
+_MAX_JOBS = 1000  # Aelteste abgeschlossene Jobs werden vergessen
+_WAIT_POLL = 0.25  # Sekunden zwischen zwei Status-Abfragen (Jobs anderer Worker)
+# Nicht abgeschlossene Jobs, die aelter sind, gelten als abgebrochen (Neustart)
+_STALE_AFTER = timedelta(minutes=10)
+_INTERRUPTED = "Verarbeitung abgebrochen (Server-Neustart)"
+
+_executor: Optional[Executor] = None
+
+
+def _get_executor() -> Optional[Executor]:
+    """Process pool for extraction (None = worker thread, UPLOAD_EXTRACT_WORKERS=0)"""
+    global _executor
+    if _executor is None and settings.upload_extract_workers > 0:
+        _executor = ProcessPoolExecutor(max_workers=settings.upload_extract_workers)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_extraction(file_path: str, mime_type: Optional[str]) -> str:
+    """extract_text off the event loop"""
+    from agent.document_handler import extract_text
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), extract_text, file_path, mime_type
+    )
+
+
+@dataclass
+class UploadJob:
+    id: str
+    document_id: str
+    filename: str
+    status: str = "pending"
+    error: Optional[str] = None
+    has_text: bool = False
+    text_preview: str = ""
+    chunks: int = 0
+    reused: bool = False  # Inhalt war bereits extrahiert und eingebettet
+    created_at: float = field(default_factory=time.time)
+    version: int = 0  # Incremented on every update
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    def to_dict(self) -> dict:
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if not f.name.startswith("_")
+        }
+
+    def update(self, **changes) -> None:
+        for key, value in changes.items():
+            setattr(self, key, value)
+        self.version += 1
+        # Wake current subscribers, later waits use a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, since: int, timeout: float) -> bool:
+        """Wait until version differs from since; False on timeout"""
+        if self.version != since:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+def _is_stale(created_at: datetime) -> bool:
+    return created_at < datetime.utcnow() - _STALE_AFTER
+
+
+class UploadJobRegistry:
+    """Tracks extraction jobs and runs them as background tasks"""
+
+    def __init__(self, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        self._session_factory = session_factory
+        self._jobs: OrderedDict[str, UploadJob] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+        # content hash -> running extraction, shared by concurrent jobs
+        self._blob_tasks: dict[str, asyncio.Task] = {}
+
+    def get(self, job_id: str) -> Optional[UploadJob]:
+        return self._jobs.get(job_id)
+
+    def start(
+        self, doc: UploadedDocument, file_path: str, mime_type: Optional[str]
+    ) -> UploadJob:
+        job = UploadJob(id=doc.id, document_id=doc.id, filename=doc.filename)
+        self._jobs[job.id] = job
+        self._evict()
+        task = asyncio.create_task(
+            self._run(job, doc.content_hash, file_path, mime_type, doc.conversation_id),
+            name=f"upload-job-{job.id}",
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def _evict(self) -> None:
+        while len(self._jobs) > _MAX_JOBS:
+            oldest = next(iter(self._jobs.values()))
+            if not oldest.finished:
+                break
+            self._jobs.popitem(last=False)
+
+    async def load(self, job_id: str) -> Optional[dict]:
+        """
+        Job status as returned by UploadJob.to_dict(), also for jobs running
+        in another worker (read from the document)
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        async with self._session_factory_or_default()() as db:
+            doc = await db.get(UploadedDocument, job_id)
+            if doc is None or doc.extract_status is None:
+                return None
+            blob = None
+            if doc.extract_status == "done" and doc.content_hash:
+                blob = await db.get(DocumentBlob, doc.content_hash)
+        status, error = doc.extract_status, doc.extract_error
+        if status not in TERMINAL_STATES and _is_stale(doc.created_at):
+            # The worker running it is gone; nothing will finish this job
+            status, error = "failed", _INTERRUPTED
+        extracted = blob.extracted_text if blob is not None else None
+        return {
+            "id": doc.id,
+            "document_id": doc.id,
+            "filename": doc.filename,
+            "status": status,
+            "error": error,
+            "has_text": bool(extracted and not extracted.startswith("[")),
+            "text_preview": extracted[:200] if extracted else "",
+            "chunks": blob.chunk_count if blob is not None else 0,
+            "reused": False,
+            "created_at": timegm(doc.created_at.utctimetuple()),
+            "version": 0,
+        }
+
+    async def fail_stale(self) -> int:
+        """Mark jobs left unfinished by a stopped worker as failed (startup)"""
+        async with self._session_factory_or_default()() as db:
+            result = await db.execute(
+                update(UploadedDocument)
+                .where(
+                    UploadedDocument.extract_status.notin_(TERMINAL_STATES),
+                    UploadedDocument.created_at < datetime.utcnow() - _STALE_AFTER,
+                )
+                .values(extract_status="failed", extract_error=_INTERRUPTED)
+            )
+            await db.commit()
+        if result.rowcount:
+            logger.warning(
+                f"{result.rowcount} abgebrochene Upload-Jobs als fehlgeschlagen markiert"
+            )
+        return result.rowcount
+
+    async def _pending_documents(self, conversation_id: str) -> list[str]:
+        since = datetime.utcnow() - _STALE_AFTER
+        async with self._session_factory_or_default()() as db:
+            result = await db.execute(
+                select(UploadedDocument.id).where(
+                    UploadedDocument.conversation_id == conversation_id,
+                    UploadedDocument.extract_status.notin_(TERMINAL_STATES),
+                    UploadedDocument.created_at >= since,
+                )
+            )
+            return list(result.scalars())
+
+    async def wait_for_conversation(self, conversation_id: str, timeout: float) -> bool:
+        """
+        Wait until the uploads of a conversation are extracted (in any
+        worker), at most timeout seconds. Returns True if there was anything
+        to wait for.
+        """
+        if timeout <= 0:
+            return False
+        deadline = time.monotonic() + timeout
+        waited = False
+        while True:
+            pending = await self._pending_documents(conversation_id)
+            remaining = deadline - time.monotonic()
+            if not pending:
+                return waited
+            if remaining <= 0:
+                logger.warning(
+                    f"Konversation {conversation_id}: {len(pending)} Upload(s) "
+                    f"nach {timeout:.0f}s noch nicht verarbeitet"
+                )
+                return waited
+            waited = True
+            local = [self._jobs[i] for i in pending if i in self._jobs]
+            if local:
+                # Own jobs wake us up directly, others are polled
+                await local[0].wait_for_change(local[0].version, min(remaining, 1.0))
+            else:
+                await asyncio.sleep(min(remaining, _WAIT_POLL))
+
+    async def wait_all(self) -> None:
+        """Wait for running jobs (tests, shutdown)"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _session_factory_or_default(self):
+        if self._session_factory is not None:
+            return self._session_factory
+        from db.database import async_session
+
+        return async_session
+
+    async def _update(self, job: UploadJob, **changes) -> None:
+        """Update the job and persist its status for other workers"""
+        if "status" in changes:
+            try:
+                async with self._session_factory_or_default()() as db:
+                    await db.execute(
+                        update(UploadedDocument)
+                        .where(UploadedDocument.id == job.document_id)
+                        .values(
+                            extract_status=changes["status"],
+                            extract_error=changes.get("error"),
+                        )
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"Upload-Job {job.id}: Status nicht gespeichert: {e}")
+        job.update(**changes)
+
+    async def _process_blob(
+        self, job: UploadJob, sha256: str, file_path: str, mime_type: Optional[str]
+    ) -> tuple[str, int, bool]:
+        """Extract and embed a blob once; returns (text, chunks, reused)"""
+        from agent.document_chunks import index_blob
+
+        session_factory = self._session_factory_or_default()
+        async with session_factory() as db:
+            blob = await db.get(DocumentBlob, sha256)
+            if blob is None:
+                raise RuntimeError("Dokument wurde waehrend der Extraktion geloescht")
+            if blob.indexed_at is not None:
+                return blob.extracted_text, blob.chunk_count, True
+
+        await self._update(job, status="extracting")
+        extracted = await run_extraction(file_path, mime_type)
+
+        await self._update(job, status="indexing")
+        async with session_factory() as db:
+            blob = await db.get(DocumentBlob, sha256)
+            if blob is None:
+                raise RuntimeError("Dokument wurde waehrend der Extraktion geloescht")
+            blob.extracted_text = extracted
+            chunks = await index_blob(db, blob)
+            blob.indexed_at = datetime.utcnow()
+            await db.commit()
+        return extracted, chunks, False
+
+    async def _run(
+        self,
+        job: UploadJob,
+        sha256: str,
+        file_path: str,
+        mime_type: Optional[str],
+        conversation_id: Optional[str],
+    ):
+        from agent.conversation_context import conversation_context_cache
+
+        try:
+            task = self._blob_tasks.get(sha256)
+            if task is None:
+                task = asyncio.create_task(
+                    self._process_blob(job, sha256, file_path, mime_type)
+                )
+                self._blob_tasks[sha256] = task
+                task.add_done_callback(lambda _: self._blob_tasks.pop(sha256, None))
+            else:
+                await self._update(job, status="extracting")
+            # shield: a cancelled job must not cancel the shared extraction
+            extracted, chunks, reused = await asyncio.shield(task)
+
+            conversation_context_cache.invalidate_documents(conversation_id)
+            await self._update(
+                job,
+                status="done",
+                has_text=bool(extracted and not extracted.startswith("[")),
+                text_preview=extracted[:200] if extracted else "",
+                chunks=chunks,
+                reused=reused,
+            )
+        except Exception as e:
+            logger.error(f"Upload-Job {job.id} ({job.filename}) fehlgeschlagen: {e}")
+            await self._update(job, status="failed", error=str(e)[:500])
+
+
+# Global singleton — used by the upload API
+upload_jobs = UploadJobRegistry()
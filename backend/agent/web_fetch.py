@@ -0,0 +1,402 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Web Fetch Service
+
+Gemeinsame HTTP-Schicht fuer das web_fetch Tool:
+
+- Ein langlebiger httpx.AsyncClient mit Connection-Pool statt eines Clients
+  pro Aufruf (geschlossen im FastAPI-Lifespan)
+- Der Body wird gestreamt und inkrementell dekodiert (Charset aus dem
+  Content-Type, BOM oder <meta charset>); gelesen wird nur bis
+  WEB_FETCH_MAX_CHARS Zeichen bzw. WEB_FETCH_MAX_BYTES Bytes
+- HTTP-Cache in SQLite auf Disk: frische Antworten (Cache-Control max-age,
+  Expires, heuristisch ueber Last-Modified) kommen ohne Netzwerk, abgelaufene
+  werden per If-None-Match / If-Modified-Since revalidiert (304 = Treffer).
+  Die SQLite-Zugriffe laufen per asyncio.to_thread (aget/aput), nicht auf
+  dem Event-Loop
+
+Gecacht werden nur GET-Antworten mit Status 200 ohne `no-store`.
+"""
+
+import asyncio
+import codecs
+import email.utils
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (compatible; Axon/2.0)"
+_SNIFF_BYTES = 2048  # Bytes fuer BOM / <meta charset> vor dem Dekodieren
+_HEURISTIC_MAX = 86400  # Heuristische Frische hoechstens 1 Tag
+_PRUNE_EVERY = 200  # Disk-Cache nach so vielen Inserts kuerzen
+
+_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(
+    rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE
+)
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _valid_codec(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.decode() if isinstance(name, bytes) else name).name
+    except (LookupError, UnicodeDecodeError):
+        return None
+
+
+def detect_charset(content_type: str, head: bytes) -> str:
+    """Charset from the Content-Type header, a BOM or <meta charset>; else UTF-8"""
+    match = _CHARSET_RE.search(content_type or "")
+    charset = _valid_codec(match.group(1)) if match else None
+    if charset:
+        return charset
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return name
+    if "html" in (content_type or "") or head.lstrip()[:1] == b"<":
+        meta = _META_CHARSET_RE.search(head)
+        charset = _valid_codec(meta.group(1)) if meta else None
+        if charset:
+            return charset
+    return "utf-8"
+
+
+def _parse_cache_control(value: str) -> dict[str, Optional[str]]:
+    directives = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_lifetime(headers: httpx.Headers, now: float) -> Optional[float]:
+    """
+    Seconds the response may be served without revalidation.
+    None = must not be stored (no-store).
+    """
+    cc = _parse_cache_control(headers.get("cache-control", ""))
+    if "no-store" in cc:
+        return None
+    if "no-cache" in cc:
+        return 0.0
+    age_header = headers.get("age", "")
+    age = int(age_header) if age_header.isdigit() else 0
+    if cc.get("max-age") and cc["max-age"].isdigit():
+        return max(0.0, int(cc["max-age"]) - age)
+    date = _http_date(headers.get("date")) or now
+    expires = _http_date(headers.get("expires"))
+    if headers.get("expires") is not None:
+        return max(0.0, (expires or 0) - date)
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        # RFC 9111 heuristic: 10% of the time since the last change
+        return min(_HEURISTIC_MAX, max(0.0, (date - last_modified) * 0.1))
+    return float(settings.web_fetch_cache_default_ttl)
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status: int
+    content_type: str
+    text: str
+    complete: bool  # False = body was cut at max_chars/max_bytes
+    max_chars: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fresh_until: float
+
+
+class HttpCache:
+    """On-disk (SQLite) store of decoded web_fetch responses"""
+
+    def __init__(self, path: Optional[str], max_entries: int = 5000):
+        self.path = path or None
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._inserts_since_prune = 0
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is None:
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, data TEXT NOT NULL, "
+                    "stored_at REAL NOT NULL)"
+                )
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"Web-Cache auf Disk deaktiviert ({self.path}): {e}")
+                self.path = None
+                return None
+        return self._conn
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        try:
+            with self._lock:
+                conn = self._db()
+                if conn is None:
+                    return None
+                row = conn.execute(
+                    "SELECT data FROM responses WHERE key = ?", (self._key(url),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Web-Cache: Lesen fehlgeschlagen: {e}")
+            return None
+        if row is None:
+            return None
+        try:
+            return CachedResponse(**json.loads(row[0]))
+        except (TypeError, ValueError):
+            return None
+
+    async def aget(self, url: str) -> Optional[CachedResponse]:
+        """get() in a worker thread"""
+        return await asyncio.to_thread(self.get, url)
+
+    def put(self, entry: CachedResponse) -> None:
+        try:
+            with self._lock:
+                conn = self._db()
+                if conn is None:
+                    return
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, data, stored_at) "
+                    "VALUES (?, ?, ?)",
+                    (self._key(entry.url), json.dumps(entry.__dict__), time.time()),
+                )
+                conn.commit()
+                self._inserts_since_prune += 1
+                if self._inserts_since_prune >= _PRUNE_EVERY:
+                    self._inserts_since_prune = 0
+                    conn.execute(
+                        "DELETE FROM responses WHERE key IN (SELECT key FROM "
+                        "responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,),
+                    )
+                    conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Web-Cache: Schreiben fehlgeschlagen: {e}")
+
+    async def aput(self, entry: CachedResponse) -> None:
+        """put() (including the periodic prune) in a worker thread"""
+        await asyncio.to_thread(self.put, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._db()
+            if conn is not None:
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class WebFetcher:
+    """Pooled, byte-capped, cached HTTP fetches for web_fetch"""
+
+    def __init__(
+        self,
+        cache: Optional[HttpCache] = None,
+        max_chars: int = 10000,
+        max_bytes: int = 1_000_000,
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.cache = cache
+        self.max_chars = max_chars
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        # Metrics
+        self.hits = 0  # Fresh from cache, no request
+        self.revalidated = 0  # 304 Not Modified
+        self.misses = 0
+        self.bytes_read = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                headers={"User-Agent": USER_AGENT},
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self.cache is not None:
+            self.cache.close()
+
+    async def fetch(self, url: str, method: str = "GET") -> str:
+        """Decoded body (at most max_chars characters), from cache where allowed"""
+        method = method.upper()
+        cached = None
+        if method == "GET" and self.cache is not None:
+            cached = await self.cache.aget(url)
+            if cached is not None and not self._usable(cached):
+                cached = None
+            if cached is not None and cached.fresh_until > time.time():
+                self.hits += 1
+                return cached.text
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        client = self._get_client()
+        async with client.stream(method, url, headers=headers) as response:
+            now = time.time()
+            if response.status_code == 304 and cached is not None:
+                self.revalidated += 1
+                lifetime = freshness_lifetime(response.headers, now)
+                if lifetime is not None:
+                    cached.fresh_until = now + lifetime
+                    cached.etag = response.headers.get("etag", cached.etag)
+                    await self.cache.aput(cached)
+                return cached.text
+
+            self.misses += 1
+            text, complete = await self._read_text(response)
+
+        if method == "GET" and self.cache is not None and response.status_code == 200:
+            lifetime = freshness_lifetime(response.headers, now)
+            if lifetime is not None:
+                await self.cache.aput(
+                    CachedResponse(
+                        url=url,
+                        status=response.status_code,
+                        content_type=response.headers.get("content-type", ""),
+                        text=text,
+                        complete=complete,
+                        max_chars=self.max_chars,
+                        etag=response.headers.get("etag"),
+                        last_modified=response.headers.get("last-modified"),
+                        fresh_until=now + lifetime,
+                    )
+                )
+        return text
+
+    def _usable(self, cached: CachedResponse) -> bool:
+        """A cut-off body only serves requests that want at most as much text"""
+        return cached.complete or cached.max_chars >= self.max_chars
+
+    async def _read_text(self, response: httpx.Response) -> tuple[str, bool]:
+        """Stream and decode the body until max_chars / max_bytes; (text, complete)"""
+        content_type = response.headers.get("content-type", "")
+        head = b""
+        decoder = None
+        parts: list[str] = []
+        chars = 0
+        read = 0
+        complete = True
+
+        async for chunk in response.aiter_bytes():
+            read += len(chunk)
+            if decoder is None:
+                head += chunk
+                if len(head) < _SNIFF_BYTES:
+                    continue
+                chunk, head = head, b""
+                decoder = codecs.getincrementaldecoder(
+                    detect_charset(content_type, chunk)
+                )(errors="replace")
+            text = decoder.decode(chunk)
+            parts.append(text)
+            chars += len(text)
+            if chars >= self.max_chars or read >= self.max_bytes:
+                complete = False
+                break
+
+        if decoder is None:  # Short body: everything is still in head
+            decoder = codecs.getincrementaldecoder(detect_charset(content_type, head))(
+                errors="replace"
+            )
+            parts.append(decoder.decode(head, final=True))
+        elif complete:
+            parts.append(decoder.decode(b"", final=True))
+
+        self.bytes_read += read
+        return "".join(parts)[: self.max_chars], complete
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_rate": (
+                round((self.hits + self.revalidated) / lookups, 3) if lookups else None
+            ),
+            "bytes_read": self.bytes_read,
+        }
+
+
+# Global singleton — used by the web_fetch tool
+web_fetcher = WebFetcher(
+    cache=HttpCache(
+        settings.web_fetch_cache_path, settings.web_fetch_cache_max_entries
+    ),
+    max_chars=settings.web_fetch_max_chars,
+    max_bytes=settings.web_fetch_max_bytes,
+    timeout=settings.web_fetch_timeout,
+    max_connections=settings.web_fetch_max_connections,
+)
@@ -0,0 +1,200 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Web Search Service
+
+Suchschicht fuer das web_search Tool:
+
+- Der synchrone DDGS-Client laeuft in einem Worker-Thread statt auf dem
+  Event Loop; Fallback ist der DuckDuckGo-Lite-Endpunkt (vorkompilierte
+  Regex, ein langlebiger httpx-Client)
+- Ergebnisse werden pro normalisierter Query (Kleinschreibung, Leerzeichen)
+  und max_results mit TTL gecacht (LRU, WEB_SEARCH_CACHE_TTL)
+- Gleichzeitige identische Suchen (mehrere Sessions, Scheduler) teilen sich
+  eine Upstream-Anfrage
+- Metriken ueber stats() (GET /analytics/caches)
+
+Hinweis: Cache und Coalescing gelten pro Prozess (ein Uvicorn-Worker).
+"""
+
+import asyncio
+import html
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LITE_URL = "https://lite.duckduckgo.com/lite/"
+USER_AGENT = "Mozilla/5.0 (compatible; Axon/1.1)"
+
+# Result links — href may appear before or after class
+_LINK_RE = re.compile(
+    r"""<a[^>]*href=["']([^"']+)["'][^>]*class=.result-link[^>]*>(.+?)</a>""",
+    re.DOTALL,
+)
+_LINK_REVERSED_RE = re.compile(
+    r"""<a[^>]*class=.result-link[^>]*href=["']([^"']+)["'][^>]*>(.+?)</a>""",
+    re.DOTALL,
+)
+_SNIPPET_RE = re.compile(r"""class=.result-snippet.[^>]*>(.+?)</td>""", re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+_Key = tuple[str, int]  # (normalized query, max_results)
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: case-folded, whitespace collapsed"""
+    return _SPACE_RE.sub(" ", query).strip().casefold()
+
+
+def _ddgs_text(query: str, max_results: int) -> list[dict]:
+    """Blocking DDGS search (runs in a worker thread)"""
+    from duckduckgo_search import DDGS
+
+    with DDGS() as ddgs:
+        return [
+            {
+                "title": r.get("title", ""),
+                "url": r.get("href", ""),
+                "snippet": r.get("body", ""),
+            }
+            for r in ddgs.text(query, max_results=max_results)
+        ]
+
+
+def parse_lite_results(page: str, max_results: int) -> list[dict]:
+    """Results from the DuckDuckGo lite HTML page"""
+    links = _LINK_RE.findall(page) or _LINK_REVERSED_RE.findall(page)
+    snippets = _SNIPPET_RE.findall(page)
+    results = []
+    for i, (url, title) in enumerate(links[:max_results]):
+        title = html.unescape(_TAG_RE.sub("", title)).strip()
+        snippet = ""
+        if i < len(snippets):
+            snippet = html.unescape(_TAG_RE.sub("", snippets[i])).strip()
+        if title:
+            results.append({"title": title, "url": url, "snippet": snippet})
+    return results
+
+
+class WebSearchService:
+    """Cached, coalesced DuckDuckGo search"""
+
+    def __init__(self, ttl: float = 900, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: OrderedDict[_Key, tuple[float, list[dict]]] = OrderedDict()
+        self._inflight: dict[_Key, asyncio.Task] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_errors = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=15.0,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_cached(self, key: _Key) -> Optional[list[dict]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, results = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return results
+
+    def _put(self, key: _Key, results: list[dict]) -> None:
+        if self.ttl <= 0 or not results:
+            return
+        self._cache[key] = (time.monotonic() + self.ttl, results)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def search(self, query: str, max_results: int = 5) -> list[dict]:
+        """Search results (empty list = nothing found); raises on upstream errors"""
+        key = (normalize_query(query), max_results)
+        cached = self._get_cached(key)
+        if cached is not None:
+            self.hits += 1
+            return [dict(r) for r in cached]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._fetch(key, query, max_results))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: a cancelled caller must not cancel the shared request
+        results = await asyncio.shield(task)
+        return [dict(r) for r in results]
+
+    async def _fetch(self, key: _Key, query: str, max_results: int) -> list[dict]:
+        results = await self._search_upstream(query, max_results)
+        self._put(key, results)
+        return results
+
+    async def _search_upstream(self, query: str, max_results: int) -> list[dict]:
+        # DDGS is synchronous: keep it off the event loop
+        try:
+            results = await asyncio.to_thread(_ddgs_text, query, max_results)
+            if results:
+                return results
+        except Exception as e:
+            logger.warning(f"DDGS library failed: {e}, falling back to lite")
+
+        # Fallback: DuckDuckGo HTML lite endpoint (bypasses API rate limits)
+        try:
+            response = await self._get_client().get(LITE_URL, params={"q": query})
+            response.raise_for_status()
+        except Exception:
+            self.upstream_errors += 1
+            raise
+        return parse_lite_results(response.text, max_results)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "upstream_errors": self.upstream_errors,
+            "hit_rate": (
+                round((self.hits + self.coalesced) / lookups, 3) if lookups else None
+            ),
+        }
+
+
+# Global singleton — used by the web_search tool
+web_search = WebSearchService(
+    ttl=settings.web_search_cache_ttl,
+    max_entries=settings.web_search_cache_size,
+)
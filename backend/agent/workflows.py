@@ -2,20 +2,36 @@
 Axon by NeuroVexon - Workflow Engine
 
 Mehrstufige Agent-Aufgaben mit Template-Variablen und Approval-Modes.
+
+Jeder fertige Step wird als Checkpoint gespeichert (workflow_step_results),
+mit SHA-256 ueber Provider, Modell und aufgeloeste Nachrichten. Ein
+fehlgeschlagener oder abgebrochener Run kann per resume_run() fortgesetzt
+werden: Steps mit passendem Checkpoint werden uebernommen, nur der Rest geht an
+das LLM. Abgebrochen ("cancelled") ist ein Run, dessen Task abgebrochen wurde
+oder dessen Worker nicht mehr lebt: Laufende Runs erneuern heartbeat_at, der
+Scheduler-Worker bricht Runs ohne aktuellen Heartbeat ab (cancel_interrupted_runs).
+Optional (WORKFLOW_STEP_CACHE_TTL) werden Ergebnisse mit identischer
+Eingabe auch runuebergreifend wiederverwendet.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import re
-from datetime import datetime
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.models import Workflow, WorkflowRun, Settings as SettingsModel
+from db.models import Workflow, WorkflowRun, WorkflowStepResult
 from llm.router import llm_router
 from llm.provider import ChatMessage
-from core.config import LLMProvider
+from core.config import LLMProvider, settings
+from core.settings_cache import configure_llm_router
 from core.i18n import t
 
 logger = logging.getLogger(__name__)
@@ -24,13 +40,147 @@ logger = logging.getLogger(__name__)
 MAX_STEPS = 20
 STEP_TIMEOUT_SECONDS = 120
 MAX_CONTEXT_SIZE = 50000  # Zeichen
+RESUMABLE_STATUSES = ("failed", "cancelled")
+RUN_HEARTBEAT_SECONDS = 30  # Laufende Runs erneuern heartbeat_at so oft
+# Ohne Heartbeat so lange gilt der ausfuehrende Worker als beendet
+_RUN_STALE_AFTER = timedelta(seconds=4 * RUN_HEARTBEAT_SECONDS)
+
+_VARIABLE_RE = re.compile(r"\{\{(.+?)\}\}")
+
+
+class RunNotResumable(ValueError):
+    """The run is not failed/cancelled, or another request resumed it first"""
+
+
+async def cancel_interrupted_runs(db: AsyncSession) -> int:
+    """
+    Mark runs whose worker stopped (no heartbeat for _RUN_STALE_AFTER) as
+    cancelled, so they can be resumed. Runs of live workers are left alone.
+    """
+    last_seen = func.coalesce(WorkflowRun.heartbeat_at, WorkflowRun.started_at)
+    result = await db.execute(
+        update(WorkflowRun)
+        .where(
+            WorkflowRun.status == "running",
+            last_seen < datetime.utcnow() - _RUN_STALE_AFTER,
+        )
+        .values(status="cancelled", error=t("wf.interrupted"))
+    )
+    await db.commit()
+    if result.rowcount:
+        logger.warning(
+            f"{result.rowcount} unterbrochene Workflow-Runs als abgebrochen markiert"
+        )
+    return result.rowcount
+
+
+async def sweep_interrupted_runs() -> int:
+    """cancel_interrupted_runs on the app database (periodic scheduler job)"""
+    from db.database import async_session
+
+    async with async_session() as db:
+        return await cancel_interrupted_runs(db)
+
+
+@dataclass
+class StepPlan:
+    """One workflow step with the earlier steps it depends on"""
+
+    index: int  # Position after sorting by order (0-based)
+    prompt: str
+    store_as: str
+    depends_on: set[int] = field(default_factory=set)
+    # Referenced variable -> index of the step whose result it reads (None = missing)
+    reads: dict[str, Optional[int]] = field(default_factory=dict)
+
+    @property
+    def number(self) -> int:
+        return self.index + 1
+
+    def scope(self, results: dict[int, str]) -> dict[str, str]:
+        """Variables visible to this step (as in a sequential run)"""
+        return {
+            name: results[source]
+            for name, source in self.reads.items()
+            if source is not None and source in results
+        }
+
+
+class _StepFailed(Exception):
+    def __init__(self, step: StepPlan, error: Exception):
+        super().__init__(str(error))
+        self.step = step
+        self.error = error
+
+
+def plan_workflow_steps(steps: list[dict]) -> list[StepPlan]:
+    """
+    Sort steps by order and derive their dependencies.
+
+    A step depends on the latest earlier step that stores each {{variable}}
+    it uses, and on the steps named in its optional depends_on list
+    (store_as names of earlier steps). Dependencies only point backwards,
+    so the graph has no cycles and a sequential run gives the same result.
+    """
+    sorted_steps = sorted(steps, key=lambda s: s.get("order", 0))
+    plan: list[StepPlan] = []
+    writers: dict[str, int] = {}  # store_as -> latest step index so far
+    for i, step in enumerate(sorted_steps):
+        prompt = step.get("prompt", "")
+        planned = StepPlan(i, prompt, step.get("store_as", f"step_{i+1}"))
+        for match in _VARIABLE_RE.finditer(prompt):
+            name = match.group(1).strip()
+            planned.reads[name] = writers.get(name)
+        planned.depends_on = {j for j in planned.reads.values() if j is not None}
+
+        depends_on = step.get("depends_on") or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        for name in depends_on:
+            if name not in writers:
+                raise ValueError(t("wf.invalid_dependency", step=i + 1, var=name))
+            planned.depends_on.add(writers[name])
+
+        writers[planned.store_as] = i
+        plan.append(planned)
+    return plan
+
+
+def step_input_hash(provider: str, model: str, messages: list[ChatMessage]) -> str:
+    """SHA-256 over everything the LLM sees for a step"""
+    payload = json.dumps(
+        [provider, model, [[m.role, m.content] for m in messages]],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def _timed_chat(provider, messages: list[ChatMessage]):
+    start = time.monotonic()
+    response = await provider.chat(messages)
+    return response, int((time.monotonic() - start) * 1000)
+
+
+def ordered_context(plan: list[StepPlan], results: dict[int, str]) -> dict:
+    """Run context {store_as: result}, later steps winning as in step order"""
+    return {plan[i].store_as: results[i] for i in sorted(results)}
 
 
 class WorkflowEngine:
     """Fuehrt Workflows mit Variablen-Kontext aus"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        max_parallel: Optional[int] = None,
+        cache_ttl: Optional[int] = None,
+    ):
         self.db = db
+        self.max_parallel = max(1, max_parallel or settings.workflow_max_parallel_steps)
+        # Seconds a step result may be reused for identical input (0 = off)
+        self.cache_ttl = (
+            settings.workflow_step_cache_ttl if cache_ttl is None else cache_ttl
+        )
 
     async def detect_trigger(self, message: str) -> Optional[Workflow]:
         """Pruefen ob eine Nachricht einen Workflow-Trigger enthaelt"""
@@ -47,13 +197,7 @@ class WorkflowEngine:
                 return wf
         return None
 
-    async def execute_workflow(
-        self,
-        workflow_id: str,
-        on_step_start: Optional[callable] = None,
-        on_step_result: Optional[callable] = None,
-    ) -> WorkflowRun:
-        """Workflow ausfuehren"""
+    async def _load_workflow(self, workflow_id: str) -> Workflow:
         workflow = await self.db.get(Workflow, workflow_id)
         if not workflow:
             raise ValueError(t("wf.not_found", id=workflow_id))
@@ -63,6 +207,17 @@ class WorkflowEngine:
 
         if len(workflow.steps) > MAX_STEPS:
             raise ValueError(t("wf.too_many_steps", max=MAX_STEPS))
+        return workflow
+
+    async def execute_workflow(
+        self,
+        workflow_id: str,
+        on_step_start: Optional[callable] = None,
+        on_step_result: Optional[callable] = None,
+    ) -> WorkflowRun:
+        """Workflow ausfuehren"""
+        workflow = await self._load_workflow(workflow_id)
+        plan = plan_workflow_steps(workflow.steps)
 
         # Run-Eintrag erstellen
         run = WorkflowRun(
@@ -70,16 +225,80 @@ class WorkflowEngine:
             status="running",
             current_step=0,
             context={},
+            heartbeat_at=datetime.utcnow(),
         )
         self.db.add(run)
         await self.db.commit()
         await self.db.refresh(run)
 
-        # LLM Provider laden
-        result = await self.db.execute(select(SettingsModel))
-        db_settings = {s.key: s.value for s in result.scalars().all()}
-        current_provider = db_settings.get("llm_provider", "ollama")
-        llm_router.update_settings(db_settings)
+        return await self._execute(
+            workflow, run, plan, {}, on_step_start, on_step_result
+        )
+
+    async def resume_run(
+        self,
+        run_id: str,
+        on_step_start: Optional[callable] = None,
+        on_step_result: Optional[callable] = None,
+    ) -> WorkflowRun:
+        """
+        Continue a failed or cancelled run.
+
+        Steps whose checkpoint matches their input are taken over without an
+        LLM call, so the run continues at the first incomplete step. A step
+        whose input changed (edited workflow, other model) runs again.
+        """
+        run = await self.db.get(WorkflowRun, run_id)
+        if not run:
+            raise ValueError(t("wf.run_not_found", id=run_id))
+        if run.status not in RESUMABLE_STATUSES:
+            raise RunNotResumable(t("wf.not_resumable", status=run.status))
+
+        workflow = await self._load_workflow(run.workflow_id)
+        plan = plan_workflow_steps(workflow.steps)
+
+        # Claim the run in one statement: of two concurrent resumes, one wins
+        claimed = await self.db.execute(
+            update(WorkflowRun)
+            .where(WorkflowRun.id == run.id, WorkflowRun.status.in_(RESUMABLE_STATUSES))
+            .values(
+                status="running",
+                error=None,
+                completed_at=None,
+                heartbeat_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        await self.db.refresh(run)
+        if claimed.rowcount == 0:
+            raise RunNotResumable(t("wf.not_resumable", status=run.status))
+
+        result = await self.db.execute(
+            select(WorkflowStepResult).where(WorkflowStepResult.run_id == run.id)
+        )
+        checkpoints = {cp.step_index: cp for cp in result.scalars().all()}
+        logger.info(
+            f"Workflow '{workflow.name}' wird fortgesetzt "
+            f"({len(checkpoints)}/{len(plan)} Checkpoints)"
+        )
+
+        return await self._execute(
+            workflow, run, plan, checkpoints, on_step_start, on_step_result
+        )
+
+    async def _execute(
+        self,
+        workflow: Workflow,
+        run: WorkflowRun,
+        plan: list[StepPlan],
+        checkpoints: dict[int, WorkflowStepResult],
+        on_step_start: Optional[callable],
+        on_step_result: Optional[callable],
+    ) -> WorkflowRun:
+        # LLM Provider laden (gecachter Settings-Snapshot)
+        snapshot = await configure_llm_router(self.db)
+        current_provider = snapshot.get("llm_provider", "ollama")
 
         try:
             provider = llm_router.get_provider(LLMProvider(current_provider))
@@ -89,76 +308,263 @@ class WorkflowEngine:
             await self.db.commit()
             return run
 
-        # Steps ausfuehren
-        context = {}
-        sorted_steps = sorted(workflow.steps, key=lambda s: s.get("order", 0))
-
-        for i, step in enumerate(sorted_steps):
-            run.current_step = i + 1
-            await self.db.commit()
-
-            prompt = step.get("prompt", "")
-            store_as = step.get("store_as", f"step_{i+1}")
-
-            # Template-Variablen ersetzen: {{variable}}
-            resolved_prompt = self._resolve_variables(prompt, context)
-
-            if on_step_start:
-                try:
-                    await on_step_start(
-                        i + 1, len(sorted_steps), resolved_prompt, store_as
-                    )
-                except Exception:
-                    pass
-
-            logger.info(
-                f"Workflow '{workflow.name}' Step {i+1}/{len(sorted_steps)}: {store_as}"
+        run_id = run.id  # run is expired after a rollback
+        heartbeat = asyncio.create_task(self._heartbeat(run_id))
+        try:
+            await self._run_steps(
+                workflow,
+                run,
+                provider,
+                current_provider,
+                plan,
+                checkpoints,
+                on_step_start,
+                on_step_result,
             )
-
+        except asyncio.CancelledError:
+            # Client gone or shutdown: keep the run resumable. The session may
+            # have been cancelled mid-flush, so start from a clean transaction
             try:
-                messages = [
-                    ChatMessage(
-                        role="assistant",
-                        content=t(
-                            "wf.step_intro",
-                            name=workflow.name,
-                            step=i + 1,
-                            total=len(sorted_steps),
-                        ),
-                    ),
-                    ChatMessage(role="user", content=resolved_prompt),
-                ]
-                response = await provider.chat(messages)
-                result_text = response.content or t("wf.no_response")
-
-                # Im Kontext speichern
-                context[store_as] = result_text[:MAX_CONTEXT_SIZE]
-                run.context = context
-
-                if on_step_result:
-                    try:
-                        await on_step_result(i + 1, store_as, result_text)
-                    except Exception:
-                        pass
-
-            except Exception as e:
-                logger.error(f"Workflow '{workflow.name}' Step {i+1} Fehler: {e}")
-                run.status = "failed"
-                run.error = f"Step {i+1} ({store_as}): {str(e)[:500]}"
-                run.context = context
+                await self.db.rollback()
+                await self.db.execute(
+                    update(WorkflowRun)
+                    .where(WorkflowRun.id == run_id, WorkflowRun.status == "running")
+                    .values(status="cancelled", error=t("wf.cancelled"))
+                    .execution_options(synchronize_session=False)
+                )
                 await self.db.commit()
-                return run
+            except Exception as e:
+                logger.warning(f"Workflow-Run {run_id}: Abbruch nicht gespeichert: {e}")
+            raise
+        except _StepFailed as failed:
+            step = failed.step
+            logger.error(
+                f"Workflow '{workflow.name}' Step {step.number} Fehler: {failed.error}"
+            )
+            run.status = "failed"
+            run.error = (
+                f"Step {step.number} ({step.store_as}): {str(failed.error)[:500]}"
+            )
+            await self.db.commit()
+            return run
+        finally:
+            heartbeat.cancel()
 
         # Erfolgreich abgeschlossen
         run.status = "completed"
         run.completed_at = datetime.utcnow()
-        run.context = context
         await self.db.commit()
         await self.db.refresh(run)
 
         logger.info(f"Workflow '{workflow.name}' abgeschlossen")
         return run
 
+    async def _heartbeat(self, run_id: str) -> None:
+        """Refresh heartbeat_at until cancelled (own session, own transaction)"""
+        while True:
+            await asyncio.sleep(RUN_HEARTBEAT_SECONDS)
+            try:
+                async with AsyncSession(self.db.bind) as db:
+                    await db.execute(
+                        update(WorkflowRun)
+                        .where(
+                            WorkflowRun.id == run_id, WorkflowRun.status == "running"
+                        )
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"Workflow-Run {run_id}: Heartbeat fehlgeschlagen: {e}")
+
+    async def _run_steps(
+        self,
+        workflow: Workflow,
+        run: WorkflowRun,
+        provider,
+        provider_name: str,
+        plan: list[StepPlan],
+        checkpoints: dict[int, WorkflowStepResult],
+        on_step_start: Optional[callable],
+        on_step_result: Optional[callable],
+    ) -> None:
+        """
+        Run the steps as a DAG: a step starts once its dependencies are done,
+        up to self.max_parallel at a time. Steps with a matching checkpoint
+        or cache entry finish at once and do not take a slot.
+
+        Only this coroutine touches the DB session and the callbacks; the
+        step tasks just call the LLM. Raises _StepFailed on the first error.
+        """
+        total = len(plan)
+        model = getattr(provider, "model", None) or ""
+        results: dict[int, str] = {}
+        waiting = list(plan)
+        running: dict[asyncio.Task, tuple[StepPlan, str]] = {}
+
+        async def finish(step: StepPlan, result_text: str) -> None:
+            # Im Kontext speichern (Reihenfolge wie sequentiell)
+            results[step.index] = result_text[:MAX_CONTEXT_SIZE]
+            run.context = ordered_context(plan, results)
+            await self.db.commit()
+
+            if on_step_result:
+                try:
+                    await on_step_result(step.number, step.store_as, result_text)
+                except Exception:
+                    pass
+
+        try:
+            while waiting or running:
+                ready = [s for s in waiting if s.depends_on.issubset(results)]
+                for step in ready:
+                    if len(running) >= self.max_parallel:
+                        break
+                    waiting.remove(step)
+                    resolved_prompt = self._resolve_variables(
+                        step.prompt, step.scope(results)
+                    )
+                    messages = [
+                        ChatMessage(
+                            role="assistant",
+                            content=t(
+                                "wf.step_intro",
+                                name=workflow.name,
+                                step=step.number,
+                                total=total,
+                            ),
+                        ),
+                        ChatMessage(role="user", content=resolved_prompt),
+                    ]
+                    input_hash = step_input_hash(provider_name, model, messages)
+                    run.current_step = max(run.current_step or 0, step.number)
+                    await self.db.commit()
+
+                    if on_step_start:
+                        try:
+                            await on_step_start(
+                                step.number, total, resolved_prompt, step.store_as
+                            )
+                        except Exception:
+                            pass
+
+                    reused = await self._reuse_result(
+                        run, step, input_hash, checkpoints
+                    )
+                    if reused is not None:
+                        await finish(step, reused)
+                        continue
+
+                    logger.info(
+                        f"Workflow '{workflow.name}' Step {step.number}/{total}: "
+                        f"{step.store_as}"
+                    )
+                    task = asyncio.create_task(_timed_chat(provider, messages))
+                    running[task] = (step, input_hash)
+
+                if not running:
+                    # Only reused steps this round; they may unblock others
+                    continue
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                failed = None
+                for task in sorted(done, key=lambda d: running[d][0].index):
+                    step, input_hash = running.pop(task)
+                    try:
+                        response, duration_ms = task.result()
+                    except Exception as e:
+                        failed = failed or _StepFailed(step, e)
+                        continue
+                    result_text = response.content or t("wf.no_response")
+                    await self._checkpoint(
+                        run,
+                        step,
+                        input_hash,
+                        checkpoints,
+                        provider=provider_name,
+                        model=model,
+                        result=result_text[:MAX_CONTEXT_SIZE],
+                        input_tokens=response.input_tokens,
+                        output_tokens=response.output_tokens,
+                        duration_ms=duration_ms,
+                    )
+                    await finish(step, result_text)
+                if failed:
+                    raise failed
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            run.context = ordered_context(plan, results)
+
+    async def _reuse_result(
+        self,
+        run: WorkflowRun,
+        step: StepPlan,
+        input_hash: str,
+        checkpoints: dict[int, WorkflowStepResult],
+    ) -> Optional[str]:
+        """Result of this run's checkpoint or of a cached step with the same input"""
+        checkpoint = checkpoints.get(step.index)
+        if checkpoint is not None and checkpoint.input_hash == input_hash:
+            logger.info(f"Step {step.number} ({step.store_as}) aus Checkpoint")
+            return checkpoint.result
+
+        if self.cache_ttl <= 0:
+            return None
+        cutoff = datetime.utcnow() - timedelta(seconds=self.cache_ttl)
+        result = await self.db.execute(
+            select(WorkflowStepResult)
+            .where(
+                WorkflowStepResult.input_hash == input_hash,
+                WorkflowStepResult.created_at >= cutoff,
+            )
+            .order_by(WorkflowStepResult.created_at.desc())
+            .limit(1)
+        )
+        cached = result.scalar_one_or_none()
+        if cached is None:
+            return None
+
+        logger.info(f"Step {step.number} ({step.store_as}) aus Cache")
+        # Keep the original time, so the TTL counts from the LLM call
+        await self._checkpoint(
+            run,
+            step,
+            input_hash,
+            checkpoints,
+            provider=cached.provider,
+            model=cached.model,
+            source="cache",
+            result=cached.result,
+            created_at=cached.created_at,
+        )
+        return cached.result
+
+    async def _checkpoint(
+        self,
+        run: WorkflowRun,
+        step: StepPlan,
+        input_hash: str,
+        checkpoints: dict[int, WorkflowStepResult],
+        **values,
+    ) -> None:
+        """Store a step result; replaces an outdated checkpoint of this run"""
+        outdated = checkpoints.pop(step.index, None)
+        if outdated is not None:
+            await self.db.delete(outdated)
+        checkpoint = WorkflowStepResult(
+            run_id=run.id,
+            step_index=step.index,
+            store_as=step.store_as,
+            input_hash=input_hash,
+            **values,
+        )
+        self.db.add(checkpoint)
+        checkpoints[step.index] = checkpoint
+
     def _resolve_variables(self, template: str, context: dict) -> str:
         """Ersetzt {{variable}} mit Werten aus dem Kontext"""
 
@@ -166,7 +572,7 @@ class WorkflowEngine:
             var_name = match.group(1).strip()
             return context.get(var_name, t("wf.var_missing", var=var_name))
 
-        return re.sub(r"\{\{(.+?)\}\}", replace, template)
+        return _VARIABLE_RE.sub(replace, template)
 
 
 def workflow_to_dict(wf: Workflow) -> dict:
@@ -195,3 +601,19 @@ def run_to_dict(run: WorkflowRun) -> dict:
         "started_at": run.started_at.isoformat(),
         "completed_at": run.completed_at.isoformat() if run.completed_at else None,
     }
+
+
+def step_result_to_dict(checkpoint: WorkflowStepResult) -> dict:
+    return {
+        "step": checkpoint.step_index + 1,
+        "store_as": checkpoint.store_as,
+        "source": checkpoint.source,
+        "provider": checkpoint.provider,
+        "model": checkpoint.model,
+        "input_hash": checkpoint.input_hash,
+        "input_tokens": checkpoint.input_tokens,
+        "output_tokens": checkpoint.output_tokens,
+        "duration_ms": checkpoint.duration_ms,
+        "result": checkpoint.result,
+        "created_at": checkpoint.created_at.isoformat(),
+    }
@@ -4,68 +4,82 @@ Axon by NeuroVexon - Dashboard & Analytics API
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import and_, select, func
 from datetime import datetime, timedelta
 
 from db.database import get_db
 from db.models import (
     User,
-    Conversation,
-    Message,
-    AuditLog,
+    AnalyticsRollup,
     Agent,
     ScheduledTask,
     Workflow,
     Skill,
 )
-from core.dependencies import get_current_active_user
+from core.dependencies import get_current_active_user, get_admin_user
+from agent.analytics_rollup import (
+    LATENCY_BUCKETS,
+    METRIC_AUDIT,
+    METRIC_CONVERSATIONS,
+    METRIC_MESSAGES,
+    METRIC_TOOL_EXECUTED,
+    METRIC_TOOL_FAILED,
+    TOTAL_DAY,
+    rebuild_rollups,
+)
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
+async def _rollups(db: AsyncSession, day_filter, metrics: tuple[str, ...]):
+    result = await db.execute(
+        select(AnalyticsRollup).where(day_filter, AnalyticsRollup.metric.in_(metrics))
+    )
+    return result.scalars().all()
+
+
 @router.get("/overview")
 async def get_overview(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Dashboard-Uebersicht: Kernmetriken"""
-    # Conversations
-    conv_count = await db.scalar(select(func.count(Conversation.id)))
-
-    # Messages
-    msg_count = await db.scalar(select(func.count(Message.id)))
-
-    # Agents
-    agent_count = await db.scalar(select(func.count(Agent.id)).where(Agent.enabled))
-
-    # Tool Calls (aus Audit)
-    tool_calls = await db.scalar(
-        select(func.count(AuditLog.id)).where(AuditLog.event_type == "tool_executed")
-    )
+    # Conversations, Messages, Audit-Events: laufende Summen aus den Rollups
+    totals = {
+        (row.metric, row.dimension): row.count
+        for row in await _rollups(
+            db,
+            AnalyticsRollup.day == TOTAL_DAY,
+            (METRIC_CONVERSATIONS, METRIC_MESSAGES, METRIC_AUDIT),
+        )
+    }
+    conv_count = totals.get((METRIC_CONVERSATIONS, ""), 0)
+    msg_count = totals.get((METRIC_MESSAGES, ""), 0)
+    tool_calls = totals.get((METRIC_AUDIT, "tool_executed"), 0)
 
     # Approval Rate
-    total_requests = await db.scalar(
-        select(func.count(AuditLog.id)).where(AuditLog.event_type == "tool_requested")
-    )
-    approved = await db.scalar(
-        select(func.count(AuditLog.id)).where(AuditLog.event_type == "tool_approved")
-    )
+    total_requests = totals.get((METRIC_AUDIT, "tool_requested"), 0)
+    approved = totals.get((METRIC_AUDIT, "tool_approved"), 0)
     approval_rate = (approved / total_requests * 100) if total_requests > 0 else 0
 
-    # Scheduled Tasks
-    active_tasks = await db.scalar(
-        select(func.count(ScheduledTask.id)).where(ScheduledTask.enabled)
-    )
-
-    # Workflows
-    workflow_count = await db.scalar(
-        select(func.count(Workflow.id)).where(Workflow.enabled)
-    )
-
-    # Skills
-    active_skills = await db.scalar(
-        select(func.count(Skill.id)).where(Skill.enabled, Skill.approved)
-    )
+    # Agents, Scheduled Tasks, Workflows, Skills (kleine Tabellen, ein Roundtrip)
+    counts = (
+        await db.execute(
+            select(
+                select(func.count(Agent.id)).where(Agent.enabled).scalar_subquery(),
+                select(func.count(ScheduledTask.id))
+                .where(ScheduledTask.enabled)
+                .scalar_subquery(),
+                select(func.count(Workflow.id))
+                .where(Workflow.enabled)
+                .scalar_subquery(),
+                select(func.count(Skill.id))
+                .where(Skill.enabled, Skill.approved)
+                .scalar_subquery(),
+            )
+        )
+    ).one()
+    agent_count, active_tasks, workflow_count, active_skills = counts
 
     return {
         "conversations": conv_count or 0,
@@ -85,39 +99,31 @@ async def get_tool_stats(
     db: AsyncSession = Depends(get_db),
 ):
     """Tool-Statistiken: Nutzung, Fehlerrate, Ausfuehrungszeit"""
-    # Meistgenutzte Tools
-    result = await db.execute(
-        select(
-            AuditLog.tool_name,
-            func.count(AuditLog.id).label("count"),
-            func.avg(AuditLog.execution_time_ms).label("avg_time"),
-        )
-        .where(AuditLog.event_type == "tool_executed", AuditLog.tool_name.isnot(None))
-        .group_by(AuditLog.tool_name)
-        .order_by(func.count(AuditLog.id).desc())
-        .limit(20)
+    rows = await _rollups(
+        db,
+        AnalyticsRollup.day == TOTAL_DAY,
+        (METRIC_TOOL_EXECUTED, METRIC_TOOL_FAILED),
     )
+    executed = [r for r in rows if r.metric == METRIC_TOOL_EXECUTED and r.count > 0]
+    failures = {r.dimension: r.count for r in rows if r.metric == METRIC_TOOL_FAILED}
+
+    # Meistgenutzte Tools
+    executed.sort(key=lambda r: r.count, reverse=True)
     tool_usage = [
         {
-            "tool": row.tool_name,
+            "tool": row.dimension,
             "count": row.count,
-            "avg_time_ms": round(row.avg_time, 1) if row.avg_time else 0,
+            "avg_time_ms": (
+                round(row.time_sum_ms / row.time_count, 1) if row.time_count else 0
+            ),
+            "latency_histogram": {
+                column: getattr(row, column) for column, _ in LATENCY_BUCKETS
+            },
         }
-        for row in result
+        for row in executed[:20]
     ]
 
-    # Fehlerrate pro Tool
-    result = await db.execute(
-        select(
-            AuditLog.tool_name,
-            func.count(AuditLog.id).label("failures"),
-        )
-        .where(AuditLog.event_type == "tool_failed", AuditLog.tool_name.isnot(None))
-        .group_by(AuditLog.tool_name)
-    )
-    failures = {row.tool_name: row.failures for row in result}
-
-    # Merge
+    # Merge Fehlerrate pro Tool
     for tool in tool_usage:
         tool["failures"] = failures.get(tool["tool"], 0)
         total = tool["count"] + tool["failures"]
@@ -135,36 +141,26 @@ async def get_timeline(
     db: AsyncSession = Depends(get_db),
 ):
     """30-Tage Verlauf: Conversations und Tool-Calls pro Tag"""
-    cutoff = datetime.utcnow() - timedelta(days=days)
-
-    # Conversations pro Tag
-    result = await db.execute(
-        select(
-            func.date(Conversation.created_at).label("day"),
-            func.count(Conversation.id).label("count"),
-        )
-        .where(Conversation.created_at >= cutoff)
-        .group_by(func.date(Conversation.created_at))
-        .order_by(func.date(Conversation.created_at))
-    )
-    conv_by_day = {str(row.day): row.count for row in result}
+    now = datetime.utcnow()
+    first_day = (now - timedelta(days=days - 1)).strftime("%Y-%m-%d")
 
-    # Tool-Calls pro Tag
-    result = await db.execute(
-        select(
-            func.date(AuditLog.timestamp).label("day"),
-            func.count(AuditLog.id).label("count"),
-        )
-        .where(AuditLog.timestamp >= cutoff, AuditLog.event_type == "tool_executed")
-        .group_by(func.date(AuditLog.timestamp))
-        .order_by(func.date(AuditLog.timestamp))
+    # Tages-Rollups ("total" sortiert hinter jedes Datum und wird ausgeschlossen)
+    rows = await _rollups(
+        db,
+        and_(AnalyticsRollup.day >= first_day, AnalyticsRollup.day != TOTAL_DAY),
+        (METRIC_CONVERSATIONS, METRIC_AUDIT),
     )
-    tools_by_day = {str(row.day): row.count for row in result}
+    conv_by_day = {r.day: r.count for r in rows if r.metric == METRIC_CONVERSATIONS}
+    tools_by_day = {
+        r.day: r.count
+        for r in rows
+        if r.metric == METRIC_AUDIT and r.dimension == "tool_executed"
+    }
 
     # Alle Tage im Zeitraum
     timeline = []
     for i in range(days):
-        day = (datetime.utcnow() - timedelta(days=days - 1 - i)).strftime("%Y-%m-%d")
+        day = (now - timedelta(days=days - 1 - i)).strftime("%Y-%m-%d")
         timeline.append(
             {
                 "date": day,
@@ -176,6 +172,32 @@ async def get_timeline(
     return {"timeline": timeline}
 
 
+@router.post("/rebuild")
+async def rebuild_analytics(
+    current_user: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Rollups aus den Basistabellen neu berechnen (Admin, z.B. nach Restore)"""
+    rows = await rebuild_rollups(db)
+    return {"status": "rebuilt", "rows": rows}
+
+
+@router.get("/caches")
+async def get_cache_stats(
+    current_user: User = Depends(get_admin_user),
+):
+    """Trefferquoten der Prozess-Caches (Admin)"""
+    from agent.embedding_cache import embedding_cache
+    from agent.web_fetch import web_fetcher
+    from agent.web_search import web_search
+
+    return {
+        "web_search": web_search.stats(),
+        "web_fetch": web_fetcher.stats(),
+        "embeddings": embedding_cache.stats(),
+    }
+
+
 @router.get("/agents")
 async def get_agent_stats(
     current_user: User = Depends(get_current_active_user),
@@ -219,6 +241,8 @@ async def get_task_overview(
     )
     tasks = result.scalars().all()
 
+    from agent.scheduler import task_scheduler
+
     return {
         "tasks": [
             {
@@ -236,5 +260,6 @@ async def get_task_overview(
                 ),
             }
             for t in tasks
-        ]
+        ],
+        "scheduler": task_scheduler.stats(),
     }
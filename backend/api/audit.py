@@ -2,14 +2,21 @@
 Axon by NeuroVexon - Audit API Endpoints
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
-import csv
-import io
-
+from datetime import datetime
+
+from agent.audit_export import (
+    ENCODERS,
+    EXPORT_FORMATS,
+    AuditExportFilter,
+    iter_audit_rows,
+)
+from agent.audit_writer import audit_writer
+from core.config import settings
 from db.database import get_db
 from db.models import AuditLog
 from db.models import User
@@ -29,6 +36,7 @@ async def list_audit_logs(
     db: AsyncSession = Depends(get_db),
 ):
     """List audit logs with optional filters"""
+    await audit_writer.flush()  # Include events still in the write buffer
     query = select(AuditLog).order_by(AuditLog.timestamp.desc())
 
     if session_id:
@@ -66,6 +74,7 @@ async def get_audit_stats(
     db: AsyncSession = Depends(get_db),
 ):
     """Get audit statistics"""
+    await audit_writer.flush()
     from sqlalchemy import func
 
     base_query = select(AuditLog)
@@ -107,6 +116,7 @@ async def get_audit_stats(
         "by_event_type": by_type,
         "by_tool": by_tool,
         "avg_execution_time_ms": round(avg_time, 2) if avg_time else None,
+        "writer": audit_writer.stats(),
     }
 
 
@@ -114,69 +124,51 @@ async def get_audit_stats(
 async def export_audit_logs(
     format: str = "csv",
     session_id: Optional[str] = None,
+    event_type: Optional[str] = None,
+    tool_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after_timestamp: Optional[datetime] = None,
+    after_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
 ):
-    """Export audit logs as CSV or JSON"""
-    query = select(AuditLog).order_by(AuditLog.timestamp.desc())
-    if session_id:
-        query = query.where(AuditLog.conversation_id == session_id)
-
-    result = await db.execute(query)
-    logs = result.scalars().all()
-
-    if format == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
-            [
-                "id",
-                "session_id",
-                "timestamp",
-                "event_type",
-                "tool_name",
-                "tool_params",
-                "result",
-                "error",
-                "user_decision",
-                "execution_time_ms",
-            ]
+    """
+    Export audit logs as CSV, NDJSON, JSON or Parquet (streamed).
+
+    Rows are sorted newest first. For keyset pagination pass the timestamp and
+    id of the last exported row as after_timestamp / after_id.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format. Allowed: {', '.join(EXPORT_FORMATS)}",
         )
-        for log in logs:
-            writer.writerow(
-                [
-                    log.id,
-                    log.conversation_id,
-                    log.timestamp.isoformat(),
-                    log.event_type,
-                    log.tool_name,
-                    str(log.tool_params) if log.tool_params else "",
-                    log.result[:500] if log.result else "",
-                    log.error or "",
-                    log.user_decision or "",
-                    log.execution_time_ms or "",
-                ]
+    if format == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise HTTPException(
+                status_code=400,
+                detail="pyarrow package not installed. Run: pip install pyarrow",
             )
 
-        output.seek(0)
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=axon_audit_log.csv"},
-        )
-    else:
-        return [
-            {
-                "id": log.id,
-                "session_id": log.conversation_id,
-                "timestamp": log.timestamp.isoformat(),
-                "event_type": log.event_type,
-                "tool_name": log.tool_name,
-                "tool_params": log.tool_params,
-                "result": log.result,
-                "error": log.error,
-                "user_decision": log.user_decision,
-                "execution_time_ms": log.execution_time_ms,
-            }
-            for log in logs
-        ]
+    await audit_writer.flush()
+    export_filter = AuditExportFilter(
+        session_id=session_id,
+        event_type=event_type,
+        tool_name=tool_name,
+        since=since,
+        until=until,
+        after_timestamp=after_timestamp,
+        after_id=after_id,
+        limit=limit,
+    )
+    chunks = iter_audit_rows(export_filter, chunk_size=settings.audit_export_chunk_size)
+    return StreamingResponse(
+        ENCODERS[format](chunks),
+        media_type=EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f"attachment; filename=axon_audit_log.{format}"
+        },
+    )
@@ -21,13 +21,15 @@ from core.security import (
     create_refresh_token,
     decode_token,
 )
-from core.dependencies import get_current_active_user
+from core.dependencies import get_current_active_user, get_admin_user
+from core.principal_cache import principal_cache
 from core.i18n import t
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+USER_ROLES = {"admin", "user"}
 EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 
 
@@ -44,6 +46,11 @@ class RefreshRequest(BaseModel):
     refresh_token: str
 
 
+class UserUpdateRequest(BaseModel):
+    role: str | None = None
+    is_active: bool | None = None
+
+
 class TokenResponse(BaseModel):
     access_token: str
     refresh_token: str
@@ -71,7 +78,8 @@ def _user_dict(user: User) -> dict:
 
 
 def _create_tokens(user: User) -> dict:
-    data = {"sub": user.id}
+    # role/active are only trusted with AUTH_TRUST_TOKEN_CLAIMS
+    data = {"sub": user.id, "role": user.role, "active": bool(user.is_active)}
     return {
         "access_token": create_access_token(data),
         "refresh_token": create_refresh_token(data),
@@ -194,11 +202,58 @@ async def refresh_token(data: RefreshRequest, db: AsyncSession = Depends(get_db)
 
 
 @router.get("/me")
-async def get_me(current_user: User = Depends(get_current_active_user)):
+async def get_me(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
     """Get current authenticated user"""
+    if current_user.email is None:
+        # Principal built from token claims: profile fields are not in the token
+        current_user = await db.get(User, current_user.id) or current_user
     return _user_dict(current_user)
 
 
+@router.patch("/users/{user_id}")
+async def update_user(
+    user_id: str,
+    data: UserUpdateRequest,
+    current_user: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Change role or active state of a user (admin only)"""
+    if data.role is not None and data.role not in USER_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=t("auth.invalid_role"),
+        )
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=t("auth.cannot_modify_self"),
+        )
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=t("auth.user_not_found"),
+        )
+
+    if data.role is not None:
+        user.role = data.role
+    if data.is_active is not None:
+        user.is_active = data.is_active
+    await db.commit()
+    # Cached principals / trusted token claims of this user are now stale
+    principal_cache.invalidate(user.id)
+
+    logger.info(
+        f"User updated: {user.email} (role={user.role}, active={user.is_active})"
+    )
+    return _user_dict(user)
+
+
 @router.post("/logout")
 async def logout():
     """Stateless logout — client should discard tokens"""
@@ -7,45 +7,33 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
-import asyncio
 import json
 import logging
 
 from db.database import get_db
-from db.models import Agent, Conversation, Message, Settings, UploadedDocument, User
+from db.models import Agent, Conversation, Message, User
 from core.dependencies import get_current_active_user
 from llm.router import llm_router
 from llm.provider import ChatMessage
 from agent.orchestrator import AgentOrchestrator
 from agent.memory import MemoryManager
+from agent.conversation_context import conversation_context_cache
+from agent.upload_jobs import upload_jobs
 from agent.agent_manager import AgentManager
-from agent.permission_manager import PermissionScope
+from agent.permission_manager import PermissionScope, permission_manager
 from sqlalchemy import select
-from core.config import LLMProvider
-from core.security import decrypt_value
+from core.config import LLMProvider, settings
+from core.settings_cache import configure_llm_router
 from core.i18n import t, set_language, get_lang_from_header
 
-ENCRYPTED_SETTINGS = {"anthropic_api_key", "openai_api_key"}
-
-# Pending approval events: approval_id -> (asyncio.Event, result_holder)
-_approval_events: dict[str, tuple[asyncio.Event, dict]] = {}
-
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
-async def load_settings_to_router(db: AsyncSession):
-    """Load settings from database and update the LLM router"""
-    result = await db.execute(select(Settings))
-    db_settings = {s.key: s.value for s in result.scalars().all()}
-
-    # Decrypt encrypted settings before passing to router
-    for key in ENCRYPTED_SETTINGS:
-        if key in db_settings and db_settings[key]:
-            db_settings[key] = decrypt_value(db_settings[key])
-
-    llm_router.update_settings(db_settings)
-    return db_settings
+async def load_settings_to_router(db: AsyncSession) -> dict:
+    """Apply the cached settings snapshot to the LLM router"""
+    snapshot = await configure_llm_router(db)
+    return snapshot.values
 
 
 class ChatRequest(BaseModel):
@@ -261,6 +249,12 @@ async def agent_message(
     db.add(user_message)
     await db.commit()
 
+    # Documents uploaded just before this message may still be extracted
+    # (possibly in another worker) — wait, so the answer already sees them
+    await upload_jobs.wait_for_conversation(
+        conversation.id, settings.upload_wait_seconds
+    )
+
     # Load agent profile
     agent_manager = AgentManager(db)
     agent = None
@@ -271,11 +265,12 @@ async def agent_message(
     else:
         agent = await agent_manager.get_default_agent()
 
-    # Build message history from DB
+    # Build message history from the context cache (only new messages are read)
     # NOTE: mistral:7b-instruct breaks tool calling when system/markdown prompt is present.
     # Use plain text memory as initial assistant message to preserve tool calling.
     memory_manager = MemoryManager(db)
-    memory_block = await memory_manager.build_memory_prompt(plain=True)
+    memory_block = await memory_manager.build_memory_prompt(plain=True, use_cache=True)
+    context = await conversation_context_cache.load(db, conversation)
 
     messages = []
 
@@ -291,39 +286,19 @@ async def agent_message(
     if memory_block:
         intro_parts.append(memory_block)
 
-    # Document context: Lade hochgeladene Dokumente dieser Conversation
-    doc_result = await db.execute(
-        select(UploadedDocument)
-        .where(UploadedDocument.conversation_id == conversation.id)
-        .order_by(UploadedDocument.created_at.asc())
-        .limit(10)
+    # Document context: chunks of uploaded documents relevant to this message
+    doc_block = await conversation_context_cache.get_documents(
+        db, conversation.id, query=request.message
     )
-    docs = doc_result.scalars().all()
-    if docs:
-        from agent.document_handler import format_for_context
-
-        doc_contexts = []
-        for doc in docs:
-            if doc.extracted_text:
-                doc_contexts.append(
-                    format_for_context(doc.filename, doc.extracted_text)
-                )
-        if doc_contexts:
-            intro_parts.append(
-                t("chat.docs_uploaded") + "\n" + "\n\n".join(doc_contexts)
-            )
+    if doc_block:
+        intro_parts.append(doc_block)
 
-    messages.append(ChatMessage(role="assistant", content=" ".join(intro_parts)))
+    # Rolling summary of turns that no longer fit into the window
+    if context.summary:
+        intro_parts.append(t("chat.summary_intro") + " " + context.summary)
 
-    history_result = await db.execute(
-        select(Message)
-        .where(Message.conversation_id == conversation.id)
-        .where(Message.role.in_(["user", "assistant"]))
-        .order_by(Message.created_at.asc())
-        .limit(50)
-    )
-    for msg in history_result.scalars().all():
-        messages.append(ChatMessage(role=msg.role, content=msg.content))
+    messages.append(ChatMessage(role="assistant", content=" ".join(intro_parts)))
+    messages.extend(context.chat_messages())
 
     session_id = conversation.id
 
@@ -340,22 +315,11 @@ async def agent_message(
         if not approval_id:
             return None
 
-        # Create an event to wait on
-        event = asyncio.Event()
-        result_holder = {"decision": None}
-        _approval_events[approval_id] = (event, result_holder)
-
-        try:
-            # Wait for approval (timeout 120s)
-            await asyncio.wait_for(event.wait(), timeout=120.0)
-            decision = result_holder["decision"]
-            if decision is None or decision == "never":
-                return None
-            return PermissionScope(decision)
-        except asyncio.TimeoutError:
+        # Wait for approval (timeout 120s) — the POST may land on any worker
+        decision = await permission_manager.backend.wait(approval_id, timeout=120.0)
+        if decision is None or decision == "never":
             return None
-        finally:
-            _approval_events.pop(approval_id, None)
+        return PermissionScope(decision)
 
     async def generate():
         from db.database import async_session
@@ -406,6 +370,9 @@ async def agent_message(
                 stream_db.add(assistant_message)
                 await stream_db.commit()
 
+        # Summarize turns that left the window (background, off the hot path)
+        conversation_context_cache.schedule_summary(session_id, provider)
+
         yield f"data: {json.dumps({'type': 'done', 'session_id': session_id})}\n\n"
 
     return StreamingResponse(
@@ -415,14 +382,9 @@ async def agent_message(
     )
 
 
-def resolve_approval(approval_id: str, decision: str) -> bool:
-    """Resolve a pending approval (called from tools.py /approve endpoint)"""
-    if approval_id not in _approval_events:
-        return False
-    event, result_holder = _approval_events[approval_id]
-    result_holder["decision"] = decision
-    event.set()
-    return True
+async def resolve_approval(approval_id: str, decision: str) -> bool:
+    """Resolve a pending approval of an agent stream (on any worker)"""
+    return await permission_manager.backend.resolve(approval_id, decision)
 
 
 @router.post("/approve/{approval_id}")
@@ -437,7 +399,7 @@ async def approve_agent_tool(
             status_code=400, detail="Decision must be: once, session, never"
         )
 
-    if not resolve_approval(approval_id, decision):
+    if not await resolve_approval(approval_id, decision):
         raise HTTPException(status_code=404, detail="Approval not found or expired")
 
     return {"status": "ok", "approval_id": approval_id, "decision": decision}
@@ -523,4 +485,5 @@ async def delete_conversation(
 
     await db.delete(conversation)
     await db.commit()
+    conversation_context_cache.invalidate(conversation_id)
     return {"status": "deleted"}
@@ -15,7 +15,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.database import get_db
 from mcp.server import mcp_server
-from core.security import rate_limiter
 from core.security import decode_token
 
 logger = logging.getLogger(__name__)
@@ -29,19 +28,12 @@ MCP_AUTH_TOKEN_KEY = "mcp_auth_token"
 
 async def _get_mcp_settings(db: AsyncSession) -> dict:
     """MCP-Einstellungen aus DB laden"""
-    from sqlalchemy import select
-    from db.models import Settings
-    from core.security import decrypt_value
+    from core.settings_cache import settings_cache
 
-    result = await db.execute(select(Settings))
-    db_settings = {s.key: s.value for s in result.scalars().all()}
+    snapshot = await settings_cache.get(db)
     return {
-        "enabled": db_settings.get(MCP_ENABLED_KEY, "false") == "true",
-        "auth_token": (
-            decrypt_value(db_settings.get(MCP_AUTH_TOKEN_KEY, ""))
-            if db_settings.get(MCP_AUTH_TOKEN_KEY)
-            else ""
-        ),
+        "enabled": snapshot.get(MCP_ENABLED_KEY, "false") == "true",
+        "auth_token": snapshot.get(MCP_AUTH_TOKEN_KEY) or "",
     }
 
 
@@ -83,11 +75,6 @@ async def mcp_sse_endpoint(request: Request, db: AsyncSession = Depends(get_db))
     if not _validate_auth(request, mcp_settings):
         raise HTTPException(status_code=401, detail="Ungueliger Auth-Token")
 
-    # Rate Limiting
-    client_ip = request.client.host if request.client else "unknown"
-    if not rate_limiter.is_allowed(f"mcp:{client_ip}"):
-        raise HTTPException(status_code=429, detail="Rate Limit erreicht")
-
     session_id = f"mcp-{uuid.uuid4().hex[:12]}"
 
     async def event_stream():
@@ -134,11 +121,6 @@ async def mcp_messages_endpoint(
     if not _validate_auth(request, mcp_settings):
         raise HTTPException(status_code=401, detail="Ungueliger Auth-Token")
 
-    # Rate Limiting
-    client_ip = request.client.host if request.client else "unknown"
-    if not rate_limiter.is_allowed(f"mcp:{client_ip}"):
-        raise HTTPException(status_code=429, detail="Rate Limit erreicht")
-
     body = await request.body()
     raw_data = body.decode("utf-8")
 
@@ -4,12 +4,12 @@ Axon by NeuroVexon - Scheduled Tasks API Endpoints
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, func, select
 from pydantic import BaseModel
 from typing import Optional
 
 from db.database import get_db
-from db.models import ScheduledTask, User
+from db.models import ScheduledTask, TaskRun, User
 from core.dependencies import get_current_active_user
 from agent.scheduler import task_scheduler, MAX_ACTIVE_TASKS
 
@@ -101,8 +101,9 @@ async def create_task(
 ):
     """Neuen Task erstellen"""
     # Safety: Max Tasks
-    result = await db.execute(select(ScheduledTask).where(ScheduledTask.enabled))
-    active_count = len(result.scalars().all())
+    active_count = await db.scalar(
+        select(func.count(ScheduledTask.id)).where(ScheduledTask.enabled)
+    )
     if active_count >= MAX_ACTIVE_TASKS:
         raise HTTPException(
             status_code=400,
@@ -173,6 +174,7 @@ async def delete_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task nicht gefunden")
 
+    await db.execute(delete(TaskRun).where(TaskRun.task_id == task_id))
     await db.delete(task)
     await db.commit()
 
@@ -201,6 +203,40 @@ async def run_task(
     return {"status": "executed", "result": result, "task": _task_to_dict(task)}
 
 
+@router.get("/{task_id}/runs")
+async def list_task_runs(
+    task_id: str,
+    limit: int = 20,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Letzte Ausfuehrungen eines Tasks (Dauer, Tokens, Status)"""
+    task = await db.get(ScheduledTask, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task nicht gefunden")
+
+    result = await db.execute(
+        select(TaskRun)
+        .where(TaskRun.task_id == task_id)
+        .order_by(TaskRun.started_at.desc())
+        .limit(min(max(limit, 1), 200))
+    )
+    return [
+        {
+            "id": run.id,
+            "trigger": run.trigger,
+            "status": run.status,
+            "provider": run.provider,
+            "started_at": run.started_at.isoformat() if run.started_at else None,
+            "duration_ms": run.duration_ms,
+            "input_tokens": run.input_tokens,
+            "output_tokens": run.output_tokens,
+            "result": run.result,
+        }
+        for run in result.scalars().all()
+    ]
+
+
 @router.post("/{task_id}/toggle")
 async def toggle_task(
     task_id: str,
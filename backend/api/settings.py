@@ -13,24 +13,11 @@ from db.models import Settings
 from db.models import User
 from core.dependencies import get_current_active_user, get_admin_user
 from core.config import settings as app_settings, LLMProvider
-from core.security import encrypt_value, decrypt_value
+from core.security import encrypt_value
+from core.settings_cache import ENCRYPTED_KEYS, settings_cache
 from llm.router import llm_router
 from core.i18n import t, set_language, get_lang_from_header
 
-# Keys that must be encrypted in the database
-ENCRYPTED_KEYS = {
-    "anthropic_api_key",
-    "openai_api_key",
-    "gemini_api_key",
-    "groq_api_key",
-    "openrouter_api_key",
-    "imap_password",
-    "smtp_password",
-    "mcp_auth_token",
-    "telegram_bot_token",
-    "discord_bot_token",
-}
-
 router = APIRouter(prefix="/settings", tags=["settings"])
 
 
@@ -85,13 +72,12 @@ async def get_settings(
     db: AsyncSession = Depends(get_db),
 ):
     """Get current settings"""
-    result = await db.execute(select(Settings))
-    db_settings = {s.key: s.value for s in result.scalars().all()}
+    snapshot = await settings_cache.get(db)
+    db_settings = snapshot.raw
 
-    # Get API keys (from DB first — decrypt — then fallback to env)
+    # Get API keys (from DB first — already decrypted — then fallback to env)
     def _get_key(db_key: str, env_fallback):
-        encrypted = db_settings.get(db_key)
-        return decrypt_value(encrypted) if encrypted else env_fallback
+        return snapshot.get(db_key) if db_settings.get(db_key) else env_fallback
 
     anthropic_key = _get_key("anthropic_api_key", app_settings.anthropic_api_key)
     openai_key = _get_key("openai_api_key", app_settings.openai_api_key)
@@ -174,6 +160,7 @@ async def update_settings(
             db.add(setting)
 
     await db.commit()
+    settings_cache.invalidate()
     # Don't return raw values — only confirm which keys were changed
     return {"status": "updated", "changes": list(updates.keys())}
 
@@ -207,6 +194,7 @@ async def delete_api_key(
     if setting:
         await db.delete(setting)
         await db.commit()
+        settings_cache.invalidate()
         return {"status": "deleted", "key": key_name}
     return {"status": "not_found", "key": key_name}
 
@@ -90,7 +90,7 @@ async def approve_tool(
         )
 
     # Grant or block permission
-    permission_manager.grant_permission(
+    await permission_manager.grant_permission(
         session_id=request.session_id,
         tool=request.tool,
         params=request.params,
@@ -121,7 +121,7 @@ async def revoke_permission(
     current_user: User = Depends(get_current_active_user),
 ):
     """Revoke a tool permission"""
-    permission_manager.revoke_permission(session_id, tool)
+    await permission_manager.revoke_permission(session_id, tool)
 
     audit = AuditLogger(db)
     await audit.log(
@@ -141,7 +141,7 @@ async def unblock_tool(
     current_user: User = Depends(get_current_active_user),
 ):
     """Remove a tool from the blocklist"""
-    permission_manager.unblock(tool, params)
+    await permission_manager.unblock(tool, params)
     return {"status": "unblocked", "tool": tool}
 
 
@@ -150,5 +150,5 @@ async def get_session_permissions(
     session_id: str, current_user: User = Depends(get_current_active_user)
 ):
     """Get all permissions for a session (debug)"""
-    permissions = permission_manager.get_session_permissions(session_id)
+    permissions = await permission_manager.get_session_permissions(session_id)
     return {"session_id": session_id, "permissions": permissions}
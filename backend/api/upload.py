@@ -2,19 +2,23 @@
 Axon by NeuroVexon - Document Upload API
 """
 
-import os
+import asyncio
+import json
 import logging
-from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
 
 from db.database import get_db
 from db.models import UploadedDocument, User
+from agent.conversation_context import conversation_context_cache
 from core.dependencies import get_current_active_user
-from agent.document_handler import is_allowed_file, extract_text, ALLOWED_EXTENSIONS
+from agent.document_handler import is_allowed_file, ALLOWED_EXTENSIONS
+from agent.blob_store import blob_store
+from agent.upload_jobs import TERMINAL_STATES, upload_jobs
 from core.security import sanitize_filename
 from core.i18n import t, set_language, get_lang_from_header
 
@@ -22,8 +26,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
-UPLOAD_DIR = "data/uploads"
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+SSE_KEEPALIVE = 15  # Sekunden
+JOB_POLL = 1.0  # Sekunden; Jobs eines anderen Workers werden abgefragt
 
 
 @router.post("")
@@ -34,7 +39,7 @@ async def upload_document(
     conversation_id: Optional[str] = Form(None),
     db: AsyncSession = Depends(get_db),
 ):
-    """Dokument hochladen und Text extrahieren"""
+    """Dokument hochladen; die Text-Extraktion laeuft als Job im Hintergrund"""
     set_language(get_lang_from_header(request.headers.get("accept-language")))
 
     if not file.filename:
@@ -46,51 +51,104 @@ async def upload_document(
             status_code=400, detail=t("upload.type_not_allowed", allowed=allowed)
         )
 
-    # Datei lesen und Groesse pruefen
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=t("upload.too_large", max_mb=MAX_FILE_SIZE // 1024 // 1024),
-        )
-
-    # Speicherpfad erstellen
+    # Datei in Chunks empfangen (Groessenlimit + SHA-256 unterwegs)
     safe_name = sanitize_filename(file.filename)
-    upload_subdir = conversation_id or "general"
-    upload_path = Path(UPLOAD_DIR) / upload_subdir
-    upload_path.mkdir(parents=True, exist_ok=True)
-    file_path = upload_path / safe_name
+    incoming, size, content_hash = await blob_store.receive(file, MAX_FILE_SIZE)
 
-    # Datei speichern
-    with open(file_path, "wb") as f:
-        f.write(content)
-
-    # Text extrahieren
-    extracted = extract_text(str(file_path), file.content_type)
-
-    # In DB speichern
+    # Gleicher Inhalt wird nur einmal gespeichert (Blob mit Referenzzaehler)
     doc = UploadedDocument(
         conversation_id=conversation_id,
         filename=safe_name,
         mime_type=file.content_type,
-        file_size=len(content),
-        extracted_text=extracted,
-        file_path=str(file_path),
+        file_size=size,
+        content_hash=content_hash,
+        extract_status="pending",
     )
-    db.add(doc)
-    await db.commit()
-    await db.refresh(doc)
+    blob, created = await blob_store.add_document(db, doc, incoming)
+
+    # Extraktion + Abschnitte/Embeddings einmal pro Inhalt, im Hintergrund
+    job = upload_jobs.start(doc, blob.file_path, file.content_type)
 
     return {
         "id": doc.id,
         "filename": doc.filename,
         "mime_type": doc.mime_type,
         "file_size": doc.file_size,
-        "has_text": bool(extracted and not extracted.startswith("[")),
-        "text_preview": extracted[:200] if extracted else "",
+        "sha256": content_hash,
+        "deduplicated": not created,
+        "has_text": False,
+        "text_preview": "",
+        "job_id": job.id,
+        "status": job.status,
     }
 
 
+@router.get("/jobs/{job_id}")
+async def get_upload_job(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+):
+    """Status der Text-Extraktion eines Uploads"""
+    set_language(get_lang_from_header(request.headers.get("accept-language")))
+    state = await upload_jobs.load(job_id)
+    if not state:
+        raise HTTPException(status_code=404, detail=t("upload.job_not_found"))
+    return state
+
+
+@router.get("/jobs/{job_id}/events")
+async def upload_job_events(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+):
+    """Job-Status per SSE, bis der Job fertig oder fehlgeschlagen ist"""
+    set_language(get_lang_from_header(request.headers.get("accept-language")))
+    job = upload_jobs.get(job_id)
+    if not job:
+        state = await upload_jobs.load(job_id)
+        if not state:
+            raise HTTPException(status_code=404, detail=t("upload.job_not_found"))
+        generator = _poll_job_events(job_id, state)
+    else:
+        generator = _job_events(job)
+
+    return StreamingResponse(
+        generator,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+    )
+
+
+async def _job_events(job):
+    """Events of a job running in this worker"""
+    while True:
+        sent = job.version
+        yield f"data: {json.dumps(job.to_dict())}\n\n"
+        if job.finished:
+            return
+        while not await job.wait_for_change(sent, SSE_KEEPALIVE):
+            yield ": keepalive\n\n"
+
+
+async def _poll_job_events(job_id: str, state: dict):
+    """Events of a job running in another worker (status from the database)"""
+    sent, idle = None, 0.0
+    while state is not None:
+        if state != sent:
+            yield f"data: {json.dumps(state)}\n\n"
+            sent, idle = state, 0.0
+        elif idle >= SSE_KEEPALIVE:
+            yield ": keepalive\n\n"
+            idle = 0.0
+        if state["status"] in TERMINAL_STATES:
+            return
+        await asyncio.sleep(JOB_POLL)
+        idle += JOB_POLL
+        state = await upload_jobs.load(job_id)
+
+
 @router.get("")
 async def list_documents(
     current_user: User = Depends(get_current_active_user),
@@ -132,13 +190,7 @@ async def delete_document(
     if not doc:
         raise HTTPException(status_code=404, detail=t("upload.not_found"))
 
-    # Datei loeschen
-    try:
-        if os.path.exists(doc.file_path):
-            os.unlink(doc.file_path)
-    except Exception as e:
-        logger.warning(f"Konnte Datei nicht loeschen: {e}")
-
-    await db.delete(doc)
-    await db.commit()
+    # Datei/Blob wird mit dem letzten Verweis geloescht
+    await blob_store.remove_document(db, doc)
+    conversation_context_cache.invalidate_documents(doc.conversation_id)
     return {"status": "deleted"}
@@ -4,14 +4,21 @@ Axon by NeuroVexon - Workflow API Endpoints
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from pydantic import BaseModel
 from typing import Optional
 
 from db.database import get_db
-from db.models import Workflow, WorkflowRun, User
+from db.models import Workflow, WorkflowRun, WorkflowStepResult, User
 from core.dependencies import get_current_active_user
-from agent.workflows import WorkflowEngine, workflow_to_dict, run_to_dict
+from agent.workflows import (
+    RunNotResumable,
+    WorkflowEngine,
+    plan_workflow_steps,
+    workflow_to_dict,
+    run_to_dict,
+    step_result_to_dict,
+)
 
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
@@ -23,7 +30,7 @@ class WorkflowCreate(BaseModel):
     description: Optional[str] = None
     trigger_phrase: Optional[str] = None
     agent_id: Optional[str] = None
-    steps: list[dict]  # [{order, prompt, store_as}]
+    steps: list[dict]  # [{order, prompt, store_as, depends_on?}]
     approval_mode: str = "each_step"
 
 
@@ -37,6 +44,14 @@ class WorkflowUpdate(BaseModel):
     enabled: Optional[bool] = None
 
 
+def _validate_steps(steps: list[dict]) -> None:
+    """depends_on must name earlier steps"""
+    try:
+        plan_workflow_steps(steps)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("")
 async def list_workflows(
     current_user: User = Depends(get_current_active_user),
@@ -85,6 +100,8 @@ async def create_workflow(
     if data.approval_mode not in ("each_step", "once_at_start", "never"):
         raise HTTPException(status_code=400, detail="Ungueltiger approval_mode")
 
+    _validate_steps(data.steps)
+
     wf = Workflow(
         name=data.name,
         description=data.description,
@@ -119,6 +136,9 @@ async def update_workflow(
     ):
         raise HTTPException(status_code=400, detail="Ungueltiger approval_mode")
 
+    if updates.get("steps"):
+        _validate_steps(updates["steps"])
+
     for key, value in updates.items():
         setattr(wf, key, value)
 
@@ -138,6 +158,11 @@ async def delete_workflow(
     if not wf:
         raise HTTPException(status_code=404, detail="Workflow nicht gefunden")
 
+    run_ids = select(WorkflowRun.id).where(WorkflowRun.workflow_id == workflow_id)
+    await db.execute(
+        delete(WorkflowStepResult).where(WorkflowStepResult.run_id.in_(run_ids))
+    )
+    await db.execute(delete(WorkflowRun).where(WorkflowRun.workflow_id == workflow_id))
     await db.delete(wf)
     await db.commit()
     return {"status": "deleted"}
@@ -174,3 +199,40 @@ async def workflow_history(
     )
     runs = result.scalars().all()
     return [run_to_dict(r) for r in runs]
+
+
+@router.post("/runs/{run_id}/resume")
+async def resume_workflow_run(
+    run_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Fehlgeschlagenen Run ab dem ersten unfertigen Step fortsetzen"""
+    run = await db.get(WorkflowRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run nicht gefunden")
+
+    engine = WorkflowEngine(db)
+    try:
+        run = await engine.resume_run(run_id)
+    except RunNotResumable as e:
+        # Not failed/cancelled, or resumed concurrently by another request
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return run_to_dict(run)
+
+
+@router.get("/runs/{run_id}/steps")
+async def workflow_run_steps(
+    run_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Checkpoints eines Runs (fertige Steps)"""
+    result = await db.execute(
+        select(WorkflowStepResult)
+        .where(WorkflowStepResult.run_id == run_id)
+        .order_by(WorkflowStepResult.step_index)
+    )
+    return [step_result_to_dict(cp) for cp in result.scalars().all()]
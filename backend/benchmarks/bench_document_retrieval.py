@@ -0,0 +1,163 @@
+"""
+Axon by NeuroVexon - Benchmark: Chunked Document Retrieval
+
+Laedt ein synthetisches 100-Seiten-Dokument in eine In-Memory-DB und vergleicht
+pro Turn:
+- legacy: ganzes Dokument im Intro, auf 8000 Zeichen gekuerzt (alter Pfad)
+- chunked: nur die top-k Abschnitte zur User-Nachricht
+
+Gemessen werden Prompt-Tokens pro Turn, Trefferquote (steht der gefragte Fakt
+im Prompt?) und Retrieval-Latenz. Embeddings kommen aus einem lokalen
+Hashing-Embedder (Bag-of-Words), damit kein Ollama noetig ist.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_document_retrieval [--pages 100] [--turns 200] [--top-k 6]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import zlib
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.conversation_context import (  # noqa: E402
+    ConversationContextCache,
+    estimate_tokens,
+)
+from agent.document_chunks import index_document  # noqa: E402
+from agent.document_handler import format_for_context  # noqa: E402
+from core.i18n import t  # noqa: E402
+from db.database import Base  # noqa: E402
+from db.models import Conversation, UploadedDocument  # noqa: E402
+
+DIM = 256
+_FILLER = (
+    "Der Bericht beschreibt Ablaeufe, Zustaendigkeiten und Termine im Projekt. "
+    "Weitere Details finden sich in den Anlagen und im Protokoll der Sitzung. "
+)
+
+
+class HashingEmbedder:
+    """Bag-of-words hashing embedder (stands in for nomic-embed-text)"""
+
+    def _vector(self, text: str) -> list[float]:
+        vec = np.zeros(DIM, dtype=np.float32)
+        for word in text.lower().split():
+            vec[zlib.crc32(word.strip(".,:;?!").encode()) % DIM] += 1.0
+        return vec.tolist()
+
+    async def embed(self, text: str):
+        return self._vector(text)
+
+    async def embed_batch(self, texts: list[str]):
+        return [self._vector(text) for text in texts]
+
+
+def _document(pages: int) -> str:
+    parts = []
+    for page in range(pages):
+        fact = f"Kennzahl der Abteilung {page:03d}: Budget {1000 + page * 7} Euro."
+        body = _FILLER * 18
+        middle = len(body) // 2
+        parts.append(f"Seite {page + 1}\n{body[:middle]}{fact} {body[middle:]}")
+    return "\n\n".join(parts)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=6)
+    args = parser.parse_args()
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    embedder = HashingEmbedder()
+    text = _document(args.pages)
+    print(f"Dokument: {args.pages} Seiten, {len(text)} Zeichen")
+
+    async with session_factory() as db:
+        conv = Conversation(title="bench")
+        db.add(conv)
+        await db.flush()
+        doc = UploadedDocument(
+            conversation_id=conv.id,
+            filename="bericht.pdf",
+            extracted_text=text,
+            file_path="bericht.pdf",
+        )
+        db.add(doc)
+        await db.flush()
+        start = time.perf_counter()
+        chunks = await index_document(db, doc, embedder)
+        await db.commit()
+        print(
+            f"Index: {chunks} Abschnitte in "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms (inkl. Embedding)"
+        )
+
+        cache = ConversationContextCache(document_top_k=args.top_k)
+        await cache.load(db, conv)
+        start = time.perf_counter()
+        await cache.get_documents(db, conv.id, "start", embedder)
+        print(
+            f"Erstes Laden der Vektoren: {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+        legacy_block = (
+            t("chat.docs_uploaded") + "\n" + format_for_context(doc.filename, text)
+        )
+        rng = random.Random(42)
+        legacy_tokens, chunked_tokens, latencies = [], [], []
+        legacy_hits = chunked_hits = 0
+        for _ in range(args.turns):
+            page = rng.randrange(args.pages)
+            question = f"Wie hoch ist das Budget der Abteilung {page:03d}?"
+            answer = f"Budget {1000 + page * 7} Euro"
+
+            start = time.perf_counter()
+            block = await cache.get_documents(db, conv.id, question, embedder)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            legacy_tokens.append(estimate_tokens(legacy_block))
+            chunked_tokens.append(estimate_tokens(block))
+            legacy_hits += answer in legacy_block
+            chunked_hits += answer in block
+
+    await engine.dispose()
+
+    print(f"{args.turns} Turns, top-k {args.top_k}")
+    print(
+        f"legacy   {statistics.mean(legacy_tokens):7.0f} Tokens/Turn   "
+        f"Treffer {legacy_hits / args.turns:6.1%}"
+    )
+    print(
+        f"chunked  {statistics.mean(chunked_tokens):7.0f} Tokens/Turn   "
+        f"Treffer {chunked_hits / args.turns:6.1%}"
+    )
+    print(
+        f"Retrieval p50 {statistics.median(latencies):6.2f} ms   "
+        f"p99 {_percentile(latencies, 0.99):6.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Axon by NeuroVexon - Benchmark: Embedding Cache + Batched Backfill
+
+Startet einen lokalen Stub fuer Ollama /api/embed (mit simulierter
+Modell-Latenz pro Request) und vergleicht den Embedding-Durchsatz:
+- per-row: ein Request pro Text, kein Cache (alter Lazy-Pfad)
+- batch:   embed_batch in Batches, kalter Cache
+- warm:    dieselben Texte erneut, alle Treffer im Cache
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_embedding_cache [--texts 500] [--batch 32] [--delay-ms 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.embedding_cache import EmbeddingCache  # noqa: E402
+from agent.embeddings import EmbeddingProvider  # noqa: E402
+
+DIM = 768
+
+
+def _make_handler(delay: float):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Minimal HTTP/1.1 server answering /api/embed with constant vectors"""
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                payload = json.loads(await reader.readexactly(length)) if length else {}
+                texts = payload.get("input", [])
+                if isinstance(texts, str):
+                    texts = [texts]
+                await asyncio.sleep(delay)
+                body = json.dumps({"embeddings": [[0.1] * DIM for _ in texts]})
+                body = body.encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                    b"Connection: keep-alive\r\n\r\n" + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+def _provider(base_url: str, cache) -> EmbeddingProvider:
+    provider = EmbeddingProvider(cache=cache)
+    provider.base_url = base_url
+    provider._available = True
+    provider._checked_at = time.monotonic()
+    return provider
+
+
+async def _timed(label: str, count: int, coro):
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {elapsed * 1000:9.1f} ms   {count / elapsed:9.0f} texts/s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--texts", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    server = await asyncio.start_server(
+        _make_handler(args.delay_ms / 1000), "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+    print(
+        f"Stub server on {base_url}, {args.texts} texts, batch {args.batch}, "
+        f"{args.delay_ms} ms per request"
+    )
+
+    texts = [f"Memory Nummer {i}: Projektnotiz" for i in range(args.texts)]
+
+    async def per_row(provider):
+        for text in texts:
+            await provider.embed(text)
+
+    async def batched(provider):
+        for start in range(0, len(texts), args.batch):
+            await provider.embed_batch(texts[start : start + args.batch])
+
+    await _timed("per-row", len(texts), per_row(_provider(base_url, None)))
+
+    cached = _provider(base_url, EmbeddingCache(max_entries=len(texts)))
+    await _timed("batch", len(texts), batched(cached))
+    await _timed("warm", len(texts), batched(cached))
+    print(f"cache    {cached.cache.stats()}")
+
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
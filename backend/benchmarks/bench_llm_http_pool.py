@@ -0,0 +1,137 @@
+"""
+Axon by NeuroVexon - Benchmark: LLM HTTP Connection Pooling
+
+Startet einen lokalen Keep-Alive-Stub, der wie Ollama /api/chat antwortet,
+und vergleicht den Overhead pro Turn:
+- legacy: neuer httpx.AsyncClient pro Request (TCP-Handshake jedes Mal)
+- pooled: OllamaProvider.chat mit langlebigem Client
+
+Misst nur den Transport-Overhead, kein echtes LLM.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_llm_http_pool [--turns 500] [--concurrency 1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm.ollama import OllamaProvider  # noqa: E402
+from llm.provider import ChatMessage  # noqa: E402
+
+_BODY = json.dumps(
+    {
+        "model": "stub",
+        "message": {"role": "assistant", "content": "ok"},
+        "done": True,
+        "prompt_eval_count": 10,
+        "eval_count": 1,
+    }
+).encode()
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal HTTP/1.1 keep-alive server: reads a request, sends a JSON reply"""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Content-Length: " + str(len(_BODY)).encode() + b"\r\n"
+                b"Connection: keep-alive\r\n\r\n" + _BODY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _legacy_chat(base_url: str, messages: list[dict]):
+    async with httpx.AsyncClient(timeout=120.0) as client:
+        response = await client.post(
+            f"{base_url}/api/chat",
+            json={"model": "stub", "messages": messages, "stream": False},
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+async def _run(label: str, call, turns: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    timings: list[float] = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            timings.append((time.perf_counter() - start) * 1000)
+
+    await call()  # Warm-up
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(turns)))
+    total = time.perf_counter() - start
+
+    p50 = statistics.median(timings)
+    p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+    print(
+        f"{label:<8} p50 {p50:7.3f} ms   p95 {p95:7.3f} ms   "
+        f"{turns / total:8.0f} turns/s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+    print(
+        f"Stub server on {base_url}, {args.turns} turns, concurrency {args.concurrency}"
+    )
+
+    messages = [{"role": "user", "content": "hi"}]
+    await _run(
+        "legacy",
+        lambda: _legacy_chat(base_url, messages),
+        args.turns,
+        args.concurrency,
+    )
+
+    provider = OllamaProvider()
+    provider.base_url = base_url
+    provider.model = "stub"
+    chat_messages = [ChatMessage(role="user", content="hi")]
+    await _run(
+        "pooled",
+        lambda: provider.chat(chat_messages),
+        args.turns,
+        args.concurrency,
+    )
+    await provider.aclose()
+
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
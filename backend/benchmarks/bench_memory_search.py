@@ -0,0 +1,94 @@
+"""
+Axon by NeuroVexon - Benchmark: Memory Search
+
+Vergleicht die Query-Latenz der alten Per-Row-Suche (struct.unpack +
+cosine_similarity pro Memory) mit dem MemoryIndex (exact / ivf / hnsw)
+bei 1k, 10k und 100k Memories. Reines In-Memory, keine DB und kein Ollama.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_memory_search [--dim 768] [--queries 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.embeddings import cosine_similarity  # noqa: E402
+from agent.memory import _serialize_embedding, _deserialize_embedding  # noqa: E402
+from agent.memory_index import MemoryIndex  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000)
+# Per-Row-Suche ist bei 100k extrem langsam — nur wenige Queries messen
+LEGACY_MAX_QUERIES = 3
+
+
+def _legacy_search(query: list[float], blobs: list[bytes], limit: int = 10):
+    scored = []
+    for i, blob in enumerate(blobs):
+        score = cosine_similarity(query, _deserialize_embedding(blob))
+        scored.append((score, i))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [i for score, i in scored if score > 0.3][:limit]
+
+
+def _time_ms(fn, queries) -> list[float]:
+    timings = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _fmt(timings: list[float]) -> str:
+    p50 = statistics.median(timings)
+    p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+    return f"p50 {p50:9.2f} ms   p95 {p95:9.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    for n in SIZES:
+        vectors = rng.normal(size=(n, args.dim)).astype(np.float32)
+        queries = [
+            (vectors[i] + rng.normal(scale=0.1, size=args.dim)).tolist()
+            for i in rng.choice(n, args.queries, replace=False)
+        ]
+        print(f"\n=== {n:,} memories, dim={args.dim} ===")
+
+        if not args.skip_legacy:
+            blobs = [_serialize_embedding(v.tolist()) for v in vectors]
+            timings = _time_ms(
+                lambda q: _legacy_search(q, blobs), queries[:LEGACY_MAX_QUERIES]
+            )
+            print(f"legacy per-row     {_fmt(timings)}")
+            del blobs
+
+        for mode in ("exact", "ivf", "hnsw"):
+            index = MemoryIndex(mode=mode, ann_threshold=0)
+            start = time.perf_counter()
+            for i, v in enumerate(vectors):
+                index.upsert(f"m{i}", v)
+            index.search(queries[0])  # Warm-up (IVF-Training / HNSW-Aufbau)
+            build_ms = (time.perf_counter() - start) * 1000
+            label = index.mode if index.mode == mode else f"{mode}->{index.mode}"
+            timings = _time_ms(lambda q: index.search(q, k=10), queries)
+            print(f"{label:<18} {_fmt(timings)}   (build {build_ms:,.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Axon by NeuroVexon - Benchmark: Rate Limiter
+
+Vergleicht den alten RateLimiter (Liste von datetime pro Key, bei jedem
+Aufruf per List Comprehension neu aufgebaut, keine Eviction) mit
+SlidingWindowLimiter und TokenBucketLimiter:
+
+- Zeit pro Pruefung bei N verschiedenen Keys (z.B. Client-IPs auf /mcp)
+- Zeit pro Pruefung fuer einen heissen Key nahe am Limit
+- Speicher nach dem Lauf (tracemalloc) und verbleibende Keys nach Leerlauf
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_rate_limiter [--keys 100000] [--hits 5] [--limit 60]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.rate_limit import SlidingWindowLimiter, TokenBucketLimiter  # noqa: E402
+
+
+class LegacyRateLimiter:
+    """Old core.security.RateLimiter (before the O(1) limiters)"""
+
+    def __init__(self, max_requests: int = 60, window_seconds: int = 60):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._requests: dict[str, list[datetime]] = {}
+
+    def is_allowed(self, key: str) -> bool:
+        now = datetime.utcnow()
+        window_start = now - timedelta(seconds=self.window_seconds)
+        if key not in self._requests:
+            self._requests[key] = []
+        self._requests[key] = [t for t in self._requests[key] if t > window_start]
+        if len(self._requests[key]) >= self.max_requests:
+            return False
+        self._requests[key].append(now)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+
+class _Clock:
+    """Fake monotonic clock, so idle eviction can be shown without waiting"""
+
+    def __init__(self):
+        self.now = time.monotonic()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _memory_mb(make, keys: list[str], hits: int) -> float:
+    tracemalloc.start()
+    limiter = make(_Clock())
+    for _ in range(hits):
+        for key in keys:
+            limiter.is_allowed(key)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory / 1024 / 1024
+
+
+def _run(make, keys: list[str], hits: int, limit: int) -> dict:
+    clock = _Clock()
+    limiter = make(clock)
+
+    start = time.perf_counter()
+    for _ in range(hits):
+        for key in keys:
+            limiter.is_allowed(key)
+    distinct_us = (time.perf_counter() - start) / (hits * len(keys)) * 1e6
+
+    hot = limit * 20
+    start = time.perf_counter()
+    for _ in range(hot):
+        limiter.is_allowed("hot-key")
+    hot_us = (time.perf_counter() - start) / hot * 1e6
+
+    # Ten minutes idle, then one request from a new client
+    clock.now += 600
+    limiter.is_allowed("after-idle")
+    return {
+        "distinct_us": distinct_us,
+        "hot_us": hot_us,
+        "memory_mb": _memory_mb(make, keys, hits),
+        "keys_after_idle": len(limiter),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--hits", type=int, default=5, help="Anfragen pro Key")
+    parser.add_argument("--limit", type=int, default=60, help="Anfragen pro Minute")
+    args = parser.parse_args()
+
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.keys)]
+    limit = args.limit
+    candidates = {
+        "alt (Liste)": lambda clock: LegacyRateLimiter(limit, 60),
+        "Sliding Window": lambda clock: SlidingWindowLimiter(
+            limit, 60, max_keys=args.keys * 2, clock=clock
+        ),
+        "Token Bucket": lambda clock: TokenBucketLimiter(
+            limit / 60, limit, max_keys=args.keys * 2, clock=clock
+        ),
+    }
+
+    print(f"{args.keys} Keys x {args.hits} Anfragen, Limit {limit}/min")
+    print(
+        f"{'Limiter':16} {'us/Key':>8} {'us/heiss':>9} {'Speicher MB':>12} "
+        f"{'Keys nach Leerlauf':>19}"
+    )
+    for name, make in candidates.items():
+        r = _run(make, keys, args.hits, limit)
+        print(
+            f"{name:16} {r['distinct_us']:8.2f} {r['hot_us']:9.2f} "
+            f"{r['memory_mb']:12.1f} {r['keys_after_idle']:19d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
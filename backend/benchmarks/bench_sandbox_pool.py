@@ -0,0 +1,89 @@
+"""
+Axon by NeuroVexon - Benchmark: Sandbox Container Pool
+
+Vergleicht die Latenz von code_execute (kleines Python-Snippet):
+- cold: docker run --rm pro Aufruf (Temp-Datei + Bind-Mount)
+- pooled: docker exec in vorgestartete Container (SandboxPool)
+
+Braucht Docker und das Sandbox-Image (axon-sandbox:latest).
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_sandbox_pool [--runs 30] [--pool-size 2]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sandbox import executor  # noqa: E402
+from sandbox.pool import SandboxPool  # noqa: E402
+
+_CODE = "print(sum(range(1000)))"
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def _run(label: str, call, runs: int, pause: float):
+    timings: list[float] = []
+    await call()  # Warm-up
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await call()
+        timings.append((time.perf_counter() - start) * 1000)
+        if result.exit_code != 0:
+            print(f"{label}: exit {result.exit_code}: {result.stderr[:200]}")
+            return
+        if pause:
+            await asyncio.sleep(pause)  # Pool-Refill wie bei realen Abstaenden
+    print(
+        f"{label:<7} p50 {statistics.median(timings):8.1f} ms   "
+        f"p99 {_percentile(timings, 0.99):8.1f} ms   "
+        f"max {max(timings):8.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument(
+        "--pause", type=float, default=1.0, help="Sekunden zwischen Aufrufen"
+    )
+    args = parser.parse_args()
+
+    if not await executor._check_docker():
+        print("Docker ist nicht verfuegbar — Benchmark uebersprungen")
+        return
+    if not await executor._check_image_exists():
+        print(f"Image {executor.SANDBOX_IMAGE} fehlt — erst bauen:")
+        print(
+            "  docker build -t axon-sandbox:latest -f sandbox/Dockerfile.sandbox sandbox"
+        )
+        return
+
+    print(f"{args.runs} Aufrufe, Pool-Groesse {args.pool_size}")
+
+    cold_pool = SandboxPool(image=executor.SANDBOX_IMAGE, size=0)
+    executor.sandbox_pool = cold_pool
+    await _run("cold", lambda: executor.execute_code(_CODE), args.runs, 0)
+
+    pool = SandboxPool(image=executor.SANDBOX_IMAGE, size=args.pool_size)
+    executor.sandbox_pool = pool
+    pool.fill()
+    await asyncio.sleep(3)  # Container vorstarten lassen
+    await _run("pooled", lambda: executor.execute_code(_CODE), args.runs, args.pause)
+    print(f"Pool: {pool.stats()}")
+    await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
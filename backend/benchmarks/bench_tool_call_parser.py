@@ -0,0 +1,155 @@
+"""
+Axon by NeuroVexon - Benchmark: Text Tool-Call Parser
+
+Vergleicht den alten Fallback-Parser (drei Regex-Strategien auf dem fertigen
+Text, ein Muster pro Tool-Name) mit TextToolCallParser, der die gestreamten
+Deltas einzeln bekommt:
+
+- Laufzeit pro Antwort (alt: einmal am Ende, neu: Summe aller feed()-Aufrufe)
+- Latenz nach dem letzten Delta (alt: ganzer Parse, neu: finish())
+- Erkennung: bei wie viel Prozent des Streams der Tool-Call gemeldet wird
+  (alt immer erst nach dem letzten Delta)
+
+Szenarien: lange Antwort ohne Call, Call am Anfang, Call am Ende, jeweils
+mit vielen registrierten Tools.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_tool_call_parser [--chars 50000] [--tools 200] [--delta 4]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm.text_tool_calls import TextToolCallParser  # noqa: E402
+
+_PROSE = (
+    "Die Auswertung zeigt, dass die Ablaeufe (Planung, Umsetzung, Review) "
+    "stabil laufen; Details stehen im Bericht vom 3. Mai. "
+)
+
+
+def legacy_parse(text: str, available_tools: list[dict]):
+    """Old _parse_tool_calls_from_text (before the incremental parser)"""
+    if not text or not available_tools:
+        return None
+    tool_names = {t["function"]["name"] for t in available_tools}
+    match = re.search(r"\[TOOL_CALLS\]\s*(\[.*?\])", text, re.DOTALL)
+    if match:
+        try:
+            calls = [c for c in json.loads(match.group(1)) if c["name"] in tool_names]
+            if calls:
+                return calls
+        except (json.JSONDecodeError, KeyError):
+            pass
+    fence_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
+    if fence_match:
+        try:
+            obj = json.loads(fence_match.group(1))
+            if obj.get("name") in tool_names and obj.get("arguments"):
+                return [obj]
+        except json.JSONDecodeError:
+            pass
+    for tool_name in tool_names:
+        pattern = rf"{re.escape(tool_name)}\s*\((.+?)\)"
+        match = re.search(pattern, text, re.DOTALL)
+        if match:
+            args = dict(re.findall(r'(\w+)\s*=\s*["\']([^"\']*)["\']', match.group(1)))
+            if args:
+                return [{"name": tool_name, "arguments": args}]
+    return None
+
+
+def _tools(count: int) -> list[dict]:
+    names = ["web_search", "memory_save"] + [
+        f"plugin_tool_{i:03d}" for i in range(count)
+    ]
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": name,
+                "parameters": {"type": "object", "required": ["query"]},
+            },
+        }
+        for name in names[:count]
+    ]
+
+
+def _scenarios(chars: int) -> dict[str, str]:
+    prose = (_PROSE * (chars // len(_PROSE) + 1))[:chars]
+    call = 'web_search(query="axon benchmark")'
+    marker = '[TOOL_CALLS] [{"name": "memory_save", "arguments": {"key": "k"}}]'
+    return {
+        "ohne Call": prose,
+        "Call am Anfang": marker + "\n" + prose,
+        "Call am Ende": prose + "\n" + call,
+    }
+
+
+def _timed(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chars", type=int, default=50000)
+    parser.add_argument("--tools", type=int, default=200)
+    parser.add_argument("--delta", type=int, default=4, help="Zeichen pro Delta")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tools = _tools(args.tools)
+    print(f"{args.tools} Tools, ~{args.chars} Zeichen, Deltas zu {args.delta} Zeichen")
+    print(
+        f"{'Szenario':16} {'alt ms':>9} {'neu ms':>9} {'neu Ende ms':>12} "
+        f"{'Erkennung':>10}"
+    )
+
+    for name, text in _scenarios(args.chars).items():
+        deltas = [text[i : i + args.delta] for i in range(0, len(text), args.delta)]
+
+        legacy_ms = _timed(lambda: legacy_parse(text, tools), args.repeat)
+
+        def incremental():
+            p = TextToolCallParser(tools)
+            for delta in deltas:
+                p.feed(delta)
+            p.finish()
+
+        new_ms = _timed(incremental, args.repeat)
+
+        fed = TextToolCallParser(tools)
+        for delta in deltas:
+            fed.feed(delta)
+        start = time.perf_counter()
+        fed.finish()
+        finish_ms = (time.perf_counter() - start) * 1000
+
+        detected_at = None
+        p = TextToolCallParser(tools)
+        for i, delta in enumerate(deltas):
+            if p.feed(delta):
+                detected_at = (i + 1) / len(deltas)
+                break
+        detection = f"{detected_at:9.1%}" if detected_at is not None else "        -"
+        print(
+            f"{name:16} {legacy_ms:9.2f} {new_ms:9.2f} {finish_ms:12.3f} "
+            f"{detection:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -58,6 +58,12 @@ class Settings(BaseSettings):
     openrouter_api_key: Optional[str] = None
     openrouter_model: str = "anthropic/claude-sonnet-4"
 
+    # LLM HTTP Connection Pool (pro Provider)
+    llm_http_max_connections: int = 20
+    llm_http_max_keepalive: int = 10
+    llm_http_keepalive_expiry: float = 30.0  # Sekunden
+    llm_http2: bool = False  # Braucht h2 (pip install "httpx[http2]")
+
     # Security — auto-generated if not set via env
     secret_key: str = ""
 
@@ -67,12 +73,94 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
     registration_enabled: bool = True
+    auth_principal_cache_ttl: int = 60  # Sekunden, 0 = jeder Request fragt die DB
+    auth_principal_cache_size: int = 1024
+    auth_principal_sync_seconds: float = 2.0  # Aenderungen anderer Worker
+    auth_trust_token_claims: bool = False  # role/active aus dem Token statt DB
 
     # Tool Execution
     outputs_dir: str = "./outputs"
     max_file_size_mb: int = 10
+    upload_extract_workers: int = 2  # Prozesse fuer Text-Extraktion, 0 = Thread
+    upload_wait_seconds: float = 30.0  # Chat wartet auf laufende Uploads, 0 = nie
     code_execution_timeout: int = 30
     code_execution_memory_mb: int = 256
+    sandbox_pool_size: int = 2  # Vorgestartete Container, 0 = docker run pro Aufruf
+    sandbox_container_ttl: int = (
+        300  # Sekunden bis ein unbenutzter Container ersetzt wird
+    )
+    agent_max_parallel_tools: int = 4  # Pro Session, 1 = sequentiell
+
+    # Task Scheduler
+    scheduler_max_active_tasks: int = 500  # Geplante Tasks insgesamt
+    scheduler_max_concurrent: int = 4  # Gleichzeitige Task-Ausfuehrungen
+    scheduler_provider_concurrency: str = "ollama=1"  # Pro Provider, z.B. "claude=4"
+    scheduler_default_provider_concurrency: int = 2  # Provider ohne eigenen Wert
+    scheduler_jitter_seconds: int = 60  # Zufaelliger Versatz pro Lauf, 0 = aus
+    scheduler_lock_path: str = "./data/scheduler.lock"  # Leader-Wahl der Worker
+    scheduler_sync_seconds: int = 30  # Leader uebernimmt Aenderungen anderer Worker
+
+    # Settings-Cache: Aenderungen anderer Worker spaetestens nach so vielen Sek.
+    settings_cache_check_seconds: float = 2.0
+
+    # Workflows
+    workflow_max_parallel_steps: int = 4  # Unabhaengige Steps parallel, 1 = seriell
+    workflow_step_cache_ttl: int = 0  # Sek. Wiederverwendung, 0 = aus
+
+    # Rate Limiting (pro Client-IP und Route, 0 = Policy aus)
+    rate_limit_chat_per_minute: int = 0  # POST /chat/send, /stream, /agent, 0 = aus
+    rate_limit_chat_burst: int = 10
+    rate_limit_mcp_per_minute: int = 60
+    rate_limit_auth_per_minute: int = 10  # Login, Registrierung
+    rate_limit_upload_per_minute: int = 0  # 0 = aus
+    rate_limit_upload_burst: int = 5
+    rate_limit_max_keys: int = 100_000  # Max. gemerkte Clients pro Policy
+    rate_limit_trusted_proxies: str = "127.0.0.1,::1"  # X-Forwarded-For von hier
+
+    # Approval Bus (Tool-Freigaben und Session-Grants)
+    approval_backend: str = "memory"  # memory, sqlite (mehrere Uvicorn-Worker)
+    approval_db_path: str = "./data/approvals.db"  # Gemeinsame Datei fuer sqlite
+    approval_poll_interval: float = 0.2  # Sekunden zwischen zwei Polls
+
+    # Web Fetch (web_fetch Tool)
+    web_fetch_max_chars: int = 10000  # Zeichen, die an das LLM gehen
+    web_fetch_max_bytes: int = 1_000_000  # Danach wird nicht weiter gelesen
+    web_fetch_timeout: float = 30.0  # Sekunden
+    web_fetch_max_connections: int = 10
+    web_fetch_cache_path: str = "./data/web_cache.db"  # Leer = kein HTTP-Cache
+    web_fetch_cache_max_entries: int = 5000
+    web_fetch_cache_default_ttl: int = 0  # Sekunden frisch ohne Cache-Header
+
+    # Web Search (web_search Tool)
+    web_search_cache_ttl: int = 900  # Sekunden, 0 = kein Ergebnis-Cache
+    web_search_cache_size: int = 1024  # Queries im Cache
+
+    # Audit Log Writer
+    audit_sync: bool = False  # True = jedes Event sofort committen (Compliance)
+    audit_batch_size: int = 100
+    audit_max_latency_ms: int = 200  # Spaetestens nach so vielen ms schreiben
+    audit_queue_max: int = 10000  # Volle Queue bremst die Aufrufer
+    audit_write_retries: int = 5  # Wiederholungen pro Batch bei Schreibfehlern
+    audit_retry_backoff_ms: int = 100  # Verdoppelt sich pro Versuch
+    audit_export_chunk_size: int = 1000  # Zeilen pro Chunk beim Streaming-Export
+
+    # Embedding Cache
+    embedding_cache_size: int = 4096  # Eintraege im In-Memory LRU
+    embedding_cache_path: str = "./data/embedding_cache.db"  # Leer = kein Disk-Cache
+    embedding_backfill_batch_size: int = 32  # Texte pro embed_batch-Aufruf
+
+    # Conversation Context
+    context_max_tokens: int = 6000  # Token-Budget fuer das Nachrichtenfenster
+    context_cache_size: int = 256  # Max. Conversations im Context-Cache
+    context_summary_min_messages: int = 20  # Zusammenfassen ab so vielen alten Msgs
+    document_chunk_size: int = 1200  # Zeichen pro Dokument-Abschnitt
+    document_chunk_overlap: int = 200  # Ueberlappung zwischen Abschnitten
+    document_top_k: int = 6  # Abschnitte pro Turn im Prompt
+
+    # Memory Vector Index
+    memory_index_mode: str = "exact"  # exact, ivf, hnsw (hnsw braucht hnswlib)
+    memory_index_ann_threshold: int = 20000  # ANN-Modi erst ab so vielen Memories
+    memory_index_check_seconds: float = 2.0  # Abgleich mit anderen Workern (0 = immer)
 
     # E-Mail Integration
     email_enabled: bool = False
@@ -2,6 +2,8 @@
 Axon by NeuroVexon - Auth Dependencies
 """
 
+import time
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
@@ -9,6 +11,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.database import get_db
 from db.models import User
+from core.config import settings
+from core.principal_cache import (
+    detached_principal,
+    principal_cache,
+    principal_from_claims,
+)
 from core.security import decode_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -18,7 +26,7 @@ async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
 ) -> User:
-    """Decode JWT and load user from DB"""
+    """Decode JWT and load user (principal cache first, then DB)"""
     payload = decode_token(token)
     if payload is None or payload.get("type") != "access":
         raise HTTPException(
@@ -35,14 +43,30 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    iat = payload.get("iat")
+    await principal_cache.sync(db)
+    user = principal_cache.get(user_id, iat)
+    if user is not None:
+        return user
+
+    if settings.auth_trust_token_claims and not principal_cache.claims_stale(
+        user_id, iat
+    ):
+        user = principal_from_claims(payload)
+    loaded_at = None
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        loaded_at = time.time()
+        result = await db.execute(select(User).where(User.id == user_id))
+        db_user = result.scalar_one_or_none()
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user = detached_principal(db_user)
+
+    principal_cache.put(user_id, iat, user, loaded_at=loaded_at)
     return user
 
 
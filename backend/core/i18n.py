@@ -13,6 +13,7 @@ _current_language: ContextVar[str] = ContextVar("lang", default="de")
 TRANSLATIONS = {
     "de": {
         # Auth
+        "security.rate_limited": "Zu viele Anfragen, bitte spaeter erneut versuchen",
         "auth.registration_disabled": "Registrierung ist deaktiviert",
         "auth.email_exists": "E-Mail-Adresse bereits registriert",
         "auth.invalid_credentials": "Ungueltige E-Mail oder Passwort",
@@ -23,6 +24,9 @@ TRANSLATIONS = {
         "auth.user_created": "Benutzer erfolgreich erstellt",
         "auth.first_user_admin": "Erster Benutzer wird automatisch Administrator",
         "auth.logout_success": "Erfolgreich abgemeldet",
+        "auth.invalid_role": "Ungueltige Rolle",
+        "auth.cannot_modify_self": "Eigenes Konto kann hier nicht geaendert werden",
+        "auth.user_not_found": "Benutzer nicht gefunden",
         # Orchestrator
         "orch.agent_no_access": "Agent '{agent}' hat keinen Zugriff auf {tool}",
         "orch.tool_not_allowed": "Tool {tool} ist fuer diesen Agent nicht erlaubt.",
@@ -34,11 +38,14 @@ TRANSLATIONS = {
         "chat.intro_default": "Ich bin Axon, dein KI-Assistent.",
         "chat.intro_agent": "Ich bin {name}, dein KI-Assistent.",
         "chat.docs_uploaded": "Der User hat folgende Dokumente hochgeladen:",
+        "chat.summary_intro": "Bisheriger Gespraechsverlauf (Zusammenfassung):",
+        "chat.summary_prompt": "Fasse den folgenden Gespraechsverlauf in wenigen Saetzen zusammen. Behalte Fakten, Entscheidungen und offene Fragen bei.\n\nBisherige Zusammenfassung:\n{summary}\n\nNeue Nachrichten:\n{transcript}",
         # Upload
         "upload.no_filename": "Kein Dateiname",
         "upload.type_not_allowed": "Dateityp nicht erlaubt. Erlaubt: {allowed}",
         "upload.too_large": "Datei zu gross (max {max_mb} MB)",
         "upload.not_found": "Dokument nicht gefunden",
+        "upload.job_not_found": "Upload-Job nicht gefunden",
         # Settings
         "settings.not_configured": "Nicht konfiguriert",
         # Scheduler
@@ -56,6 +63,7 @@ TRANSLATIONS = {
         "scheduler.intro": "Ich bin Axon. Ich fuehre jetzt den geplanten Task '{name}' aus.",
         "scheduler.no_response": "Keine Antwort vom LLM",
         "scheduler.not_found": "Task nicht gefunden",
+        "scheduler.already_running": "Task laeuft bereits",
         # Tool handlers
         "tool.memory_saved": "Gespeichert: '{key}' — {content}",
         "tool.memory_not_found": "Keine Erinnerungen gefunden.",
@@ -69,6 +77,11 @@ TRANSLATIONS = {
         "wf.step_intro": "Ich fuehre Workflow '{name}' aus, Step {step}/{total}.",
         "wf.no_response": "Keine Antwort",
         "wf.var_missing": "[{var} nicht vorhanden]",
+        "wf.invalid_dependency": "Step {step}: depends_on '{var}' ist kein frueherer Step",
+        "wf.run_not_found": "Workflow-Run {id} nicht gefunden",
+        "wf.not_resumable": "Run mit Status '{status}' kann nicht fortgesetzt werden",
+        "wf.cancelled": "Run abgebrochen",
+        "wf.interrupted": "Run unterbrochen: Server wurde neu gestartet",
         # Tool descriptions (DE)
         "tool.desc.file_read": "Liest den Inhalt einer Datei",
         "tool.desc.file_write": "Schreibt Inhalt in eine Datei (nur im /outputs/ Verzeichnis)",
@@ -110,6 +123,7 @@ TRANSLATIONS = {
     },
     "en": {
         # Auth
+        "security.rate_limited": "Too many requests, please try again later",
         "auth.registration_disabled": "Registration is disabled",
         "auth.email_exists": "Email address already registered",
         "auth.invalid_credentials": "Invalid email or password",
@@ -120,6 +134,9 @@ TRANSLATIONS = {
         "auth.user_created": "User created successfully",
         "auth.first_user_admin": "First user is automatically administrator",
         "auth.logout_success": "Successfully logged out",
+        "auth.invalid_role": "Invalid role",
+        "auth.cannot_modify_self": "Your own account cannot be changed here",
+        "auth.user_not_found": "User not found",
         # Orchestrator
         "orch.agent_no_access": "Agent '{agent}' does not have access to {tool}",
         "orch.tool_not_allowed": "Tool {tool} is not allowed for this agent.",
@@ -131,11 +148,14 @@ TRANSLATIONS = {
         "chat.intro_default": "I am Axon, your AI assistant.",
         "chat.intro_agent": "I am {name}, your AI assistant.",
         "chat.docs_uploaded": "The user has uploaded the following documents:",
+        "chat.summary_intro": "Conversation so far (summary):",
+        "chat.summary_prompt": "Summarize the following conversation in a few sentences. Keep facts, decisions and open questions.\n\nPrevious summary:\n{summary}\n\nNew messages:\n{transcript}",
         # Upload
         "upload.no_filename": "No filename provided",
         "upload.type_not_allowed": "File type not allowed. Allowed: {allowed}",
         "upload.too_large": "File too large (max {max_mb} MB)",
         "upload.not_found": "Document not found",
+        "upload.job_not_found": "Upload job not found",
         # Settings
         "settings.not_configured": "Not configured",
         # Scheduler
@@ -153,6 +173,7 @@ TRANSLATIONS = {
         "scheduler.intro": "I am Axon. I am now executing the scheduled task '{name}'.",
         "scheduler.no_response": "No response from LLM",
         "scheduler.not_found": "Task not found",
+        "scheduler.already_running": "Task is already running",
         # Tool handlers
         "tool.memory_saved": "Saved: '{key}' — {content}",
         "tool.memory_not_found": "No memories found.",
@@ -166,6 +187,11 @@ TRANSLATIONS = {
         "wf.step_intro": "I am executing workflow '{name}', step {step}/{total}.",
         "wf.no_response": "No response",
         "wf.var_missing": "[{var} not available]",
+        "wf.invalid_dependency": "Step {step}: depends_on '{var}' is not an earlier step",
+        "wf.run_not_found": "Workflow run {id} not found",
+        "wf.not_resumable": "A run with status '{status}' cannot be resumed",
+        "wf.cancelled": "Run cancelled",
+        "wf.interrupted": "Run interrupted: the server was restarted",
         # Tool descriptions (EN)
         "tool.desc.file_read": "Read the contents of a file",
         "tool.desc.file_write": "Write content to a file (only in /outputs/ directory)",
@@ -0,0 +1,163 @@
+"""
+Axon by NeuroVexon - Authenticated Principal Cache
+
+Kleiner TTL-Cache fuer get_current_user: pro Access-Token (sub + iat) wird der
+User nur einmal aus der DB geladen. Jede SSE-Approval und jeder CLI-Poll
+kostet danach keinen DB-Roundtrip mehr.
+
+Rollen- oder Aktiv-Aenderungen (api/auth.py) invalidieren alle Eintraege des
+Users. Optional (AUTH_TRUST_TOKEN_CLAIMS) werden die signierten role/active
+Claims fuer die Token-Laufzeit direkt vertraut; Tokens, die vor einer
+Aenderung ausgestellt wurden, gehen dann wieder ueber die DB.
+
+invalidate() wirkt nur im eigenen Prozess. sync() liest deshalb spaetestens
+alle AUTH_PRINCIPAL_SYNC_SECONDS die seitdem geaenderten User
+(users.updated_at) und invalidiert sie auch in den anderen Workern.
+"""
+
+import calendar
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.models import User
+
+
+def detached_principal(user: User) -> User:
+    """Session-independent copy of a user, safe to share between requests"""
+    return User(
+        id=user.id,
+        email=user.email,
+        display_name=user.display_name,
+        role=user.role,
+        is_active=user.is_active,
+        created_at=user.created_at,
+    )
+
+
+def principal_from_claims(payload: dict) -> Optional[User]:
+    """Build the principal from signed token claims (trust-claims mode)"""
+    if "role" not in payload or "active" not in payload:
+        return None  # Token issued before claims were added
+    return User(
+        id=payload["sub"],
+        role=payload["role"],
+        is_active=bool(payload["active"]),
+    )
+
+
+class PrincipalCache:
+    """Size-bounded TTL cache of principals, keyed by (sub, iat)"""
+
+    def __init__(
+        self, max_size: int = 1024, ttl: float = 60.0, sync_interval: float = 2.0
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self._synced_at: Optional[float] = None
+        self._watermark: Optional[datetime] = None  # Latest users.updated_at seen
+        self._entries: OrderedDict[tuple[str, Optional[int]], tuple[float, User]] = (
+            OrderedDict()
+        )
+        # user_id -> unix time of the last role/active change
+        self._changed_at: dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str, iat: Optional[int]) -> Optional[User]:
+        if self.ttl <= 0:
+            return None
+        key = (user_id, iat)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, user = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return user
+
+    def put(
+        self,
+        user_id: str,
+        iat: Optional[int],
+        user: User,
+        loaded_at: Optional[float] = None,
+    ) -> None:
+        """Cache a principal; loaded_at (time.time() before the DB read) skips
+        results that raced with a concurrent invalidate()"""
+        if self.ttl <= 0:
+            return
+        changed = self._changed_at.get(user_id)
+        if loaded_at is not None and changed is not None and changed >= loaded_at:
+            return
+        key = (user_id, iat)
+        self._entries[key] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str, changed_at: Optional[float] = None) -> None:
+        """Drop all cached tokens of a user (call after role/active changes)"""
+        changed_at = time.time() if changed_at is None else changed_at
+        self._changed_at[user_id] = max(self._changed_at.get(user_id, 0), changed_at)
+        for key in [k for k in self._entries if k[0] == user_id]:
+            del self._entries[key]
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Apply user changes made by other workers (at most every sync_interval)"""
+        if self.ttl <= 0 and not settings.auth_trust_token_claims:
+            return  # Nothing cached or trusted
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+
+        query = select(User.id, User.updated_at).where(User.updated_at.isnot(None))
+        if self._watermark is not None:
+            query = query.where(User.updated_at > self._watermark)
+        for user_id, updated_at in (await db.execute(query)).all():
+            # users.updated_at is naive UTC, like the iat claim
+            self.invalidate(user_id, calendar.timegm(updated_at.timetuple()))
+            if self._watermark is None or updated_at > self._watermark:
+                self._watermark = updated_at
+
+    def claims_stale(self, user_id: str, iat: Optional[int]) -> bool:
+        """True if the token was issued before the user's last change"""
+        changed = self._changed_at.get(user_id)
+        if changed is None:
+            return False
+        return iat is None or iat <= changed
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._changed_at.clear()
+        self._synced_at = None
+        self._watermark = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+# Global singleton — used by core.dependencies
+principal_cache = PrincipalCache(
+    max_size=settings.auth_principal_cache_size,
+    ttl=settings.auth_principal_cache_ttl,
+    sync_interval=settings.auth_principal_sync_seconds,
+)
@@ -0,0 +1,340 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Rate Limiting
+
+Zwei Algorithmen, beide O(1) pro Pruefung und mit monotoner Uhr:
+
+- SlidingWindowLimiter: Sliding-Window-Counter — Zaehler fuer das aktuelle
+  und das vorige Fenster, das vorige anteilig gewichtet. Zwei Zahlen pro Key
+  statt einer Liste von Zeitstempeln.
+- TokenBucketLimiter: Token Bucket mit Burst (capacity) und Nachfuellrate.
+
+Keys liegen in LRU-Reihenfolge; bei jeder Pruefung werden Keys vom alten
+Ende entfernt, die so lange inaktiv sind, dass ihr Zustand keinen Einfluss
+mehr hat (amortisiert O(1)). max_keys begrenzt den Speicher zusaetzlich.
+
+RateLimitMiddleware wendet pro Route eine Policy an (Chat, MCP, Auth,
+Upload), Key ist die Client-IP. Hinter einem Reverse Proxy (nginx) waere das
+die IP des Proxys: Kommt die Verbindung von RATE_LIMIT_TRUSTED_PROXIES, zaehlt
+die erste nicht vertrauenswuerdige Adresse in X-Forwarded-For (von rechts).
+Antwort bei Ueberschreitung: 429 mit Retry-After.
+
+Hinweis: Zaehler gelten pro Prozess (ein Uvicorn-Worker).
+"""
+
+import ipaddress
+import json
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from core.config import settings
+from core.i18n import get_lang_from_header, t
+
+logger = logging.getLogger(__name__)
+
+
+class _KeyedLimiter(ABC):
+    """Per-key state in LRU order with eviction of idle keys"""
+
+    def __init__(
+        self,
+        idle_ttl: float,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.idle_ttl = idle_ttl
+        self.max_keys = max_keys
+        self.clock = clock
+        # key -> mutable state list, state[0] = last access
+        self._keys: OrderedDict[str, list] = OrderedDict()
+        self.evicted = 0
+
+    def hit(self, key: str) -> Optional[float]:
+        """Count a request; None if allowed, else seconds until retry"""
+        now = self.clock()
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = self._new_state(now)
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._keys.move_to_end(key)
+        state[0] = now
+        retry_after = self._admit(state, now)
+        self._evict_idle(now)
+        return retry_after
+
+    def is_allowed(self, key: str) -> bool:
+        """Check if a request is allowed (and count it)"""
+        return self.hit(key) is None
+
+    def reset(self, key: str) -> None:
+        """Reset rate limit for a key"""
+        self._keys.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _evict_idle(self, now: float) -> None:
+        # Oldest access first: stop at the first key that is still active
+        cutoff = now - self.idle_ttl
+        keys = self._keys
+        while keys:
+            key, state = next(iter(keys.items()))
+            if state[0] >= cutoff:
+                return
+            del keys[key]
+            self.evicted += 1
+
+    @abstractmethod
+    def _new_state(self, now: float) -> list:
+        """Initial state of a new key, state[0] = last access"""
+
+    @abstractmethod
+    def _admit(self, state: list, now: float) -> Optional[float]:
+        """Count a request in state; None if allowed, else seconds until retry"""
+
+
+class SlidingWindowLimiter(_KeyedLimiter):
+    """Sliding-window counter: max_requests per window_seconds"""
+
+    def __init__(
+        self,
+        max_requests: int = 60,
+        window_seconds: float = 60,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        # After two windows without requests both counters are zero
+        super().__init__(2 * window_seconds, max_keys, clock)
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+
+    def _new_state(self, now: float) -> list:
+        # [last access, window index, count in window, count in previous window]
+        return [now, int(now // self.window_seconds), 0, 0]
+
+    def _admit(self, state: list, now: float) -> Optional[float]:
+        window = self.window_seconds
+        index = int(now // window)
+        if index != state[1]:
+            state[3] = state[2] if index == state[1] + 1 else 0
+            state[2] = 0
+            state[1] = index
+        elapsed = now - index * window
+        weight = 1.0 - elapsed / window
+        if state[3] * weight + state[2] < self.max_requests:
+            state[2] += 1
+            return None
+        return self._retry_after(state[2], state[3], elapsed)
+
+    def _retry_after(self, current: int, previous: int, elapsed: float) -> float:
+        window = self.window_seconds
+        limit = self.max_requests
+        if current < limit:
+            # The previous window's share decays within this window
+            return (1.0 - (limit - current) / previous) * window - elapsed
+        # This window is full: wait until its share in the next one is small enough
+        return (window - elapsed) + window * (1.0 - limit / current)
+
+
+class TokenBucketLimiter(_KeyedLimiter):
+    """Token bucket: bursts up to capacity, refilled at rate tokens per second"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        # An idle bucket is full again after capacity / rate seconds
+        super().__init__(capacity / rate, max_keys, clock)
+        self.rate = rate
+        self.capacity = capacity
+
+    def _new_state(self, now: float) -> list:
+        # [last access, tokens, last refill]
+        return [now, float(self.capacity), now]
+
+    def _admit(self, state: list, now: float) -> Optional[float]:
+        tokens = min(self.capacity, state[1] + (now - state[2]) * self.rate)
+        state[2] = now
+        if tokens >= 1.0:
+            state[1] = tokens - 1.0
+            return None
+        state[1] = tokens
+        return (1.0 - tokens) / self.rate
+
+
+# Name of the former list-based limiter
+RateLimiter = SlidingWindowLimiter
+
+
+@dataclass
+class RateLimitPolicy:
+    """A limiter applied to requests whose path starts with one of prefixes"""
+
+    name: str
+    limiter: _KeyedLimiter
+    prefixes: tuple[str, ...]
+    methods: Optional[frozenset[str]] = None  # None = all methods
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods is not None and method not in self.methods:
+            return False
+        return path.startswith(self.prefixes)
+
+
+def _per_minute(count: int, burst: int, max_keys: int) -> TokenBucketLimiter:
+    return TokenBucketLimiter(count / 60.0, max(1, burst), max_keys)
+
+
+def default_policies() -> list[RateLimitPolicy]:
+    """Route policies from settings (a limit of 0 disables its policy)"""
+    max_keys = settings.rate_limit_max_keys
+    post = frozenset({"POST"})
+    policies = []
+    if settings.rate_limit_chat_per_minute > 0:
+        policies.append(
+            RateLimitPolicy(
+                "chat",
+                _per_minute(
+                    settings.rate_limit_chat_per_minute,
+                    settings.rate_limit_chat_burst,
+                    max_keys,
+                ),
+                ("/api/v1/chat/send", "/api/v1/chat/stream", "/api/v1/chat/agent"),
+                post,
+            )
+        )
+    if settings.rate_limit_mcp_per_minute > 0:
+        policies.append(
+            RateLimitPolicy(
+                "mcp",
+                SlidingWindowLimiter(settings.rate_limit_mcp_per_minute, 60, max_keys),
+                ("/api/v1/mcp/v1/",),
+            )
+        )
+    if settings.rate_limit_auth_per_minute > 0:
+        policies.append(
+            RateLimitPolicy(
+                "auth",
+                SlidingWindowLimiter(settings.rate_limit_auth_per_minute, 60, max_keys),
+                ("/api/v1/auth/login", "/api/v1/auth/register"),
+                post,
+            )
+        )
+    if settings.rate_limit_upload_per_minute > 0:
+        policies.append(
+            RateLimitPolicy(
+                "upload",
+                _per_minute(
+                    settings.rate_limit_upload_per_minute,
+                    settings.rate_limit_upload_burst,
+                    max_keys,
+                ),
+                ("/api/v1/upload",),
+                post,
+            )
+        )
+    return policies
+
+
+def parse_trusted_proxies(spec: str) -> list:
+    """'127.0.0.1,172.16.0.0/12' -> list of ip_network"""
+    networks = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(part, strict=False))
+        except ValueError:
+            logger.warning(f"Ungueltiger Trusted Proxy ignoriert: '{part}'")
+    return networks
+
+
+class RateLimitMiddleware:
+    """ASGI middleware: per-route rate limits keyed by client IP"""
+
+    def __init__(
+        self,
+        app,
+        policies: Optional[list[RateLimitPolicy]] = None,
+        trusted_proxies: Optional[list] = None,
+    ):
+        self.app = app
+        self.policies = default_policies() if policies is None else policies
+        if trusted_proxies is None:
+            trusted_proxies = parse_trusted_proxies(settings.rate_limit_trusted_proxies)
+        self.trusted_proxies = trusted_proxies
+
+    def _trusted(self, host: str) -> bool:
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
+
+    def client_key(self, scope) -> str:
+        """Client IP; behind a trusted proxy taken from X-Forwarded-For"""
+        client = scope.get("client")
+        peer = client[0] if client else "unknown"
+        if not self.trusted_proxies or not self._trusted(peer):
+            return peer
+        values = [
+            value.decode("latin-1")
+            for name, value in scope.get("headers") or []
+            if name == b"x-forwarded-for"
+        ]
+        hops = [hop.strip() for hop in ",".join(values).split(",") if hop.strip()]
+        # Rightmost first: every hop up to the first untrusted one was added
+        # by our own proxies, anything left of it may be forged by the client
+        for hop in reversed(hops):
+            if not self._trusted(hop):
+                return hop
+        return hops[0] if hops else peer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.policies:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        for policy in self.policies:
+            if policy.matches(method, path):
+                retry_after = policy.limiter.hit(self.client_key(scope))
+                if retry_after is not None:
+                    await self._reject(scope, send, retry_after)
+                    return
+                break
+
+        await self.app(scope, receive, send)
+
+    async def _reject(self, scope, send, retry_after: float) -> None:
+        headers = dict(scope.get("headers") or [])
+        lang = get_lang_from_header(
+            headers.get(b"accept-language", b"").decode("latin-1")
+        )
+        body = json.dumps({"detail": t("security.rate_limited", lang)}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
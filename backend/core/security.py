@@ -7,6 +7,7 @@ import hashlib
 import logging
 import secrets
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
 from argon2 import PasswordHasher
@@ -15,6 +16,7 @@ import jwt
 from cryptography.fernet import Fernet
 
 from .config import settings
+from .rate_limit import RateLimiter  # noqa: F401  (moved to core.rate_limit)
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +48,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     expire = datetime.utcnow() + (
         expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
     )
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "access"})
     return jwt.encode(to_encode, _get_jwt_secret(), algorithm=settings.jwt_algorithm)
 
 
@@ -86,14 +88,19 @@ def hash_string(value: str) -> str:
     return hashlib.sha256(value.encode()).hexdigest()
 
 
-def _get_fernet() -> Fernet:
-    """Get Fernet instance derived from secret_key"""
+@lru_cache(maxsize=4)
+def _fernet_for(secret_key: str) -> Fernet:
     # Derive a 32-byte key from the secret_key using SHA-256
-    key_bytes = hashlib.sha256(settings.secret_key.encode()).digest()
+    key_bytes = hashlib.sha256(secret_key.encode()).digest()
     fernet_key = base64.urlsafe_b64encode(key_bytes)
     return Fernet(fernet_key)
 
 
+def _get_fernet() -> Fernet:
+    """Get Fernet instance derived from secret_key (cached per key)"""
+    return _fernet_for(settings.secret_key)
+
+
 def encrypt_value(value: str) -> str:
     """Encrypt a value using Fernet (derived from SECRET_KEY)"""
     if not value:
@@ -273,40 +280,3 @@ def sanitize_filename(filename: str) -> str:
         filename = name[:250] + ("." + ext if ext else "")
 
     return filename or "unnamed"
-
-
-class RateLimiter:
-    """Simple in-memory rate limiter"""
-
-    def __init__(self, max_requests: int = 60, window_seconds: int = 60):
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self._requests: dict[str, list[datetime]] = {}
-
-    def is_allowed(self, key: str) -> bool:
-        """Check if a request is allowed"""
-        now = datetime.utcnow()
-        window_start = now - timedelta(seconds=self.window_seconds)
-
-        # Get requests for this key
-        if key not in self._requests:
-            self._requests[key] = []
-
-        # Remove old requests
-        self._requests[key] = [t for t in self._requests[key] if t > window_start]
-
-        # Check limit
-        if len(self._requests[key]) >= self.max_requests:
-            return False
-
-        # Add this request
-        self._requests[key].append(now)
-        return True
-
-    def reset(self, key: str) -> None:
-        """Reset rate limit for a key"""
-        self._requests.pop(key, None)
-
-
-# Global rate limiter instance
-rate_limiter = RateLimiter()
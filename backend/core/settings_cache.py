@@ -0,0 +1,151 @@
+"""
+Axon by NeuroVexon - Settings Snapshot Cache
+
+Prozessweiter Snapshot der Settings-Tabelle. Statt bei jedem Chat-Request,
+Scheduler-Lauf oder Workflow die Tabelle zu lesen und alle API-Keys neu zu
+entschluesseln, wird der Snapshot nur neu geladen, wenn api/settings.py
+schreibt (invalidate() erhoeht die Version).
+
+invalidate() wirkt nur im eigenen Prozess. Damit andere Uvicorn-Worker
+Aenderungen sehen, wird spaetestens alle SETTINGS_CACHE_CHECK_SECONDS ein
+Fingerabdruck der Tabelle (Anzahl, max(updated_at)) gelesen; weicht er ab,
+wird neu geladen.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.security import decrypt_value
+from db.models import Settings
+
+logger = logging.getLogger(__name__)
+
+# Keys that are stored encrypted in the database
+ENCRYPTED_KEYS = {
+    "anthropic_api_key",
+    "openai_api_key",
+    "gemini_api_key",
+    "groq_api_key",
+    "openrouter_api_key",
+    "imap_password",
+    "smtp_password",
+    "mcp_auth_token",
+    "telegram_bot_token",
+    "discord_bot_token",
+}
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """Immutable view of all DB settings at one version"""
+
+    version: int
+    raw: dict = field(default_factory=dict)  # As stored (secrets encrypted)
+    values: dict = field(default_factory=dict)  # Secrets decrypted
+
+    def get(self, key: str, default=None):
+        return self.values.get(key, default)
+
+
+class SettingsCache:
+    """Holds the current SettingsSnapshot, reloads after invalidate()"""
+
+    def __init__(self, check_interval: Optional[float] = None):
+        self.version = 0
+        self.loads = 0
+        # Seconds between fingerprint checks against the DB (0 = every get)
+        self.check_interval = (
+            settings.settings_cache_check_seconds
+            if check_interval is None
+            else check_interval
+        )
+        self._snapshot: Optional[SettingsSnapshot] = None
+        self._fingerprint: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        # ciphertext -> plaintext, kept across reloads for unchanged secrets
+        self._decrypted: dict[str, str] = {}
+
+    def invalidate(self) -> None:
+        """Mark the snapshot stale (call after writing the settings table)"""
+        self.version += 1
+
+    def _fresh(self, snapshot: Optional[SettingsSnapshot]) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == self.version
+            and time.monotonic() - self._checked_at < self.check_interval
+        )
+
+    async def get(self, db: AsyncSession) -> SettingsSnapshot:
+        """Current snapshot; reads the DB only after an invalidate() or a change"""
+        snapshot = self._snapshot
+        if self._fresh(snapshot):
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if self._fresh(snapshot):
+                return snapshot
+
+            fingerprint = await self._read_fingerprint(db)
+            self._checked_at = time.monotonic()
+            if snapshot is not None and snapshot.version == self.version:
+                if fingerprint == self._fingerprint:
+                    return snapshot
+                # Written by another worker
+                logger.info("Settings in anderem Prozess geaendert — neu geladen")
+                self.version += 1
+
+            # A write during the load bumps self.version -> reloaded next time
+            version = self.version
+            result = await db.execute(select(Settings.key, Settings.value))
+            raw = dict(result.all())
+            self._snapshot = SettingsSnapshot(
+                version=version, raw=raw, values=self._decrypt(raw)
+            )
+            self._fingerprint = fingerprint
+            self.loads += 1
+            logger.debug(f"Settings-Snapshot v{version} geladen ({len(raw)} Keys)")
+            return self._snapshot
+
+    async def _read_fingerprint(self, db: AsyncSession) -> tuple:
+        result = await db.execute(
+            select(func.count(Settings.id), func.max(Settings.updated_at))
+        )
+        return tuple(result.one())
+
+    def _decrypt(self, raw: dict) -> dict:
+        values = dict(raw)
+        decrypted = {}
+        for key in ENCRYPTED_KEYS:
+            encrypted = raw.get(key)
+            if not encrypted:
+                continue
+            plain = self._decrypted.get(encrypted)
+            if plain is None:
+                plain = decrypt_value(encrypted)
+            decrypted[encrypted] = plain
+            values[key] = plain
+        self._decrypted = decrypted
+        return values
+
+
+# Global singleton
+settings_cache = SettingsCache()
+
+
+async def configure_llm_router(db: AsyncSession) -> SettingsSnapshot:
+    """Load the settings snapshot and apply it to the LLM router"""
+    from llm.router import llm_router
+
+    snapshot = await settings_cache.get(db)
+    llm_router.update_settings(snapshot.values, version=snapshot.version)
+    return snapshot
@@ -35,6 +35,8 @@ async def init_db():
         await conn.run_sync(Base.metadata.create_all)
         # Auto-add missing columns for SQLite (no ALTER COLUMN support)
         await conn.run_sync(_auto_migrate_columns)
+        # create_all only creates indexes together with new tables
+        await conn.run_sync(_auto_migrate_indexes)
 
 
 def _auto_migrate_columns(conn):
@@ -60,6 +62,20 @@ def _auto_migrate_columns(conn):
                 )
 
 
+def _auto_migrate_indexes(conn):
+    """Create indexes that were added to existing tables"""
+    from sqlalchemy import inspect
+
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)
+
+
 async def get_db() -> AsyncSession:
     """Dependency for getting database session"""
     async with async_session() as session:
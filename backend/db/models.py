@@ -11,7 +11,9 @@ from sqlalchemy import (
     Boolean,
     JSON,
     ForeignKey,
+    Index,
     LargeBinary,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -36,17 +38,26 @@ class User(Base):
     role = Column(String(20), nullable=False, default="user")  # admin, user
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Last change (role/active); other workers drop cached principals (sync)
+    updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow, index=True)
 
 
 class Conversation(Base):
     """Conversations / Chat Sessions"""
 
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_user_updated", "user_id", "updated_at"),
+        Index("ix_conversations_created_at", "created_at"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=True, index=True)
     title = Column(String(255), nullable=True)
     system_prompt = Column(Text, nullable=True)
+    # Rolling summary of older turns (outside the context window)
+    summary = Column(Text, nullable=True)
+    summary_until = Column(DateTime, nullable=True)  # created_at of last summarized msg
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -62,6 +73,10 @@ class Message(Base):
     """Chat Messages"""
 
     __tablename__ = "messages"
+    __table_args__ = (
+        # Chat history / context window: WHERE conversation_id ORDER BY created_at
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     conversation_id = Column(String(36), ForeignKey("conversations.id"), nullable=False)
@@ -80,6 +95,13 @@ class AuditLog(Base):
     """Audit Log for Tool Executions"""
 
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # /audit filters (session, event_type, tool_name), all sorted by timestamp
+        Index("ix_audit_logs_conversation_timestamp", "conversation_id", "timestamp"),
+        Index("ix_audit_logs_event_type_timestamp", "event_type", "timestamp"),
+        Index("ix_audit_logs_tool_name_timestamp", "tool_name", "timestamp"),
+        Index("ix_audit_logs_timestamp", "timestamp"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     conversation_id = Column(String(36), ForeignKey("conversations.id"), nullable=False)
@@ -107,6 +129,29 @@ class AuditLog(Base):
     conversation = relationship("Conversation", back_populates="audit_logs")
 
 
+class AnalyticsRollup(Base):
+    """Pre-aggregated dashboard counters — maintained by agent.analytics_rollup"""
+
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (
+        UniqueConstraint("day", "metric", "dimension", name="uq_analytics_rollup"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(String(10), nullable=False)  # YYYY-MM-DD oder "total"
+    metric = Column(String(50), nullable=False)  # conversations, audit, tool_executed
+    dimension = Column(String(100), nullable=False, default="")  # event_type / tool
+    count = Column(Integer, nullable=False, default=0)
+    # Latenz (nur tool_executed): Summe + Anzahl fuer den Durchschnitt, Histogramm
+    time_sum_ms = Column(Integer, nullable=False, default=0)
+    time_count = Column(Integer, nullable=False, default=0)
+    le_100ms = Column(Integer, nullable=False, default=0)
+    le_1s = Column(Integer, nullable=False, default=0)
+    le_5s = Column(Integer, nullable=False, default=0)
+    le_30s = Column(Integer, nullable=False, default=0)
+    gt_30s = Column(Integer, nullable=False, default=0)
+
+
 class Memory(Base):
     """Persistent Agent Memory — facts the AI remembers across conversations"""
 
@@ -197,6 +242,27 @@ class ScheduledTask(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class TaskRun(Base):
+    """Execution history of a scheduled task (one row per run)"""
+
+    __tablename__ = "task_runs"
+    __table_args__ = (
+        # Task history: WHERE task_id ORDER BY started_at DESC
+        Index("ix_task_runs_task_started", "task_id", "started_at"),
+    )
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    task_id = Column(String(36), ForeignKey("scheduled_tasks.id"), nullable=False)
+    trigger = Column(String(20), default="schedule")  # schedule, manual
+    status = Column(String(20), nullable=False)  # success, error, timeout, skipped
+    provider = Column(String(50), nullable=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    duration_ms = Column(Integer, nullable=True)
+    input_tokens = Column(Integer, nullable=True)
+    output_tokens = Column(Integer, nullable=True)
+    result = Column(Text, nullable=True)  # Gekuerzt wie last_result
+
+
 class Workflow(Base):
     """Workflow-Chains — mehrstufige Agent-Aufgaben"""
 
@@ -233,22 +299,112 @@ class WorkflowRun(Base):
     error = Column(Text, nullable=True)
     started_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
+    # Refreshed by the executing worker while the run is "running"
+    heartbeat_at = Column(DateTime, nullable=True)
+
+
+class WorkflowStepResult(Base):
+    """Checkpoint of a finished workflow step (resume and memoization)"""
+
+    __tablename__ = "workflow_step_results"
+    __table_args__ = (
+        # Resume: WHERE run_id
+        Index("ix_workflow_step_results_run", "run_id", "step_index"),
+        # Memoization: WHERE input_hash AND created_at >= now - TTL
+        Index("ix_workflow_step_results_input", "input_hash", "created_at"),
+    )
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    run_id = Column(String(36), ForeignKey("workflow_runs.id"), nullable=False)
+    step_index = Column(Integer, nullable=False)  # 0-based, nach order sortiert
+    store_as = Column(String(255), nullable=False)
+    input_hash = Column(String(64), nullable=False)  # SHA-256 von Modell + Prompt
+    provider = Column(String(50), nullable=True)
+    model = Column(String(255), nullable=True)
+    source = Column(String(20), default="llm")  # llm, cache
+    result = Column(Text, nullable=False)
+    input_tokens = Column(Integer, nullable=True)
+    output_tokens = Column(Integer, nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class DocumentBlob(Base):
+    """Content-addressed upload (SHA-256), shared by all documents with that content"""
+
+    __tablename__ = "document_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String(1000), nullable=False)
+    file_size = Column(Integer, default=0)
+    mime_type = Column(String(100), nullable=True)
+    extracted_text = Column(Text, nullable=True)  # None = noch nicht extrahiert
+    chunk_count = Column(Integer, default=0)
+    indexed_at = Column(DateTime, nullable=True)  # Abschnitte + Embeddings fertig
+    ref_count = Column(Integer, default=0)  # Verweisende UploadedDocuments
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    chunks = relationship(
+        "DocumentChunk", back_populates="blob", cascade="all, delete-orphan"
+    )
 
 
 class UploadedDocument(Base):
     """Uploaded Documents — Dateien die in Conversations hochgeladen wurden"""
 
     __tablename__ = "uploaded_documents"
+    __table_args__ = (
+        Index(
+            "ix_uploaded_documents_conversation_created",
+            "conversation_id",
+            "created_at",
+        ),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     conversation_id = Column(String(36), ForeignKey("conversations.id"), nullable=True)
     filename = Column(String(500), nullable=False)
     mime_type = Column(String(100), nullable=True)
     file_size = Column(Integer, default=0)
+    # SHA-256 der Datei; verweist auf den geteilten DocumentBlob
+    content_hash = Column(
+        String(64), ForeignKey("document_blobs.sha256"), nullable=True, index=True
+    )
+    # Nur Dokumente ohne Blob (vor dem Blob-Store hochgeladen)
     extracted_text = Column(Text, nullable=True)
     file_path = Column(String(1000), nullable=False)
+    # Status des Extraktions-Jobs (agent/upload_jobs.py), fuer alle Worker sichtbar
+    extract_status = Column(String(20), nullable=True)
+    extract_error = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    chunks = relationship(
+        "DocumentChunk", back_populates="document", cascade="all, delete-orphan"
+    )
+
+
+class DocumentChunk(Base):
+    """Overlapping text chunk of an uploaded document, with embedding"""
+
+    __tablename__ = "document_chunks"
+    __table_args__ = (
+        Index("ix_document_chunks_document_index", "document_id", "chunk_index"),
+        Index("ix_document_chunks_blob_index", "blob_hash", "chunk_index"),
+    )
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    # Genau eins von beiden: Blob (geteilt) oder Dokument ohne Blob
+    blob_hash = Column(String(64), ForeignKey("document_blobs.sha256"), nullable=True)
+    document_id = Column(String(36), ForeignKey("uploaded_documents.id"), nullable=True)
+    conversation_id = Column(String(36), nullable=True, index=True)
+    chunk_index = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+    embedding = Column(LargeBinary, nullable=True)  # numpy float32 Bytes
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    document = relationship("UploadedDocument", back_populates="chunks")
+    blob = relationship("DocumentBlob", back_populates="chunks")
+
 
 class Settings(Base):
     """User Settings"""
@@ -3,9 +3,20 @@ Axon by NeuroVexon - Claude (Anthropic) LLM Provider
 """
 
 from typing import AsyncGenerator, Optional
+import json
 import logging
 
-from .provider import BaseLLMProvider, ChatMessage, LLMResponse, ToolCall
+import httpx
+
+from .provider import (
+    BaseLLMProvider,
+    ChatMessage,
+    LLMResponse,
+    StreamEvent,
+    ToolCall,
+    token_count,
+)
+from .http_pool import create_http_client
 from core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -19,6 +30,7 @@ class ClaudeProvider(BaseLLMProvider):
         self.api_key = settings.anthropic_api_key
         self._client = None
         self._current_key = None
+        self._http: Optional[httpx.AsyncClient] = None
 
     def update_config(self, api_key: Optional[str] = None, model: Optional[str] = None):
         """Update provider configuration"""
@@ -29,12 +41,26 @@ class ClaudeProvider(BaseLLMProvider):
         if model:
             self.model = model
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Pooled transport shared by all SDK clients of this provider"""
+        if self._http is None or self._http.is_closed:
+            self._http = create_http_client(timeout=600.0)
+        return self._http
+
+    async def aclose(self) -> None:
+        self._client = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
     def _get_client(self):
         if self._client is None or self._current_key != self.api_key:
             try:
                 from anthropic import AsyncAnthropic
 
-                self._client = AsyncAnthropic(api_key=self.api_key)
+                self._client = AsyncAnthropic(
+                    api_key=self.api_key, http_client=self._get_http_client()
+                )
                 self._current_key = self.api_key
             except ImportError:
                 raise ImportError(
@@ -83,7 +109,7 @@ class ClaudeProvider(BaseLLMProvider):
             kwargs["system"] = system_message
 
         if tools:
-            kwargs["tools"] = self._convert_tools(tools)
+            kwargs["tools"] = self.converted_tools(tools, "claude", self._convert_tools)
 
         response = await client.messages.create(**kwargs)
 
@@ -101,10 +127,13 @@ class ClaudeProvider(BaseLLMProvider):
                     ToolCall(id=block.id, name=block.name, parameters=block.input)
                 )
 
+        usage = getattr(response, "usage", None)
         return LLMResponse(
             content=content,
             tool_calls=tool_calls,
             finish_reason=response.stop_reason or "stop",
+            input_tokens=token_count(getattr(usage, "input_tokens", None)),
+            output_tokens=token_count(getattr(usage, "output_tokens", None)),
         )
 
     async def chat_stream(
@@ -128,12 +157,76 @@ class ClaudeProvider(BaseLLMProvider):
             kwargs["system"] = system_message
 
         if tools:
-            kwargs["tools"] = self._convert_tools(tools)
+            kwargs["tools"] = self.converted_tools(tools, "claude", self._convert_tools)
 
         async with client.messages.stream(**kwargs) as stream:
             async for text in stream.text_stream:
                 yield text
 
+    async def chat_events(
+        self, messages: list[ChatMessage], tools: Optional[list[dict]] = None
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream text deltas and tool_use blocks from Claude"""
+        client = self._get_client()
+
+        # Separate system message
+        system_message = None
+        chat_messages = []
+        for m in messages:
+            if m.role == "system":
+                system_message = m.content
+            else:
+                chat_messages.append({"role": m.role, "content": m.content})
+
+        kwargs = {"model": self.model, "max_tokens": 4096, "messages": chat_messages}
+
+        if system_message:
+            kwargs["system"] = system_message
+
+        if tools:
+            kwargs["tools"] = self.converted_tools(tools, "claude", self._convert_tools)
+
+        # tool_use blocks by content index; input arrives as partial JSON
+        tool_blocks: dict[int, dict] = {}
+        finish_reason = "stop"
+
+        stream = await client.messages.create(stream=True, **kwargs)
+        async for event in stream:
+            if event.type == "content_block_start":
+                block = event.content_block
+                if block.type == "tool_use":
+                    tool_blocks[event.index] = {
+                        "id": block.id,
+                        "name": block.name,
+                        "input": "",
+                    }
+            elif event.type == "content_block_delta":
+                delta = event.delta
+                if delta.type == "text_delta":
+                    yield StreamEvent(text=delta.text)
+                elif delta.type == "input_json_delta" and event.index in tool_blocks:
+                    tool_blocks[event.index]["input"] += delta.partial_json
+            elif event.type == "content_block_stop":
+                block = tool_blocks.pop(event.index, None)
+                if block is not None:
+                    try:
+                        params = json.loads(block["input"] or "{}")
+                    except json.JSONDecodeError:
+                        params = {}
+                        logger.warning(
+                            f"Failed to parse tool input for {block['name']}"
+                        )
+                    yield StreamEvent(
+                        tool_call=ToolCall(
+                            id=block["id"], name=block["name"], parameters=params
+                        )
+                    )
+            elif event.type == "message_delta":
+                if event.delta.stop_reason:
+                    finish_reason = event.delta.stop_reason
+
+        yield StreamEvent(finish_reason=finish_reason)
+
     async def health_check(self) -> bool:
         """Check if Claude API is accessible"""
         if not self.api_key:
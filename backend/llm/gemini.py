@@ -10,7 +10,14 @@ Supports tool calling via Gemini Function Calling.
 from typing import AsyncGenerator, Optional
 import logging
 
-from .provider import BaseLLMProvider, ChatMessage, LLMResponse, ToolCall
+from .provider import (
+    BaseLLMProvider,
+    ChatMessage,
+    LLMResponse,
+    StreamEvent,
+    ToolCall,
+    token_count,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +40,11 @@ class GeminiProvider(BaseLLMProvider):
         if model:
             self.model = model
 
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aio.aclose()
+
     def _get_client(self):
         if self._client is None or self._current_key != self.api_key:
             try:
@@ -64,6 +76,23 @@ class GeminiProvider(BaseLLMProvider):
 
         return gemini_functions
 
+    def _build_gemini_tools(self, tools: list[dict]) -> Optional[list]:
+        """Build google-genai Tool objects (cached per tool schema version)"""
+        gemini_fns = self._convert_tools_to_gemini(tools)
+        if not gemini_fns:
+            return None
+        from google.genai.types import FunctionDeclaration, Tool
+
+        declarations = [
+            FunctionDeclaration(
+                name=fn["name"],
+                description=fn["description"],
+                parameters=fn["parameters"],
+            )
+            for fn in gemini_fns
+        ]
+        return [Tool(function_declarations=declarations)]
+
     async def chat(
         self,
         messages: list[ChatMessage],
@@ -101,20 +130,10 @@ class GeminiProvider(BaseLLMProvider):
         # Convert tools if provided
         gemini_tools = None
         if tools:
-            gemini_fns = self._convert_tools_to_gemini(tools)
-            if gemini_fns:
-                from google.genai.types import FunctionDeclaration, Tool
-
-                declarations = []
-                for fn in gemini_fns:
-                    declarations.append(
-                        FunctionDeclaration(
-                            name=fn["name"],
-                            description=fn["description"],
-                            parameters=fn["parameters"],
-                        )
-                    )
-                gemini_tools = [Tool(function_declarations=declarations)]
+            gemini_tools = self.converted_tools(
+                tools, "gemini", self._build_gemini_tools
+            )
+            if gemini_tools:
                 config_kwargs["tools"] = gemini_tools
 
         config = types.GenerateContentConfig(**config_kwargs)
@@ -155,8 +174,13 @@ class GeminiProvider(BaseLLMProvider):
                 fr_str = fr.name if hasattr(fr, "name") else str(fr)
                 finish_reason = fr_str.lower()
 
+        usage = getattr(response, "usage_metadata", None)
         return LLMResponse(
-            content=content, tool_calls=tool_calls, finish_reason=finish_reason
+            content=content,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason,
+            input_tokens=token_count(getattr(usage, "prompt_token_count", None)),
+            output_tokens=token_count(getattr(usage, "candidates_token_count", None)),
         )
 
     async def chat_stream(
@@ -191,20 +215,11 @@ class GeminiProvider(BaseLLMProvider):
 
         # Convert tools for streaming too
         if tools:
-            gemini_fns = self._convert_tools_to_gemini(tools)
-            if gemini_fns:
-                from google.genai.types import FunctionDeclaration, Tool
-
-                declarations = []
-                for fn in gemini_fns:
-                    declarations.append(
-                        FunctionDeclaration(
-                            name=fn["name"],
-                            description=fn["description"],
-                            parameters=fn["parameters"],
-                        )
-                    )
-                config_kwargs["tools"] = [Tool(function_declarations=declarations)]
+            gemini_tools = self.converted_tools(
+                tools, "gemini", self._build_gemini_tools
+            )
+            if gemini_tools:
+                config_kwargs["tools"] = gemini_tools
 
         config = types.GenerateContentConfig(**config_kwargs)
 
@@ -216,6 +231,77 @@ class GeminiProvider(BaseLLMProvider):
             if chunk.text:
                 yield chunk.text
 
+    async def chat_events(
+        self, messages: list[ChatMessage], tools: Optional[list[dict]] = None
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream text deltas and function calls from Gemini"""
+        client = self._get_client()
+        from google.genai import types
+
+        # Build contents
+        system_instruction = None
+        contents = []
+        for m in messages:
+            if m.role == "system":
+                system_instruction = m.content
+            elif m.role == "user":
+                contents.append(
+                    types.Content(
+                        role="user", parts=[types.Part.from_text(text=m.content)]
+                    )
+                )
+            elif m.role == "assistant":
+                contents.append(
+                    types.Content(
+                        role="model", parts=[types.Part.from_text(text=m.content)]
+                    )
+                )
+
+        config_kwargs = {}
+        if system_instruction:
+            config_kwargs["system_instruction"] = system_instruction
+
+        if tools:
+            gemini_tools = self.converted_tools(
+                tools, "gemini", self._build_gemini_tools
+            )
+            if gemini_tools:
+                config_kwargs["tools"] = gemini_tools
+
+        config = types.GenerateContentConfig(**config_kwargs)
+
+        # Gemini sends function calls as complete parts — no assembly needed
+        tool_call_count = 0
+        finish_reason = "stop"
+        async for chunk in client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=config,
+        ):
+            if not chunk.candidates:
+                continue
+            candidate = chunk.candidates[0]
+            if candidate.content and candidate.content.parts:
+                for part in candidate.content.parts:
+                    if part.text:
+                        yield StreamEvent(text=part.text)
+                    elif part.function_call:
+                        fc = part.function_call
+                        yield StreamEvent(
+                            tool_call=ToolCall(
+                                id=f"gemini_{tool_call_count}",
+                                name=fc.name,
+                                parameters=dict(fc.args) if fc.args else {},
+                            )
+                        )
+                        tool_call_count += 1
+            if candidate.finish_reason:
+                fr = candidate.finish_reason
+                fr_str = fr.name if hasattr(fr, "name") else str(fr)
+                finish_reason = fr_str.lower()
+
+        yield StreamEvent(finish_reason=finish_reason)
+
     async def health_check(self) -> bool:
         """Check if Gemini API is accessible"""
         if not self.api_key:
@@ -0,0 +1,41 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Shared HTTP Client Factory for LLM Providers
+
+Jeder Provider haelt einen langlebigen httpx.AsyncClient mit Connection-Pool,
+statt pro Request TCP/TLS neu aufzubauen. Geschlossen wird im FastAPI-Lifespan
+ueber LLMRouter.aclose().
+"""
+
+import logging
+
+import httpx
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+def create_http_client(timeout: float = 120.0, **kwargs) -> httpx.AsyncClient:
+    """Create a pooled AsyncClient configured from settings"""
+    http2 = settings.llm_http2
+    if http2 and not _http2_available():
+        logger.warning("LLM_HTTP2 aktiv, aber 'h2' fehlt — nutze HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.llm_http_max_connections,
+        max_keepalive_connections=settings.llm_http_max_keepalive,
+        keepalive_expiry=settings.llm_http_keepalive_expiry,
+    )
+    return httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2, **kwargs)
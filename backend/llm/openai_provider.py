@@ -6,7 +6,17 @@ from typing import AsyncGenerator, Optional
 import logging
 import json
 
-from .provider import BaseLLMProvider, ChatMessage, LLMResponse, ToolCall
+import httpx
+
+from .provider import (
+    BaseLLMProvider,
+    ChatMessage,
+    LLMResponse,
+    StreamEvent,
+    ToolCall,
+    token_count,
+)
+from .http_pool import create_http_client
 from core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -20,6 +30,7 @@ class OpenAIProvider(BaseLLMProvider):
         self.api_key = settings.openai_api_key
         self._client = None
         self._current_key = None
+        self._http: Optional[httpx.AsyncClient] = None
 
     def update_config(self, api_key: Optional[str] = None, model: Optional[str] = None):
         """Update provider configuration"""
@@ -30,12 +41,26 @@ class OpenAIProvider(BaseLLMProvider):
         if model:
             self.model = model
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Pooled transport shared by all SDK clients of this provider"""
+        if self._http is None or self._http.is_closed:
+            self._http = create_http_client(timeout=600.0)
+        return self._http
+
+    async def aclose(self) -> None:
+        self._client = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
     def _get_client(self):
         if self._client is None or self._current_key != self.api_key:
             try:
                 from openai import AsyncOpenAI
 
-                self._client = AsyncOpenAI(api_key=self.api_key)
+                self._client = AsyncOpenAI(
+                    api_key=self.api_key, http_client=self._get_http_client()
+                )
                 self._current_key = self.api_key
             except ImportError:
                 raise ImportError(
@@ -75,10 +100,13 @@ class OpenAIProvider(BaseLLMProvider):
                 for tc in message.tool_calls
             ]
 
+        usage = getattr(response, "usage", None)
         return LLMResponse(
             content=message.content,
             tool_calls=tool_calls,
             finish_reason=response.choices[0].finish_reason or "stop",
+            input_tokens=token_count(getattr(usage, "prompt_tokens", None)),
+            output_tokens=token_count(getattr(usage, "completion_tokens", None)),
         )
 
     async def chat_stream(
@@ -102,6 +130,72 @@ class OpenAIProvider(BaseLLMProvider):
             if chunk.choices[0].delta.content:
                 yield chunk.choices[0].delta.content
 
+    async def chat_events(
+        self, messages: list[ChatMessage], tools: Optional[list[dict]] = None
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Stream text deltas and tool calls from OpenAI"""
+        client = self._get_client()
+
+        kwargs = {
+            "model": self.model,
+            "messages": [{"role": m.role, "content": m.content} for m in messages],
+            "stream": True,
+        }
+
+        if tools:
+            kwargs["tools"] = tools
+
+        stream = await client.chat.completions.create(**kwargs)
+
+        # Tool call deltas arrive per index: id/name first, then argument fragments.
+        # A call is complete once the next index starts or the choice finishes.
+        pending: Optional[dict] = None
+        finish_reason = "stop"
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+
+            if delta.content:
+                yield StreamEvent(text=delta.content)
+
+            for tc in delta.tool_calls or []:
+                if pending is None or tc.index != pending["index"]:
+                    if pending is not None:
+                        yield StreamEvent(tool_call=self._assemble_tool_call(pending))
+                    pending = {"index": tc.index, "id": "", "name": "", "arguments": ""}
+                if tc.id:
+                    pending["id"] = tc.id
+                if tc.function and tc.function.name:
+                    pending["name"] += tc.function.name
+                if tc.function and tc.function.arguments:
+                    pending["arguments"] += tc.function.arguments
+
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+                if pending is not None:
+                    yield StreamEvent(tool_call=self._assemble_tool_call(pending))
+                    pending = None
+
+        if pending is not None:
+            yield StreamEvent(tool_call=self._assemble_tool_call(pending))
+        yield StreamEvent(finish_reason=finish_reason)
+
+    @staticmethod
+    def _assemble_tool_call(pending: dict) -> ToolCall:
+        try:
+            params = json.loads(pending["arguments"] or "{}")
+        except json.JSONDecodeError:
+            params = {}
+            logger.warning(f"Failed to parse tool arguments for {pending['name']}")
+        return ToolCall(
+            id=pending["id"] or f"call_{pending['index']}",
+            name=pending["name"],
+            parameters=params,
+        )
+
     async def health_check(self) -> bool:
         """Check if OpenAI API is accessible"""
         if not self.api_key:
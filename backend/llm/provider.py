@@ -3,7 +3,7 @@ Axon by NeuroVexon - LLM Provider Base Class
 """
 
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Callable, Optional
 from pydantic import BaseModel
 
 
@@ -22,6 +22,25 @@ class LLMResponse(BaseModel):
     content: Optional[str] = None
     tool_calls: Optional[list[ToolCall]] = None
     finish_reason: str = "stop"
+    # Token usage as reported by the provider (None if unknown)
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+
+
+def token_count(value: Any) -> Optional[int]:
+    """Token count from a provider usage field, None if missing"""
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+class StreamEvent(BaseModel):
+    """
+    One event from BaseLLMProvider.chat_events():
+    either a text delta or a fully assembled tool call
+    """
+
+    text: Optional[str] = None
+    tool_call: Optional[ToolCall] = None
+    finish_reason: Optional[str] = None
 
 
 class BaseLLMProvider(ABC):
@@ -44,7 +63,41 @@ class BaseLLMProvider(ABC):
         """Stream chat response"""
         pass
 
+    async def chat_events(
+        self, messages: list[ChatMessage], tools: Optional[list[dict]] = None
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """
+        Stream text deltas and tool calls as soon as each one is complete.
+        Default: one blocking chat() call, replayed as events.
+        """
+        response = await self.chat(messages=messages, tools=tools)
+        if response.content:
+            yield StreamEvent(text=response.content)
+        for tool_call in response.tool_calls or []:
+            yield StreamEvent(tool_call=tool_call)
+        yield StreamEvent(finish_reason=response.finish_reason)
+
+    @staticmethod
+    def converted_tools(
+        tools: list[dict], fmt: str, convert: Callable[[list[dict]], Any]
+    ) -> Any:
+        """
+        Provider-specific tool format. Cached registry schemas (ToolSchema)
+        carry a `converted` dict, so the conversion runs once per schema
+        version instead of on every call.
+        """
+        cache = getattr(tools, "converted", None)
+        if cache is None:
+            return convert(tools)
+        if fmt not in cache:
+            cache[fmt] = convert(tools)
+        return cache[fmt]
+
     @abstractmethod
     async def health_check(self) -> bool:
         """Check if provider is available"""
         pass
+
+    async def aclose(self) -> None:
+        """Release pooled connections (called on application shutdown)"""
+        pass
@@ -18,6 +18,17 @@ from core.config import settings, LLMProvider
 logger = logging.getLogger(__name__)
 
 
+# provider -> (API key setting, model setting); DB value first, then env
+_PROVIDER_SETTINGS = {
+    LLMProvider.OLLAMA: (None, "ollama_model"),
+    LLMProvider.CLAUDE: ("anthropic_api_key", "claude_model"),
+    LLMProvider.OPENAI: ("openai_api_key", "openai_model"),
+    LLMProvider.GEMINI: ("gemini_api_key", "gemini_model"),
+    LLMProvider.GROQ: ("groq_api_key", "groq_model"),
+    LLMProvider.OPENROUTER: ("openrouter_api_key", "openrouter_model"),
+}
+
+
 class LLMRouter:
     """Routes requests to the configured LLM provider"""
 
@@ -25,112 +36,66 @@ class LLMRouter:
         self._providers: dict[LLMProvider, BaseLLMProvider] = {}
         self._current_provider: Optional[LLMProvider] = None
         self._db_settings: dict = {}
-
-    def update_settings(self, db_settings: dict):
-        """Update router with settings from database"""
+        self._settings_version: Optional[int] = None
+        # Last config passed to update_config() per provider
+        self._applied: dict[LLMProvider, dict] = {}
+
+    def update_settings(self, db_settings: dict, version: Optional[int] = None):
+        """
+        Update router with settings from database (secrets decrypted).
+
+        With a snapshot version, an unchanged version is a no-op; providers
+        are only reconfigured when their API key or model actually changed.
+        """
+        if version is not None and version == self._settings_version:
+            return
         self._db_settings = db_settings
-
-        # Update Claude provider if exists
-        if LLMProvider.CLAUDE in self._providers:
-            api_key = db_settings.get("anthropic_api_key") or settings.anthropic_api_key
-            model = db_settings.get("claude_model") or settings.claude_model
-            self._providers[LLMProvider.CLAUDE].update_config(
-                api_key=api_key, model=model
-            )
-
-        # Update OpenAI provider if exists
-        if LLMProvider.OPENAI in self._providers:
-            api_key = db_settings.get("openai_api_key") or settings.openai_api_key
-            model = db_settings.get("openai_model") or settings.openai_model
-            self._providers[LLMProvider.OPENAI].update_config(
-                api_key=api_key, model=model
-            )
-
-        # Update Ollama provider if exists
-        if LLMProvider.OLLAMA in self._providers:
-            model = db_settings.get("ollama_model") or settings.ollama_model
-            self._providers[LLMProvider.OLLAMA].update_config(model=model)
-
-        # Update Gemini provider if exists
-        if LLMProvider.GEMINI in self._providers:
-            api_key = db_settings.get("gemini_api_key") or settings.gemini_api_key
-            model = db_settings.get("gemini_model") or settings.gemini_model
-            self._providers[LLMProvider.GEMINI].update_config(
-                api_key=api_key, model=model
-            )
-
-        # Update Groq provider if exists
-        if LLMProvider.GROQ in self._providers:
-            api_key = db_settings.get("groq_api_key") or settings.groq_api_key
-            model = db_settings.get("groq_model") or settings.groq_model
-            self._providers[LLMProvider.GROQ].update_config(
-                api_key=api_key, model=model
+        self._settings_version = version
+        for provider, instance in self._providers.items():
+            self._configure(provider, instance)
+
+    def _provider_config(self, provider: LLMProvider) -> dict:
+        key_setting, model_setting = _PROVIDER_SETTINGS[provider]
+        config = {
+            "model": self._db_settings.get(model_setting)
+            or getattr(settings, model_setting)
+        }
+        if key_setting:
+            config["api_key"] = self._db_settings.get(key_setting) or getattr(
+                settings, key_setting
             )
+        return config
 
-        # Update OpenRouter provider if exists
-        if LLMProvider.OPENROUTER in self._providers:
-            api_key = (
-                db_settings.get("openrouter_api_key") or settings.openrouter_api_key
-            )
-            model = db_settings.get("openrouter_model") or settings.openrouter_model
-            self._providers[LLMProvider.OPENROUTER].update_config(
-                api_key=api_key, model=model
-            )
+    def _configure(self, provider: LLMProvider, instance: BaseLLMProvider):
+        config = self._provider_config(provider)
+        if self._applied.get(provider) == config:
+            return
+        instance.update_config(**config)
+        self._applied[provider] = config
 
     def _get_or_create_provider(self, provider: LLMProvider) -> BaseLLMProvider:
         """Get or create a provider instance"""
         if provider not in self._providers:
             if provider == LLMProvider.OLLAMA:
-                self._providers[provider] = OllamaProvider()
+                p = OllamaProvider()
             elif provider == LLMProvider.CLAUDE:
                 p = ClaudeProvider()
-                api_key = (
-                    self._db_settings.get("anthropic_api_key")
-                    or settings.anthropic_api_key
-                )
-                model = self._db_settings.get("claude_model") or settings.claude_model
-                p.update_config(api_key=api_key, model=model)
-                self._providers[provider] = p
             elif provider == LLMProvider.OPENAI:
                 p = OpenAIProvider()
-                api_key = (
-                    self._db_settings.get("openai_api_key") or settings.openai_api_key
-                )
-                model = self._db_settings.get("openai_model") or settings.openai_model
-                p.update_config(api_key=api_key, model=model)
-                self._providers[provider] = p
             elif provider == LLMProvider.GEMINI:
                 p = GeminiProvider()
-                api_key = (
-                    self._db_settings.get("gemini_api_key") or settings.gemini_api_key
-                )
-                model = self._db_settings.get("gemini_model") or settings.gemini_model
-                p.update_config(api_key=api_key, model=model)
-                self._providers[provider] = p
             elif provider == LLMProvider.GROQ:
                 p = OpenAICompatibleProvider(
                     base_url="https://api.groq.com/openai/v1", provider_name="groq"
                 )
-                api_key = self._db_settings.get("groq_api_key") or settings.groq_api_key
-                model = self._db_settings.get("groq_model") or settings.groq_model
-                p.update_config(api_key=api_key, model=model)
-                self._providers[provider] = p
             elif provider == LLMProvider.OPENROUTER:
                 p = OpenAICompatibleProvider(
                     base_url="https://openrouter.ai/api/v1", provider_name="openrouter"
                 )
-                api_key = (
-                    self._db_settings.get("openrouter_api_key")
-                    or settings.openrouter_api_key
-                )
-                model = (
-                    self._db_settings.get("openrouter_model")
-                    or settings.openrouter_model
-                )
-                p.update_config(api_key=api_key, model=model)
-                self._providers[provider] = p
             else:
                 raise ValueError(f"Unknown provider: {provider}")
+            self._configure(provider, p)
+            self._providers[provider] = p
         return self._providers[provider]
 
     def get_provider(self, provider: Optional[LLMProvider] = None) -> BaseLLMProvider:
@@ -154,6 +119,16 @@ class LLMRouter:
                 results[provider.value] = False
         return results
 
+    async def aclose(self):
+        """Close pooled HTTP clients of all instantiated providers"""
+        for provider, instance in self._providers.items():
+            try:
+                await instance.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close provider {provider}: {e}")
+        self._providers.clear()
+        self._applied.clear()
+
 
 # Global router instance
 llm_router = LLMRouter()
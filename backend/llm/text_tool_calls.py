@@ -0,0 +1,282 @@
+# Copyright 2026 NeuroVexon UG (haftungsbeschraenkt)
+# SPDX-License-Identifier: Apache-2.0
+"""
+Axon by NeuroVexon - Incremental Text Tool-Call Parser
+
+Manche Modelle (z.B. mistral:7b-instruct) schreiben Tool-Calls als Text statt
+als strukturierte tool_calls. TextToolCallParser erkennt drei Formen:
+
+- [TOOL_CALLS] [{"name": "memory_save", "arguments": {...}}]
+- ```json {"name": "memory_save", "arguments": {...}} ```
+- memory_save(key="...", content="...") / memory_save({...}) / memory_save("...")
+
+Der Parser wird mit gestreamten Deltas gefuettert (feed) und liefert jeden
+Call, sobald seine Form geschlossen ist — der Orchestrator kann das Tool noch
+waehrend des Streams starten. Ein Durchlauf ueber den Text: Ein vorkompiliertes
+Muster findet den naechsten Kandidaten (Tool-Namen per Set-Lookup, unabhaengig
+von der Zahl der Tools), ein fortsetzbarer Klammer-Scanner findet sein Ende.
+Bereits gepruefter Text wird verworfen.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from .provider import ToolCall
+
+logger = logging.getLogger(__name__)
+
+TOOL_CALLS_MARKER = "[TOOL_CALLS]"
+FENCE = "```"
+
+_KWARG_RE = re.compile(r'(\w+)\s*=\s*["\']([^"\']*)["\']')
+_POSITIONAL_RE = re.compile(r'^["\'](.+?)["\']$', re.DOTALL)
+_FENCE_LANG_RE = re.compile(r"^json\b", re.IGNORECASE)
+_CLOSERS = {"(": ")", "[": "]", "{": "}"}
+
+# Unclosed candidates longer than this are given up (prose, not a call)
+MAX_CANDIDATE_CHARS = 20000
+
+
+# Candidate starts: marker, fence or any identifier followed by "("
+_CANDIDATE_RE = re.compile(r"\[TOOL_CALLS\]|```|(?<![\w.])(?P<name>[A-Za-z_]\w*)\s*\(")
+
+
+class _Balance:
+    """Resumable bracket matcher that skips brackets inside quoted strings"""
+
+    def __init__(self, start: int, quotes: str):
+        self.pos = start  # Next character to scan
+        self.quotes = quotes
+        self.stack: list[str] = []
+        self.quote: Optional[str] = None
+        self.escape = False
+
+    def scan(self, text: str) -> Optional[int]:
+        """Index after the bracket that closes the first one, or None (incomplete)"""
+        i = self.pos
+        n = len(text)
+        while i < n:
+            ch = text[i]
+            i += 1
+            if self.quote:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == self.quote:
+                    self.quote = None
+            elif ch in self.quotes:
+                self.quote = ch
+            elif ch in _CLOSERS:
+                self.stack.append(_CLOSERS[ch])
+            elif self.stack and ch == self.stack[-1]:
+                self.stack.pop()
+                if not self.stack:
+                    self.pos = i
+                    return i
+        self.pos = i
+        return None
+
+
+@dataclass
+class _Candidate:
+    kind: str  # "marker", "fence" or "call"
+    start: int  # Where the candidate starts in the text
+    body: int  # Where its JSON list / fence content / "(" starts
+    name: Optional[str] = None  # Tool name ("call")
+    balance: Optional[_Balance] = None
+    resume: int = 0  # Fence: next index to look for the closing fence
+    after: int = 0  # Set once closed: scanning continues here
+
+
+class TextToolCallParser:
+    """Finds tool calls written as text, incrementally over streamed deltas"""
+
+    def __init__(self, available_tools: list[dict]):
+        self.tool_names = frozenset(t["function"]["name"] for t in available_tools)
+        # tool_name -> first required parameter (positional calls)
+        self._first_param = {}
+        for t in available_tools:
+            required = t["function"].get("parameters", {}).get("required", [])
+            if required:
+                self._first_param[t["function"]["name"]] = required[0]
+        # Unscanned tail kept between deltas: a marker may be split
+        self._keep = max([len(n) for n in self.tool_names] + [len(TOOL_CALLS_MARKER)])
+        self._keep += 16
+        self._buf = ""  # Text not yet ruled out; positions below are relative
+        self._pos = 0  # No candidate starts before this index
+        self._candidate: Optional[_Candidate] = None
+        self._closing_fence = -1  # Closing fence of a fence that was no call
+        self._count = 0
+
+    def feed(self, delta: str) -> list[ToolCall]:
+        """Add streamed text; returns the calls completed by it"""
+        self._buf += delta
+        if self._candidate is None and not (
+            "(" in delta or "]" in delta or "`" in delta
+        ):
+            # Every candidate ends with "(", "]" or "`": none completed here
+            self._pos = max(self._pos, len(self._buf) - self._keep)
+            self._discard_scanned()
+            return []
+        return self._scan(final=False)
+
+    def finish(self) -> list[ToolCall]:
+        """End of stream: give up unclosed candidates and scan the rest"""
+        return self._scan(final=True)
+
+    def _discard_scanned(self) -> None:
+        """Drop text before _pos (one character stays for the lookbehind)"""
+        cut = self._pos - 1
+        if cut > 0:
+            self._buf = self._buf[cut:]
+            self._pos -= cut
+            self._closing_fence -= cut
+
+    def _scan(self, final: bool) -> list[ToolCall]:
+        calls: list[ToolCall] = []
+        while True:
+            text = self._buf
+            candidate = self._candidate
+            if candidate is None:
+                match = _CANDIDATE_RE.search(text, self._pos)
+                if match is None:
+                    keep = 0 if final else self._keep
+                    self._pos = max(self._pos, len(text) - keep)
+                    self._discard_scanned()
+                    return calls
+                name = match.group("name")
+                if match.start() == self._closing_fence or (
+                    name is not None and name not in self.tool_names
+                ):
+                    self._pos = match.end()
+                    continue
+                candidate = self._candidate = self._start(match)
+
+            end = self._find_end(candidate, text)
+            if end is None and (
+                final or len(text) - candidate.start > MAX_CANDIDATE_CHARS
+            ):
+                end = -1  # Never closed: not a call
+            if end is None:
+                return calls
+
+            self._candidate = None
+            parsed = (
+                self._parse(candidate, text[candidate.body : end]) if end >= 0 else []
+            )
+            if parsed:
+                calls.extend(parsed)
+                self._pos = candidate.after
+            elif candidate.kind == "fence" and end >= 0:
+                # Code block, not a JSON call: a tool(...) call may be inside
+                self._pos = candidate.body
+                self._closing_fence = end
+            else:
+                # Skip this marker only, later calls may start inside it
+                self._pos = candidate.start + 1
+
+    def _start(self, match: re.Match) -> _Candidate:
+        if match.group("name"):
+            paren = match.end() - 1
+            return _Candidate(
+                "call",
+                match.start(),
+                paren,
+                name=match.group("name"),
+                balance=_Balance(paren, "\"'"),
+            )
+        if match.group(0) == TOOL_CALLS_MARKER:
+            return _Candidate("marker", match.start(), match.end())
+        return _Candidate("fence", match.start(), match.end(), resume=match.end())
+
+    def _find_end(self, c: _Candidate, text: str) -> Optional[int]:
+        """End of the candidate body; None = not closed yet, -1 = invalid"""
+        if c.kind == "fence":
+            close = text.find(FENCE, c.resume)
+            if close == -1:
+                c.resume = max(c.body, len(text) - len(FENCE) + 1)
+                return None
+            c.after = close + len(FENCE)
+            return close
+
+        if c.balance is None:  # marker: wait for the JSON list
+            rest = text[c.body :].lstrip()
+            if not rest:
+                return None
+            if rest[0] != "[":
+                return -1
+            c.body = len(text) - len(rest)
+            c.balance = _Balance(c.body, '"')
+        end = c.balance.scan(text)
+        if end is not None:
+            c.after = end
+        return end
+
+    def _next_id(self) -> str:
+        call_id = f"fallback_{self._count}"
+        self._count += 1
+        return call_id
+
+    def _parse(self, c: _Candidate, body: str) -> list[ToolCall]:
+        try:
+            if c.kind == "marker":
+                return self._parse_marker(body)
+            if c.kind == "fence":
+                return self._parse_fence(body)
+            return self._parse_call(c.name, body[1:-1].strip())
+        except (json.JSONDecodeError, AttributeError, TypeError):
+            return []
+
+    def _parse_marker(self, body: str) -> list[ToolCall]:
+        calls = []
+        for call in json.loads(body):
+            name = call.get("name", "")
+            if name in self.tool_names:
+                args = call.get("arguments", {})
+                calls.append(ToolCall(id=self._next_id(), name=name, parameters=args))
+        if calls:
+            logger.info(f"Parsed {len(calls)} tool call(s) from [TOOL_CALLS] text")
+        return calls
+
+    def _parse_fence(self, body: str) -> list[ToolCall]:
+        body = _FENCE_LANG_RE.sub("", body.strip(), count=1).strip()
+        if not body.startswith("{"):
+            return []
+        obj = json.loads(body)
+        name = obj.get("name", "") or obj.get("function_name", "")
+        args = obj.get("arguments", {}) or obj.get("parameters", {})
+        if name not in self.tool_names or not args:
+            return []
+        logger.info(f"Parsed tool call from code fence: {name}({args})")
+        return [ToolCall(id=self._next_id(), name=name, parameters=args)]
+
+    def _parse_call(self, tool_name: str, args_str: str) -> list[ToolCall]:
+        if args_str.startswith("{"):
+            args = json.loads(args_str)
+        else:
+            # kwargs-style: key="value", content="value"
+            args = {kv.group(1): kv.group(2) for kv in _KWARG_RE.finditer(args_str)}
+            if not args:
+                # positional: tool("value")
+                positional = _POSITIONAL_RE.match(args_str)
+                if positional and tool_name in self._first_param:
+                    args = {self._first_param[tool_name]: positional.group(1)}
+        if not args:
+            return []
+        logger.info(f"Parsed tool call from text: {tool_name}({args})")
+        return [ToolCall(id=self._next_id(), name=tool_name, parameters=args)]
+
+
+def parse_tool_calls_from_text(
+    text: str, available_tools: list[dict]
+) -> Optional[list[ToolCall]]:
+    """Tool calls in a complete response text, or None"""
+    if not text or not available_tools:
+        return None
+    parser = TextToolCallParser(available_tools)
+    calls = parser.feed(text) + parser.finish()
+    return calls or None
@@ -17,6 +17,7 @@ from contextlib import asynccontextmanager
 import logging
 
 from core.config import settings
+from core.rate_limit import RateLimitMiddleware
 from db.database import init_db
 from api import (
     auth,
@@ -50,20 +51,59 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
 
-    # Create default agents
+    # Start batched audit writer
+    from agent.audit_writer import audit_writer
+
+    if not settings.audit_sync:
+        audit_writer.start()
+
+    # Build analytics rollups once for databases that predate them
     from db.database import async_session
+    from agent.analytics_rollup import ensure_rollups
+
+    async with async_session() as db:
+        await ensure_rollups(db)
+
+    # Uploads whose worker stopped mid-extraction never finish: mark them failed
+    from agent.upload_jobs import upload_jobs
+
+    await upload_jobs.fail_stale()
+
+    # Embed memories that were stored without embedding (background)
+    from agent.memory import schedule_embedding_backfill
+
+    schedule_embedding_backfill()
+
+    # Pre-start sandbox containers (background, skipped without Docker)
+    from sandbox.executor import warm_sandbox_pool
+
+    asyncio.create_task(warm_sandbox_pool())
+
+    # Create default agents
     from agent.agent_manager import AgentManager
 
     async with async_session() as db:
         agent_mgr = AgentManager(db)
         await agent_mgr.ensure_defaults()
 
-    # Start task scheduler
-    from agent.scheduler import task_scheduler
+    # Start task scheduler — only in one worker (file lock)
+    from agent.scheduler import LeaderLock, task_scheduler
+
+    scheduler_lock = LeaderLock(settings.scheduler_lock_path)
+    if scheduler_lock.acquire():
+        task_scheduler.start(sync_interval=settings.scheduler_sync_seconds)
+        # Workflow runs whose worker stopped (no heartbeat) become resumable
+        from agent.workflows import RUN_HEARTBEAT_SECONDS, sweep_interrupted_runs
 
-    task_scheduler.start()
-    await task_scheduler.sync_tasks()
-    logger.info("TaskScheduler gestartet")
+        await sweep_interrupted_runs()
+        task_scheduler.add_interval_job(
+            sweep_interrupted_runs, RUN_HEARTBEAT_SECONDS, "workflow_run_sweep"
+        )
+        await task_scheduler.sync_tasks()
+        logger.info("TaskScheduler gestartet")
+    else:
+        task_scheduler.leader = False
+        logger.info("TaskScheduler laeuft in einem anderen Worker")
 
     # Create outputs directory
     os.makedirs(settings.outputs_dir, exist_ok=True)
@@ -109,6 +149,45 @@ async def lifespan(app: FastAPI):
     from agent.scheduler import task_scheduler as ts
 
     ts.stop()
+    scheduler_lock.release()
+
+    # Close pooled LLM HTTP connections
+    from llm.router import llm_router
+
+    await llm_router.aclose()
+
+    # Write pending audit events
+    await audit_writer.stop()
+
+    # Stop text extraction worker processes
+    from agent.upload_jobs import shutdown_executor
+
+    shutdown_executor()
+
+    # Remove pre-started sandbox containers
+    from sandbox.executor import sandbox_pool
+
+    await sandbox_pool.close()
+
+    # Close web_fetch client and HTTP cache file
+    from agent.web_fetch import web_fetcher
+
+    await web_fetcher.aclose()
+
+    # Close web_search client
+    from agent.web_search import web_search
+
+    await web_search.aclose()
+
+    # Close approval bus file
+    from agent.approval_bus import approval_backend
+
+    approval_backend.close()
+
+    # Close embedding cache file
+    from agent.embedding_cache import embedding_cache
+
+    embedding_cache.close()
     logger.info("Shutting down Axon")
 
 
@@ -119,6 +198,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Per-route rate limits (inside CORS, so 429 responses keep CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
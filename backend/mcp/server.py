@@ -8,7 +8,6 @@ Transport: Server-Sent Events (SSE)
 Auth: Bearer Token
 """
 
-import asyncio
 import json
 import logging
 import time
@@ -32,10 +31,6 @@ MCP_SERVER_NAME = "axon-mcp"
 MCP_SERVER_VERSION = "2.0.0"
 MCP_PROTOCOL_VERSION = "2024-11-05"
 
-# Pending approval requests: {approval_id: asyncio.Event}
-_pending_approvals: dict[str, asyncio.Event] = {}
-_approval_decisions: dict[str, str] = {}  # approval_id -> "approved" | "rejected"
-
 
 class MCPServer:
     """MCP Server Handler"""
@@ -8,6 +8,9 @@ Docker-basierte Code-Ausfuehrung mit Isolation:
 - Read-only Filesystem
 - Non-root User
 - Auto-Remove Container
+
+Mit SANDBOX_POOL_SIZE > 0 laeuft der Code in vorgestarteten Containern aus
+sandbox.pool (docker exec statt docker run pro Aufruf).
 """
 
 import asyncio
@@ -15,6 +18,10 @@ import logging
 import os
 import tempfile
 import time
+import uuid
+
+from core.config import settings
+from sandbox.pool import SandboxPool, run_docker, sandbox_limit_args
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +37,18 @@ SANDBOX_IMAGE = "axon-sandbox:latest"
 # Semaphore fuer max gleichzeitige Container
 _semaphore = asyncio.Semaphore(MAX_CONCURRENT)
 
+# docker info / image inspect: Ergebnis wird zwischengespeichert
+_CHECK_TTL = 60  # Sekunden
+_check_cache: dict[str, tuple[float, bool]] = {}
+
+sandbox_pool = SandboxPool(
+    image=SANDBOX_IMAGE,
+    size=settings.sandbox_pool_size,
+    ttl=settings.sandbox_container_ttl,
+    memory=DEFAULT_MEMORY,
+    cpus=DEFAULT_CPUS,
+)
+
 
 class SandboxResult:
     """Ergebnis einer Sandbox-Ausfuehrung"""
@@ -66,36 +85,49 @@ class SandboxResult:
         return output[:MAX_OUTPUT_LENGTH]
 
 
-async def _check_docker() -> bool:
-    """Prueft ob Docker verfuegbar ist"""
+async def _cached_check(name: str, *docker_args: str) -> bool:
+    """Runs a docker check command, result cached for _CHECK_TTL seconds"""
+    cached = _check_cache.get(name)
+    if cached is not None and time.monotonic() - cached[0] < _CHECK_TTL:
+        return cached[1]
     try:
         proc = await asyncio.create_subprocess_exec(
             "docker",
-            "info",
+            *docker_args,
             stdout=asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.DEVNULL,
         )
         await proc.wait()
-        return proc.returncode == 0
+        ok = proc.returncode == 0
     except Exception:
-        return False
+        ok = False
+    _check_cache[name] = (time.monotonic(), ok)
+    return ok
+
+
+async def _check_docker() -> bool:
+    """Prueft ob Docker verfuegbar ist"""
+    return await _cached_check("docker", "info")
 
 
 async def _check_image_exists() -> bool:
     """Prueft ob das Sandbox-Image existiert"""
-    try:
-        proc = await asyncio.create_subprocess_exec(
-            "docker",
-            "image",
-            "inspect",
-            SANDBOX_IMAGE,
-            stdout=asyncio.subprocess.DEVNULL,
-            stderr=asyncio.subprocess.DEVNULL,
-        )
-        await proc.wait()
-        return proc.returncode == 0
-    except Exception:
+    return await _cached_check("image", "image", "inspect", SANDBOX_IMAGE)
+
+
+async def warm_sandbox_pool() -> bool:
+    """Startet die Pool-Container vor, falls Docker und Image vorhanden sind"""
+    if not sandbox_pool.enabled:
         return False
+    if not await _check_docker() or not await _check_image_exists():
+        return False
+    try:
+        await sandbox_pool.reap_orphans()
+    except Exception as e:
+        logger.warning(f"Sandbox-Pool: Aufraeumen fehlgeschlagen: {e}")
+    sandbox_pool.start()
+    logger.info(f"Sandbox-Pool: {sandbox_pool.size} Container werden vorgestartet")
+    return True
 
 
 async def build_sandbox_image() -> bool:
@@ -118,6 +150,7 @@ async def build_sandbox_image() -> bool:
             stderr=asyncio.subprocess.PIPE,
         )
         _stdout, _stderr = await proc.wait(), None
+        _check_cache.pop("image", None)
         return proc.returncode == 0
     except Exception as e:
         logger.error(f"Sandbox Image Build fehlgeschlagen: {e}")
@@ -178,81 +211,93 @@ async def execute_code(
             )
 
     async with _semaphore:
-        # Code in temporaere Datei schreiben
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".py", delete=False, prefix="axon_sandbox_"
-        ) as f:
-            f.write(code)
-            code_file = f.name
+        if sandbox_pool.enabled and memory == DEFAULT_MEMORY and cpus == DEFAULT_CPUS:
+            result = await _execute_pooled(code, timeout)
+            if result is not None:
+                return result
+        return await _execute_cold(code, timeout, memory, cpus)
+
+
+async def _execute_pooled(code: str, timeout: int):
+    """Warm path: docker exec in a pre-started container"""
+    start_time = time.time()
+    outcome = await sandbox_pool.execute(code, timeout)
+    if outcome is None:
+        return None  # Pool could not start a container -> cold path
+    exit_code, stdout_bytes, stderr_bytes, timed_out = outcome
+    return SandboxResult(
+        stdout=stdout_bytes.decode("utf-8", errors="replace")[:MAX_OUTPUT_LENGTH],
+        stderr=stderr_bytes.decode("utf-8", errors="replace")[:MAX_OUTPUT_LENGTH],
+        exit_code=exit_code,
+        execution_time_ms=int((time.time() - start_time) * 1000),
+        timed_out=timed_out,
+    )
+
+
+async def _execute_cold(code: str, timeout: int, memory: str, cpus: str):
+    """Cold path: one docker run --rm per call with the code bind-mounted"""
+    # Code in temporaere Datei schreiben
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".py", delete=False, prefix="axon_sandbox_"
+    ) as f:
+        f.write(code)
+        code_file = f.name
+
+    container_name = f"axon-sandbox-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    try:
+        start_time = time.time()
 
-        try:
-            start_time = time.time()
-
-            cmd = [
-                "docker",
-                "run",
-                "--rm",
-                "--network",
-                "none",
-                "--memory",
-                memory,
-                "--cpus",
-                cpus,
-                "--read-only",
-                "--tmpfs",
-                "/tmp:rw,noexec,nosuid,size=64m",
-                "--pids-limit",
-                "50",
-                "-v",
-                f"{code_file}:/home/sandbox/code.py:ro",
-                SANDBOX_IMAGE,
-                "python3",
-                "/home/sandbox/code.py",
-            ]
-
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
+        cmd = [
+            "docker",
+            "run",
+            "--rm",
+            "--name",
+            container_name,
+            *sandbox_limit_args(memory, cpus),
+            "-v",
+            f"{code_file}:/home/sandbox/code.py:ro",
+            SANDBOX_IMAGE,
+            "python3",
+            "/home/sandbox/code.py",
+        ]
 
-            timed_out = False
-            try:
-                stdout_bytes, stderr_bytes = await asyncio.wait_for(
-                    proc.communicate(), timeout=timeout
-                )
-            except asyncio.TimeoutError:
-                timed_out = True
-                proc.kill()
-                stdout_bytes, stderr_bytes = b"", b""
-                # Kill container
-                try:
-                    await asyncio.create_subprocess_exec(
-                        "docker",
-                        "kill",
-                        f"axon-sandbox-{os.getpid()}",
-                        stdout=asyncio.subprocess.DEVNULL,
-                        stderr=asyncio.subprocess.DEVNULL,
-                    )
-                except Exception:
-                    pass
-
-            execution_time_ms = int((time.time() - start_time) * 1000)
-
-            stdout = stdout_bytes.decode("utf-8", errors="replace")[:MAX_OUTPUT_LENGTH]
-            stderr = stderr_bytes.decode("utf-8", errors="replace")[:MAX_OUTPUT_LENGTH]
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
 
-            return SandboxResult(
-                stdout=stdout,
-                stderr=stderr,
-                exit_code=proc.returncode or 0,
-                execution_time_ms=execution_time_ms,
-                timed_out=timed_out,
+        timed_out = False
+        try:
+            stdout_bytes, stderr_bytes = await asyncio.wait_for(
+                proc.communicate(), timeout=timeout
             )
-
-        finally:
-            # Temporaere Datei loeschen
+        except asyncio.TimeoutError:
+            timed_out = True
+            proc.kill()
+            stdout_bytes, stderr_bytes = b"", b""
+            # Kill container
             try:
-                os.unlink(code_file)
+                await run_docker("kill", container_name, timeout=10)
             except Exception:
                 pass
+
+        execution_time_ms = int((time.time() - start_time) * 1000)
+
+        stdout = stdout_bytes.decode("utf-8", errors="replace")[:MAX_OUTPUT_LENGTH]
+        stderr = stderr_bytes.decode("utf-8", errors="replace")[:MAX_OUTPUT_LENGTH]
+
+        return SandboxResult(
+            stdout=stdout,
+            stderr=stderr,
+            exit_code=proc.returncode or 0,
+            execution_time_ms=execution_time_ms,
+            timed_out=timed_out,
+        )
+
+    finally:
+        # Temporaere Datei loeschen
+        try:
+            os.unlink(code_file)
+        except Exception:
+            pass
@@ -0,0 +1,321 @@
+"""
+Axon by NeuroVexon - Warm Sandbox Container Pool
+
+Haelt N vorgestartete Sandbox-Container bereit (gleiche Limits wie der kalte
+Pfad: kein Netzwerk, Read-only, Memory/CPU/PID-Limits, Non-root). Code kommt
+per `docker exec -i ... python3 -` ueber stdin in den Container — keine
+Temp-Datei, kein Bind-Mount, kein Container-Start im Hot Path.
+
+- Jeder Container wird genau einmal benutzt und danach entsorgt (kein Zustand
+  zwischen zwei Ausfuehrungen)
+- Ungenutzte Container werden nach SANDBOX_CONTAINER_TTL Sekunden ersetzt
+  (Hintergrund-Sweep, nicht erst beim naechsten acquire)
+- Nachgefuellt wird im Hintergrund
+- Alle Pool-Container tragen das Label axon.sandbox.pool=1 plus Besitzer
+  (Host:PID) und Startzeit. reap_orphans() entfernt beim Start Container
+  abgestuerzter Prozesse und alles, was deutlich aelter als die TTL ist.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+POOL_LABEL = "axon.sandbox.pool=1"
+_OWNER_LABEL = "axon.sandbox.owner"
+_STARTED_LABEL = "axon.sandbox.started"
+_PS_FORMAT = (
+    '{{.ID}}\t{{.Label "axon.sandbox.owner"}}\t{{.Label "axon.sandbox.started"}}'
+)
+
+
+def _owner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+def sandbox_limit_args(memory: str, cpus: str) -> list[str]:
+    """Isolation flags shared by pooled and cold containers"""
+    return [
+        "--network",
+        "none",
+        "--memory",
+        memory,
+        "--cpus",
+        cpus,
+        "--read-only",
+        "--tmpfs",
+        "/tmp:rw,noexec,nosuid,size=64m",
+        "--pids-limit",
+        "50",
+    ]
+
+
+async def run_docker(
+    *args: str, stdin: Optional[bytes] = None, timeout: Optional[float] = None
+) -> tuple[int, bytes, bytes]:
+    """Run a docker CLI command; raises asyncio.TimeoutError after timeout"""
+    proc = await asyncio.create_subprocess_exec(
+        "docker",
+        *args,
+        stdin=asyncio.subprocess.PIPE if stdin is not None else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(stdin), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode or 0, stdout, stderr
+
+
+@dataclass
+class _Container:
+    name: str
+    started_at: float
+
+
+class SandboxPool:
+    """Pool of pre-started, single-use sandbox containers"""
+
+    def __init__(
+        self,
+        image: str,
+        size: int = 2,
+        ttl: float = 300,
+        memory: str = "256m",
+        cpus: str = "0.5",
+    ):
+        self.image = image
+        self.size = size
+        self.ttl = ttl
+        self.memory = memory
+        self.cpus = cpus
+        self._ready: list[_Container] = []
+        self._starting = 0
+        self._counter = 0
+        self._tasks: set[asyncio.Task] = set()
+        self._sweeper: Optional[asyncio.Task] = None
+        self._closed = False
+        self._owner = _owner_id()
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.reaped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def _next_name(self) -> str:
+        self._counter += 1
+        return f"axon-sandbox-{os.getpid()}-{self._counter}"
+
+    async def _start_container(self) -> Optional[_Container]:
+        name = self._next_name()
+        code, _out, err = await run_docker(
+            "run",
+            "-d",
+            "--rm",
+            "--name",
+            name,
+            "--label",
+            POOL_LABEL,
+            "--label",
+            f"{_OWNER_LABEL}={self._owner}",
+            "--label",
+            f"{_STARTED_LABEL}={int(time.time())}",
+            *sandbox_limit_args(self.memory, self.cpus),
+            self.image,
+            "sleep",
+            "infinity",
+        )
+        if code != 0:
+            logger.warning(f"Sandbox-Container {name} nicht gestartet: {err!r}")
+            return None
+        return _Container(name=name, started_at=time.monotonic())
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refill_one(self) -> None:
+        try:
+            container = await self._start_container()
+        finally:
+            self._starting -= 1
+        if container is None:
+            return
+        if self._closed:
+            await self._remove(container)
+        else:
+            self._ready.append(container)
+
+    def fill(self) -> None:
+        """Start containers in the background until size are ready or starting"""
+        if self._closed:
+            return
+        while len(self._ready) + self._starting < self.size:
+            self._starting += 1
+            self._spawn(self._refill_one())
+
+    async def _remove(self, container: _Container) -> None:
+        self.recycled += 1
+        try:
+            await run_docker("rm", "-f", container.name, timeout=30)
+        except Exception as e:
+            logger.debug(f"Sandbox-Container {container.name} nicht entfernt: {e}")
+
+    def _expire(self) -> int:
+        """Discard ready containers older than the TTL; returns the count"""
+        now = time.monotonic()
+        expired = [c for c in self._ready if now - c.started_at >= self.ttl]
+        for container in expired:
+            self._ready.remove(container)
+            self._spawn(self._remove(container))
+        return len(expired)
+
+    def start(self) -> None:
+        """Fill the pool and start the background TTL sweep"""
+        self.fill()
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        interval = max(1.0, self.ttl / 2)
+        while not self._closed:
+            await asyncio.sleep(interval)
+            if self._expire():
+                self.fill()
+
+    async def reap_orphans(self) -> int:
+        """
+        Remove pool containers left behind by crashed processes: those of a
+        dead process on this host, and any older than twice the TTL.
+        """
+        code, out, err = await run_docker(
+            "ps",
+            "-a",
+            "--filter",
+            f"label={POOL_LABEL}",
+            "--format",
+            _PS_FORMAT,
+            timeout=30,
+        )
+        if code != 0:
+            logger.warning(f"Sandbox-Container nicht aufgelistet: {err!r}")
+            return 0
+
+        host = socket.gethostname()
+        max_age = 2 * self.ttl + 60
+        now = time.time()
+        orphans = []
+        for line in out.decode("utf-8", "replace").splitlines():
+            container_id, _, rest = line.partition("\t")
+            owner, _, started = rest.partition("\t")
+            owner_host, _, owner_pid = owner.rpartition(":")
+            if owner == self._owner:
+                continue
+            too_old = started.isdigit() and now - int(started) > max_age
+            dead = owner_host == host and owner_pid.isdigit()
+            dead = dead and not _pid_alive(int(owner_pid))
+            if container_id and (too_old or dead):
+                orphans.append(container_id)
+
+        if orphans:
+            await run_docker("rm", "-f", *orphans, timeout=60)
+            self.reaped += len(orphans)
+            logger.info(f"Sandbox-Pool: {len(orphans)} verwaiste Container entfernt")
+        return len(orphans)
+
+    async def acquire(self) -> Optional[_Container]:
+        """A ready container (warm hit) or a freshly started one (miss)"""
+        now = time.monotonic()
+        while self._ready:
+            container = self._ready.pop(0)
+            if now - container.started_at < self.ttl:
+                self.hits += 1
+                self.fill()
+                return container
+            self._spawn(self._remove(container))
+        self.misses += 1
+        self.fill()
+        return await self._start_container()
+
+    def release(self, container: _Container) -> None:
+        """Discard a used container (single use) in the background"""
+        self._spawn(self._remove(container))
+
+    async def execute(
+        self, code: str, timeout: float
+    ) -> Optional[tuple[int, bytes, bytes, bool]]:
+        """
+        Run Python code in a pooled container.
+
+        Returns (exit_code, stdout, stderr, timed_out), or None when no
+        container could be started.
+        """
+        container = await self.acquire()
+        if container is None:
+            return None
+        try:
+            exit_code, stdout, stderr = await run_docker(
+                "exec",
+                "-i",
+                container.name,
+                "python3",
+                "-",
+                stdin=code.encode("utf-8"),
+                timeout=timeout,
+            )
+            return exit_code, stdout, stderr, False
+        except asyncio.TimeoutError:
+            # Stops the user process; the container is discarded anyway
+            try:
+                await run_docker("kill", container.name, timeout=10)
+            except Exception:
+                pass
+            return -9, b"", b"", True
+        finally:
+            self.release(container)
+
+    async def close(self) -> None:
+        """Remove all pooled containers (lifespan shutdown)"""
+        self._closed = True
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        # Containers still starting remove themselves once _refill_one returns
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        ready, self._ready = self._ready, []
+        await asyncio.gather(*(self._remove(c) for c in ready), return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "ready": len(self._ready),
+            "starting": self._starting,
+            "hits": self.hits,
+            "misses": self.misses,
+            "recycled": self.recycled,
+            "reaped": self.reaped,
+        }
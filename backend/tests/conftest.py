@@ -38,11 +38,14 @@ async def db_engine():
 
 
 @pytest.fixture
-async def db(db_engine):
+def session_factory(db_engine):
+    """Session factory on the test engine (for code that opens its own sessions)"""
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def db(session_factory):
     """Create an async database session for testing"""
-    session_factory = async_sessionmaker(
-        db_engine, class_=AsyncSession, expire_on_commit=False
-    )
     async with session_factory() as session:
         yield session
         await session.rollback()
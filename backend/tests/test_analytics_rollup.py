@@ -0,0 +1,109 @@
+"""
+Axon by NeuroVexon - Tests for incrementally maintained analytics rollups
+"""
+
+import pytest
+from datetime import datetime
+from sqlalchemy import select
+
+from agent.analytics_rollup import TOTAL_DAY, rebuild_rollups
+from agent.audit_writer import AuditWriter
+from api.analytics import get_overview, get_timeline, get_tool_stats
+from db.models import AnalyticsRollup, AuditLog, Conversation, Message
+
+
+async def _snapshot(db) -> dict:
+    rows = (await db.execute(select(AnalyticsRollup))).scalars().all()
+    return {
+        (r.day, r.metric, r.dimension): (r.count, r.time_sum_ms, r.le_100ms)
+        for r in rows
+        if r.count
+    }
+
+
+async def _conversation(db, messages: int = 2) -> Conversation:
+    conv = Conversation(title="Test")
+    db.add(conv)
+    await db.flush()
+    for i in range(messages):
+        db.add(Message(conversation_id=conv.id, role="user", content=f"m{i}"))
+    await db.commit()
+    return conv
+
+
+def _audit(conv_id: str, event_type: str, tool: str = "web_search", ms=None):
+    return {
+        "id": f"{event_type}-{tool}-{ms}-{datetime.utcnow().timestamp()}",
+        "conversation_id": conv_id,
+        "timestamp": datetime.utcnow(),
+        "event_type": event_type,
+        "tool_name": tool,
+        "execution_time_ms": ms,
+    }
+
+
+class TestIncrementalRollups:
+    @pytest.mark.asyncio
+    async def test_orm_writes_update_rollups(self, db):
+        await _conversation(db, messages=3)
+        await _conversation(db, messages=1)
+
+        overview = await get_overview(current_user=None, db=db)
+        assert overview["conversations"] == 2
+        assert overview["messages"] == 4
+
+        timeline = await get_timeline(days=7, current_user=None, db=db)
+        assert timeline["timeline"][-1]["conversations"] == 2
+
+    @pytest.mark.asyncio
+    async def test_audit_writer_batch_updates_rollups(self, db, session_factory):
+        conv = await _conversation(db)
+        writer = AuditWriter(batch_size=10, session_factory=session_factory)
+        writer.start()
+        for row in [
+            _audit(conv.id, "tool_requested"),
+            _audit(conv.id, "tool_approved"),
+            _audit(conv.id, "tool_executed", ms=50),
+            _audit(conv.id, "tool_executed", ms=2000),
+            _audit(conv.id, "tool_failed"),
+        ]:
+            await writer.enqueue(row)
+        await writer.stop()
+
+        overview = await get_overview(current_user=None, db=db)
+        assert overview["tool_calls"] == 2
+        assert overview["approval_rate"] == 100.0
+
+        tools = (await get_tool_stats(current_user=None, db=db))["tools"]
+        assert tools[0]["tool"] == "web_search"
+        assert tools[0]["avg_time_ms"] == 1025.0
+        assert tools[0]["failures"] == 1
+        assert tools[0]["latency_histogram"]["le_100ms"] == 1
+        assert tools[0]["latency_histogram"]["le_5s"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cascade_delete_decrements(self, db):
+        conv = await _conversation(db, messages=2)
+        db.add(AuditLog(**_audit(conv.id, "tool_executed", ms=10)))
+        await db.commit()
+        await _conversation(db, messages=1)
+
+        await db.refresh(conv, ["messages", "audit_logs"])
+        await db.delete(conv)
+        await db.commit()
+
+        totals = await _snapshot(db)
+        assert totals[(TOTAL_DAY, "conversations", "")][0] == 1
+        assert totals[(TOTAL_DAY, "messages", "")][0] == 1
+        assert (TOTAL_DAY, "tool_executed", "web_search") not in totals
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental(self, db):
+        conv = await _conversation(db, messages=3)
+        db.add(AuditLog(**_audit(conv.id, "tool_executed", ms=80)))
+        db.add(AuditLog(**_audit(conv.id, "tool_requested")))
+        await db.commit()
+
+        incremental = await _snapshot(db)
+        await rebuild_rollups(db)
+        assert await _snapshot(db) == incremental
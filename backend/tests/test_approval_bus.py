@@ -0,0 +1,124 @@
+"""
+Axon by NeuroVexon - Tests for the approval bus (in-process and shared SQLite)
+"""
+
+import asyncio
+
+import pytest
+
+from agent.approval_bus import (
+    InMemoryApprovalBackend,
+    SqliteApprovalBackend,
+    create_approval_backend,
+)
+from agent.permission_manager import PermissionManager, PermissionScope
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        instance = InMemoryApprovalBackend()
+    else:
+        instance = SqliteApprovalBackend(str(tmp_path / "approvals.db"), 0.01)
+    yield instance
+    instance.close()
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two backends on one file, as in two uvicorn worker processes"""
+    path = str(tmp_path / "approvals.db")
+    first = SqliteApprovalBackend(path, poll_interval=0.01)
+    second = SqliteApprovalBackend(path, poll_interval=0.01)
+    yield first, second
+    first.close()
+    second.close()
+
+
+def test_create_approval_backend(tmp_path):
+    assert isinstance(create_approval_backend("memory"), InMemoryApprovalBackend)
+    assert isinstance(
+        create_approval_backend("sqlite", str(tmp_path / "a.db")),
+        SqliteApprovalBackend,
+    )
+    assert isinstance(create_approval_backend("redis"), InMemoryApprovalBackend)
+
+
+@pytest.mark.asyncio
+async def test_resolve_wakes_waiter(backend):
+    waiter = asyncio.create_task(backend.wait("abc", timeout=5))
+    await asyncio.sleep(0.05)  # Registration runs in a worker thread
+    assert backend.pending_count() == 1
+    assert await backend.resolve("abc", "session") is True
+    assert await waiter == "session"
+    assert backend.pending_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_resolve_unknown_approval(backend):
+    assert await backend.resolve("missing", "once") is False
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out(backend):
+    assert await backend.wait("abc", timeout=0.05) is None
+    # Expired approvals can no longer be resolved
+    assert await backend.resolve("abc", "once") is False
+
+
+@pytest.mark.asyncio
+async def test_approval_resolved_on_other_worker(workers):
+    stream_worker, api_worker = workers
+    waiter = asyncio.create_task(stream_worker.wait("abc", timeout=5))
+    await asyncio.sleep(0.05)  # Registration runs in a worker thread
+    assert await api_worker.resolve("abc", "once") is True
+    assert await asyncio.wait_for(waiter, timeout=1) == "once"
+    # Only the first decision counts
+    assert await api_worker.resolve("abc", "never") is False
+
+
+@pytest.mark.asyncio
+async def test_cancelled_wait_is_unregistered(workers):
+    stream_worker, api_worker = workers
+    waiter = asyncio.create_task(stream_worker.wait("abc", timeout=5))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert await api_worker.resolve("abc", "once") is False
+
+
+@pytest.mark.asyncio
+async def test_permission_manager_with_backend(backend):
+    manager = PermissionManager(backend)
+    await manager.grant_permission(
+        "s1", "file_read", {"path": "/a"}, PermissionScope.ONCE
+    )
+    await manager.grant_permission("s1", "shell_execute", {}, PermissionScope.SESSION)
+    assert await manager.check_permission("s1", "file_read", {"path": "/a"}) is True
+    assert await manager.check_permission("s1", "file_read", {"path": "/b"}) is False
+    assert await manager.check_permission("s1", "shell_execute", {"cmd": "ls"}) is True
+    assert len(await manager.get_session_permissions("s1")) == 2
+
+    await manager.revoke_permission("s1", "shell_execute")
+    assert await manager.check_permission("s1", "shell_execute", {"cmd": "ls"}) is False
+
+    await manager.grant_permission("s1", "file_write", {"p": 1}, PermissionScope.NEVER)
+    assert await manager.is_blocked("file_write", {"p": 1}) is True
+    await manager.unblock("file_write", {"p": 1})
+    assert await manager.is_blocked("file_write", {"p": 1}) is False
+
+    await manager.revoke_session("s1")
+    assert await manager.get_session_permissions("s1") == []
+
+
+@pytest.mark.asyncio
+async def test_grants_shared_between_workers(workers):
+    first = PermissionManager(workers[0])
+    second = PermissionManager(workers[1])
+    await first.grant_permission("s1", "file_read", {}, PermissionScope.SESSION)
+    await first.grant_permission("s1", "file_write", {"p": 1}, PermissionScope.NEVER)
+    assert await second.check_permission("s1", "file_read", {"path": "/x"}) is True
+    assert await second.is_blocked("file_write", {"p": 1}) is True
+    await second.revoke_session("s1")
+    assert await first.check_permission("s1", "file_read", {"path": "/x"}) is False
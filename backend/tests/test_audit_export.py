@@ -0,0 +1,147 @@
+"""
+Axon by NeuroVexon - Audit Export Tests
+
+Tests for the streaming audit export: chunked reads, CSV/NDJSON/JSON/Parquet
+encoding, time range filter and keyset pagination.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from agent.audit_export import (
+    AuditExportFilter,
+    csv_chunks,
+    iter_audit_rows,
+    json_chunks,
+    ndjson_chunks,
+    parquet_chunks,
+)
+from db.models import AuditLog
+
+_T0 = datetime(2026, 3, 1, 8, 0, 0)
+
+
+@pytest.fixture
+async def session_factory(db_engine):
+    factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        await session.execute(
+            insert(AuditLog),
+            [
+                {
+                    "id": f"id-{i:03d}",
+                    "conversation_id": "sess",
+                    # Two rows per timestamp, to exercise the id tie-breaker
+                    "timestamp": _T0 + timedelta(minutes=i // 2),
+                    "event_type": "tool_executed",
+                    "tool_name": "web_search",
+                    "tool_params": {"query": f"q{i}"},
+                    "result": "x" * 600,
+                    "execution_time_ms": i,
+                }
+                for i in range(25)
+            ],
+        )
+        await session.commit()
+    return factory
+
+
+async def _collect(gen) -> list:
+    return [item async for item in gen]
+
+
+class TestAuditRowStream:
+    """Rows are read chunk by chunk in export order"""
+
+    @pytest.mark.asyncio
+    async def test_chunks(self, session_factory):
+        chunks = await _collect(
+            iter_audit_rows(AuditExportFilter(), 10, session_factory)
+        )
+        assert [len(c) for c in chunks] == [10, 10, 5]
+        ids = [row["id"] for chunk in chunks for row in chunk]
+        assert ids == [f"id-{i:03d}" for i in range(24, -1, -1)]
+
+    @pytest.mark.asyncio
+    async def test_time_range(self, session_factory):
+        export_filter = AuditExportFilter(
+            since=_T0 + timedelta(minutes=2), until=_T0 + timedelta(minutes=4)
+        )
+        chunks = await _collect(iter_audit_rows(export_filter, 100, session_factory))
+        ids = sorted(row["id"] for chunk in chunks for row in chunk)
+        assert ids == ["id-004", "id-005", "id-006", "id-007"]
+
+    @pytest.mark.asyncio
+    async def test_keyset_pagination(self, session_factory):
+        seen = []
+        export_filter = AuditExportFilter(limit=7)
+        while True:
+            chunks = await _collect(iter_audit_rows(export_filter, 3, session_factory))
+            page = [row for chunk in chunks for row in chunk]
+            if not page:
+                break
+            seen.extend(row["id"] for row in page)
+            last = page[-1]
+            export_filter = AuditExportFilter(
+                limit=7,
+                after_timestamp=datetime.fromisoformat(last["timestamp"]),
+                after_id=last["id"],
+            )
+        assert seen == [f"id-{i:03d}" for i in range(24, -1, -1)]
+
+
+class TestEncoders:
+    """Each format is produced incrementally and parses back"""
+
+    @pytest.mark.asyncio
+    async def test_csv(self, session_factory):
+        parts = await _collect(
+            csv_chunks(iter_audit_rows(AuditExportFilter(), 10, session_factory))
+        )
+        assert len(parts) == 4  # Header + 3 chunks
+        rows = list(csv.reader(io.StringIO("".join(parts))))
+        assert rows[0][0] == "id"
+        assert len(rows) == 26
+        assert len(rows[1][6]) == 500  # Result truncated as before
+
+    @pytest.mark.asyncio
+    async def test_ndjson(self, session_factory):
+        parts = await _collect(
+            ndjson_chunks(iter_audit_rows(AuditExportFilter(), 10, session_factory))
+        )
+        lines = "".join(parts).splitlines()
+        assert len(lines) == 25
+        assert json.loads(lines[0])["tool_params"] == {"query": "q24"}
+
+    @pytest.mark.asyncio
+    async def test_json(self, session_factory):
+        parts = await _collect(
+            json_chunks(iter_audit_rows(AuditExportFilter(), 10, session_factory))
+        )
+        data = json.loads("".join(parts))
+        assert len(data) == 25
+        assert len(data[0]["result"]) == 600
+
+    @pytest.mark.asyncio
+    async def test_json_empty(self, session_factory):
+        export_filter = AuditExportFilter(session_id="unknown")
+        parts = await _collect(
+            json_chunks(iter_audit_rows(export_filter, 10, session_factory))
+        )
+        assert json.loads("".join(parts)) == []
+
+    @pytest.mark.asyncio
+    async def test_parquet(self, session_factory):
+        pq = pytest.importorskip("pyarrow.parquet")
+        parts = await _collect(
+            parquet_chunks(iter_audit_rows(AuditExportFilter(), 10, session_factory))
+        )
+        table = pq.read_table(io.BytesIO(b"".join(parts)))
+        assert table.num_rows == 25
+        assert table.num_row_groups == 3
@@ -0,0 +1,193 @@
+"""
+Axon by NeuroVexon - Audit Writer Tests
+
+Tests for the batched AuditWriter: batching, max latency, back-pressure,
+flush on stop, metrics, and AuditLogger routing (buffered vs. sync mode).
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from unittest.mock import patch
+
+from agent.audit_logger import AuditLogger
+from agent.audit_writer import AuditWriter
+from db.models import AuditLog, Conversation
+
+
+async def _count(session_factory) -> int:
+    async with session_factory() as session:
+        return (await session.execute(select(func.count(AuditLog.id)))).scalar()
+
+
+def _row(i: int) -> dict:
+    return {
+        "id": f"id-{i}",
+        "conversation_id": "sess",
+        "event_type": "tool_executed",
+        "tool_name": "web_search",
+    }
+
+
+class TestAuditWriter:
+    """Batching, latency bound and shutdown flush"""
+
+    @pytest.mark.asyncio
+    async def test_batches_and_flush(self, session_factory):
+        writer = AuditWriter(
+            batch_size=10, max_latency_ms=1000, session_factory=session_factory
+        )
+        writer.start()
+        for i in range(25):
+            await writer.enqueue(_row(i))
+        await writer.flush()
+
+        assert await _count(session_factory) == 25
+        stats = writer.stats()
+        assert stats["written"] == 25
+        assert stats["batches"] == 3
+        assert stats["queue_depth"] == 0
+        assert stats["flush_ms_avg"] is not None
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_max_latency_bound(self, session_factory):
+        writer = AuditWriter(
+            batch_size=100, max_latency_ms=50, session_factory=session_factory
+        )
+        writer.start()
+        await writer.enqueue(_row(1))
+        await asyncio.sleep(0.2)
+
+        # Written without a flush() although the batch is not full
+        assert await _count(session_factory) == 1
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_writes_pending_events(self, session_factory):
+        writer = AuditWriter(
+            batch_size=1000, max_latency_ms=10_000, session_factory=session_factory
+        )
+        writer.start()
+        for i in range(5):
+            await writer.enqueue(_row(i))
+        await writer.stop()
+
+        assert not writer.running
+        assert await _count(session_factory) == 5
+
+    @pytest.mark.asyncio
+    async def test_back_pressure(self, session_factory):
+        writer = AuditWriter(
+            batch_size=1,
+            max_latency_ms=10,
+            queue_max=2,
+            session_factory=session_factory,
+        )
+        writer.start()
+        gate = asyncio.Event()
+        original_write = writer._write
+
+        async def slow_write(batch):
+            await gate.wait()
+            await original_write(batch)
+
+        writer._write = slow_write
+        await writer.enqueue(_row(0))  # Taken by the writer task
+        await asyncio.sleep(0.01)
+        await writer.enqueue(_row(1))
+        await writer.enqueue(_row(2))  # Queue now full
+
+        blocked = asyncio.create_task(writer.enqueue(_row(3)))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        gate.set()
+        await asyncio.wait_for(blocked, timeout=1)
+        await writer.stop()
+        assert await _count(session_factory) == 4
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_retried(self, session_factory):
+        writer = AuditWriter(
+            batch_size=10,
+            max_latency_ms=10,
+            retry_backoff_ms=1,
+            session_factory=session_factory,
+        )
+        original_insert = writer._insert
+        failures = [RuntimeError("database is locked")] * 2
+
+        async def flaky_insert(rows):
+            if failures:
+                raise failures.pop()
+            await original_insert(rows)
+
+        writer._insert = flaky_insert
+        writer.start()
+        for i in range(3):
+            await writer.enqueue(_row(i))
+        await writer.stop()
+
+        assert await _count(session_factory) == 3
+        stats = writer.stats()
+        assert stats["retries"] == 2
+        assert stats["failed"] == 0
+        assert stats["alert"] is False
+
+    @pytest.mark.asyncio
+    async def test_bad_event_does_not_lose_batch(self, session_factory):
+        writer = AuditWriter(
+            batch_size=10,
+            max_latency_ms=10,
+            retries=1,
+            retry_backoff_ms=1,
+            session_factory=session_factory,
+        )
+        writer.start()
+        await writer.enqueue(_row(0))
+        await writer.enqueue(_row(1))
+        await writer.enqueue(_row(0))  # Duplicate primary key
+        await writer.stop()
+
+        assert await _count(session_factory) == 2
+        stats = writer.stats()
+        assert stats["written"] == 2
+        assert stats["failed"] == 1
+        assert stats["alert"] is True
+        assert stats["last_error"]
+
+
+class TestAuditLoggerRouting:
+    """AuditLogger uses the writer when it runs, otherwise commits directly"""
+
+    @pytest.mark.asyncio
+    async def test_buffered_when_writer_runs(self, db, session_factory):
+        writer = AuditWriter(session_factory=session_factory)
+        writer.start()
+        with patch("agent.audit_logger.audit_writer", writer):
+            entry = await AuditLogger(db).log_tool_request("sess", "web_search", {})
+            assert entry.event_type == "tool_requested"
+            await writer.stop()
+
+        assert writer.stats()["written"] == 1
+        assert await _count(session_factory) == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_mode_commits_directly(self, db, session_factory):
+        conv = Conversation(title="Audit")
+        db.add(conv)
+        await db.commit()
+
+        writer = AuditWriter(session_factory=session_factory)
+        writer.start()
+        with (
+            patch("agent.audit_logger.audit_writer", writer),
+            patch("agent.audit_logger.settings.audit_sync", True),
+        ):
+            await AuditLogger(db).log_tool_request(conv.id, "web_search", {})
+        await writer.stop()
+
+        assert writer.stats()["enqueued"] == 0
+        assert await _count(session_factory) == 1
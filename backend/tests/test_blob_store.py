@@ -0,0 +1,121 @@
+"""
+Axon by NeuroVexon - Tests for the content-addressed upload store
+"""
+
+import io
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select
+from starlette.datastructures import UploadFile
+
+from agent.blob_store import BlobStore
+from agent.document_chunks import index_blob, load_document_index
+from db.models import Conversation, DocumentBlob, DocumentChunk, UploadedDocument
+
+
+class NoEmbeddings:
+    async def embed_batch(self, texts):
+        return [None] * len(texts)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(tmp_path / "blobs")
+
+
+async def _add(db, store, content: bytes, filename: str, conversation_id=None):
+    incoming, size, sha256 = await store.receive(
+        UploadFile(io.BytesIO(content), filename=filename), 1 << 20
+    )
+    doc = UploadedDocument(
+        conversation_id=conversation_id,
+        filename=filename,
+        file_size=size,
+        content_hash=sha256,
+    )
+    blob, created = await store.add_document(db, doc, incoming)
+    return doc, blob, created
+
+
+class TestBlobStore:
+    async def test_same_content_shares_one_blob(self, db, store, tmp_path):
+        first, blob, created = await _add(db, store, b"Handbuch", "handbuch.txt")
+        second, same, created_again = await _add(db, store, b"Handbuch", "kopie.md")
+
+        assert created and not created_again
+        assert first.content_hash == second.content_hash == blob.sha256
+        assert first.file_path == second.file_path == blob.file_path
+        assert same.ref_count == 2
+        files = [p for p in (tmp_path / "blobs").rglob("*") if p.is_file()]
+        assert len(files) == 1
+        assert files[0].name == f"{blob.sha256}.txt"
+
+    async def test_last_reference_deletes_blob(self, db, store, tmp_path):
+        first, blob, _ = await _add(db, store, b"Inhalt " * 100, "a.txt")
+        second, _, _ = await _add(db, store, b"Inhalt " * 100, "b.txt")
+        blob.extracted_text = "Inhalt " * 100
+        await index_blob(db, blob, NoEmbeddings())
+        await db.commit()
+        path = blob.file_path
+
+        assert await store.remove_document(db, first) is False
+        assert (await db.get(DocumentBlob, blob.sha256)).ref_count == 1
+        assert Path(path).exists()
+
+        assert await store.remove_document(db, second) is True
+        assert await db.get(DocumentBlob, blob.sha256) is None
+        assert await db.scalar(select(func.count(DocumentChunk.id))) == 0
+        assert await db.scalar(select(func.count(UploadedDocument.id))) == 0
+        assert not Path(path).exists()
+
+    async def test_add_after_concurrent_delete_restores_file(self, db, store):
+        first, blob, _ = await _add(db, store, b"Handbuch", "a.txt")
+        # Worker B has seen the blob before worker A deleted its last reference
+        stale = DocumentBlob(sha256=blob.sha256, file_path=blob.file_path)
+        assert await store.remove_document(db, first) is True
+        assert not Path(blob.file_path).exists()
+
+        get = db.get
+
+        async def worker_b_get(model, key, **kwargs):
+            if model is DocumentBlob and not kwargs:
+                return stale
+            return await get(model, key, **kwargs)
+
+        with patch.object(db, "get", worker_b_get):
+            _, again, created = await _add(db, store, b"Handbuch", "b.txt")
+
+        assert not created
+        assert again.ref_count == 1
+        assert Path(again.file_path).read_bytes() == b"Handbuch"
+
+    async def test_document_without_blob_owns_its_file(self, db, store, tmp_path):
+        legacy = tmp_path / "alt.txt"
+        legacy.write_text("alt")
+        doc = UploadedDocument(filename="alt.txt", file_path=str(legacy))
+        db.add(doc)
+        await db.commit()
+
+        assert await store.remove_document(db, doc) is False
+        assert not legacy.exists()
+
+    async def test_conversations_share_chunks(self, db, store):
+        text = "Kapitel ueber Wartung. " * 200
+        convs = [Conversation(title="A"), Conversation(title="B")]
+        db.add_all(convs)
+        await db.commit()
+        docs = []
+        for conv in convs:
+            doc, blob, _ = await _add(db, store, text.encode(), "h.txt", conv.id)
+            docs.append(doc)
+        blob.extracted_text = text
+        await index_blob(db, blob, NoEmbeddings())
+        await db.commit()
+
+        for conv, doc in zip(convs, docs):
+            index = await load_document_index(db, conv.id, NoEmbeddings())
+            assert len(index) == blob.chunk_count > 1
+            assert {c.document_id for c in index.chunks} == {doc.id}
+        assert await db.scalar(select(func.count(DocumentChunk.id))) == blob.chunk_count
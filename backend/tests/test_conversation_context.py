@@ -0,0 +1,240 @@
+"""
+Axon by NeuroVexon - Conversation Context Tests
+
+Tests for the per-conversation context cache: incremental loading,
+token-budgeted window, document caching and the rolling summary.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from agent.conversation_context import ConversationContextCache, estimate_tokens
+from db.models import Conversation, Message, UploadedDocument
+from llm.provider import LLMResponse
+
+_T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+async def _conversation(db) -> Conversation:
+    conv = Conversation(title="Kontext")
+    db.add(conv)
+    await db.commit()
+    return conv
+
+
+async def _add_messages(db, conv, start: int, count: int, content: str = "msg"):
+    for i in range(start, start + count):
+        db.add(
+            Message(
+                conversation_id=conv.id,
+                role="user" if i % 2 == 0 else "assistant",
+                content=f"{content} {i}",
+                created_at=_T0 + timedelta(seconds=i),
+            )
+        )
+    await db.commit()
+
+
+class TestContextWindow:
+    """Incremental loading and token budget"""
+
+    @pytest.mark.asyncio
+    async def test_incremental_load(self, db):
+        cache = ConversationContextCache()
+        conv = await _conversation(db)
+        await _add_messages(db, conv, 0, 3)
+
+        ctx = await cache.load(db, conv)
+        assert [m.content for m in ctx.chat_messages()] == ["msg 0", "msg 1", "msg 2"]
+
+        await _add_messages(db, conv, 3, 2)
+        ctx = await cache.load(db, conv)
+        assert len(ctx.window) == 5
+        assert ctx.chat_messages()[-1].content == "msg 4"
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_same_timestamp_not_duplicated(self, db):
+        cache = ConversationContextCache()
+        conv = await _conversation(db)
+        await _add_messages(db, conv, 0, 1)
+        await cache.load(db, conv)
+
+        db.add(
+            Message(
+                conversation_id=conv.id, role="assistant", content="x", created_at=_T0
+            )
+        )
+        await db.commit()
+        ctx = await cache.load(db, conv)
+        assert [m.content for m in ctx.chat_messages()] == ["msg 0", "x"]
+
+    @pytest.mark.asyncio
+    async def test_window_bounded_by_tokens(self, db):
+        per_message = estimate_tokens("msg 00")
+        cache = ConversationContextCache(max_tokens=per_message * 4)
+        conv = await _conversation(db)
+        await _add_messages(db, conv, 10, 10)
+
+        ctx = await cache.load(db, conv)
+        assert len(ctx.window) == 4
+        assert ctx.unsummarized == 6
+        assert ctx.chat_messages()[-1].content == "msg 19"
+
+        await _add_messages(db, conv, 20, 2)
+        ctx = await cache.load(db, conv)
+        assert len(ctx.window) == 4
+        assert ctx.unsummarized == 8
+        assert ctx.tokens <= per_message * 4
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, db):
+        cache = ConversationContextCache(max_conversations=1)
+        first = await _conversation(db)
+        second = await _conversation(db)
+        await cache.load(db, first)
+        await cache.load(db, second)
+        assert cache.stats()["conversations"] == 1
+
+
+class TestDocumentContext:
+    """Document block is built once and invalidated on upload"""
+
+    @pytest.mark.asyncio
+    async def test_documents_cached_until_invalidated(self, db):
+        cache = ConversationContextCache()
+        conv = await _conversation(db)
+        await cache.load(db, conv)
+        assert await cache.get_documents(db, conv.id) == ""
+
+        db.add(
+            UploadedDocument(
+                conversation_id=conv.id,
+                filename="notiz.txt",
+                extracted_text="Inhalt",
+                file_path="/tmp/notiz.txt",
+            )
+        )
+        await db.commit()
+        # Still cached
+        assert await cache.get_documents(db, conv.id) == ""
+
+        cache.invalidate_documents(conv.id)
+        assert "notiz.txt" in await cache.get_documents(db, conv.id)
+
+    @pytest.mark.asyncio
+    async def test_upload_processed_by_other_worker_is_seen(self, db):
+        cache = ConversationContextCache()
+        conv = await _conversation(db)
+        await cache.load(db, conv)
+        assert await cache.get_documents(db, conv.id) == ""
+
+        # Another worker finished the extraction; this worker's cache was
+        # never invalidated
+        db.add(
+            UploadedDocument(
+                conversation_id=conv.id,
+                filename="bericht.txt",
+                extracted_text="Inhalt",
+                file_path="/tmp/bericht.txt",
+                extract_status="done",
+            )
+        )
+        await db.commit()
+        assert "bericht.txt" in await cache.get_documents(db, conv.id)
+
+
+class TestRollingSummary:
+    """Older turns are folded into Conversation.summary"""
+
+    @pytest.mark.asyncio
+    async def test_summarize_updates_conversation(self, db, session_factory):
+        per_message = estimate_tokens("msg 00")
+        cache = ConversationContextCache(
+            max_tokens=per_message * 2, summary_min_messages=3
+        )
+        conv = await _conversation(db)
+        await _add_messages(db, conv, 10, 6)
+        ctx = await cache.load(db, conv)
+        assert ctx.unsummarized == 4
+
+        provider = MagicMock()
+        provider.chat = AsyncMock(return_value=LLMResponse(content="Kurzfassung"))
+        summary = await cache.summarize(conv.id, provider, session_factory)
+
+        assert summary == "Kurzfassung"
+        prompt = provider.chat.call_args.args[0][0].content
+        assert "msg 10" in prompt and "msg 13" in prompt
+        assert "msg 14" not in prompt
+        assert ctx.summary == "Kurzfassung"
+        assert ctx.unsummarized == 0
+
+        await db.refresh(conv)
+        assert conv.summary == "Kurzfassung"
+        assert conv.summary_until == _T0 + timedelta(seconds=13)
+
+        # A new cache (e.g. after restart) starts after the summarized part
+        fresh = await ConversationContextCache().load(db, conv)
+        assert fresh.summary == "Kurzfassung"
+        assert fresh.chat_messages()[0].content == "msg 14"
+
+    @pytest.mark.asyncio
+    async def test_summary_of_other_worker_is_not_folded_again(
+        self, db, session_factory
+    ):
+        per_message = estimate_tokens("msg 00")
+        worker_a, worker_b = (
+            ConversationContextCache(max_tokens=per_message * 2) for _ in range(2)
+        )
+        conv = await _conversation(db)
+        await _add_messages(db, conv, 10, 6)
+        await worker_a.load(db, conv)
+        ctx_b = await worker_b.load(db, conv)
+
+        provider = MagicMock()
+        provider.chat = AsyncMock(return_value=LLMResponse(content="Kurzfassung"))
+        await worker_a.summarize(conv.id, provider, session_factory)
+
+        # B still holds the state from before A's summary
+        assert await worker_b.summarize(conv.id, provider, session_factory) == (
+            "Kurzfassung"
+        )
+        assert provider.chat.await_count == 1
+        assert ctx_b.summary_until == _T0 + timedelta(seconds=13)
+        assert ctx_b.unsummarized == 0
+
+    @pytest.mark.asyncio
+    async def test_summary_does_not_overwrite_newer_one(self, db, session_factory):
+        per_message = estimate_tokens("msg 00")
+        cache = ConversationContextCache(max_tokens=per_message * 2)
+        conv = await _conversation(db)
+        await _add_messages(db, conv, 10, 6)
+        ctx = await cache.load(db, conv)
+
+        async def chat(messages):
+            # Another worker commits its summary while this one waits for the LLM
+            async with session_factory() as other:
+                stored = await other.get(Conversation, conv.id)
+                stored.summary = "Neuer"
+                stored.summary_until = _T0 + timedelta(seconds=12)
+                await other.commit()
+            return LLMResponse(content="Veraltet")
+
+        provider = MagicMock()
+        provider.chat = AsyncMock(side_effect=chat)
+        assert await cache.summarize(conv.id, provider, session_factory) == "Neuer"
+
+        await db.refresh(conv)
+        assert conv.summary == "Neuer"
+        assert ctx.summary_until == _T0 + timedelta(seconds=12)
+        assert ctx.unsummarized == 1
+
+    @pytest.mark.asyncio
+    async def test_schedule_needs_min_messages(self, db):
+        cache = ConversationContextCache(summary_min_messages=5)
+        conv = await _conversation(db)
+        await _add_messages(db, conv, 0, 2)
+        await cache.load(db, conv)
+        assert cache.schedule_summary(conv.id, MagicMock()) is None
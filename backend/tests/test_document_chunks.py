@@ -0,0 +1,132 @@
+"""
+Axon by NeuroVexon - Tests for chunked document retrieval
+"""
+
+import pytest
+from sqlalchemy import func, select
+
+from agent.conversation_context import ConversationContextCache
+from agent.document_chunks import chunk_text, index_document, load_document_index
+from db.models import Conversation, DocumentChunk, UploadedDocument
+
+_TOPICS = ["apfel", "banane", "kirsche", "dattel", "feige", "traube", "zitrone"]
+
+
+class TopicEmbedder:
+    """Deterministic embedding: one dimension per known topic word"""
+
+    def __init__(self, available: bool = True):
+        self.available = available
+
+    def _vector(self, text: str):
+        if not self.available:
+            return None
+        lower = text.lower()
+        return [float(lower.count(topic)) for topic in _TOPICS] + [0.01]
+
+    async def embed(self, text):
+        return self._vector(text)
+
+    async def embed_batch(self, texts):
+        return [self._vector(t) for t in texts]
+
+
+def _document_text() -> str:
+    sections = []
+    for topic in _TOPICS:
+        sentence = f"Dieser Abschnitt handelt von {topic}. "
+        sections.append(sentence * 40)
+    return "\n\n".join(sections)
+
+
+async def _upload(db, conv_id: str, text: str, provider=None) -> UploadedDocument:
+    doc = UploadedDocument(
+        conversation_id=conv_id,
+        filename="obst.txt",
+        extracted_text=text,
+        file_path="/tmp/obst.txt",
+    )
+    db.add(doc)
+    await db.flush()
+    if provider is not None:
+        await index_document(db, doc, provider)
+    await db.commit()
+    return doc
+
+
+@pytest.fixture
+async def conv(db):
+    conv = Conversation(title="Docs")
+    db.add(conv)
+    await db.commit()
+    return conv
+
+
+class TestChunkText:
+    def test_overlapping_chunks_cover_text(self):
+        text = _document_text()
+        chunks = chunk_text(text, size=500, overlap=100)
+
+        assert len(chunks) > 1
+        assert all(len(c) <= 500 for c in chunks)
+        assert chunks[0] == text[: len(chunks[0])]
+        assert text.rstrip().endswith(chunks[-1])
+        # Consecutive chunks share text
+        assert chunks[0][-50:].split()[-1] in chunks[1]
+
+    def test_short_and_empty_text(self):
+        assert chunk_text("kurz", size=500) == ["kurz"]
+        assert chunk_text("   ") == []
+
+
+class TestRetrieval:
+    @pytest.mark.asyncio
+    async def test_top_k_by_embedding(self, db, conv):
+        provider = TopicEmbedder()
+        await _upload(db, conv.id, _document_text(), provider)
+
+        index = await load_document_index(db, conv.id, provider)
+        assert index.vectors is not None
+        selected = index.select(2, query_embedding=await provider.embed("kirsche?"))
+
+        assert len(selected) == 2
+        assert all("kirsche" in c.content for c in selected)
+        assert selected[0].index < selected[1].index
+
+    @pytest.mark.asyncio
+    async def test_lexical_fallback_without_embeddings(self, db, conv):
+        provider = TopicEmbedder(available=False)
+        await _upload(db, conv.id, _document_text(), provider)
+
+        index = await load_document_index(db, conv.id, provider)
+        assert index.vectors is None
+        selected = index.select(1, query="Was steht zur Zitrone drin?")
+        assert "zitrone" in selected[0].content
+
+    @pytest.mark.asyncio
+    async def test_documents_without_chunks_are_backfilled(self, db, conv):
+        await _upload(db, conv.id, _document_text())  # no chunks yet
+        index = await load_document_index(db, conv.id, TopicEmbedder())
+
+        stored = await db.scalar(select(func.count(DocumentChunk.id)))
+        assert stored == len(index) > 1
+
+    @pytest.mark.asyncio
+    async def test_prompt_contains_only_top_k_chunks(self, db, conv):
+        provider = TopicEmbedder()
+        await _upload(db, conv.id, _document_text(), provider)
+        cache = ConversationContextCache(document_top_k=2)
+        await cache.load(db, conv)
+
+        block = await cache.get_documents(db, conv.id, "feige", provider)
+        assert "obst.txt" in block
+        assert "feige" in block
+        assert "apfel" not in block
+        assert len(block) < len(_document_text()) / 3
+
+    @pytest.mark.asyncio
+    async def test_delete_document_removes_chunks(self, db, conv):
+        doc = await _upload(db, conv.id, _document_text(), TopicEmbedder())
+        await db.delete(doc)
+        await db.commit()
+        assert await db.scalar(select(func.count(DocumentChunk.id))) == 0
@@ -0,0 +1,152 @@
+"""
+Axon by NeuroVexon - Embedding Cache Tests
+
+Tests for EmbeddingCache (LRU + SQLite tier), cache use in EmbeddingProvider,
+and the batched embedding backfill for memories.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from agent.embedding_cache import EmbeddingCache, embedding_key
+from agent.embeddings import EmbeddingProvider
+from agent.memory import backfill_embeddings, _deserialize_embedding
+from agent.memory_index import MemoryIndex
+from db.models import Memory
+
+
+class TestEmbeddingCache:
+    """Two-tier cache behaviour"""
+
+    def test_key_depends_on_model(self):
+        assert embedding_key("a", "text") != embedding_key("b", "text")
+        assert embedding_key("a", "text") == embedding_key("a", "text")
+
+    def test_put_and_get(self):
+        cache = EmbeddingCache()
+        cache.put("m", "hallo", [1.0, 2.0])
+        assert cache.get("m", "hallo") == [1.0, 2.0]
+        assert cache.get("m", "unbekannt") is None
+        assert cache.get("other-model", "hallo") is None
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_entries=2)
+        cache.put("m", "a", [1.0])
+        cache.put("m", "b", [2.0])
+        cache.get("m", "a")  # a is now most recently used
+        cache.put("m", "c", [3.0])
+        assert cache.get("m", "b") is None
+        assert cache.get("m", "a") == [1.0]
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        cache = EmbeddingCache(path=path)
+        cache.put_many("m", ["a", "b"], [[1.0, 0.5], None])
+        cache.close()
+
+        reopened = EmbeddingCache(path=path)
+        assert reopened.get_many("m", ["a", "b"]) == [[1.0, 0.5], None]
+        assert reopened.stats()["disk_hits"] == 1
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_async_disk_access_runs_in_thread(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        cache = EmbeddingCache(path=path)
+        with patch(
+            "agent.embedding_cache.asyncio.to_thread", wraps=asyncio.to_thread
+        ) as to_thread:
+            await cache.aput_many("m", ["a", "b"], [[1.0, 0.5], None])
+            cache._lru.clear()
+            assert await cache.aget_many("m", ["a", "b"]) == [[1.0, 0.5], None]
+        assert to_thread.call_count == 2
+        assert cache.stats()["disk_hits"] == 1
+        cache.close()
+
+    def test_stats(self):
+        cache = EmbeddingCache()
+        cache.put("m", "a", [1.0])
+        cache.get_many("m", ["a", "a", "b"])
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+
+class TestEmbeddingProviderCache:
+    """EmbeddingProvider only asks Ollama for cache misses"""
+
+    @pytest.mark.asyncio
+    async def test_cached_embed_skips_ollama(self):
+        cache = EmbeddingCache()
+        provider = EmbeddingProvider(cache=cache)
+        cache.put(provider.model, "hallo", [0.1, 0.2])
+        provider.is_available = AsyncMock(return_value=False)
+
+        assert await provider.embed("hallo") == pytest.approx([0.1, 0.2])
+        provider.is_available.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_sends_only_misses(self):
+        cache = EmbeddingCache()
+        provider = EmbeddingProvider(cache=cache)
+        cache.put(provider.model, "a", [1.0])
+
+        async def fake_uncached(texts):
+            return [[float(len(t))] for t in texts]
+
+        with patch.object(
+            provider, "_embed_uncached", side_effect=fake_uncached
+        ) as mock_uncached:
+            result = await provider.embed_batch(["a", "bb", "bb", "ccc"])
+
+        mock_uncached.assert_called_once_with(["bb", "ccc"])
+        assert result == [[1.0], [2.0], [2.0], [3.0]]
+        assert cache.get(provider.model, "ccc") == [3.0]
+
+
+class TestEmbeddingBackfill:
+    """Batched background backfill of memories without embedding"""
+
+    @pytest.mark.asyncio
+    async def test_backfill_in_batches(self, db, session_factory):
+        for i in range(7):
+            db.add(Memory(key=f"k{i}", content=f"c{i}"))
+        await db.commit()
+
+        calls = []
+
+        async def embed_batch(texts):
+            calls.append(len(texts))
+            return [[1.0, float(i)] for i in range(len(texts))]
+
+        index = MemoryIndex()
+        index.loaded = True
+        with patch("agent.memory.embedding_provider") as mock:
+            mock.embed_batch = AsyncMock(side_effect=embed_batch)
+            count = await backfill_embeddings(
+                session_factory=session_factory, batch_size=3, index=index
+            )
+
+        assert count == 7
+        assert calls == [3, 3, 1]
+        assert len(index) == 7
+
+        async with session_factory() as session:
+            mem = await session.get(Memory, index._ids[0])
+            assert _deserialize_embedding(mem.embedding)[0] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_backfill_stops_when_unavailable(self, db, session_factory):
+        db.add(Memory(key="k", content="c"))
+        await db.commit()
+
+        with patch("agent.memory.embedding_provider") as mock:
+            mock.embed_batch = AsyncMock(return_value=[None])
+            count = await backfill_embeddings(
+                session_factory=session_factory, batch_size=3, index=MemoryIndex()
+            )
+
+        assert count == 0
+        mock.embed_batch.assert_called_once()
@@ -0,0 +1,276 @@
+"""
+Axon by NeuroVexon - LLM Provider Tests
+
+Tests for pooled HTTP clients, provider lifecycle (aclose) and
+streaming chat_events (text deltas + assembled tool calls).
+"""
+
+import json
+
+import httpx
+import pytest
+
+from llm.http_pool import create_http_client
+from llm.ollama import OllamaProvider
+from llm.openai_provider import OpenAIProvider
+from llm.provider import ChatMessage
+from llm.router import LLMRouter
+from core.config import LLMProvider
+
+
+def _ollama_transport(calls: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(
+            200,
+            json={
+                "message": {"role": "assistant", "content": "ok"},
+                "done": True,
+                "eval_count": 1,
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+class TestHttpPool:
+    """Tests for the shared client factory"""
+
+    @pytest.mark.asyncio
+    async def test_limits_from_settings(self):
+        client = create_http_client(timeout=5.0)
+        try:
+            assert client.timeout.read == 5.0
+        finally:
+            await client.aclose()
+
+
+class TestOllamaPooling:
+    """OllamaProvider keeps one client across calls"""
+
+    @pytest.mark.asyncio
+    async def test_client_reused_across_calls(self):
+        calls = []
+        provider = OllamaProvider()
+        provider._http = create_http_client(transport=_ollama_transport(calls))
+        first = provider._get_http_client()
+
+        response = await provider.chat([ChatMessage(role="user", content="hi")])
+        await provider.chat([ChatMessage(role="user", content="hi")])
+
+        assert response.content == "ok"
+        assert calls == ["/api/chat", "/api/chat"]
+        assert provider._get_http_client() is first
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_client(self):
+        provider = OllamaProvider()
+        client = provider._get_http_client()
+        await provider.aclose()
+        assert client.is_closed
+        assert provider._http is None
+        # A new client is created lazily after close
+        assert not provider._get_http_client().is_closed
+        await provider.aclose()
+
+
+class TestRouterClose:
+    """LLMRouter.aclose releases all provider instances"""
+
+    @pytest.mark.asyncio
+    async def test_router_aclose(self):
+        router = LLMRouter()
+        provider = router.get_provider(LLMProvider.OLLAMA)
+        client = provider._get_http_client()
+
+        await router.aclose()
+
+        assert client.is_closed
+        assert router._providers == {}
+
+
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "web_search",
+            "description": "Search",
+            "parameters": {"type": "object", "properties": {}, "required": []},
+        },
+    }
+]
+
+
+async def _collect(provider, tools=None) -> list:
+    return [
+        event
+        async for event in provider.chat_events(
+            [ChatMessage(role="user", content="hi")], tools=tools
+        )
+    ]
+
+
+def _ollama_stream_provider(lines: list[dict]) -> OllamaProvider:
+    body = "\n".join(json.dumps(line) for line in lines).encode()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    provider = OllamaProvider()
+    provider._http = create_http_client(transport=transport)
+    return provider
+
+
+class TestOllamaChatEvents:
+    """Streaming events from Ollama NDJSON"""
+
+    @pytest.mark.asyncio
+    async def test_text_deltas(self):
+        provider = _ollama_stream_provider(
+            [
+                {"message": {"content": "Hal"}},
+                {"message": {"content": "lo"}},
+                {"message": {"content": ""}, "done": True, "done_reason": "stop"},
+            ]
+        )
+        events = await _collect(provider)
+        assert [e.text for e in events if e.text] == ["Hal", "lo"]
+        assert events[-1].finish_reason == "stop"
+
+    @pytest.mark.asyncio
+    async def test_structured_tool_call(self):
+        provider = _ollama_stream_provider(
+            [
+                {
+                    "message": {
+                        "content": "",
+                        "tool_calls": [
+                            {
+                                "function": {
+                                    "name": "web_search",
+                                    "arguments": {"query": "axon"},
+                                }
+                            }
+                        ],
+                    }
+                },
+                {"message": {"content": ""}, "done": True},
+            ]
+        )
+        events = await _collect(provider, tools=TOOLS)
+        calls = [e.tool_call for e in events if e.tool_call]
+        assert len(calls) == 1
+        assert calls[0].name == "web_search"
+        assert calls[0].parameters == {"query": "axon"}
+
+    @pytest.mark.asyncio
+    async def test_text_tool_call_is_held_back(self):
+        provider = _ollama_stream_provider(
+            [
+                {"message": {"content": "[TOOL_"}},
+                {"message": {"content": 'CALLS] [{"name": "web_search", '}},
+                {"message": {"content": '"arguments": {"query": "x"}}]'}},
+                {"message": {"content": ""}, "done": True},
+            ]
+        )
+        events = await _collect(provider, tools=TOOLS)
+        assert not any(e.text for e in events)
+        calls = [e.tool_call for e in events if e.tool_call]
+        assert calls[0].name == "web_search"
+        assert calls[0].parameters == {"query": "x"}
+
+    @pytest.mark.asyncio
+    async def test_text_tool_call_emitted_mid_stream(self):
+        provider = _ollama_stream_provider(
+            [
+                {"message": {"content": "Ich suche: "}},
+                {"message": {"content": 'web_search(query="a'}},
+                {"message": {"content": 'xon")'}},
+                {"message": {"content": " und fasse dann zusammen."}},
+                {"message": {"content": ""}, "done": True},
+            ]
+        )
+        events = await _collect(provider, tools=TOOLS)
+        kinds = [
+            "call" if e.tool_call else "text" for e in events if not e.finish_reason
+        ]
+        # The call is emitted before the text that follows it
+        assert kinds == ["text", "text", "text", "call", "text"]
+        call = next(e.tool_call for e in events if e.tool_call)
+        assert call.parameters == {"query": "axon"}
+
+    @pytest.mark.asyncio
+    async def test_plain_text_flushed_with_tools(self):
+        provider = _ollama_stream_provider(
+            [
+                {"message": {"content": "Das "}},
+                {"message": {"content": "ist Text"}},
+                {"message": {"content": ""}, "done": True},
+            ]
+        )
+        events = await _collect(provider, tools=TOOLS)
+        assert "".join(e.text for e in events if e.text) == "Das ist Text"
+        assert not any(e.tool_call for e in events)
+
+
+def _sse(chunks: list[dict]) -> bytes:
+    lines = [f"data: {json.dumps(chunk)}\n\n" for chunk in chunks]
+    return ("".join(lines) + "data: [DONE]\n\n").encode()
+
+
+def _openai_chunk(delta: dict, finish_reason=None) -> dict:
+    return {
+        "id": "c1",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+class TestOpenAIChatEvents:
+    """Tool call fragments are assembled per index"""
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_assembled(self):
+        pytest.importorskip("openai")
+
+        def tool_delta(index, **fields):
+            return _openai_chunk({"tool_calls": [{"index": index, **fields}]})
+
+        body = _sse(
+            [
+                _openai_chunk({"role": "assistant", "content": "Moment"}),
+                tool_delta(
+                    0,
+                    id="call_a",
+                    type="function",
+                    function={"name": "web_search", "arguments": ""},
+                ),
+                tool_delta(0, function={"arguments": '{"query":'}),
+                tool_delta(0, function={"arguments": ' "a"}'}),
+                tool_delta(
+                    1,
+                    id="call_b",
+                    type="function",
+                    function={"name": "web_search", "arguments": '{"query": "b"}'},
+                ),
+                _openai_chunk({}, finish_reason="tool_calls"),
+            ]
+        )
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(
+                200, content=body, headers={"content-type": "text/event-stream"}
+            )
+        )
+        provider = OpenAIProvider()
+        provider.api_key = "sk-test"
+        provider._http = create_http_client(transport=transport)
+
+        events = await _collect(provider, tools=TOOLS)
+
+        assert events[0].text == "Moment"
+        calls = [e.tool_call for e in events if e.tool_call]
+        assert [(c.id, c.parameters) for c in calls] == [
+            ("call_a", {"query": "a"}),
+            ("call_b", {"query": "b"}),
+        ]
+        assert events[-1].finish_reason == "tool_calls"
+        await provider.aclose()
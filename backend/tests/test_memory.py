@@ -252,3 +252,33 @@ class TestMemoryPrompt:
         assert "Bekannte Fakten:" in prompt
         assert "Server: Hetzner" in prompt
         assert "**" not in prompt  # No markdown
+
+    @pytest.mark.asyncio
+    async def test_cached_prompt_invalidated_on_write(self, db, mock_embedding):
+        manager = MemoryManager(db)
+        await manager.add("Server", "Hetzner")
+        first = await manager.build_memory_prompt(plain=True, use_cache=True)
+        assert "Server: Hetzner" in first
+
+        # Direct DB change is not visible while cached
+        memory = await manager.get("Server")
+        memory.content = "Netcup"
+        await db.flush()
+        assert await manager.build_memory_prompt(plain=True, use_cache=True) == first
+
+        # Writes through the manager invalidate the cache
+        await manager.add("OS", "Linux")
+        prompt = await manager.build_memory_prompt(plain=True, use_cache=True)
+        assert "Server: Netcup" in prompt
+        assert "OS: Linux" in prompt
+        await manager.clear_all()
+
+    @pytest.mark.asyncio
+    async def test_cached_prompt_invalidated_on_remove_by_key(self, db, mock_embedding):
+        manager = MemoryManager(db)
+        await manager.add("Server", "Hetzner")
+        first = await manager.build_memory_prompt(plain=True, use_cache=True)
+        assert "Server: Hetzner" in first
+
+        await manager.remove_by_key("Server")
+        assert await manager.build_memory_prompt(plain=True, use_cache=True) == ""
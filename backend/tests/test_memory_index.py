@@ -0,0 +1,229 @@
+"""
+Axon by NeuroVexon - Memory Vector Index Tests
+
+Tests for MemoryIndex: exact top-k, upsert/remove/clear, IVF mode,
+and MemoryManager integration with a semantic embedding mock.
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from agent.memory import MemoryManager
+from agent.memory_index import MemoryIndex
+
+
+def _vec(*values) -> list[float]:
+    return [float(v) for v in values]
+
+
+class TestMemoryIndexExact:
+    """Tests for the brute-force (exact) mode"""
+
+    def test_empty_index_returns_nothing(self):
+        index = MemoryIndex()
+        assert index.search(_vec(1, 0, 0)) == []
+
+    def test_top_k_ordering(self):
+        index = MemoryIndex()
+        index.upsert("a", _vec(1, 0, 0))
+        index.upsert("b", _vec(0.7, 0.7, 0))
+        index.upsert("c", _vec(0, 1, 0))
+
+        hits = index.search(_vec(1, 0.1, 0), k=2)
+        assert [memory_id for memory_id, _ in hits] == ["a", "b"]
+        assert hits[0][1] > hits[1][1]
+
+    def test_scores_are_cosine(self):
+        index = MemoryIndex()
+        index.upsert("a", _vec(3, 4))  # Not normalized on input
+        hits = index.search(_vec(3, 4))
+        assert abs(hits[0][1] - 1.0) < 1e-5
+
+    def test_min_score_filters(self):
+        index = MemoryIndex()
+        index.upsert("same", _vec(1, 0))
+        index.upsert("orthogonal", _vec(0, 1))
+        hits = index.search(_vec(1, 0), k=10, min_score=0.3)
+        assert [memory_id for memory_id, _ in hits] == ["same"]
+
+    def test_upsert_replaces_vector(self):
+        index = MemoryIndex()
+        index.upsert("a", _vec(1, 0))
+        index.upsert("a", _vec(0, 1))
+        assert len(index) == 1
+        hits = index.search(_vec(0, 1))
+        assert hits[0][0] == "a"
+        assert abs(hits[0][1] - 1.0) < 1e-5
+
+    def test_remove(self):
+        index = MemoryIndex()
+        index.upsert("a", _vec(1, 0))
+        index.upsert("b", _vec(0.9, 0.1))
+        index.remove("a")
+        index.remove("unknown")  # Should not raise
+        assert [memory_id for memory_id, _ in index.search(_vec(1, 0))] == ["b"]
+
+    def test_remove_many_compacts(self):
+        index = MemoryIndex()
+        for i in range(100):
+            index.upsert(f"m{i}", _vec(1, i / 100))
+        for i in range(60):
+            index.remove(f"m{i}")
+        assert len(index) == 40
+        hits = index.search(_vec(1, 0), k=100)
+        assert len(hits) == 40
+        assert all(int(memory_id[1:]) >= 60 for memory_id, _ in hits)
+
+    def test_clear(self):
+        index = MemoryIndex()
+        index.upsert("a", _vec(1, 0))
+        index.clear()
+        assert len(index) == 0
+        assert index.search(_vec(1, 0)) == []
+
+    def test_zero_vector_not_indexed(self):
+        index = MemoryIndex()
+        index.upsert("zero", _vec(0, 0, 0))
+        assert len(index) == 0
+
+    def test_dimension_mismatch_ignored(self):
+        index = MemoryIndex()
+        index.upsert("a", _vec(1, 0, 0))
+        index.upsert("b", _vec(1, 0))
+        assert len(index) == 1
+        assert index.search(_vec(1, 0)) == []
+
+    def test_load_from_bytes(self):
+        index = MemoryIndex()
+        rows = [
+            ("a", np.array([1, 0], dtype=np.float32).tobytes()),
+            ("b", None),
+        ]
+        index.load(rows)
+        assert index.loaded is True
+        assert len(index) == 1
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            MemoryIndex(mode="faiss")
+
+
+class TestMemoryIndexIVF:
+    """Tests for the IVF approximate mode"""
+
+    def test_ivf_finds_exact_neighbour(self):
+        rng = np.random.default_rng(42)
+        vectors = rng.normal(size=(2000, 32)).astype(np.float32)
+
+        index = MemoryIndex(mode="ivf", ann_threshold=100, nprobe=16)
+        for i, v in enumerate(vectors):
+            index.upsert(f"m{i}", v)
+
+        hits = index.search(vectors[123], k=5)
+        assert hits[0][0] == "m123"
+        assert abs(hits[0][1] - 1.0) < 1e-4
+
+    def test_ivf_respects_removals(self):
+        rng = np.random.default_rng(7)
+        vectors = rng.normal(size=(500, 16)).astype(np.float32)
+
+        index = MemoryIndex(mode="ivf", ann_threshold=100, nprobe=64)
+        for i, v in enumerate(vectors):
+            index.upsert(f"m{i}", v)
+        index.search(vectors[0], k=1)  # Train
+        index.remove("m10")
+
+        hits = index.search(vectors[10], k=3)
+        assert "m10" not in [memory_id for memory_id, _ in hits]
+
+    def test_below_threshold_uses_exact(self):
+        index = MemoryIndex(mode="ivf", ann_threshold=1000)
+        index.upsert("a", _vec(1, 0))
+        index.search(_vec(1, 0))
+        assert index._centroids is None
+
+
+class TestMemoryManagerSemanticSearch:
+    """MemoryManager search through the vector index"""
+
+    @pytest.fixture
+    def vector_embedding(self):
+        """Embed texts into a tiny keyword space"""
+        vocab = ["python", "server", "kaffee"]
+
+        async def embed(text):
+            text = text.lower()
+            return [1.0 if word in text else 0.0 for word in vocab] + [0.1]
+
+        with patch("agent.memory.embedding_provider") as mock:
+            mock.embed = AsyncMock(side_effect=embed)
+            yield mock
+
+    @pytest.mark.asyncio
+    async def test_semantic_search_ranks_by_similarity(self, db, vector_embedding):
+        manager = MemoryManager(db, index=MemoryIndex())
+        await manager.add("Sprache", "Python 3.11")
+        await manager.add("Hosting", "Server bei Hetzner")
+        await manager.add("Getraenk", "Kaffee schwarz")
+
+        results = await manager.search("python")
+        assert results[0].key == "Sprache"
+        assert all(m.key != "Getraenk" for m in results)
+
+    @pytest.mark.asyncio
+    async def test_index_follows_add_and_remove(self, db, vector_embedding):
+        index = MemoryIndex()
+        manager = MemoryManager(db, index=index)
+        mem = await manager.add("Hosting", "Server bei Hetzner")
+        await db.commit()
+        await manager.search("server")  # Loads the index
+        assert len(index) == 1
+
+        # Index changes wait for the commit
+        await manager.add("Sprache", "Python")
+        assert len(index) == 1
+        await db.commit()
+        assert len(index) == 2
+
+        await manager.remove(mem.id)
+        await db.commit()
+        assert len(index) == 1
+        assert await manager.search("server") == []
+
+        await manager.clear_all()
+        await db.commit()
+        assert len(index) == 0
+
+    @pytest.mark.asyncio
+    async def test_rollback_leaves_index_unchanged(self, db, vector_embedding):
+        index = MemoryIndex()
+        manager = MemoryManager(db, index=index)
+        mem = await manager.add("Hosting", "Server bei Hetzner")
+        await db.commit()
+        await manager.search("server")  # Loads the index
+
+        await manager.add("Sprache", "Python")
+        await manager.remove_by_key("Hosting")
+        await db.rollback()
+
+        assert len(index) == 1
+        assert [m.id for m in await manager.search("server")] == [mem.id]
+
+    @pytest.mark.asyncio
+    async def test_index_follows_other_worker(self, db, vector_embedding):
+        worker_a = MemoryManager(db, index=MemoryIndex())
+        worker_b = MemoryManager(db, index=MemoryIndex())
+        await worker_a.add("Sprache", "Python 3.11")
+        await db.commit()
+        assert len(await worker_b.search("python")) == 1  # Loads B's index
+
+        with patch("agent.memory.settings.memory_index_check_seconds", 0):
+            mem = await worker_a.add("Hosting", "Server bei Hetzner")
+            await db.commit()
+            assert [m.id for m in await worker_b.search("server")] == [mem.id]
+
+            await worker_a.remove(mem.id)
+            await db.commit()
+            assert await worker_b.search("server") == []
+        assert len(worker_b.index) == 1
@@ -6,8 +6,10 @@ blocked tools, max iterations, error handling, event types.
 All LLM calls are mocked — no Ollama/API dependency needed.
 """
 
+import asyncio
 import pytest
 import os
+import time
 import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -16,10 +18,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from agent.orchestrator import AgentOrchestrator
 from agent.tool_registry import ToolRegistry, ToolDefinition, RiskLevel
 from agent.permission_manager import PermissionManager, PermissionScope
-from llm.provider import BaseLLMProvider, ChatMessage, ToolCall, LLMResponse
+from llm.provider import (
+    BaseLLMProvider,
+    ChatMessage,
+    ToolCall,
+    LLMResponse,
+    StreamEvent,
+)
 from db.models import Agent
 
-
 # ============================================================
 # Helpers
 # ============================================================
@@ -452,7 +459,7 @@ class TestOrchestratorApprovalFlow:
     ):
         """After granting SESSION permission, second call should not request approval"""
         # Pre-grant session permission
-        test_permissions.grant_permission(
+        await test_permissions.grant_permission(
             "sess-perm", "file_read", {"path": "x"}, PermissionScope.SESSION
         )
 
@@ -523,7 +530,7 @@ class TestOrchestratorUnknownAndBlocked:
         self, db, test_registry, test_permissions
     ):
         # Block file_read
-        test_permissions.grant_permission(
+        await test_permissions.grant_permission(
             "sess-block", "file_read", {"path": "/bad"}, PermissionScope.NEVER
         )
 
@@ -614,6 +621,28 @@ class TestOrchestratorAgentPermissions:
         assert "tool_request" not in types
         assert "tool_result" in types
 
+    @pytest.mark.asyncio
+    async def test_llm_only_sees_allowed_tools(
+        self, db, test_registry, test_permissions, mock_agent_recherche
+    ):
+        """The tool schema sent to the LLM is filtered by allowed_tools"""
+        llm = MockLLMProvider([LLMResponse(content="Ok.", tool_calls=None)])
+        llm.chat = AsyncMock(return_value=LLMResponse(content="Ok.", tool_calls=None))
+        orch = AgentOrchestrator(
+            llm, db, test_registry, test_permissions, agent=mock_agent_recherche
+        )
+
+        await collect_events(
+            orch, "sess-filter", [ChatMessage(role="user", content="Hi")]
+        )
+
+        tools = llm.chat.call_args.kwargs["tools"]
+        names = {t["function"]["name"] for t in tools}
+        assert names == {"web_search", "file_read"}
+        assert tools is test_registry.get_tools_for_llm(
+            mock_agent_recherche.allowed_tools
+        )
+
     @pytest.mark.asyncio
     async def test_default_agent_allows_all(
         self, db, test_registry, test_permissions, mock_agent_default
@@ -1017,3 +1046,234 @@ class TestOrchestratorAuditLogging:
                 mock_log.assert_called_once()
                 call_args = mock_log.call_args[0]
                 assert "Disk error" in call_args[3]
+
+
+# ============================================================
+# Token Streaming
+# ============================================================
+
+
+class StreamingMockLLMProvider(MockLLMProvider):
+    """Mock LLM that streams pre-configured event lists via chat_events"""
+
+    def __init__(self, turns: list[list[StreamEvent]], trace: list):
+        super().__init__([])
+        self._turns = list(turns)
+        self._trace = trace
+
+    async def chat_events(self, messages, tools=None):
+        events = self._turns.pop(0) if self._turns else [StreamEvent(text="Ende")]
+        for event in events:
+            self._trace.append(("llm", event.text or event.tool_call.name))
+            yield event
+        self._trace.append(("llm", "finished"))
+
+
+class TestOrchestratorStreaming:
+    """Text deltas and early tool execution via chat_events"""
+
+    @pytest.mark.asyncio
+    async def test_text_deltas_forwarded(self, db, test_registry, test_permissions):
+        llm = StreamingMockLLMProvider(
+            [[StreamEvent(text="Hal"), StreamEvent(text="lo"), StreamEvent(text="!")]],
+            trace=[],
+        )
+        orch = AgentOrchestrator(llm, db, test_registry, test_permissions)
+
+        events = await collect_events(
+            orch, "sess-stream", [ChatMessage(role="user", content="Hi")]
+        )
+
+        assert [e["content"] for e in events if e["type"] == "text"] == [
+            "Hal",
+            "lo",
+            "!",
+        ]
+        assert events[-1]["type"] == "done"
+
+    @pytest.mark.asyncio
+    async def test_tool_runs_before_stream_finishes(
+        self, db, test_registry, test_permissions
+    ):
+        trace = []
+        llm = StreamingMockLLMProvider(
+            [
+                [
+                    StreamEvent(tool_call=make_tool_call("web_search", {"query": "a"})),
+                    StreamEvent(text="Suche laeuft"),
+                ],
+                [StreamEvent(text="Fertig")],
+            ],
+            trace=trace,
+        )
+        orch = AgentOrchestrator(
+            llm, db, test_registry, test_permissions, max_parallel_tools=1
+        )
+
+        async def run_tool(name, params, db_session=None):
+            trace.append(("tool", name))
+            return "ok"
+
+        with patch("agent.orchestrator.execute_tool", side_effect=run_tool):
+            events = await collect_events(
+                orch, "sess-early", [ChatMessage(role="user", content="Suche")]
+            )
+
+        assert trace.index(("tool", "web_search")) < trace.index(("llm", "finished"))
+        types = [e["type"] for e in events]
+        assert types.index("tool_result") < types.index("text")
+        assert [e["content"] for e in events if e["type"] == "text"] == [
+            "Suche laeuft",
+            "Fertig",
+        ]
+
+
+# ============================================================
+# Parallel Tool Execution
+# ============================================================
+
+
+class TestOrchestratorParallelTools:
+    """Concurrent execution of several tool calls from one LLM turn"""
+
+    @staticmethod
+    def _search_turn(*queries):
+        return LLMResponse(
+            content=None,
+            tool_calls=[
+                ToolCall(id=f"call_{q}", name="web_search", parameters={"query": q})
+                for q in queries
+            ],
+        )
+
+    @pytest.mark.asyncio
+    async def test_calls_run_concurrently_results_in_call_order(
+        self, db, test_registry, test_permissions
+    ):
+        llm = MockLLMProvider(
+            [
+                self._search_turn("slow", "medium", "fast"),
+                LLMResponse(content="Fertig", tool_calls=None),
+            ]
+        )
+        orch = AgentOrchestrator(
+            llm, db, test_registry, test_permissions, max_parallel_tools=4
+        )
+        delays = {"slow": 0.15, "medium": 0.1, "fast": 0.05}
+
+        async def run_tool(name, params, db_session=None):
+            await asyncio.sleep(delays[params["query"]])
+            return params["query"]
+
+        start = time.perf_counter()
+        with patch("agent.orchestrator.execute_tool", side_effect=run_tool):
+            events = await collect_events(
+                orch, "sess-parallel", [ChatMessage(role="user", content="Suche")]
+            )
+        elapsed = time.perf_counter() - start
+
+        results = [e for e in events if e["type"] == "tool_result"]
+        assert [e["result"] for e in results] == ["slow", "medium", "fast"]
+        assert elapsed < 0.28  # Sequential would take >= 0.3s
+        # Per-tool timing, not the accumulated wall time
+        assert results[0]["execution_time_ms"] >= 140
+        assert results[2]["execution_time_ms"] < 100
+
+    @pytest.mark.asyncio
+    async def test_session_concurrency_cap(self, db, test_registry, test_permissions):
+        llm = MockLLMProvider(
+            [
+                self._search_turn("a", "b", "c", "d", "e"),
+                LLMResponse(content="Fertig", tool_calls=None),
+            ]
+        )
+        orch = AgentOrchestrator(
+            llm, db, test_registry, test_permissions, max_parallel_tools=2
+        )
+        running = 0
+        peak = 0
+
+        async def run_tool(name, params, db_session=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return "ok"
+
+        with patch("agent.orchestrator.execute_tool", side_effect=run_tool):
+            events = await collect_events(
+                orch, "sess-cap", [ChatMessage(role="user", content="Suche")]
+            )
+
+        assert peak == 2
+        assert len([e for e in events if e["type"] == "tool_result"]) == 5
+
+    @pytest.mark.asyncio
+    async def test_audit_order_and_timings(self, db, test_registry, test_permissions):
+        llm = MockLLMProvider(
+            [
+                self._search_turn("slow", "fast"),
+                LLMResponse(content="Fertig", tool_calls=None),
+            ]
+        )
+        orch = AgentOrchestrator(
+            llm, db, test_registry, test_permissions, max_parallel_tools=4
+        )
+
+        async def run_tool(name, params, db_session=None):
+            await asyncio.sleep(0.1 if params["query"] == "slow" else 0.01)
+            return params["query"]
+
+        with patch("agent.orchestrator.execute_tool", side_effect=run_tool):
+            with patch.object(
+                orch.audit, "log_tool_execution", new_callable=AsyncMock
+            ) as mock_log:
+                await collect_events(
+                    orch, "sess-audit-par", [ChatMessage(role="user", content="x")]
+                )
+
+        logged = [(c.args[2]["query"], c.args[4]) for c in mock_log.call_args_list]
+        assert [query for query, _ in logged] == ["slow", "fast"]
+        assert logged[0][1] >= 90
+        assert logged[1][1] < 90
+
+    @pytest.mark.asyncio
+    async def test_approval_before_parallel_execution(
+        self, db, test_registry, test_permissions
+    ):
+        llm = MockLLMProvider(
+            [
+                LLMResponse(
+                    content=None,
+                    tool_calls=[
+                        make_tool_call("web_search", {"query": "a"}),
+                        make_tool_call("file_read", {"path": "/tmp/x"}),
+                    ],
+                ),
+                LLMResponse(content="Fertig", tool_calls=None),
+            ]
+        )
+        orch = AgentOrchestrator(
+            llm, db, test_registry, test_permissions, max_parallel_tools=4
+        )
+        on_approval = AsyncMock(return_value=PermissionScope.ONCE)
+
+        with patch(
+            "agent.orchestrator.execute_tool", new_callable=AsyncMock
+        ) as mock_exec:
+            mock_exec.return_value = "ok"
+            events = await collect_events(
+                orch,
+                "sess-par-approval",
+                [ChatMessage(role="user", content="x")],
+                on_approval=on_approval,
+            )
+
+        types = [e["type"] for e in events]
+        assert types.index("tool_request") < types.index("tool_result")
+        assert [e["tool"] for e in events if e["type"] == "tool_result"] == [
+            "web_search",
+            "file_read",
+        ]
+        on_approval.assert_called_once()
@@ -0,0 +1,142 @@
+"""
+Axon by NeuroVexon - Tests for the authenticated principal cache
+"""
+
+import pytest
+from unittest.mock import patch
+
+from core.dependencies import get_current_user
+from core.principal_cache import PrincipalCache
+from core.security import create_access_token, decode_token
+from db.models import User
+
+
+class _CountingSession:
+    """Wraps an AsyncSession and counts execute() calls"""
+
+    def __init__(self, db):
+        self._db = db
+        self.queries = 0
+
+    async def execute(self, *args, **kwargs):
+        self.queries += 1
+        return await self._db.execute(*args, **kwargs)
+
+
+@pytest.fixture
+async def user(db):
+    user = User(email="alice@example.com", password_hash="x", role="user")
+    db.add(user)
+    await db.commit()
+    return user
+
+
+@pytest.fixture
+async def cache(db):
+    cache = PrincipalCache(max_size=8, ttl=60, sync_interval=3600)
+    await cache.sync(db)  # Initial sync, so the tests count only their queries
+    with patch("core.dependencies.principal_cache", cache):
+        yield cache
+
+
+def _token(user: User, **claims) -> str:
+    return create_access_token({"sub": user.id, **claims})
+
+
+class TestPrincipalCache:
+    @pytest.mark.asyncio
+    async def test_steady_state_needs_no_db(self, db, user, cache):
+        session = _CountingSession(db)
+        token = _token(user)
+
+        first = await get_current_user(token=token, db=session)
+        second = await get_current_user(token=token, db=session)
+
+        assert session.queries == 1
+        assert first is second
+        assert first.email == "alice@example.com"
+
+    @pytest.mark.asyncio
+    async def test_token_contains_iat(self, user):
+        assert "iat" in decode_token(_token(user))
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_changed_user(self, db, user, cache):
+        session = _CountingSession(db)
+        token = _token(user)
+        await get_current_user(token=token, db=session)
+
+        user.is_active = False
+        await db.commit()
+        cache.invalidate(user.id)
+
+        principal = await get_current_user(token=token, db=session)
+        assert session.queries == 2
+        assert principal.is_active is False
+
+    @pytest.mark.asyncio
+    async def test_change_on_other_worker_is_synced(self, db, user):
+        worker_a = PrincipalCache(ttl=60, sync_interval=0)
+        worker_b = PrincipalCache(ttl=60, sync_interval=0)
+        token = _token(user)
+        with patch("core.dependencies.principal_cache", worker_b):
+            assert (await get_current_user(token=token, db=db)).is_active
+
+        # Worker A deactivates the user and invalidates only its own cache
+        user.is_active = False
+        await db.commit()
+        worker_a.invalidate(user.id)
+
+        with patch("core.dependencies.principal_cache", worker_b):
+            principal = await get_current_user(token=token, db=db)
+        assert principal.is_active is False
+
+    @pytest.mark.asyncio
+    async def test_token_carries_no_profile_claims(self, user):
+        from api.auth import _create_tokens
+
+        payload = decode_token(_create_tokens(user)["access_token"])
+        assert "email" not in payload
+        assert "name" not in payload
+        assert payload["sub"] == user.id
+
+    def test_expired_and_evicted_entries(self):
+        cache = PrincipalCache(max_size=2, ttl=60)
+        for i in range(3):
+            cache.put(f"u{i}", 1, User(id=f"u{i}"))
+        assert cache.get("u0", 1) is None  # evicted (LRU)
+        assert cache.get("u2", 1) is not None
+
+        cache.ttl = -1  # disabled
+        assert cache.get("u2", 1) is None
+
+    def test_put_skips_result_older_than_invalidate(self):
+        cache = PrincipalCache()
+        cache.invalidate("u1")
+        cache.put("u1", 1, User(id="u1"), loaded_at=0.0)
+        assert cache.get("u1", 1) is None
+
+
+class TestTrustTokenClaims:
+    @pytest.mark.asyncio
+    async def test_claims_trusted_without_db(self, db, user, cache):
+        session = _CountingSession(db)
+        token = _token(user, role="admin", active=True, email=user.email)
+
+        with patch("core.dependencies.settings.auth_trust_token_claims", True):
+            principal = await get_current_user(token=token, db=session)
+
+        assert session.queries == 0
+        assert principal.role == "admin"
+
+    @pytest.mark.asyncio
+    async def test_claims_ignored_after_change(self, db, user, cache):
+        session = _CountingSession(db)
+        token = _token(user, role="admin", active=True)
+        cache.invalidate(user.id)  # role changed after the token was issued
+
+        with patch("core.dependencies.settings.auth_trust_token_claims", True):
+            principal = await get_current_user(token=token, db=session)
+
+        assert session.queries == 1
+        assert principal.role == "user"
@@ -0,0 +1,145 @@
+"""
+Axon by NeuroVexon - Query Plan Tests
+
+Asserts via EXPLAIN QUERY PLAN that the hot queries (chat history, /audit
+filters, /audit/stats, analytics timeline, documents) use the indexes from
+db/models.py, and that init_db adds missing indexes to existing databases.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.dialects import sqlite
+
+from db.database import Base, _auto_migrate_indexes
+from db.models import AuditLog, Conversation, Message, UploadedDocument
+
+_CUTOFF = datetime(2026, 1, 1)
+
+
+async def _plan(db_engine, stmt) -> str:
+    compiled = stmt.compile(
+        dialect=sqlite.dialect(), compile_kwargs={"render_postcompile": True}
+    )
+    params = tuple(
+        value.isoformat(" ") if isinstance(value, datetime) else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    async with db_engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        return "\n".join(row[-1] for row in result.all())
+
+
+HOT_QUERIES = {
+    "chat_context": (
+        select(Message)
+        .where(Message.conversation_id == "c1")
+        .where(Message.role.in_(["user", "assistant"]))
+        .where(Message.created_at >= _CUTOFF)
+        .order_by(Message.created_at.asc()),
+        "ix_messages_conversation_created",
+    ),
+    "audit_by_session": (
+        select(AuditLog)
+        .where(AuditLog.conversation_id == "c1")
+        .order_by(AuditLog.timestamp.desc())
+        .limit(100),
+        "ix_audit_logs_conversation_timestamp",
+    ),
+    "audit_by_event_type": (
+        select(AuditLog)
+        .where(AuditLog.event_type == "tool_executed")
+        .order_by(AuditLog.timestamp.desc())
+        .limit(100),
+        "ix_audit_logs_event_type_timestamp",
+    ),
+    "audit_by_tool": (
+        select(AuditLog)
+        .where(AuditLog.tool_name == "web_search")
+        .order_by(AuditLog.timestamp.desc())
+        .limit(100),
+        "ix_audit_logs_tool_name_timestamp",
+    ),
+    "audit_latest": (
+        select(AuditLog).order_by(AuditLog.timestamp.desc()).limit(100),
+        "ix_audit_logs_timestamp",
+    ),
+    "audit_stats_by_event": (
+        select(AuditLog.event_type, func.count(AuditLog.id)).group_by(
+            AuditLog.event_type
+        ),
+        "ix_audit_logs_event_type_timestamp",
+    ),
+    "analytics_timeline": (
+        select(func.date(AuditLog.timestamp), func.count(AuditLog.id))
+        .where(AuditLog.timestamp >= _CUTOFF, AuditLog.event_type == "tool_executed")
+        .group_by(func.date(AuditLog.timestamp)),
+        "ix_audit_logs_event_type_timestamp",
+    ),
+    "conversation_list": (
+        select(Conversation)
+        .where(Conversation.user_id == "u1")
+        .order_by(Conversation.updated_at.desc())
+        .limit(50),
+        "ix_conversations_user_updated",
+    ),
+    "documents": (
+        select(UploadedDocument)
+        .where(UploadedDocument.conversation_id == "c1")
+        .order_by(UploadedDocument.created_at.asc())
+        .limit(10),
+        "ix_uploaded_documents_conversation_created",
+    ),
+}
+
+
+class TestQueryPlans:
+    """Hot queries are served by an index, not a full scan"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+    async def test_hot_query_uses_index(self, db_engine, name):
+        stmt, index = HOT_QUERIES[name]
+        plan = await _plan(db_engine, stmt)
+        assert index in plan, plan
+        assert "USE TEMP B-TREE FOR ORDER BY" not in plan, plan
+
+
+class TestIndexMigration:
+    """init_db creates indexes that are missing on existing tables"""
+
+    @pytest.mark.asyncio
+    async def test_missing_indexes_created(self, db_engine):
+        async with db_engine.begin() as conn:
+            await conn.execute(text("DROP INDEX ix_messages_conversation_created"))
+            await conn.execute(text("DROP INDEX ix_audit_logs_timestamp"))
+            await conn.run_sync(_auto_migrate_indexes)
+
+            names = await conn.run_sync(
+                lambda sync_conn: {
+                    ix["name"]
+                    for table in ("messages", "audit_logs")
+                    for ix in inspect(sync_conn).get_indexes(table)
+                }
+            )
+        assert "ix_messages_conversation_created" in names
+        assert "ix_audit_logs_timestamp" in names
+
+    @pytest.mark.asyncio
+    async def test_all_model_indexes_exist(self, db_engine):
+        async with db_engine.connect() as conn:
+            await conn.run_sync(_auto_migrate_indexes)  # idempotent
+            existing = await conn.run_sync(
+                lambda sync_conn: {
+                    ix["name"]
+                    for table in Base.metadata.sorted_tables
+                    for ix in inspect(sync_conn).get_indexes(table.name)
+                }
+            )
+        expected = {
+            index.name
+            for table in Base.metadata.sorted_tables
+            for index in table.indexes
+        }
+        assert expected <= existing
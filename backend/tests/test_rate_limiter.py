@@ -1,11 +1,20 @@
 """
 Axon by NeuroVexon - Rate Limiter Tests
 
-Tests for the in-memory RateLimiter used for MCP and API protection.
+Tests for the sliding-window and token-bucket limiters and the route middleware.
 """
 
-from datetime import datetime, timedelta
-
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from core.rate_limit import (
+    RateLimitMiddleware,
+    RateLimitPolicy,
+    SlidingWindowLimiter,
+    TokenBucketLimiter,
+    default_policies,
+    parse_trusted_proxies,
+)
 from core.security import RateLimiter
 
 
@@ -53,11 +62,164 @@ class TestRateLimiter:
 
     def test_window_expiry(self):
         """Requests outside the window should not count"""
-        limiter = RateLimiter(max_requests=1, window_seconds=60)
+        now = [1000.0]
+        limiter = RateLimiter(max_requests=1, window_seconds=60, clock=lambda: now[0])
 
-        # Manually inject an old request
-        old_time = datetime.utcnow() - timedelta(seconds=120)
-        limiter._requests["user-1"] = [old_time]
+        assert limiter.is_allowed("user-1") is True
+        assert limiter.is_allowed("user-1") is False
 
-        # Should be allowed because old request is outside window
+        # Two minutes later the old request is outside the window
+        now[0] += 120
         assert limiter.is_allowed("user-1") is True
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSlidingWindowLimiter:
+    def test_previous_window_is_weighted(self):
+        clock = _Clock(600.0)  # Start of a window
+        limiter = SlidingWindowLimiter(10, 60, clock=clock)
+        for _ in range(10):
+            assert limiter.is_allowed("ip")
+        assert limiter.hit("ip") is not None
+
+        # Halfway through the next window: 10 * 0.5 = 5 still count
+        clock.now = 690.0
+        for _ in range(5):
+            assert limiter.is_allowed("ip")
+        assert not limiter.is_allowed("ip")
+
+    def test_retry_after(self):
+        clock = _Clock(600.0)
+        limiter = SlidingWindowLimiter(2, 60, clock=clock)
+        limiter.hit("ip")
+        limiter.hit("ip")
+        retry_after = limiter.hit("ip")
+        assert retry_after == pytest.approx(60.0)
+        clock.now += retry_after + 0.01
+        assert limiter.is_allowed("ip")
+
+    def test_idle_keys_are_evicted(self):
+        clock = _Clock()
+        limiter = SlidingWindowLimiter(5, 60, clock=clock)
+        for i in range(100):
+            limiter.hit(f"ip-{i}")
+        assert len(limiter) == 100
+        clock.now += 121
+        limiter.hit("new")
+        assert len(limiter) == 1
+        assert limiter.evicted == 100
+
+    def test_max_keys(self):
+        limiter = SlidingWindowLimiter(5, 60, max_keys=10, clock=_Clock())
+        for i in range(25):
+            limiter.hit(f"ip-{i}")
+        assert len(limiter) == 10
+
+
+class TestTokenBucketLimiter:
+    def test_burst_then_refill(self):
+        clock = _Clock()
+        limiter = TokenBucketLimiter(rate=1.0, capacity=3, clock=clock)
+        assert [limiter.is_allowed("ip") for _ in range(4)] == [
+            True,
+            True,
+            True,
+            False,
+        ]
+        clock.now += 0.5
+        assert limiter.hit("ip") == pytest.approx(0.5)
+        clock.now += 0.5
+        assert limiter.is_allowed("ip")
+
+    def test_full_bucket_is_evicted(self):
+        clock = _Clock()
+        limiter = TokenBucketLimiter(rate=1.0, capacity=3, clock=clock)
+        limiter.hit("a")
+        clock.now += 3.5
+        limiter.hit("b")
+        assert len(limiter) == 1
+        # A new bucket is full, as the evicted one would have been
+        assert [limiter.is_allowed("a") for _ in range(3)] == [True, True, True]
+
+
+async def _app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+class TestRateLimitMiddleware:
+    @pytest.fixture
+    def client(self):
+        policy = RateLimitPolicy(
+            "auth",
+            SlidingWindowLimiter(2, 60),
+            ("/api/v1/auth/login",),
+            frozenset({"POST"}),
+        )
+        app = RateLimitMiddleware(_app, [policy])
+        return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+    @pytest.mark.asyncio
+    async def test_limits_matching_route(self, client):
+        async with client:
+            for _ in range(2):
+                assert (await client.post("/api/v1/auth/login")).status_code == 200
+            response = await client.post(
+                "/api/v1/auth/login", headers={"Accept-Language": "en"}
+            )
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) >= 1
+        assert response.json()["detail"] == "Too many requests, please try again later"
+
+    @pytest.mark.asyncio
+    async def test_other_routes_and_methods_not_limited(self, client):
+        async with client:
+            for _ in range(5):
+                assert (await client.get("/api/v1/auth/login")).status_code == 200
+                assert (await client.post("/api/v1/agents")).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_clients_behind_trusted_proxy_are_separate(self):
+        policy = RateLimitPolicy("auth", SlidingWindowLimiter(1, 60), ("/login",))
+        app = RateLimitMiddleware(
+            _app, [policy], parse_trusted_proxies("127.0.0.0/8, 10.0.0.0/8")
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+
+            async def login(forwarded: str) -> int:
+                response = await client.post(
+                    "/login", headers={"X-Forwarded-For": forwarded}
+                )
+                return response.status_code
+
+            assert await login("203.0.113.5") == 200
+            assert await login("203.0.113.6") == 200
+            assert await login("203.0.113.5") == 429
+            # A forged leftmost entry does not give a fresh key
+            assert await login("198.51.100.1, 203.0.113.5, 10.0.0.2") == 429
+
+    @pytest.mark.asyncio
+    async def test_forwarded_header_ignored_from_untrusted_peer(self):
+        policy = RateLimitPolicy("auth", SlidingWindowLimiter(1, 60), ("/login",))
+        app = RateLimitMiddleware(_app, [policy], parse_trusted_proxies("10.0.0.1"))
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            first = await client.post("/login", headers={"X-Forwarded-For": "1.2.3.4"})
+            second = await client.post("/login", headers={"X-Forwarded-For": "5.6.7.8"})
+        assert first.status_code == 200
+        assert second.status_code == 429
+
+    def test_refresh_not_rate_limited(self):
+        auth = next(p for p in default_policies() if p.name == "auth")
+        assert not auth.matches("POST", "/api/v1/auth/refresh")
+        assert auth.matches("POST", "/api/v1/auth/login")
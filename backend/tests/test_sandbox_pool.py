@@ -0,0 +1,175 @@
+"""
+Axon by NeuroVexon - Tests for the warm sandbox container pool (docker CLI mocked)
+"""
+
+import asyncio
+import os
+import socket
+import time
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import sandbox.executor as executor
+from sandbox.pool import POOL_LABEL, SandboxPool
+
+
+class FakeDocker:
+    """Records docker CLI calls; 'exec' echoes stdin back as stdout"""
+
+    def __init__(self, exec_delay: float = 0):
+        self.calls: list[tuple] = []
+        self.exec_delay = exec_delay
+        self.ps_output = b""
+
+    async def __call__(self, *args, stdin=None, timeout=None):
+        self.calls.append(args)
+        if args[0] == "ps":
+            return 0, self.ps_output, b""
+        if args[0] == "exec":
+            if self.exec_delay > (timeout or 0):
+                await asyncio.sleep(0)
+                raise asyncio.TimeoutError
+            return 0, stdin, b""
+        return 0, b"", b""
+
+    def count(self, command: str) -> int:
+        return sum(1 for call in self.calls if call[0] == command)
+
+
+async def _settle(pool: SandboxPool):
+    while pool._tasks:
+        await asyncio.gather(*list(pool._tasks))
+
+
+@pytest.fixture
+def docker():
+    fake = FakeDocker()
+    with patch("sandbox.pool.run_docker", fake):
+        yield fake
+
+
+class TestSandboxPool:
+    @pytest.mark.asyncio
+    async def test_warm_container_used_once(self, docker):
+        pool = SandboxPool(image="img", size=2)
+        pool.fill()
+        await _settle(pool)
+        assert docker.count("run") == 2
+
+        exit_code, stdout, _stderr, timed_out = await pool.execute("print(1)", 5)
+        await _settle(pool)
+
+        assert (exit_code, stdout, timed_out) == (0, b"print(1)", False)
+        assert pool.hits == 1 and pool.misses == 0
+        exec_call = next(c for c in docker.calls if c[0] == "exec")
+        assert exec_call[-2:] == ("python3", "-")
+        # Used container removed, pool refilled to size
+        assert docker.count("rm") == 1
+        assert len(pool._ready) == 2
+
+    @pytest.mark.asyncio
+    async def test_container_flags(self, docker):
+        pool = SandboxPool(image="img", size=1)
+        pool.fill()
+        await _settle(pool)
+        run = docker.calls[0]
+        for flag in ("--rm", "--read-only", "--pids-limit"):
+            assert flag in run
+        assert run[run.index("--network") + 1] == "none"
+
+    @pytest.mark.asyncio
+    async def test_expired_container_is_replaced(self, docker):
+        pool = SandboxPool(image="img", size=1, ttl=0)
+        pool.fill()
+        await _settle(pool)
+
+        await pool.execute("x = 1", 5)
+        await _settle(pool)
+        assert pool.hits == 0 and pool.misses == 1
+        assert docker.count("rm") == 2  # expired + used
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_container(self):
+        docker = FakeDocker(exec_delay=10)
+        with patch("sandbox.pool.run_docker", docker):
+            pool = SandboxPool(image="img", size=1)
+            outcome = await pool.execute("while True: pass", 1)
+            await pool.close()
+
+        assert outcome[3] is True
+        assert docker.count("kill") == 1
+
+    @pytest.mark.asyncio
+    async def test_containers_are_labelled(self, docker):
+        pool = SandboxPool(image="img", size=1)
+        pool.fill()
+        await _settle(pool)
+        run = docker.calls[0]
+        assert run[run.index("--label") + 1] == POOL_LABEL
+
+    @pytest.mark.asyncio
+    async def test_reap_orphans(self, docker):
+        pool = SandboxPool(image="img", size=1, ttl=300)
+        host = socket.gethostname()
+        pool._owner = f"{host}:1"  # This test process counts as another owner
+        now = int(time.time())
+        docker.ps_output = "\n".join(
+            [
+                f"own\t{pool._owner}\t{now - 10_000}",  # Ours: kept
+                f"alive\t{host}:{os.getpid()}\t{now}",  # Live process
+                f"dead\t{host}:999999999\t{now}",  # Crashed process
+                f"stale\tother-host:1\t{now - 10_000}",  # Far older than TTL
+                f"fresh\tother-host:1\t{now}",
+            ]
+        ).encode()
+
+        assert await pool.reap_orphans() == 2
+        assert ("rm", "-f", "dead", "stale") in docker.calls
+        assert pool.stats()["reaped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_sweep_replaces_expired_containers(self, docker):
+        pool = SandboxPool(image="img", size=1, ttl=300)
+        pool.fill()
+        await _settle(pool)
+        pool._ready[0].started_at -= 300
+
+        assert pool._expire() == 1
+        pool.fill()
+        await _settle(pool)
+        assert docker.count("rm") == 1
+        assert docker.count("run") == 2
+        assert len(pool._ready) == 1
+        await pool.close()
+
+
+class TestExecutor:
+    @pytest.mark.asyncio
+    async def test_docker_checks_are_cached(self):
+        executor._check_cache.clear()
+        proc = AsyncMock()
+        proc.returncode = 0
+        with patch(
+            "asyncio.create_subprocess_exec", AsyncMock(return_value=proc)
+        ) as spawn:
+            assert await executor._check_docker()
+            assert await executor._check_docker()
+        assert spawn.await_count == 1
+        executor._check_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_execute_code_uses_pool(self, docker):
+        pool = SandboxPool(image="img", size=1)
+        with (
+            patch.object(executor, "sandbox_pool", pool),
+            patch.object(executor, "_check_docker", AsyncMock(return_value=True)),
+            patch.object(executor, "_check_image_exists", AsyncMock(return_value=True)),
+        ):
+            result = await executor.execute_code("print('hi')")
+        await pool.close()
+
+        assert result.stdout == "print('hi')"
+        assert result.exit_code == 0
+        assert result.timed_out is False
+        assert docker.count("exec") == 1
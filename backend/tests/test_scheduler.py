@@ -0,0 +1,245 @@
+"""
+Axon by NeuroVexon - Tests for the task scheduler (job diffing, worker pool, runs)
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from agent import scheduler as scheduler_module
+from agent.scheduler import LeaderLock, TaskScheduler, parse_provider_limits
+from core.settings_cache import SettingsSnapshot
+from db.models import ScheduledTask, TaskRun
+from llm.provider import LLMResponse
+
+
+class FakeProvider:
+    """Counts concurrent chat() calls"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, stream=False):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return LLMResponse(content="erledigt", input_tokens=12, output_tokens=34)
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    fake = FakeProvider()
+
+    async def configure(db):
+        return SettingsSnapshot(version=1, values={"llm_provider": "ollama"})
+
+    monkeypatch.setattr(scheduler_module, "configure_llm_router", configure)
+    monkeypatch.setattr(scheduler_module.llm_router, "get_provider", lambda p: fake)
+    return fake
+
+
+async def _add_tasks(session_factory, *crons: str) -> list[str]:
+    async with session_factory() as db:
+        tasks = [
+            ScheduledTask(name=f"Task {i}", cron_expression=cron, prompt="Status?")
+            for i, cron in enumerate(crons)
+        ]
+        db.add_all(tasks)
+        await db.commit()
+        return [task.id for task in tasks]
+
+
+async def _runs(session_factory) -> list[TaskRun]:
+    async with session_factory() as db:
+        result = await db.execute(select(TaskRun).order_by(TaskRun.started_at))
+        return list(result.scalars().all())
+
+
+def test_parse_provider_limits():
+    assert parse_provider_limits("ollama=1, Claude=4,,bad=x") == {
+        "ollama": 1,
+        "claude": 4,
+    }
+    assert parse_provider_limits("") == {}
+
+
+@pytest.mark.asyncio
+async def test_sync_applies_only_changes(session_factory):
+    scheduler = TaskScheduler(session_factory=session_factory)
+    first, second, third = await _add_tasks(
+        session_factory, "0 * * * *", "*/5 * * * *", "0 9 * * *"
+    )
+    assert await scheduler.sync_tasks() == {"added": 3, "changed": 0, "removed": 0}
+    unchanged_trigger = scheduler.scheduler.get_job(f"task_{third}").trigger
+
+    # Nothing changed: no job is touched
+    assert await scheduler.sync_tasks() == {"added": 0, "changed": 0, "removed": 0}
+
+    async with session_factory() as db:
+        (await db.get(ScheduledTask, first)).cron_expression = "30 * * * *"
+        (await db.get(ScheduledTask, second)).enabled = False
+        await db.commit()
+    (fourth,) = await _add_tasks(session_factory, "0 0 * * *")
+
+    assert await scheduler.sync_tasks() == {"added": 1, "changed": 1, "removed": 1}
+    job_ids = {job.id for job in scheduler.scheduler.get_jobs()}
+    assert job_ids == {f"task_{first}", f"task_{third}", f"task_{fourth}"}
+    assert "minute='30'" in str(scheduler.scheduler.get_job(f"task_{first}").trigger)
+    assert scheduler.scheduler.get_job(f"task_{third}").trigger is unchanged_trigger
+
+
+@pytest.mark.asyncio
+async def test_sync_caps_active_tasks(session_factory, monkeypatch):
+    monkeypatch.setattr(scheduler_module, "MAX_ACTIVE_TASKS", 2)
+    scheduler = TaskScheduler(session_factory=session_factory)
+    await _add_tasks(session_factory, "0 * * * *", "0 * * * *", "0 * * * *")
+    await scheduler.sync_tasks()
+    assert len(scheduler.scheduler.get_jobs()) == 2
+
+
+def test_leader_lock_held_by_one_worker(tmp_path):
+    pytest.importorskip("fcntl")
+    path = str(tmp_path / "scheduler.lock")
+    first, second = LeaderLock(path), LeaderLock(path)
+    assert first.acquire() is True
+    assert second.acquire() is False
+    first.release()
+    assert second.acquire() is True
+    second.release()
+
+
+@pytest.mark.asyncio
+async def test_follower_plans_nothing(session_factory):
+    await _add_tasks(session_factory, "0 * * * *")
+    scheduler = TaskScheduler(session_factory)
+    scheduler.leader = False
+    assert await scheduler.sync_tasks() == {"added": 0, "changed": 0, "removed": 0}
+    assert scheduler.stats()["jobs"] == 0
+
+
+@pytest.mark.asyncio
+async def test_jitter_is_applied(session_factory):
+    scheduler = TaskScheduler(session_factory=session_factory, jitter_seconds=90)
+    (task_id,) = await _add_tasks(session_factory, "0 * * * *")
+    await scheduler.sync_tasks()
+    assert scheduler.scheduler.get_job(f"task_{task_id}").trigger.jitter == 90
+
+
+@pytest.mark.asyncio
+async def test_run_is_recorded(session_factory, provider):
+    scheduler = TaskScheduler(session_factory=session_factory)
+    (task_id,) = await _add_tasks(session_factory, "0 * * * *")
+
+    assert await scheduler.run_task_now(task_id) == "erledigt"
+
+    (run,) = await _runs(session_factory)
+    assert run.status == "success"
+    assert run.trigger == "manual"
+    assert run.provider == "ollama"
+    assert (run.input_tokens, run.output_tokens) == (12, 34)
+    assert run.duration_ms is not None
+    async with session_factory() as db:
+        task = await db.get(ScheduledTask, task_id)
+        assert task.last_result == "erledigt"
+        assert task.last_run == run.started_at
+
+
+@pytest.mark.asyncio
+async def test_settings_loaded_once_per_run(session_factory, provider, monkeypatch):
+    loads = []
+
+    async def configure(db):
+        loads.append(db)
+        return SettingsSnapshot(
+            version=1, values={"llm_provider": "ollama", "language": "en"}
+        )
+
+    monkeypatch.setattr(scheduler_module, "configure_llm_router", configure)
+    scheduler = TaskScheduler(session_factory=session_factory)
+    (task_id,) = await _add_tasks(session_factory, "0 * * * *")
+
+    assert await scheduler.run_task_now(task_id) == "erledigt"
+    assert len(loads) == 1
+
+
+@pytest.mark.asyncio
+async def test_overlapping_run_is_skipped(session_factory, provider):
+    provider.delay = 0.05
+    scheduler = TaskScheduler(session_factory=session_factory)
+    (task_id,) = await _add_tasks(session_factory, "* * * * *")
+
+    results = await asyncio.gather(
+        scheduler._execute_task(task_id), scheduler._execute_task(task_id)
+    )
+    assert sorted(results) == [False, True]
+    assert provider.calls == 1
+    assert sorted(run.status for run in await _runs(session_factory)) == [
+        "skipped",
+        "success",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_provider_limit_bounds_concurrency(session_factory, provider):
+    provider.delay = 0.02
+    scheduler = TaskScheduler(
+        session_factory=session_factory,
+        max_concurrent=4,
+        provider_limits={"ollama": 2},
+    )
+    task_ids = await _add_tasks(session_factory, *["0 * * * *"] * 6)
+
+    await asyncio.gather(*(scheduler._execute_task(tid) for tid in task_ids))
+    assert provider.calls == 6
+    assert provider.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_busy_provider_does_not_hold_global_slot(session_factory, provider):
+    provider.delay = 0.05
+    scheduler = TaskScheduler(
+        session_factory=session_factory,
+        max_concurrent=2,
+        provider_limits={"ollama": 1},
+    )
+    task_ids = await _add_tasks(session_factory, *["0 * * * *"] * 3)
+    other = FakeProvider()
+
+    async def claude(db):
+        return SettingsSnapshot(version=1, values={"llm_provider": "claude"})
+
+    waiting = [
+        asyncio.create_task(scheduler._execute_task(tid)) for tid in task_ids[:2]
+    ]
+    await asyncio.sleep(0.01)  # first ollama run holds a slot, second waits
+    with (
+        patch.object(scheduler_module, "configure_llm_router", claude),
+        patch.object(scheduler_module.llm_router, "get_provider", lambda p: other),
+    ):
+        await asyncio.wait_for(scheduler._execute_task(task_ids[2]), timeout=0.04)
+    await asyncio.gather(*waiting)
+
+    assert other.calls == 1
+    # Queueing for the provider is not part of the recorded duration
+    assert all(run.duration_ms < 100 for run in await _runs(session_factory))
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_recorded(session_factory, provider, monkeypatch):
+    provider.delay = 1.0
+    monkeypatch.setattr(scheduler_module, "TASK_TIMEOUT_SECONDS", 0.01)
+    scheduler = TaskScheduler(session_factory=session_factory)
+    (task_id,) = await _add_tasks(session_factory, "0 * * * *")
+
+    await scheduler._execute_task(task_id)
+    (run,) = await _runs(session_factory)
+    assert run.status == "timeout"
@@ -0,0 +1,103 @@
+"""
+Axon by NeuroVexon - Tests for the settings snapshot cache
+"""
+
+import pytest
+from sqlalchemy import select
+from unittest.mock import MagicMock
+
+from core.config import LLMProvider
+from core.security import _get_fernet, encrypt_value
+from core.settings_cache import SettingsCache
+from db.models import Settings
+from llm.router import LLMRouter
+
+
+async def _store(db, key, value):
+    db.add(Settings(key=key, value=value))
+    await db.commit()
+
+
+class TestSettingsCache:
+    @pytest.mark.asyncio
+    async def test_snapshot_reused_until_invalidated(self, db):
+        cache = SettingsCache()
+        await _store(db, "llm_provider", "ollama")
+
+        first = await cache.get(db)
+        second = await cache.get(db)
+        assert first is second
+        assert cache.loads == 1
+
+        await _store(db, "theme", "light")
+        assert (await cache.get(db)).get("theme") is None  # still stale
+
+        cache.invalidate()
+        snapshot = await cache.get(db)
+        assert cache.loads == 2
+        assert snapshot.get("theme") == "light"
+        assert snapshot.version == cache.version
+
+    @pytest.mark.asyncio
+    async def test_write_in_other_worker_is_seen(self, db):
+        worker_a = SettingsCache(check_interval=0)
+        worker_b = SettingsCache(check_interval=0)
+        await _store(db, "llm_provider", "ollama")
+        await worker_a.get(db)
+        snapshot = await worker_b.get(db)
+
+        # Unchanged table: only the fingerprint is read
+        assert await worker_b.get(db) is snapshot
+        assert worker_b.loads == 1
+
+        # Worker A writes and invalidates only its own cache
+        setting = (await db.execute(select(Settings))).scalar_one()
+        setting.value = "claude"
+        await db.commit()
+        worker_a.invalidate()
+
+        updated = await worker_b.get(db)
+        assert updated.get("llm_provider") == "claude"
+        assert updated.version > snapshot.version
+        assert worker_b.loads == 2
+
+    @pytest.mark.asyncio
+    async def test_secrets_are_decrypted(self, db):
+        cache = SettingsCache()
+        encrypted = encrypt_value("sk-test-1234567890")
+        await _store(db, "anthropic_api_key", encrypted)
+
+        snapshot = await cache.get(db)
+        assert snapshot.raw["anthropic_api_key"] == encrypted
+        assert snapshot.get("anthropic_api_key") == "sk-test-1234567890"
+
+    def test_fernet_instance_is_cached(self):
+        assert _get_fernet() is _get_fernet()
+
+
+class TestRouterSettings:
+    def _router_with_mock(self):
+        router = LLMRouter()
+        provider = MagicMock()
+        router._providers[LLMProvider.CLAUDE] = provider
+        return router, provider
+
+    def test_same_version_is_noop(self):
+        router, provider = self._router_with_mock()
+        router.update_settings({"anthropic_api_key": "key-a"}, version=1)
+        router.update_settings({"anthropic_api_key": "key-b"}, version=1)
+
+        provider.update_config.assert_called_once()
+        assert provider.update_config.call_args.kwargs["api_key"] == "key-a"
+
+    def test_reconfigures_only_on_change(self):
+        router, provider = self._router_with_mock()
+        router.update_settings({"anthropic_api_key": "key-a"}, version=1)
+        router.update_settings(
+            {"anthropic_api_key": "key-a", "theme": "light"}, version=2
+        )
+        assert provider.update_config.call_count == 1
+
+        router.update_settings({"anthropic_api_key": "key-b"}, version=3)
+        assert provider.update_config.call_count == 2
+        assert provider.update_config.call_args.kwargs["api_key"] == "key-b"
@@ -0,0 +1,93 @@
+"""
+Axon by NeuroVexon - Tests for the incremental text tool-call parser
+"""
+
+from llm.text_tool_calls import TextToolCallParser, parse_tool_calls_from_text
+
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": name,
+            "parameters": {"type": "object", "required": ["query"]},
+        },
+    }
+    for name in ("web_search", "web_search_news", "memory_save")
+]
+
+
+def _feed(text: str, size: int = 3) -> list[tuple[int, str]]:
+    """(characters fed when detected, tool name) for each call"""
+    parser = TextToolCallParser(TOOLS)
+    found = []
+    for i in range(0, len(text), size):
+        for call in parser.feed(text[i : i + size]):
+            found.append((min(i + size, len(text)), call.name))
+    found += [(len(text), call.name) for call in parser.finish()]
+    return found
+
+
+class TestCompleteText:
+    def test_tool_calls_marker(self):
+        calls = parse_tool_calls_from_text(
+            '[TOOL_CALLS] [{"name": "web_search", "arguments": {"query": "a]b"}}]',
+            TOOLS,
+        )
+        assert calls[0].name == "web_search"
+        assert calls[0].parameters == {"query": "a]b"}
+
+    def test_code_fence(self):
+        calls = parse_tool_calls_from_text(
+            'Gern:\n```json\n{"name": "memory_save", "arguments": {"key": "k"}}\n```',
+            TOOLS,
+        )
+        assert calls[0].name == "memory_save"
+        assert calls[0].parameters == {"key": "k"}
+
+    def test_call_syntax_variants(self):
+        calls = parse_tool_calls_from_text(
+            'memory_save(key="a", content="b (c)") und web_search_news("heute")',
+            TOOLS,
+        )
+        assert [(c.name, c.parameters) for c in calls] == [
+            ("memory_save", {"key": "a", "content": "b (c)"}),
+            ("web_search_news", {"query": "heute"}),
+        ]
+        assert [c.id for c in calls] == ["fallback_0", "fallback_1"]
+
+    def test_unknown_names_and_prose_are_ignored(self):
+        text = 'Siehe print("x") oder my_web_search(query="y") (ohne Call)'
+        assert parse_tool_calls_from_text(text, TOOLS) is None
+        assert parse_tool_calls_from_text("", TOOLS) is None
+
+    def test_code_block_is_not_a_call_but_may_contain_one(self):
+        text = '```python\nweb_search("im Block")\n```\nweb_search(query="danach")'
+        calls = parse_tool_calls_from_text(text, TOOLS)
+        assert [c.parameters["query"] for c in calls] == ["im Block", "danach"]
+
+
+class TestIncremental:
+    def test_detected_when_closed(self):
+        prefix = "Ich suche kurz. "
+        call = 'web_search(query="axon")'
+        text = prefix + call + " Danach folgt noch viel Text." * 10
+        # Reported with the closing parenthesis, not at the end of the stream
+        assert _feed(text, 1) == [(len(prefix + call), "web_search")]
+
+    def test_marker_split_across_deltas(self):
+        text = '[TOOL_CALLS] [{"name": "web_search", "arguments": {"query": "q"}}]'
+        for size in (1, 2, 5, 13):
+            [(fed, name)] = _feed(text + " Rest", size)
+            assert name == "web_search"
+            assert len(text) <= fed < len(text) + size
+
+    def test_unclosed_candidate_does_not_block_later_calls(self):
+        text = 'web_search( das bleibt offen ... memory_save(key="k")'
+        assert [name for _, name in _feed(text)] == ["memory_save"]
+
+    def test_long_prose_keeps_buffer_small(self):
+        parser = TextToolCallParser(TOOLS)
+        for _ in range(5000):
+            assert parser.feed("Viel Text ohne Aufruf, aber (mit Klammern). ") == []
+        assert len(parser._buf) < 200
+        assert parser.finish() == []
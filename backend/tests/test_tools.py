@@ -9,7 +9,7 @@ import os
 # Add backend to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from agent.tool_registry import ToolRegistry, RiskLevel
+from agent.tool_registry import ToolRegistry, ToolDefinition, RiskLevel
 from agent.permission_manager import PermissionManager, PermissionScope
 
 
@@ -55,76 +55,126 @@ class TestToolRegistry:
             assert "description" in tool["function"]
             assert "parameters" in tool["function"]
 
+    def test_tools_for_llm_cached_by_reference(self):
+        registry = ToolRegistry()
+        first = registry.get_tools_for_llm()
+        assert registry.get_tools_for_llm() is first
+        assert first.version == registry.version
+
+    def test_register_invalidates_schema(self):
+        registry = ToolRegistry()
+        first = registry.get_tools_for_llm()
+        registry.register(
+            ToolDefinition(
+                name="custom_tool",
+                description="Custom",
+                description_de="Eigenes Tool",
+                parameters={},
+                risk_level=RiskLevel.LOW,
+            )
+        )
+        second = registry.get_tools_for_llm()
+        assert second is not first
+        assert second.version > first.version
+        assert "custom_tool" in [t["function"]["name"] for t in second]
+
+    def test_tools_for_llm_filtered_by_agent(self):
+        registry = ToolRegistry()
+        view = registry.get_tools_for_llm(["web_search", "file_read"])
+        assert [t["function"]["name"] for t in view] == ["file_read", "web_search"]
+        # Same set in another order hits the same cache entry
+        assert registry.get_tools_for_llm(["file_read", "web_search"]) is view
+        assert registry.get_tools_for_llm([]) == []
+
+    def test_provider_conversion_cached_per_schema(self):
+        from llm.anthropic_provider import ClaudeProvider
+
+        registry = ToolRegistry()
+        schema = registry.get_tools_for_llm()
+        provider = ClaudeProvider()
+        converted = provider.converted_tools(schema, "claude", provider._convert_tools)
+
+        assert converted[0]["input_schema"] == schema[0]["function"]["parameters"]
+        assert (
+            provider.converted_tools(schema, "claude", provider._convert_tools)
+            is converted
+        )
+        # Plain lists are converted every time
+        plain = list(schema)
+        assert provider.converted_tools(plain, "claude", provider._convert_tools) == (
+            converted
+        )
+
 
 class TestPermissionManager:
     """Tests for PermissionManager"""
 
-    def test_no_permission_by_default(self):
+    async def test_no_permission_by_default(self):
         manager = PermissionManager()
 
-        has_perm = manager.check_permission(
+        has_perm = await manager.check_permission(
             "session-1", "file_read", {"path": "/test.txt"}
         )
 
         assert has_perm is False
 
-    def test_grant_once_permission(self):
+    async def test_grant_once_permission(self):
         manager = PermissionManager()
 
-        manager.grant_permission(
+        await manager.grant_permission(
             "session-1", "file_read", {"path": "/test.txt"}, PermissionScope.ONCE
         )
 
         # Should have permission for exact params
-        has_perm = manager.check_permission(
+        has_perm = await manager.check_permission(
             "session-1", "file_read", {"path": "/test.txt"}
         )
         assert has_perm is True
 
         # Should NOT have permission for different params
-        has_perm_other = manager.check_permission(
+        has_perm_other = await manager.check_permission(
             "session-1", "file_read", {"path": "/other.txt"}
         )
         assert has_perm_other is False
 
-    def test_grant_session_permission(self):
+    async def test_grant_session_permission(self):
         manager = PermissionManager()
 
-        manager.grant_permission(
+        await manager.grant_permission(
             "session-1", "file_read", {"path": "/test.txt"}, PermissionScope.SESSION
         )
 
         # Should have permission for any params
-        has_perm = manager.check_permission(
+        has_perm = await manager.check_permission(
             "session-1", "file_read", {"path": "/other.txt"}
         )
         assert has_perm is True
 
-    def test_block_permission(self):
+    async def test_block_permission(self):
         manager = PermissionManager()
 
-        manager.grant_permission(
+        await manager.grant_permission(
             "session-1", "file_read", {"path": "/test.txt"}, PermissionScope.NEVER
         )
 
-        is_blocked = manager.is_blocked("file_read", {"path": "/test.txt"})
+        is_blocked = await manager.is_blocked("file_read", {"path": "/test.txt"})
         assert is_blocked is True
 
-    def test_revoke_session(self):
+    async def test_revoke_session(self):
         manager = PermissionManager()
 
-        manager.grant_permission(
+        await manager.grant_permission(
             "session-1", "file_read", {"path": "/test.txt"}, PermissionScope.SESSION
         )
 
         # Verify permission exists
-        assert manager.check_permission("session-1", "file_read", {}) is True
+        assert await manager.check_permission("session-1", "file_read", {}) is True
 
         # Revoke
-        manager.revoke_session("session-1")
+        await manager.revoke_session("session-1")
 
         # Verify permission is gone
-        assert manager.check_permission("session-1", "file_read", {}) is False
+        assert await manager.check_permission("session-1", "file_read", {}) is False
 
 
 if __name__ == "__main__":
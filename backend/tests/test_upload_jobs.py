@@ -0,0 +1,252 @@
+"""
+Axon by NeuroVexon - Tests for streamed uploads and extraction jobs
+"""
+
+import asyncio
+import hashlib
+import io
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from starlette.datastructures import UploadFile
+
+from agent import upload_jobs
+from agent.upload_jobs import UploadJob, UploadJobRegistry
+from agent.blob_store import BlobStore, stream_to_disk
+from db.models import DocumentBlob, DocumentChunk, UploadedDocument
+
+
+@pytest.fixture
+def thread_extraction():
+    """Extract in a worker thread instead of a process pool"""
+    with patch("agent.upload_jobs.settings.upload_extract_workers", 0):
+        yield
+
+
+@pytest.fixture
+def no_embeddings():
+    with patch("agent.embeddings.embedding_provider") as provider:
+        provider.embed_batch = AsyncMock(side_effect=lambda texts: [None] * len(texts))
+        yield provider
+
+
+class TestStreamToDisk:
+    async def test_writes_file_and_hash(self, tmp_path):
+        payload = b"axon " * 500_000  # ~2.4 MB, several read chunks
+        target = tmp_path / "data.txt"
+        size, digest = await stream_to_disk(
+            UploadFile(io.BytesIO(payload), filename="data.txt"), target, 10 << 20
+        )
+        assert size == len(payload)
+        assert digest == hashlib.sha256(payload).hexdigest()
+        assert target.read_bytes() == payload
+        assert not (tmp_path / "data.txt.part").exists()
+
+    async def test_size_limit_removes_partial_file(self, tmp_path):
+        target = tmp_path / "big.bin"
+        with pytest.raises(HTTPException) as exc:
+            await stream_to_disk(
+                UploadFile(io.BytesIO(b"x" * (3 << 20)), filename="big.bin"),
+                target,
+                2 << 20,
+            )
+        assert exc.value.status_code == 400
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestUploadJob:
+    async def test_wait_for_change(self):
+        job = UploadJob(id="j", document_id="d", filename="f.txt")
+        assert await job.wait_for_change(0, 0.01) is False
+        waiter = asyncio.create_task(job.wait_for_change(0, 1))
+        await asyncio.sleep(0)
+        job.update(status="extracting")
+        assert await waiter is True
+        # Changes made before the wait are not missed
+        assert await job.wait_for_change(0, 0.01) is True
+        assert job.version == 1
+        assert job.to_dict()["status"] == "extracting"
+        assert "_changed" not in job.to_dict()
+
+
+async def _upload(session_factory, store, path, filename, conversation_id=None):
+    upload = UploadFile(io.BytesIO(path.read_bytes()), filename=filename)
+    incoming, size, sha256 = await store.receive(upload, 10 << 20)
+    doc = UploadedDocument(
+        conversation_id=conversation_id,
+        filename=filename,
+        mime_type="text/plain",
+        file_size=size,
+        content_hash=sha256,
+    )
+    async with session_factory() as db:
+        blob, _ = await store.add_document(db, doc, incoming)
+    return doc, blob
+
+
+class TestUploadJobRegistry:
+    async def test_job_extracts_and_indexes(
+        self, session_factory, tmp_path, thread_extraction, no_embeddings
+    ):
+        path = tmp_path / "notes.txt"
+        path.write_text("Axon Notizen. " * 300, encoding="utf-8")
+        store = BlobStore(tmp_path / "blobs")
+        doc, blob = await _upload(session_factory, store, path, "notes.txt")
+
+        registry = UploadJobRegistry(session_factory)
+        job = registry.start(doc, blob.file_path, "text/plain")
+        assert registry.get(job.id) is job
+        await registry.wait_all()
+
+        assert job.status == "done", job.error
+        assert job.has_text
+        assert not job.reused
+        assert job.text_preview.startswith("Axon Notizen.")
+        assert job.chunks > 1
+        async with session_factory() as db:
+            stored = await db.get(DocumentBlob, blob.sha256)
+            assert stored.extracted_text.startswith("Axon Notizen.")
+            assert stored.indexed_at is not None
+            count = await db.scalar(
+                select(func.count(DocumentChunk.id)).where(
+                    DocumentChunk.blob_hash == blob.sha256
+                )
+            )
+        assert count == job.chunks == stored.chunk_count
+
+    async def test_same_content_is_extracted_once(
+        self, session_factory, tmp_path, thread_extraction, no_embeddings
+    ):
+        path = tmp_path / "handbuch.txt"
+        path.write_text("Handbuch Kapitel. " * 300, encoding="utf-8")
+        store = BlobStore(tmp_path / "blobs")
+        registry = UploadJobRegistry(session_factory)
+
+        with patch(
+            "agent.upload_jobs.run_extraction", wraps=upload_jobs.run_extraction
+        ) as extraction:
+            # Two concurrent uploads share one extraction ...
+            first, blob = await _upload(session_factory, store, path, "a.txt")
+            second, _ = await _upload(session_factory, store, path, "b.txt")
+            jobs = [
+                registry.start(first, blob.file_path, "text/plain"),
+                registry.start(second, blob.file_path, "text/plain"),
+            ]
+            await registry.wait_all()
+            # ... and a later one reuses the stored chunks
+            third, _ = await _upload(session_factory, store, path, "c.txt")
+            jobs.append(registry.start(third, blob.file_path, "text/plain"))
+            await registry.wait_all()
+
+        assert extraction.call_count == 1
+        assert [job.status for job in jobs] == ["done"] * 3
+        assert jobs[2].reused
+        assert len({job.chunks for job in jobs}) == 1
+        async with session_factory() as db:
+            count = await db.scalar(select(func.count(DocumentChunk.id)))
+        assert count == jobs[0].chunks
+
+    async def test_job_fails_for_deleted_document(
+        self, session_factory, tmp_path, thread_extraction, no_embeddings
+    ):
+        path = tmp_path / "gone.txt"
+        path.write_text("Inhalt", encoding="utf-8")
+        store = BlobStore(tmp_path / "blobs")
+        doc, blob = await _upload(session_factory, store, path, "gone.txt")
+        async with session_factory() as db:
+            await store.remove_document(db, await db.get(UploadedDocument, doc.id))
+
+        registry = UploadJobRegistry(session_factory)
+        job = registry.start(doc, blob.file_path, "text/plain")
+        await registry.wait_all()
+
+        assert job.status == "failed"
+        assert job.error
+
+    async def test_status_visible_to_other_worker(
+        self, session_factory, tmp_path, thread_extraction, no_embeddings
+    ):
+        path = tmp_path / "bericht.txt"
+        path.write_text("Quartalsbericht. " * 50, encoding="utf-8")
+        store = BlobStore(tmp_path / "blobs")
+        doc, blob = await _upload(session_factory, store, path, "bericht.txt")
+
+        worker_a = UploadJobRegistry(session_factory)
+        worker_b = UploadJobRegistry(session_factory)
+        job = worker_a.start(doc, blob.file_path, "text/plain")
+        await worker_a.wait_all()
+
+        assert worker_b.get(job.id) is None
+        state = await worker_b.load(job.id)
+        assert state["status"] == "done"
+        assert state["has_text"]
+        assert state["chunks"] == job.chunks
+        assert await worker_b.load("unknown") is None
+
+    async def test_chat_waits_for_pending_upload(
+        self, session_factory, tmp_path, thread_extraction, no_embeddings
+    ):
+        path = tmp_path / "vertrag.txt"
+        path.write_text("Vertragstext. " * 50, encoding="utf-8")
+        store = BlobStore(tmp_path / "blobs")
+        doc, blob = await _upload(
+            session_factory, store, path, "vertrag.txt", conversation_id="c1"
+        )
+        worker_a = UploadJobRegistry(session_factory)
+        worker_b = UploadJobRegistry(session_factory)
+        assert await worker_b.wait_for_conversation("c1", 1) is False
+
+        gate = asyncio.Event()
+        extraction = upload_jobs.run_extraction
+
+        async def slow_extraction(*args):
+            await gate.wait()
+            return await extraction(*args)
+
+        with patch("agent.upload_jobs.run_extraction", slow_extraction):
+            job = worker_a.start(doc, blob.file_path, "text/plain")
+            await asyncio.sleep(0.05)
+            # Still extracting: a short wait gives up, a longer one sees it done
+            assert await worker_b.wait_for_conversation("c1", 0.1) is True
+            assert not job.finished
+            asyncio.get_running_loop().call_later(0.1, gate.set)
+            assert await worker_b.wait_for_conversation("c1", 5) is True
+
+        assert job.status == "done"
+        assert await worker_b.wait_for_conversation("c1", 1) is False
+
+    async def test_interrupted_job_is_reported_failed(self, session_factory):
+        # Left "extracting" by a worker that crashed 20 minutes ago
+        async with session_factory() as db:
+            doc = UploadedDocument(
+                filename="alt.pdf",
+                file_path="/data/uploads/alt.pdf",
+                mime_type="application/pdf",
+                file_size=1,
+                extract_status="extracting",
+                created_at=datetime.utcnow() - timedelta(minutes=20),
+            )
+            fresh = UploadedDocument(
+                filename="neu.pdf",
+                file_path="/data/uploads/neu.pdf",
+                mime_type="application/pdf",
+                file_size=1,
+                extract_status="extracting",
+            )
+            db.add_all([doc, fresh])
+            await db.commit()
+
+        registry = UploadJobRegistry(session_factory)
+        state = await registry.load(doc.id)
+        assert state["status"] == "failed"
+        assert state["error"]
+        assert (await registry.load(fresh.id))["status"] == "extracting"
+
+        assert await registry.fail_stale() == 1
+        async with session_factory() as db:
+            assert (await db.get(UploadedDocument, doc.id)).extract_status == "failed"
+            stored = await db.get(UploadedDocument, fresh.id)
+            assert stored.extract_status == "extracting"
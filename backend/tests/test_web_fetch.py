@@ -0,0 +1,206 @@
+"""
+Axon by NeuroVexon - Tests for the web_fetch service (streaming + HTTP cache)
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+
+from agent.web_fetch import HttpCache, WebFetcher, detect_charset, freshness_lifetime
+
+
+class CountingStream(httpx.AsyncByteStream):
+    """Response body in chunks; records how many were read"""
+
+    def __init__(self, chunk: bytes, count: int):
+        self.chunk = chunk
+        self.count = count
+        self.read = 0
+
+    async def __aiter__(self):
+        for _ in range(self.count):
+            self.read += 1
+            yield self.chunk
+
+
+def _fetcher(handler, tmp_path=None, **kwargs) -> WebFetcher:
+    cache = HttpCache(str(tmp_path / "web.db")) if tmp_path else None
+    return WebFetcher(cache=cache, transport=httpx.MockTransport(handler), **kwargs)
+
+
+class TestStreamingRead:
+    async def test_stops_reading_at_max_chars(self):
+        stream = CountingStream(b"a" * 1024, 50_000)  # ~50 MB page
+        fetcher = _fetcher(lambda request: httpx.Response(200, stream=stream))
+        text = await fetcher.fetch("https://example.com/huge")
+        await fetcher.aclose()
+
+        assert text == "a" * 10000
+        assert stream.read < 20
+        assert fetcher.bytes_read < 20 * 1024
+
+    async def test_stops_reading_at_max_bytes(self):
+        stream = CountingStream(b"\x00" * 1024, 1000)
+        fetcher = _fetcher(
+            lambda request: httpx.Response(200, stream=stream),
+            max_chars=10**9,
+            max_bytes=8 * 1024,
+        )
+        await fetcher.fetch("https://example.com/binary")
+        await fetcher.aclose()
+        assert stream.read == 8
+
+    async def test_decodes_with_declared_charset(self):
+        body = "Grüße aus Köln".encode("latin-1")
+        fetcher = _fetcher(
+            lambda request: httpx.Response(
+                200,
+                content=body,
+                headers={"content-type": "text/plain; charset=latin-1"},
+            )
+        )
+        assert await fetcher.fetch("https://example.com/") == "Grüße aus Köln"
+        await fetcher.aclose()
+
+    def test_charset_detection(self):
+        assert detect_charset("text/html; charset=UTF-8", b"") == "utf-8"
+        assert (
+            detect_charset("text/html", b'<html><meta charset="iso-8859-1">')
+            == "iso8859-1"
+        )
+        assert detect_charset("", b"\xef\xbb\xbfabc") == "utf-8-sig"
+        assert detect_charset("text/plain; charset=bogus", b"x") == "utf-8"
+
+
+class TestHttpCache:
+    async def test_fresh_response_served_from_disk(self, tmp_path):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(
+                200, text="Doku", headers={"cache-control": "max-age=600"}
+            )
+
+        fetcher = _fetcher(handler, tmp_path)
+        assert await fetcher.fetch("https://docs.example.com/page") == "Doku"
+        assert await fetcher.fetch("https://docs.example.com/page") == "Doku"
+        await fetcher.aclose()
+
+        # A new process (new fetcher) reads the same cache file
+        again = _fetcher(handler, tmp_path)
+        assert await again.fetch("https://docs.example.com/page") == "Doku"
+        await again.aclose()
+
+        assert len(calls) == 1
+        assert fetcher.stats()["hits"] == 1 and again.hits == 1
+
+    async def test_etag_revalidation(self, tmp_path):
+        calls = []
+
+        def handler(request):
+            calls.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"etag": '"v1"'})
+            return httpx.Response(
+                200,
+                text="Version 1",
+                headers={"etag": '"v1"', "cache-control": "no-cache"},
+            )
+
+        fetcher = _fetcher(handler, tmp_path)
+        assert await fetcher.fetch("https://example.com/a") == "Version 1"
+        assert await fetcher.fetch("https://example.com/a") == "Version 1"
+        await fetcher.aclose()
+
+        assert calls == [None, '"v1"']
+        assert fetcher.revalidated == 1
+
+    async def test_last_modified_revalidation(self, tmp_path):
+        modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("if-modified-since"))
+            if request.headers.get("if-modified-since") == modified:
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                text="Alt",
+                headers={"last-modified": modified, "cache-control": "max-age=0"},
+            )
+
+        fetcher = _fetcher(handler, tmp_path)
+        await fetcher.fetch("https://example.com/b")
+        assert await fetcher.fetch("https://example.com/b") == "Alt"
+        await fetcher.aclose()
+        assert seen == [None, modified]
+
+    async def test_no_store_and_errors_not_cached(self, tmp_path):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            if request.url.path == "/private":
+                return httpx.Response(
+                    200, text="x", headers={"cache-control": "no-store, max-age=60"}
+                )
+            return httpx.Response(
+                404, text="fehlt", headers={"cache-control": "max-age=60"}
+            )
+
+        fetcher = _fetcher(handler, tmp_path)
+        for _ in range(2):
+            await fetcher.fetch("https://example.com/private")
+            await fetcher.fetch("https://example.com/missing")
+        await fetcher.aclose()
+        assert len(calls) == 4
+
+    async def test_cut_body_not_reused_for_larger_limit(self, tmp_path):
+        handler = lambda request: httpx.Response(  # noqa: E731
+            200, text="x" * 5000, headers={"cache-control": "max-age=600"}
+        )
+        small = _fetcher(handler, tmp_path, max_chars=100)
+        assert len(await small.fetch("https://example.com/c")) == 100
+        await small.aclose()
+
+        large = _fetcher(handler, tmp_path, max_chars=10000)
+        assert len(await large.fetch("https://example.com/c")) == 5000
+        await large.aclose()
+        assert large.misses == 1
+
+    async def test_disk_access_off_the_event_loop(self, tmp_path):
+        handler = lambda request: httpx.Response(  # noqa: E731
+            200, text="Doku", headers={"cache-control": "max-age=600"}
+        )
+        fetcher = _fetcher(handler, tmp_path)
+        with patch(
+            "agent.web_fetch.asyncio.to_thread", wraps=asyncio.to_thread
+        ) as to_thread:
+            await fetcher.fetch("https://example.com/d")
+            await fetcher.fetch("https://example.com/d")
+        await fetcher.aclose()
+        # miss: get + put, hit: get
+        assert to_thread.call_count == 3
+
+
+class TestFreshness:
+    def test_lifetime_rules(self):
+        now = time.time()
+        h = httpx.Headers
+        assert freshness_lifetime(h({"cache-control": "max-age=60"}), now) == 60
+        assert (
+            freshness_lifetime(h({"cache-control": "max-age=60", "age": "50"}), now)
+            == 10
+        )
+        assert freshness_lifetime(h({"cache-control": "no-store"}), now) is None
+        assert freshness_lifetime(h({"cache-control": "no-cache"}), now) == 0
+        assert freshness_lifetime(h({"expires": "0"}), now) == 0
+        # Heuristic: 10% of the age of the document, at most one day
+        date = "Wed, 11 Jun 2025 00:00:00 GMT"
+        lifetime = freshness_lifetime(
+            h({"date": date, "last-modified": "Sun, 01 Jun 2025 00:00:00 GMT"}), now
+        )
+        assert lifetime == 86400
@@ -0,0 +1,167 @@
+"""
+Axon by NeuroVexon - Tests for the web_search service (cache + coalescing)
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from agent import web_search as web_search_module
+from agent.web_search import WebSearchService, normalize_query, parse_lite_results
+
+LITE_PAGE = """
+<table>
+<tr><td><a rel="nofollow" href="https://example.com/a" class='result-link'>Axon &amp; <b>Co</b></a></td></tr>
+<tr><td class='result-snippet'>Erster <b>Treffer</b></td></tr>
+<tr><td><a rel="nofollow" href="https://example.com/b" class='result-link'>Zweiter</a></td></tr>
+<tr><td class='result-snippet'>Noch einer</td></tr>
+</table>
+"""
+
+
+@pytest.fixture
+def fake_ddgs(monkeypatch):
+    """Blocking DDGS stand-in that counts calls"""
+    calls = []
+
+    def search(query, max_results):
+        calls.append((query, threading.current_thread()))
+        time.sleep(0.05)
+        return [{"title": query, "url": "https://example.com", "snippet": ""}]
+
+    monkeypatch.setattr(web_search_module, "_ddgs_text", search)
+    return calls
+
+
+def test_normalize_query():
+    assert normalize_query("  Axon   AI\tAgent ") == "axon ai agent"
+    assert normalize_query("AXON") == normalize_query("axon")
+
+
+def test_parse_lite_results():
+    results = parse_lite_results(LITE_PAGE, 5)
+    assert results[0] == {
+        "title": "Axon & Co",
+        "url": "https://example.com/a",
+        "snippet": "Erster Treffer",
+    }
+    assert len(results) == 2
+    assert len(parse_lite_results(LITE_PAGE, 1)) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_runs_off_event_loop(fake_ddgs):
+    service = WebSearchService()
+    results = await service.search("axon", 5)
+    assert results[0]["title"] == "axon"
+    assert fake_ddgs[0][1] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_for_normalized_query(fake_ddgs):
+    service = WebSearchService()
+    await service.search("Axon Agent", 5)
+    results = await service.search("  axon   agent ", 5)
+    assert len(fake_ddgs) == 1
+    assert results[0]["title"] == "Axon Agent"
+    # Different result count is a different query
+    await service.search("axon agent", 10)
+    assert len(fake_ddgs) == 2
+    stats = service.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_results_are_copies(fake_ddgs):
+    service = WebSearchService()
+    first = await service.search("axon", 5)
+    first[0]["title"] = "changed"
+    second = await service.search("axon", 5)
+    assert second[0]["title"] == "axon"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_are_coalesced(fake_ddgs):
+    service = WebSearchService()
+    results = await asyncio.gather(
+        *(service.search("Axon", 5) for _ in range(5)),
+        service.search("other", 5),
+    )
+    assert len(fake_ddgs) == 2
+    assert all(r[0]["title"] == "Axon" for r in results[:5])
+    assert service.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_search(fake_ddgs):
+    service = WebSearchService()
+    first = asyncio.create_task(service.search("axon", 5))
+    second = asyncio.create_task(service.search("axon", 5))
+    await asyncio.sleep(0)
+    first.cancel()
+    results = await second
+    assert results[0]["title"] == "axon"
+    assert len(fake_ddgs) == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry(fake_ddgs, monkeypatch):
+    service = WebSearchService(ttl=10)
+    now = [1000.0]
+    monkeypatch.setattr(web_search_module.time, "monotonic", lambda: now[0])
+    await service.search("axon", 5)
+    now[0] += 5
+    await service.search("axon", 5)
+    assert len(fake_ddgs) == 1
+    now[0] += 10
+    await service.search("axon", 5)
+    assert len(fake_ddgs) == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_zero_disables_cache(fake_ddgs):
+    service = WebSearchService(ttl=0)
+    await service.search("axon", 5)
+    await service.search("axon", 5)
+    assert len(fake_ddgs) == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction(fake_ddgs):
+    service = WebSearchService(max_entries=2)
+    for query in ("a", "b", "a", "c"):
+        await service.search(query, 5)
+    assert service.stats()["entries"] == 2
+    await service.search("a", 5)  # still cached (recently used)
+    await service.search("b", 5)  # evicted
+    assert [q for q, _ in fake_ddgs] == ["a", "b", "c", "b"]
+
+
+@pytest.mark.asyncio
+async def test_lite_fallback_and_errors_not_cached(monkeypatch):
+    def failing(query, max_results):
+        raise RuntimeError("rate limited")
+
+    monkeypatch.setattr(web_search_module, "_ddgs_text", failing)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, text=LITE_PAGE)
+
+    service = WebSearchService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.search("axon", 5)
+    results = await service.search("axon", 5)
+    assert results[0]["url"] == "https://example.com/a"
+    assert requests[0].url.params["q"] == "axon"
+    assert service.stats()["upstream_errors"] == 1
+    await service.aclose()
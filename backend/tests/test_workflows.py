@@ -0,0 +1,344 @@
+"""
+Axon by NeuroVexon - Tests for the workflow engine (dependency graph, parallel
+steps, checkpoints and resume)
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from agent import workflows as workflows_module
+from agent.workflows import (
+    RunNotResumable,
+    WorkflowEngine,
+    cancel_interrupted_runs,
+    plan_workflow_steps,
+)
+from core.settings_cache import SettingsSnapshot
+from db.models import Workflow, WorkflowRun, WorkflowStepResult
+from llm.provider import LLMResponse
+
+
+class FakeProvider:
+    """Answers with the prompt; tracks concurrent calls"""
+
+    def __init__(self, delay: float = 0.02, fail_on: str = ""):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.running = 0
+        self.max_running = 0
+        self.prompts: list[str] = []
+
+    async def chat(self, messages, tools=None, stream=False):
+        prompt = messages[-1].content
+        self.prompts.append(prompt)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_on and self.fail_on in prompt:
+                raise RuntimeError("LLM nicht erreichbar")
+        finally:
+            self.running -= 1
+        return LLMResponse(content=f"<{prompt}>")
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    fake = FakeProvider()
+
+    async def configure(db):
+        return SettingsSnapshot(version=1, values={"llm_provider": "ollama"})
+
+    monkeypatch.setattr(workflows_module, "configure_llm_router", configure)
+    monkeypatch.setattr(workflows_module.llm_router, "get_provider", lambda p: fake)
+    return fake
+
+
+BRIEFING = [
+    {"order": 1, "prompt": "Wetter", "store_as": "wetter"},
+    {"order": 2, "prompt": "Termine", "store_as": "termine"},
+    {"order": 3, "prompt": "News", "store_as": "news"},
+    {"order": 4, "prompt": "Mails", "store_as": "mails"},
+    {"order": 5, "prompt": "Wichtig: {{mails}}", "store_as": "wichtig"},
+    {"order": 6, "prompt": "Aufgaben", "store_as": "aufgaben"},
+    {"order": 7, "prompt": "Kurse", "store_as": "kurse"},
+    {
+        "order": 8,
+        "prompt": "Briefing: {{wetter}} {{termine}} {{news}} {{wichtig}}",
+        "store_as": "briefing",
+        "depends_on": ["aufgaben", "kurse"],
+    },
+]
+
+
+async def _workflow(db, steps) -> Workflow:
+    wf = Workflow(name="Morgen", steps=steps)
+    db.add(wf)
+    await db.commit()
+    return wf
+
+
+def test_plan_dependencies():
+    plan = plan_workflow_steps(BRIEFING)
+    assert [s.depends_on for s in plan[:4]] == [set(), set(), set(), set()]
+    assert plan[4].depends_on == {3}
+    assert plan[7].depends_on == {0, 1, 2, 4, 5, 6}
+
+
+def test_plan_reads_latest_earlier_writer():
+    plan = plan_workflow_steps(
+        [
+            {"order": 1, "prompt": "a", "store_as": "x"},
+            {"order": 2, "prompt": "{{x}} {{later}}", "store_as": "y"},
+            {"order": 3, "prompt": "b", "store_as": "x"},
+            {"order": 4, "prompt": "{{x}}", "store_as": "later"},
+        ]
+    )
+    assert plan[1].reads == {"x": 0, "later": None}
+    assert plan[3].depends_on == {2}
+
+
+def test_plan_rejects_unknown_dependency():
+    with pytest.raises(ValueError):
+        plan_workflow_steps(
+            [
+                {"order": 1, "prompt": "a", "store_as": "a", "depends_on": ["b"]},
+                {"order": 2, "prompt": "b", "store_as": "b"},
+            ]
+        )
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_in_parallel(db, provider):
+    wf = await _workflow(db, BRIEFING)
+    started, finished = [], []
+
+    async def on_start(step, total, prompt, store_as):
+        started.append(step)
+
+    async def on_result(step, store_as, result):
+        finished.append(store_as)
+
+    run = await WorkflowEngine(db, max_parallel=8).execute_workflow(
+        wf.id, on_step_start=on_start, on_step_result=on_result
+    )
+
+    assert run.status == "completed"
+    assert provider.max_running > 1
+    assert sorted(started) == list(range(1, 9))
+    assert finished[-1] == "briefing"
+    assert run.current_step == 8
+    assert run.context["wichtig"] == "<Wichtig: <Mails>>"
+    assert run.context["briefing"] == (
+        "<Briefing: <Wetter> <Termine> <News> <Wichtig: <Mails>>>"
+    )
+    assert list(run.context) == [s["store_as"] for s in BRIEFING]
+
+
+@pytest.mark.asyncio
+async def test_parallel_result_matches_sequential(db, provider):
+    wf = await _workflow(db, BRIEFING)
+    parallel = await WorkflowEngine(db, max_parallel=4).execute_workflow(wf.id)
+    assert provider.max_running <= 4
+
+    provider.max_running = 0
+    sequential = await WorkflowEngine(db, max_parallel=1).execute_workflow(wf.id)
+    assert provider.max_running == 1
+    assert parallel.context == sequential.context
+
+
+@pytest.mark.asyncio
+async def test_failed_step_stops_run(db, provider):
+    provider.fail_on = "News"
+    wf = await _workflow(db, BRIEFING)
+
+    run = await WorkflowEngine(db, max_parallel=2).execute_workflow(wf.id)
+
+    assert run.status == "failed"
+    assert run.error.startswith("Step 3 (news)")
+    assert "briefing" not in run.context
+    assert run.context["wetter"] == "<Wetter>"
+    assert all(not p.startswith("Briefing") for p in provider.prompts)
+
+
+async def _checkpoints(db, run_id) -> list[WorkflowStepResult]:
+    result = await db.execute(
+        select(WorkflowStepResult)
+        .where(WorkflowStepResult.run_id == run_id)
+        .order_by(WorkflowStepResult.step_index)
+    )
+    return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_steps_are_checkpointed(db, provider):
+    wf = await _workflow(db, BRIEFING)
+    run = await WorkflowEngine(db).execute_workflow(wf.id)
+
+    checkpoints = await _checkpoints(db, run.id)
+    assert [cp.store_as for cp in checkpoints] == [s["store_as"] for s in BRIEFING]
+    assert {cp.source for cp in checkpoints} == {"llm"}
+    assert len({cp.input_hash for cp in checkpoints}) == len(BRIEFING)
+    assert checkpoints[4].result == "<Wichtig: <Mails>>"
+
+
+@pytest.mark.asyncio
+async def test_resume_continues_at_failed_step(db, provider):
+    provider.fail_on = "News"
+    wf = await _workflow(db, BRIEFING)
+    engine = WorkflowEngine(db, max_parallel=1)
+    failed = await engine.execute_workflow(wf.id)
+    assert failed.status == "failed"
+
+    provider.fail_on = ""
+    provider.prompts.clear()
+    finished = []
+
+    async def on_result(step, store_as, result):
+        finished.append(store_as)
+
+    run = await engine.resume_run(failed.id, on_step_result=on_result)
+
+    assert run.id == failed.id
+    assert run.status == "completed"
+    assert run.error is None
+    # Wetter and Termine come from their checkpoints
+    assert provider.prompts[0] == "News"
+    assert all(p not in ("Wetter", "Termine") for p in provider.prompts)
+    assert finished == [s["store_as"] for s in BRIEFING]
+    assert len(await _checkpoints(db, run.id)) == len(BRIEFING)
+
+
+@pytest.mark.asyncio
+async def test_resume_reruns_step_with_changed_input(db, provider):
+    provider.fail_on = "Briefing"
+    wf = await _workflow(db, BRIEFING)
+    failed = await WorkflowEngine(db).execute_workflow(wf.id)
+
+    steps = [dict(step) for step in BRIEFING]
+    steps[3]["prompt"] = "Alle Mails"
+    wf.steps = steps
+    await db.commit()
+    provider.fail_on = ""
+    provider.prompts.clear()
+
+    run = await WorkflowEngine(db).resume_run(failed.id)
+
+    assert run.status == "completed"
+    assert sorted(provider.prompts) == sorted(
+        [
+            "Alle Mails",
+            "Wichtig: <Alle Mails>",
+            "Briefing: <Wetter> <Termine> <News> <Wichtig: <Alle Mails>>",
+        ]
+    )
+    assert len(await _checkpoints(db, run.id)) == len(BRIEFING)
+
+
+@pytest.mark.asyncio
+async def test_resume_rejects_completed_run(db, provider):
+    wf = await _workflow(db, BRIEFING[:1])
+    run = await WorkflowEngine(db).execute_workflow(wf.id)
+    with pytest.raises(ValueError):
+        await WorkflowEngine(db).resume_run(run.id)
+
+
+@pytest.mark.asyncio
+async def test_resume_claims_run_once(db, provider):
+    provider.fail_on = "News"
+    wf = await _workflow(db, BRIEFING)
+    failed = await WorkflowEngine(db).execute_workflow(wf.id)
+    provider.fail_on = ""
+
+    # Another request resumed it first; this session still sees "failed"
+    await db.execute(
+        update(WorkflowRun)
+        .where(WorkflowRun.id == failed.id)
+        .values(status="running")
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    assert failed.status == "failed"
+    with pytest.raises(RunNotResumable):
+        await WorkflowEngine(db).resume_run(failed.id)
+    assert failed.status == "running"
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_is_cancelled_and_resumable(db, provider):
+    provider.fail_on = "News"
+    wf = await _workflow(db, BRIEFING)
+    run = await WorkflowEngine(db).execute_workflow(wf.id)
+    run.status = "running"  # Worker died mid-run, three minutes ago
+    run.heartbeat_at = datetime.utcnow() - timedelta(minutes=3)
+    await db.commit()
+    provider.fail_on = ""
+
+    assert await cancel_interrupted_runs(db) == 1
+    await db.refresh(run)
+    assert run.status == "cancelled"
+    assert run.error
+
+    run = await WorkflowEngine(db).resume_run(run.id)
+    assert run.status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_run_of_live_worker_is_not_cancelled(db, provider):
+    provider.delay = 0.2
+    wf = await _workflow(db, BRIEFING[:1])
+    execution = asyncio.create_task(WorkflowEngine(db).execute_workflow(wf.id))
+    await asyncio.sleep(0.05)
+
+    # A respawned scheduler worker sweeps while the run is still executing
+    assert await cancel_interrupted_runs(db) == 0
+    run = await execution
+    assert run.status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_aborted_run_is_cancelled(db, provider):
+    provider.delay = 1.0
+    wf = await _workflow(db, BRIEFING[:1])
+    execution = asyncio.create_task(WorkflowEngine(db).execute_workflow(wf.id))
+    await asyncio.sleep(0.05)
+    execution.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await execution
+
+    (run,) = (await db.execute(select(WorkflowRun))).scalars().all()
+    await db.refresh(run)
+    assert run.status == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_cache_reuses_identical_input(db, provider):
+    wf = await _workflow(db, BRIEFING)
+    await WorkflowEngine(db, cache_ttl=0).execute_workflow(wf.id)
+    provider.prompts.clear()
+
+    assert (await WorkflowEngine(db, cache_ttl=0).execute_workflow(wf.id)).context
+    assert len(provider.prompts) == len(BRIEFING)
+    provider.prompts.clear()
+
+    run = await WorkflowEngine(db, cache_ttl=600).execute_workflow(wf.id)
+    assert run.status == "completed"
+    assert provider.prompts == []
+    checkpoints = await _checkpoints(db, run.id)
+    assert {cp.source for cp in checkpoints} == {"cache"}
+
+
+@pytest.mark.asyncio
+async def test_cache_ttl_expires(db, provider):
+    wf = await _workflow(db, BRIEFING[:1])
+    first = await WorkflowEngine(db).execute_workflow(wf.id)
+    (checkpoint,) = await _checkpoints(db, first.id)
+    checkpoint.created_at = datetime.utcnow() - timedelta(hours=2)
+    await db.commit()
+    provider.prompts.clear()
+
+    await WorkflowEngine(db, cache_ttl=3600).execute_workflow(wf.id)
+    assert provider.prompts == ["Wetter"]
@@ -636,7 +636,7 @@ export const api = {
     description: string | null
     trigger_phrase: string | null
     agent_id: string | null
-    steps: Array<{ order: number; prompt: string; store_as: string }>
+    steps: Array<{ order: number; prompt: string; store_as: string; depends_on?: string[] }>
     approval_mode: string
     enabled: boolean
     created_at: string
@@ -652,7 +652,7 @@ export const api = {
     description?: string
     trigger_phrase?: string
     agent_id?: string
-    steps: Array<{ order: number; prompt: string; store_as: string }>
+    steps: Array<{ order: number; prompt: string; store_as: string; depends_on?: string[] }>
     approval_mode?: string
   }): Promise<{ id: string }> {
     const response = await authFetch(`${API_BASE}/workflows`, {
@@ -706,6 +706,19 @@ export const api = {
     return response.json()
   },
 
+  async resumeWorkflowRun(runId: string): Promise<{
+    id: string
+    status: string
+    context: Record<string, string> | null
+    error: string | null
+    started_at: string
+    completed_at: string | null
+  }> {
+    const response = await authFetch(`${API_BASE}/workflows/runs/${runId}/resume`, { method: 'POST' })
+    if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`)
+    return response.json()
+  },
+
   // Analytics / Dashboard
   async getAnalyticsOverview(): Promise<{
     conversations: number
@@ -757,6 +770,8 @@ export const api = {
     file_size: number
     has_text: boolean
     text_preview: string
+    job_id: string
+    status: string
   }> {
     const formData = new FormData()
     formData.append('file', file)